@@ -0,0 +1,261 @@
+"""
+Almacén columnar de cajas para flotas grandes
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Guarda las cajas como columnas de arrays tipados (struct-of-arrays) en lugar
+de un objeto Caja con __dict__ por caja. Los códigos y las descripciones de
+carga se internan en tablas de cadenas, y las filas se consultan mediante
+vistas ligeras (CajaVista) compatibles con Caja.
+
+quitar() mueve la última fila al hueco que deja la caja quitada, así que las
+filas cambian. Cada vista recuerda el código de su caja y la generación del
+almacén (que sube en cada quitar): si ha cambiado, vuelve a buscar la fila
+por el código antes de leer, y si la caja ya no está lanza KeyError. Una
+vista nunca devuelve datos de otra caja.
+"""
+
+import math
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from ej6_1 import Caja
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+class TablaCadenas:
+    """Tabla de cadenas internadas: cada texto distinto se guarda una vez"""
+
+    def __init__(self):
+        self.cadenas: List[str] = []
+        self._indices: Dict[str, int] = {}
+
+    def internar(self, texto: str) -> int:
+        """Devuelve el índice del texto, añadiéndolo si es nuevo"""
+        indice = self._indices.get(texto)
+        if indice is None:
+            indice = len(self.cadenas)
+            texto = sys.intern(texto)
+            self.cadenas.append(texto)
+            self._indices[texto] = indice
+        return indice
+
+    def indice(self, texto: str) -> Optional[int]:
+        """Índice del texto, o None si no está en la tabla"""
+        return self._indices.get(texto)
+
+    def __getitem__(self, indice: int) -> str:
+        return self.cadenas[indice]
+
+    def __len__(self) -> int:
+        return len(self.cadenas)
+
+
+class CajaVista:
+    """Vista de una caja del almacén con la misma interfaz que Caja"""
+
+    __slots__ = ('_almacen', '_fila', '_codigo', '_generacion')
+
+    def __init__(self, almacen: 'AlmacenCajas', fila: int):
+        self._almacen = almacen
+        self._fila = fila
+        self._codigo = almacen.codigo_idx[fila]
+        self._generacion = almacen._generacion
+
+    def _fila_actual(self) -> int:
+        """Fila de la caja, buscándola otra vez si el almacén ha quitado cajas"""
+        almacen = self._almacen
+        if self._generacion != almacen._generacion:
+            fila = almacen._fila_de[self._codigo]
+            if fila < 0:
+                raise KeyError(f"La caja {self.codigo} ya no está en el almacén")
+            self._fila = fila
+            self._generacion = almacen._generacion
+        return self._fila
+
+    @property
+    def codigo(self) -> str:
+        return self._almacen.codigos[self._codigo]
+
+    @property
+    def peso_kg(self) -> float:
+        return self._almacen.peso_kg[self._fila_actual()]
+
+    @property
+    def descripcion_carga(self) -> str:
+        almacen = self._almacen
+        return almacen.descripciones[almacen.descripcion_idx[self._fila_actual()]]
+
+    @property
+    def largo(self) -> float:
+        return self._almacen.largo[self._fila_actual()]
+
+    @property
+    def ancho(self) -> float:
+        return self._almacen.ancho[self._fila_actual()]
+
+    @property
+    def altura(self) -> float:
+        return self._almacen.altura[self._fila_actual()]
+
+    # Misma representación y volumen que una Caja normal
+    volumen = Caja.volumen
+    __str__ = Caja.__str__
+
+    def a_caja(self) -> Caja:
+        """Materializa la fila como un objeto Caja independiente"""
+        return Caja(self.codigo, self.peso_kg, self.descripcion_carga,
+                    self.largo, self.ancho, self.altura)
+
+    def __repr__(self) -> str:
+        return f"CajaVista({self.codigo!r}, fila={self._fila})"
+
+
+class AlmacenCajas:
+    """Almacén columnar (struct-of-arrays) de cajas"""
+
+    def __init__(self, cajas: Iterable = ()):
+        self.codigo_idx = array('I')
+        self.peso_kg = array('d')
+        self.largo = array('d')
+        self.ancho = array('d')
+        self.altura = array('d')
+        self.descripcion_idx = array('I')
+        self.codigos = TablaCadenas()
+        self.descripciones = TablaCadenas()
+        # Fila de cada código (por su índice en la tabla), -1 si no está
+        self._fila_de = array('i')
+        # Sube en cada quitar(): las vistas anteriores revisan su fila
+        self._generacion = 0
+        self.extender(cajas)
+
+    def _columnas(self) -> tuple:
+        return (self.codigo_idx, self.peso_kg, self.largo, self.ancho, self.altura, self.descripcion_idx)
+
+    def _fila_codigo(self, codigo: str) -> int:
+        indice = self.codigos.indice(codigo)
+        return -1 if indice is None else self._fila_de[indice]
+
+    def agregar_fila(self, codigo: str, peso_kg: float, descripcion_carga: str,
+                     largo: float, ancho: float, altura: float) -> int:
+        """Añade una caja a partir de sus campos y devuelve su fila"""
+        if self._fila_codigo(codigo) >= 0:
+            raise ValueError(f"La caja {codigo} ya está en el almacén")
+        fila = len(self.codigo_idx)
+        indice = self.codigos.internar(codigo)
+        if indice == len(self._fila_de):
+            self._fila_de.append(fila)
+        else:
+            self._fila_de[indice] = fila  # Código que ya estuvo y se quitó
+        self.codigo_idx.append(indice)
+        self.peso_kg.append(peso_kg)
+        self.largo.append(largo)
+        self.ancho.append(ancho)
+        self.altura.append(altura)
+        self.descripcion_idx.append(self.descripciones.internar(descripcion_carga))
+        return fila
+
+    def agregar(self, caja) -> int:
+        """Añade una Caja (o cualquier objeto compatible) y devuelve su fila"""
+        return self.agregar_fila(caja.codigo, caja.peso_kg, caja.descripcion_carga,
+                                 caja.largo, caja.ancho, caja.altura)
+
+    def extender(self, cajas: Iterable):
+        """Añade varias cajas"""
+        for caja in cajas:
+            self.agregar(caja)
+
+    def quitar(self, codigo: str) -> Caja:
+        """Quita una caja en O(1) moviendo la última fila a su hueco.
+
+        Devuelve la caja materializada. Las vistas que ya había siguen a su
+        caja (la de la fila movida se reubica al usarla) y las de la caja
+        quitada lanzan KeyError.
+        """
+        fila = self._fila_codigo(codigo)
+        if fila < 0:
+            raise KeyError(codigo)
+        caja = CajaVista(self, fila).a_caja()
+        ultima = len(self.codigo_idx) - 1
+        columnas = self._columnas()
+        if fila != ultima:
+            for columna in columnas:
+                columna[fila] = columna[ultima]
+            self._fila_de[self.codigo_idx[fila]] = fila
+        for columna in columnas:
+            columna.pop()
+        self._fila_de[self.codigos.indice(codigo)] = -1
+        self._generacion += 1
+        return caja
+
+    def buscar(self, codigo: str) -> Optional[CajaVista]:
+        """Devuelve la vista de la caja con ese código o None"""
+        fila = self._fila_codigo(codigo)
+        return None if fila < 0 else CajaVista(self, fila)
+
+    def fila(self, indice: int) -> CajaVista:
+        """Devuelve la vista de una fila"""
+        if not -len(self) <= indice < len(self):
+            raise IndexError("Fila fuera de rango")
+        return CajaVista(self, indice % len(self))
+
+    # ===== Agregados vectorizados =====
+
+    def peso_total(self) -> float:
+        """Suma de pesos de todas las cajas"""
+        if NUMPY_AVAILABLE:
+            return float(np.frombuffer(self.peso_kg, dtype=np.float64).sum())
+        return math.fsum(self.peso_kg)
+
+    def volumenes(self) -> array:
+        """Volumen de cada caja (cm³), en el mismo orden que las filas"""
+        if NUMPY_AVAILABLE and len(self):
+            largo = np.frombuffer(self.largo, dtype=np.float64)
+            ancho = np.frombuffer(self.ancho, dtype=np.float64)
+            altura = np.frombuffer(self.altura, dtype=np.float64)
+            return array('d', (largo * ancho * altura).tobytes())
+        return array('d', map(lambda l, a, h: l * a * h, self.largo, self.ancho, self.altura))
+
+    def volumen_total(self) -> float:
+        """Suma de volúmenes de todas las cajas (cm³)"""
+        if NUMPY_AVAILABLE and len(self):
+            largo = np.frombuffer(self.largo, dtype=np.float64)
+            ancho = np.frombuffer(self.ancho, dtype=np.float64)
+            altura = np.frombuffer(self.altura, dtype=np.float64)
+            return float(np.dot(largo * ancho, altura))
+        return math.fsum(map(lambda l, a, h: l * a * h, self.largo, self.ancho, self.altura))
+
+    def densidades(self) -> array:
+        """Densidad de cada caja en kg/cm³ (0 si el volumen es 0)"""
+        volumenes = self.volumenes()
+        if NUMPY_AVAILABLE and len(self):
+            peso = np.frombuffer(self.peso_kg, dtype=np.float64)
+            vol = np.frombuffer(volumenes, dtype=np.float64)
+            resultado = np.divide(peso, vol, out=np.zeros_like(peso), where=vol > 0)
+            return array('d', resultado.tobytes())
+        return array('d', map(lambda p, v: p / v if v > 0 else 0.0, self.peso_kg, volumenes))
+
+    def densidad_media(self) -> float:
+        """Densidad global de la carga (peso total / volumen total)"""
+        volumen = self.volumen_total()
+        return self.peso_total() / volumen if volumen > 0 else 0.0
+
+    def __iter__(self):
+        for fila in range(len(self.codigo_idx)):
+            yield CajaVista(self, fila)
+
+    def __getitem__(self, indice: int) -> CajaVista:
+        return self.fila(indice)
+
+    def __contains__(self, codigo: str) -> bool:
+        return self._fila_codigo(codigo) >= 0
+
+    def __len__(self) -> int:
+        return len(self.codigo_idx)
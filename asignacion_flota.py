@@ -0,0 +1,381 @@
+"""
+Asignación de cajas a toda la flota de camiones
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+En lugar de cargar las cajas camión a camión, calcula una asignación global
+de N cajas a M camiones con heurísticas de bin packing por peso:
+
+- Primer ajuste decreciente (FFD): cada caja, de mayor a menor, va al primer
+  camión donde cabe. Un árbol de segmentos con la capacidad libre máxima
+  encuentra ese camión en O(log M). Para minimizar camiones se recorren de
+  mayor a menor capacidad libre (se llenan los grandes y sobran los
+  pequeños); para maximizar carga, de menor a mayor, así las cajas medianas
+  no gastan el hueco de los grandes que necesitan las que vienen después.
+- Mejor ajuste decreciente (BFD): cada caja va al camión donde menos hueco
+  deja. Una lista ordenada de capacidades libres lo encuentra con bisect.
+
+Opcionalmente se aplica una pasada de búsqueda local: vaciar los camiones
+menos cargados moviendo sus cajas o repartiendo de nuevo las de unos pocos
+camiones libres para hacerles sitio (minimizar camiones), o intercambiar
+cajas para meter las que quedaron fuera (maximizar carga). En las dos,
+iteraciones_max limita los intentos de colocar una caja en un camión.
+"""
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Optional, Sequence
+
+from ej6_1 import ResultadoCarga
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+EPSILON = 1e-9
+# Margen relativo que se deja libre en cada camión para que el redondeo de
+# las sumas en coma flotante no haga rechazar luego la carga en add_cajas
+MARGEN_CAPACIDAD = 1e-9
+# Camiones que como mucho se reparten de nuevo para hacer sitio a una caja
+# del camión que se intenta vaciar
+SOCIOS_REPARTO = 4
+
+
+class Objetivo(Enum):
+    """Qué optimiza la asignación"""
+    MINIMIZAR_CAMIONES = "min_trucks"
+    MAXIMIZAR_CARGA = "max_payload"
+
+
+class Heuristica(Enum):
+    """Heurística de colocación"""
+    PRIMER_AJUSTE_DECRECIENTE = "ffd"
+    MEJOR_AJUSTE_DECRECIENTE = "bfd"
+
+
+@dataclass
+class AsignacionFlota:
+    """Resultado de asignar cajas a la flota"""
+    asignacion: Dict[str, str] = field(default_factory=dict)  # codigo -> matricula
+    cajas_por_camion: Dict[str, list] = field(default_factory=dict)
+    sin_asignar: list = field(default_factory=list)
+    carga_kg: Dict[str, float] = field(default_factory=dict)  # Incluye la carga previa
+    capacidad_kg: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def camiones_usados(self) -> int:
+        return sum(1 for cajas in self.cajas_por_camion.values() if cajas)
+
+    @property
+    def peso_asignado(self) -> float:
+        return sum(caja.peso_kg for cajas in self.cajas_por_camion.values() for caja in cajas)
+
+    def utilizacion(self) -> Dict[str, float]:
+        """Fracción de la capacidad usada por cada camión (0-1)"""
+        return {matricula: (self.carga_kg[matricula] / capacidad if capacidad > 0 else 0.0)
+                for matricula, capacidad in self.capacidad_kg.items()}
+
+    def aplicar(self, camiones: Sequence) -> Dict[str, ResultadoCarga]:
+        """Carga realmente las cajas asignadas en cada camión"""
+        return {camion.matricula: camion.add_cajas(self.cajas_por_camion.get(camion.matricula, []))
+                for camion in camiones}
+
+    def resumen(self) -> str:
+        """Texto con la utilización de cada camión"""
+        lineas = [f"🚛 Camiones usados: {self.camiones_usados}/{len(self.capacidad_kg)}",
+                  f"📦 Cajas sin asignar: {len(self.sin_asignar)}"]
+        for matricula, uso in self.utilizacion().items():
+            lineas.append(f"  {matricula}: {self.carga_kg[matricula]:.1f}/"
+                          f"{self.capacidad_kg[matricula]} kg ({uso * 100:.1f}%)")
+        return "\n".join(lineas)
+
+
+class _ArbolMaximos:
+    """Árbol de segmentos con el máximo de capacidad libre por rango"""
+
+    def __init__(self, valores: List[float]):
+        self.n = 1
+        while self.n < max(1, len(valores)):
+            self.n *= 2
+        self.arbol = [float('-inf')] * (2 * self.n)
+        self.arbol[self.n:self.n + len(valores)] = valores
+        for i in range(self.n - 1, 0, -1):
+            self.arbol[i] = max(self.arbol[2 * i], self.arbol[2 * i + 1])
+
+    def primero_mayor_igual(self, valor: float) -> int:
+        """Índice más a la izquierda con valor >= valor, o -1"""
+        arbol = self.arbol
+        if arbol[1] < valor - EPSILON:
+            return -1
+        i = 1
+        while i < self.n:
+            i = 2 * i if arbol[2 * i] >= valor - EPSILON else 2 * i + 1
+        return i - self.n
+
+    def actualizar(self, indice: int, valor: float):
+        arbol = self.arbol
+        i = indice + self.n
+        arbol[i] = valor
+        i //= 2
+        while i:
+            nuevo = max(arbol[2 * i], arbol[2 * i + 1])
+            if arbol[i] == nuevo:
+                break
+            arbol[i] = nuevo
+            i //= 2
+
+
+def _orden_decreciente(pesos: List[float]) -> List[int]:
+    if NUMPY_AVAILABLE:
+        return np.argsort(-np.asarray(pesos, dtype=np.float64), kind='stable').tolist()
+    return sorted(range(len(pesos)), key=pesos.__getitem__, reverse=True)
+
+
+def asignar_flota(cajas: Sequence, camiones: Sequence,
+                  objetivo=Objetivo.MINIMIZAR_CAMIONES,
+                  heuristica=Heuristica.PRIMER_AJUSTE_DECRECIENTE,
+                  busqueda_local: bool = False,
+                  iteraciones_max: int = 10_000) -> AsignacionFlota:
+    """Calcula una asignación de cajas a camiones respetando capacidad_kg.
+
+    No modifica los camiones: usa AsignacionFlota.aplicar() para cargarlos.
+    La carga que ya llevan los camiones se descuenta de su capacidad.
+    """
+    objetivo = Objetivo(objetivo)
+    heuristica = Heuristica(heuristica)
+    pesos = [caja.peso_kg for caja in cajas]
+    libres = [camion.capacidad_kg * (1 - MARGEN_CAPACIDAD) - camion.peso_total()
+              for camion in camiones]
+    # Camiones de mayor a menor capacidad libre: se "abren" los grandes primero
+    orden_camiones = sorted(range(len(camiones)), key=libres.__getitem__, reverse=True)
+    libre = [libres[i] for i in orden_camiones]
+    destino = [-1] * len(cajas)  # caja -> posición en orden_camiones
+
+    if heuristica is Heuristica.PRIMER_AJUSTE_DECRECIENTE:
+        # Para maximizar carga el primer ajuste recorre los camiones al revés,
+        # del menos libre al más libre
+        invertir = objetivo is Objetivo.MAXIMIZAR_CARGA
+        if invertir:
+            libre.reverse()
+        arbol = _ArbolMaximos(libre)
+        for i in _orden_decreciente(pesos):
+            j = arbol.primero_mayor_igual(pesos[i])
+            if j >= 0:
+                destino[i] = j
+                libre[j] -= pesos[i]
+                arbol.actualizar(j, libre[j])
+        if invertir:
+            libre.reverse()
+            ultimo = len(libre) - 1
+            destino = [ultimo - j if j >= 0 else -1 for j in destino]
+    else:
+        # Lista ordenada (capacidad libre, camión). Para minimizar camiones solo
+        # se consideran los ya abiertos y se abre uno nuevo cuando no cabe.
+        abiertos = []
+        siguiente = 0
+        if objetivo is Objetivo.MAXIMIZAR_CARGA:
+            abiertos = sorted((libre[j], j) for j in range(len(libre)))
+            siguiente = len(libre)
+        for i in _orden_decreciente(pesos):
+            peso = pesos[i]
+            k = bisect_left(abiertos, (peso - EPSILON, -1))
+            if k < len(abiertos):
+                _, j = abiertos.pop(k)
+            elif siguiente < len(libre) and libre[siguiente] >= peso - EPSILON:
+                j = siguiente
+                siguiente += 1
+            else:
+                continue
+            destino[i] = j
+            libre[j] -= peso
+            insort(abiertos, (libre[j], j))
+
+    if busqueda_local:
+        if objetivo is Objetivo.MINIMIZAR_CAMIONES:
+            _vaciar_camiones(pesos, destino, libre, iteraciones_max)
+        else:
+            _intercambiar_cajas(pesos, destino, libre, iteraciones_max)
+
+    resultado = AsignacionFlota()
+    for indice in orden_camiones:
+        camion = camiones[indice]
+        resultado.cajas_por_camion[camion.matricula] = []
+        resultado.capacidad_kg[camion.matricula] = camion.capacidad_kg
+        resultado.carga_kg[camion.matricula] = camion.peso_total()
+    for i, j in enumerate(destino):
+        if j < 0:
+            resultado.sin_asignar.append(cajas[i])
+        else:
+            matricula = camiones[orden_camiones[j]].matricula
+            resultado.asignacion[cajas[i].codigo] = matricula
+            resultado.cajas_por_camion[matricula].append(cajas[i])
+            resultado.carga_kg[matricula] += pesos[i]
+    return resultado
+
+
+def _cajas_por_destino(destino: List[int], n_camiones: int) -> List[List[int]]:
+    por_camion = [[] for _ in range(n_camiones)]
+    for i, j in enumerate(destino):
+        if j >= 0:
+            por_camion[j].append(i)
+    return por_camion
+
+
+def _repartir(pesos: List[float], huecos: List[float], intentos_max: int):
+    """Reparte los pesos (de mayor a menor) entre los huecos con búsqueda en profundidad.
+
+    Devuelve (hueco de cada peso o None si no hay reparto, intentos hechos).
+    Cada intento es probar un peso en un hueco; se para en intentos_max.
+    """
+    libres = list(huecos)
+    asignado = [-1] * len(pesos)
+    pendiente = [0.0] * (len(pesos) + 1)  # Peso que queda desde cada posición
+    for n in range(len(pesos) - 1, -1, -1):
+        pendiente[n] = pendiente[n + 1] + pesos[n]
+    intentos = 0
+
+    def colocar(n: int) -> bool:
+        nonlocal intentos
+        if n == len(pesos):
+            return True
+        if pendiente[n] > sum(libres) + EPSILON:
+            return False
+        probados = set()  # Dos huecos iguales dan el mismo subárbol
+        for h, hueco in enumerate(libres):
+            if hueco < pesos[n] - EPSILON or hueco in probados:
+                continue
+            if intentos >= intentos_max:
+                return False
+            intentos += 1
+            probados.add(hueco)
+            libres[h] -= pesos[n]
+            asignado[n] = h
+            if colocar(n + 1):
+                return True
+            libres[h] += pesos[n]
+        return False
+
+    return (asignado if colocar(0) else None), intentos
+
+
+def _vaciar_camiones(pesos, destino, libre, iteraciones_max: int):
+    """Intenta repartir las cajas de los camiones menos cargados entre el resto.
+
+    Cada caja, de la más pesada a la más ligera, va al camión usado donde
+    menos hueco deja. Si no cabe en ninguno, se busca un grupo de camiones
+    libres (de 2 a SOCIOS_REPARTO, empezando por los más libres) que entre
+    todos tenga hueco para ella y se reparten de nuevo sus cajas con la
+    nueva. Si el camión no se llega a vaciar se deshacen sus movimientos.
+    """
+    por_camion = _cajas_por_destino(destino, len(libre))
+    # Cajas de cada camión como (peso, caja), de menor a mayor peso
+    cargadas = [sorted((pesos[i], i) for i in asignadas) for asignadas in por_camion]
+    usados = [j for j in range(len(libre)) if cargadas[j]]
+    # Camiones usados por capacidad libre, sin el que se está vaciando
+    huecos = sorted((libre[j], j) for j in usados)
+    # Primero los que menos peso asignado llevan
+    usados.sort(key=lambda j: sum(peso for peso, _ in cargadas[j]))
+    hechos = []  # (caja, origen, destino) del camión que se está vaciando
+    vaciando = -1
+    iteraciones = 0
+
+    def mover(i: int, origen: int, hacia: int):
+        for camion in (origen, hacia):
+            if camion != vaciando:
+                huecos.pop(bisect_left(huecos, (libre[camion], camion)))
+        cargadas[origen].remove((pesos[i], i))
+        insort(cargadas[hacia], (pesos[i], i))
+        destino[i] = hacia
+        libre[origen] += pesos[i]
+        libre[hacia] -= pesos[i]
+        for camion in (origen, hacia):
+            if camion != vaciando:
+                insort(huecos, (libre[camion], camion))
+
+    def hacer_sitio(i: int) -> bool:
+        """Mete la caja i en un grupo de camiones libres repartiendo otra vez sus cajas"""
+        nonlocal iteraciones
+        fin = len(huecos)
+        while iteraciones < iteraciones_max:
+            # El grupo más pequeño con hueco para la caja entre los más libres que quedan
+            inicio, hueco = fin, 0.0
+            while inicio > 0 and fin - inicio < SOCIOS_REPARTO and (
+                    fin - inicio < 2 or hueco < pesos[i] - EPSILON):
+                inicio -= 1
+                hueco += huecos[inicio][0]
+            if fin - inicio < 2 or hueco < pesos[i] - EPSILON:
+                return False
+            socios = [camion for _, camion in huecos[inicio:fin]]
+            cajas = [i] + [caja for camion in socios for _, caja in cargadas[camion]]
+            cajas.sort(key=pesos.__getitem__, reverse=True)
+            capacidades = [libre[camion] + sum(peso for peso, _ in cargadas[camion]) for camion in socios]
+            reparto, intentos = _repartir([pesos[caja] for caja in cajas], capacidades,
+                                          iteraciones_max - iteraciones)
+            iteraciones += intentos
+            if reparto is not None:
+                for caja, h in zip(cajas, reparto):
+                    if destino[caja] != socios[h]:
+                        hechos.append((caja, destino[caja], socios[h]))
+                        mover(caja, destino[caja], socios[h])
+                return True
+            fin = inicio
+        return False
+
+    for vaciando in usados:
+        if iteraciones >= iteraciones_max or len(huecos) < 2:
+            break
+        huecos.pop(bisect_left(huecos, (libre[vaciando], vaciando)))
+        hechos.clear()
+        for peso, i in reversed(cargadas[vaciando][:]):
+            if iteraciones >= iteraciones_max:
+                break
+            iteraciones += 1
+            k = bisect_left(huecos, (peso - EPSILON, -1))
+            if k < len(huecos):
+                hechos.append((i, vaciando, huecos[k][1]))
+                mover(i, vaciando, huecos[k][1])
+            elif not hacer_sitio(i):
+                break
+        if cargadas[vaciando]:
+            for i, origen, hacia in reversed(hechos):
+                mover(i, hacia, origen)
+            insort(huecos, (libre[vaciando], vaciando))
+
+
+def _intercambiar_cajas(pesos, destino, libre, iteraciones_max: int):
+    """Cambia cajas asignadas por otras más pesadas que se quedaron fuera"""
+    por_camion = _cajas_por_destino(destino, len(libre))
+    fuera = sorted((i for i, j in enumerate(destino) if j < 0),
+                   key=pesos.__getitem__, reverse=True)
+    iteraciones = 0
+    for u in fuera:
+        mejor: Optional[tuple] = None  # (ganancia, camión, caja que sale)
+        for j, asignadas in enumerate(por_camion):
+            iteraciones += 1
+            if iteraciones > iteraciones_max:
+                return
+            necesario = pesos[u] - libre[j]
+            if necesario <= EPSILON:
+                mejor = (pesos[u], j, None)
+                break
+            # La caja más ligera que libera espacio suficiente
+            candidata = min((i for i in asignadas if necesario - EPSILON <= pesos[i] < pesos[u]),
+                            key=pesos.__getitem__, default=None)
+            if candidata is not None:
+                ganancia = pesos[u] - pesos[candidata]
+                if mejor is None or ganancia > mejor[0]:
+                    mejor = (ganancia, j, candidata)
+        if mejor is None:
+            continue
+        _, j, sale = mejor
+        if sale is not None:
+            por_camion[j].remove(sale)
+            destino[sale] = -1
+            libre[j] += pesos[sale]
+        destino[u] = j
+        libre[j] -= pesos[u]
+        por_camion[j].append(u)
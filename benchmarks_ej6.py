@@ -0,0 +1,1313 @@
+"""
+Benchmarks del sistema de camiones (sin interfaz gráfica)
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Uso:
+    python benchmarks_ej6.py                 # Ejecuta todos
+    python benchmarks_ej6.py empaquetado_3d  # Solo los indicados
+    python benchmarks_ej6.py --salida base.json          # Guarda los resultados
+    python benchmarks_ej6.py --comparar base.json        # Marca regresiones
+
+Cada resultado lleva al menos caso, segundos y ops_por_segundo; los que se
+miden con medir() añaden pico_mb (pico de memoria con tracemalloc).
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from ej6_1 import Caja, Camion
+
+# Registro de benchmarks: nombre -> función que devuelve una lista de resultados
+BENCHMARKS: Dict[str, Callable[[], List[dict]]] = {}
+
+# Bodega de un semirremolque estándar (cm)
+BODEGA_TRAILER = (1360, 245, 270)
+
+# Los casos más rápidos que esto son demasiado ruidosos para compararlos
+MIN_SEGUNDOS_COMPARABLES = 0.002
+
+
+def benchmark(nombre: str):
+    """Decorador que registra un benchmark"""
+    def registrar(funcion):
+        BENCHMARKS[nombre] = funcion
+        return funcion
+    return registrar
+
+
+def cronometrar(funcion, *args, **kwargs):
+    """Ejecuta la función y devuelve (resultado, segundos)"""
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+
+def medir(operacion: Callable, preparar: Callable = lambda: None):
+    """Cronometra operacion(preparar()) y mide su pico de memoria.
+    
+    El pico se mide en una segunda ejecución con tracemalloc (que ralentiza
+    el código) sobre un estado recién preparado, para no falsear el tiempo.
+    Devuelve (resultado, segundos, pico en MB).
+    """
+    resultado, segundos = cronometrar(operacion, preparar())
+    estado = preparar()
+    tracemalloc.start()
+    try:
+        operacion(estado)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, segundos, round(pico / 1e6, 3)
+
+
+def resultado_medido(caso: str, operaciones: int, segundos: float, pico_mb: float, **extras) -> dict:
+    return {"caso": caso, "segundos": segundos,
+            "ops_por_segundo": operaciones / segundos if segundos else float("inf"),
+            "pico_mb": pico_mb, **extras}
+
+
+def generar_cajas(n: int, semilla: int = 42, prefijo: str = "C") -> List[Caja]:
+    """Genera cajas aleatorias reproducibles a partir de 20 referencias"""
+    rng = random.Random(semilla)
+    referencias = [(rng.choice([30, 40, 50, 60, 80, 100, 120]),
+                    rng.choice([30, 40, 50, 60, 80]),
+                    rng.choice([20, 30, 40, 50, 60])) for _ in range(20)]
+    descripciones = ["Electrodomésticos", "Muebles", "Ropa", "Ordenadores", "Herramientas"]
+    return [Caja(f"{prefijo}{i:07d}", round(rng.uniform(5, 150), 1), rng.choice(descripciones),
+                 *rng.choice(referencias)) for i in range(n)]
+
+
+# ===== Modelo de ej6_1 =====
+
+@benchmark("crear_cajas")
+def bench_crear_cajas() -> List[dict]:
+    """Construye 10/1k/100k objetos Caja"""
+    resultados = []
+    for n in (10, 1_000, 100_000):
+        datos = [(f"C{i:07d}", 5.0 + i % 145, "Reparto", 50, 40, 30) for i in range(n)]
+        _, segundos, pico = medir(lambda filas: [Caja(*fila) for fila in filas], lambda: datos)
+        resultados.append(resultado_medido(f"{n} cajas", n, segundos, pico))
+    return resultados
+
+
+def _camion_vacio() -> Camion:
+    return Camion("B0001", "Conductor", 1e12, "Reparto", 90, 0)
+
+
+@benchmark("carga_camion")
+def bench_carga_camion() -> List[dict]:
+    """add_caja, add_cajas y peso_total con 10/1k/100k cajas en un camión"""
+    resultados = []
+    for n in (10, 1_000, 100_000):
+        cajas = generar_cajas(n)
+
+        def una_a_una(camion):
+            for caja in cajas:
+                camion.add_caja(caja, eventos=None)
+            return camion
+
+        def por_lote(camion):
+            return camion.add_cajas(cajas)
+
+        camion, segundos, pico = medir(una_a_una, _camion_vacio)
+        assert len(camion.cajas) == n
+        resultados.append(resultado_medido(f"add_caja {n}", n, segundos, pico))
+
+        _, segundos, pico = medir(por_lote, _camion_vacio)
+        resultados.append(resultado_medido(f"add_cajas {n}", n, segundos, pico))
+
+        def consultar_peso(camion):
+            return sum(camion.peso_total() for _ in range(10_000))
+
+        _, segundos, pico = medir(consultar_peso, lambda: camion)
+        resultados.append(resultado_medido(f"peso_total x10k ({n})", 10_000, segundos, pico))
+    return resultados
+
+
+@benchmark("flota")
+def bench_flota() -> List[dict]:
+    """Crea y carga flotas de 10 a 10k camiones (20 cajas cada uno)"""
+    resultados = []
+    for n in (10, 100, 1_000, 10_000):
+        cajas = generar_cajas(20 * n)
+
+        def crear_y_cargar(_):
+            camiones = generar_flota(n)
+            for i, camion in enumerate(camiones):
+                camion.add_cajas(cajas[i * 20:(i + 1) * 20])
+            return camiones
+
+        camiones, segundos, pico = medir(crear_y_cargar)
+        resultados.append(resultado_medido(f"crear+cargar {n} camiones", n, segundos, pico))
+
+        def carga_flota(camiones):
+            return sum(camion.peso_total() for camion in camiones)
+
+        total, segundos, pico = medir(carga_flota, lambda: camiones)
+        assert abs(total - sum(caja.peso_kg for caja in cajas)) < 1e-6 * total
+        resultados.append(resultado_medido(f"peso flota {n} camiones", n, segundos, pico))
+    return resultados
+
+
+@benchmark("informe")
+def bench_informe() -> List[dict]:
+    """Genera informes de camiones con 10/1k/100k cajas"""
+    resultados = []
+    for n in (10, 1_000, 100_000):
+        camion = _camion_vacio()
+        camion.add_cajas(generar_cajas(n))
+        for caso, generar in (("str", str),
+                              ("texto limite=50", lambda c: c.informe(limite=50)),
+                              ("csv", lambda c: c.informe("csv")),
+                              ("json", lambda c: c.informe("json"))):
+            texto, segundos, pico = medir(generar, lambda: camion)
+            detalladas = min(n, 50) if "limite" in caso else n
+            resultados.append(resultado_medido(f"{caso} {n}", detalladas, segundos, pico,
+                                               kb=round(len(texto) / 1e3, 1)))
+    return resultados
+
+
+# ===== Módulos auxiliares =====
+
+@benchmark("empaquetado_3d")
+def bench_empaquetado_3d() -> List[dict]:
+    """Empaqueta 1k/10k/100k cajas en tantos semirremolques como hagan falta"""
+    from empaquetado_3d import EmpaquetadorBodega
+
+    resultados = []
+    for n in (1_000, 10_000, 100_000):
+        cajas = generar_cajas(n)
+        bodegas = [EmpaquetadorBodega(*BODEGA_TRAILER)]
+
+        def empaquetar():
+            # Next fit: si la caja no cabe en la bodega abierta, se abre otra
+            colocadas = 0
+            for caja in cajas:
+                if bodegas[-1].insertar(caja) is None:
+                    bodegas.append(EmpaquetadorBodega(*BODEGA_TRAILER))
+                    if bodegas[-1].insertar(caja) is None:
+                        continue
+                colocadas += 1
+            return colocadas
+
+        colocadas, segundos = cronometrar(empaquetar)
+        resultados.append({
+            "caso": f"{n} cajas",
+            "segundos": segundos,
+            "ops_por_segundo": n / segundos,
+            "colocadas": colocadas,
+            "bodegas": len(bodegas),
+            "ocupacion": round(sum(b.ocupacion() for b in bodegas) / len(bodegas), 4),
+        })
+    return resultados
+
+
+def generar_almacen(n: int, semilla: int = 42, prefijo: str = "C"):
+    """Como generar_cajas, pero directamente en un AlmacenCajas columnar"""
+    from almacen_cajas import AlmacenCajas
+
+    almacen = AlmacenCajas()
+    rng = random.Random(semilla)
+    referencias = [(rng.choice([30, 40, 50, 60, 80, 100, 120]),
+                    rng.choice([30, 40, 50, 60, 80]),
+                    rng.choice([20, 30, 40, 50, 60])) for _ in range(20)]
+    descripciones = ["Electrodomésticos", "Muebles", "Ropa", "Ordenadores", "Herramientas"]
+    for i in range(n):
+        almacen.agregar_fila(f"{prefijo}{i:07d}", round(rng.uniform(5, 150), 1),
+                             rng.choice(descripciones), *rng.choice(referencias))
+    return almacen
+
+
+def generar_flota(n: int, semilla: int = 7, prefijo: str = "T") -> List[Camion]:
+    """Genera camiones vacíos reproducibles de 5, 8 o 12 toneladas"""
+    rng = random.Random(semilla)
+    return [Camion(f"{prefijo}{i:05d}", f"Conductor {i}", rng.choice([5000.0, 8000.0, 12000.0]),
+                   "Reparto", rng.randint(1, 359), 0) for i in range(n)]
+
+
+@benchmark("asignacion_flota")
+def bench_asignacion_flota() -> List[dict]:
+    """Asigna 100k cajas a 1k camiones con FFD/BFD, con y sin búsqueda local"""
+    from asignacion_flota import Heuristica, Objetivo, asignar_flota
+
+    cajas = generar_cajas(100_000)
+    camiones = generar_flota(1_000)
+    # Cota inferior: los camiones más grandes que hacen falta para el peso total
+    pendiente, cota = sum(caja.peso_kg for caja in cajas), 0
+    for capacidad in sorted((camion.capacidad_kg for camion in camiones), reverse=True):
+        if pendiente <= 0:
+            break
+        pendiente -= capacidad
+        cota += 1
+    resultados = []
+    for heuristica in Heuristica:
+        for objetivo in Objetivo:
+            for busqueda_local in (False, True):
+                asignacion, segundos = cronometrar(asignar_flota, cajas, camiones, objetivo,
+                                                   heuristica, busqueda_local)
+                resultados.append({
+                    "caso": f"{heuristica.value}/{objetivo.value}{'+ls' if busqueda_local else ''}",
+                    "segundos": segundos,
+                    "ops_por_segundo": len(cajas) / segundos,
+                    "camiones_usados": asignacion.camiones_usados,
+                    "cota_camiones": cota,
+                    "sin_asignar": len(asignacion.sin_asignar),
+                })
+    return resultados
+
+
+@benchmark("formato_flota")
+def bench_formato_flota() -> List[dict]:
+    """Guarda y abre flotas de 100k y 1M cajas en binario (mmap) frente a JSON"""
+    from ej6_1 import ManifiestoCarga
+    from formato_flota import FlotaMapeada, guardar_flota
+
+    resultados = []
+    for n_cajas in (100_000, 1_000_000):
+        almacen = generar_almacen(n_cajas)
+        camiones = generar_flota(n_cajas // 1_000)
+        for i, camion in enumerate(camiones):
+            camion.capacidad_kg = 1e9
+            camion.manifiesto = ManifiestoCarga(almacen.fila(f) for f in range(i * 1_000, (i + 1) * 1_000))
+
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta_bin = os.path.join(directorio, "flota.bin")
+            ruta_json = os.path.join(directorio, "flota.json")
+            _, t_guardar = cronometrar(guardar_flota, ruta_bin, camiones)
+            flota, t_abrir = cronometrar(FlotaMapeada, ruta_bin)
+            medio = len(camiones) // 2
+            consulta, t_consulta = cronometrar(flota.camion, flota.buscar(camiones[medio].matricula))
+
+            # Comprobación de ida y vuelta del camión consultado
+            original = camiones[medio]
+            assert (consulta.matricula, consulta.conductor, consulta.capacidad_kg, consulta.rumbo) == \
+                   (original.matricula, original.conductor, original.capacidad_kg, original.rumbo)
+            assert [(c.codigo, c.peso_kg, c.descripcion_carga, c.largo, c.ancho, c.altura)
+                    for c in consulta.cajas] == \
+                   [(c.codigo, c.peso_kg, c.descripcion_carga, c.largo, c.ancho, c.altura)
+                    for c in original.cajas]
+            flota.cerrar()
+
+            def guardar_json():
+                with open(ruta_json, "w", encoding="utf-8") as fichero:
+                    fichero.write("[")
+                    for i, camion in enumerate(camiones):
+                        if i:
+                            fichero.write(", ")
+                        camion.escribir_informe(fichero, "json")
+                    fichero.write("]")
+
+            def cargar_json():
+                with open(ruta_json, encoding="utf-8") as fichero:
+                    return json.load(fichero)
+
+            _, t_guardar_json = cronometrar(guardar_json)
+            _, t_cargar_json = cronometrar(cargar_json)
+            tam_bin, tam_json = os.path.getsize(ruta_bin), os.path.getsize(ruta_json)
+
+        for caso, segundos in (("guardar binario", t_guardar), ("abrir binario (mmap)", t_abrir),
+                               ("consultar 1 camión", t_consulta), ("guardar JSON", t_guardar_json),
+                               ("cargar JSON", t_cargar_json)):
+            resultados.append({"caso": f"{n_cajas // 1000}k {caso}", "segundos": segundos,
+                               "ops_por_segundo": 1 / segundos if segundos else float("inf"),
+                               "mb_binario": round(tam_bin / 1e6, 1), "mb_json": round(tam_json / 1e6, 1)})
+    return resultados
+
+
+@benchmark("indice_flota")
+def bench_indice_flota() -> List[dict]:
+    """Localiza cajas en 100k cajas / 1k camiones con el índice frente a recorrer manifiestos"""
+    from ej6_1 import ManifiestoCarga
+    from indice_flota import IndiceFlota
+
+    almacen = generar_almacen(100_000)
+    camiones = generar_flota(1_000)
+    for i, camion in enumerate(camiones):
+        camion.capacidad_kg = 1e9
+        camion.manifiesto = ManifiestoCarga((almacen.fila(f) for f in range(i * 100, (i + 1) * 100)),
+                                            observadores=camion.observadores)
+    rng = random.Random(3)
+    codigos = [f"C{rng.randrange(100_000):07d}" for _ in range(10_000)]
+
+    indice, t_construir = cronometrar(IndiceFlota, camiones)
+
+    def localizar_indice():
+        return [indice.localizar(codigo) for codigo in codigos]
+
+    def localizar_recorriendo():
+        return [next((c for c in camiones if c.manifiesto.contiene(codigo)), None)
+                for codigo in codigos[:200]]
+
+    encontrados, t_indice = cronometrar(localizar_indice)
+    recorridos, t_recorrer = cronometrar(localizar_recorriendo)
+    assert encontrados[:200] == recorridos
+
+    origen = indice.localizar(codigos[0])
+    destino = camiones[0] if origen is not camiones[0] else camiones[1]
+    movida, t_transferir = cronometrar(indice.transferir, codigos[0], destino)
+    assert movida and indice.localizar(codigos[0]) is destino
+    assert not origen.manifiesto.contiene(codigos[0]) and len(indice) == 100_000
+
+    return [
+        {"caso": "construir índice", "segundos": t_construir, "ops_por_segundo": 100_000 / t_construir},
+        {"caso": "localizar (índice)", "segundos": t_indice, "ops_por_segundo": len(codigos) / t_indice},
+        {"caso": "localizar (recorrer)", "segundos": t_recorrer, "ops_por_segundo": 200 / t_recorrer},
+        {"caso": "transferir", "segundos": t_transferir, "ops_por_segundo": 1 / t_transferir},
+    ]
+
+
+@benchmark("carga_concurrente")
+def bench_carga_concurrente() -> List[dict]:
+    """Carga 20k cajas en 100 camiones desde 1 a 32 hilos con reservas y con add_caja.
+
+    Comprueba que cargar en paralelo es correcto, no que escale: con el GIL y
+    los cerrojos, las operaciones por segundo bajan al añadir hilos.
+    """
+    import threading
+
+    from indice_flota import IndiceFlota
+
+    cajas = generar_cajas(20_000)
+    resultados = []
+    intervalo = sys.getswitchinterval()
+    # Cambios de hilo muy frecuentes para provocar carreras si las hubiera
+    sys.setswitchinterval(1e-6)
+    try:
+        for modo in ("reservas", "add_caja"):
+            for n_hilos in (1, 4, 16, 32):
+                camiones = generar_flota(100)
+                cargadas = [0] * n_hilos
+
+                def cargador(k: int):
+                    rng = random.Random(k)
+                    for caja in cajas[k::n_hilos]:
+                        for _ in range(3):
+                            camion = rng.choice(camiones)
+                            if modo == "add_caja":
+                                if camion.add_caja(caja, eventos=None):
+                                    cargadas[k] += 1
+                                    break
+                                continue
+                            reserva = camion.reservar(caja.peso_kg)
+                            if reserva is not None:
+                                with reserva:
+                                    if reserva.confirmar(caja):
+                                        cargadas[k] += 1
+                                break
+
+                hilos = [threading.Thread(target=cargador, args=(k,)) for k in range(n_hilos)]
+
+                def ejecutar():
+                    for hilo in hilos:
+                        hilo.start()
+                    for hilo in hilos:
+                        hilo.join()
+
+                _, segundos = cronometrar(ejecutar)
+                for camion in camiones:
+                    assert camion.peso_total() <= camion.capacidad_kg, camion.matricula
+                    assert camion.peso_reservado == 0.0
+                assert sum(len(camion.cajas) for camion in camiones) == sum(cargadas)
+                resultados.append({
+                    "caso": f"{modo} {n_hilos} hilos",
+                    "segundos": segundos,
+                    "ops_por_segundo": len(cajas) / segundos,
+                    "cargadas": sum(cargadas),
+                    "utilizacion": round(sum(c.peso_total() for c in camiones) /
+                                         sum(c.capacidad_kg for c in camiones), 3),
+                })
+
+        # Dos hilos cargan los mismos códigos en dos camiones del mismo índice:
+        # cada código tiene que acabar en un solo camión
+        def misma_carga():
+            for intento in range(100):
+                camiones = generar_flota(2, semilla=intento)
+                indice = IndiceFlota(camiones)
+                codigos = [f"D{intento}-{k}" for k in range(50)]
+                barrera = threading.Barrier(len(camiones))
+
+                def cargar(camion):
+                    barrera.wait()
+                    for codigo in codigos:
+                        camion.add_caja(Caja(codigo, 1.0, "Duplicada", 10, 10, 10), eventos=None)
+
+                hilos = [threading.Thread(target=cargar, args=(camion,)) for camion in camiones]
+                for hilo in hilos:
+                    hilo.start()
+                for hilo in hilos:
+                    hilo.join()
+                assert len(indice) == len(codigos) and not indice._reservas
+                assert sum(len(camion.cajas) for camion in camiones) == len(codigos)
+
+        _, segundos = cronometrar(misma_carga)
+        resultados.append({"caso": "mismos códigos, 2 hilos", "segundos": segundos,
+                           "ops_por_segundo": 100 * 50 * 2 / segundos})
+    finally:
+        sys.setswitchinterval(intervalo)
+    return resultados
+
+
+class _FisicaEscalar:
+    """Física de un camión como la calculaba el TruckPhysics original (referencia)"""
+
+    def __init__(self, x: float, y: float, heading: float):
+        self.x, self.y, self.heading = x, y, heading
+        self.velocity = 0.0
+        self.max_speed, self.acceleration, self.deceleration = 3.0, 0.1, 0.15
+        self.turn_rate, self.friction = 2.0, 0.95
+
+    def update(self, controls: Dict[str, bool]):
+        import math
+        if controls.get('forward', False):
+            self.velocity = min(self.max_speed, self.velocity + self.acceleration)
+        elif controls.get('backward', False):
+            self.velocity = max(-self.max_speed * 0.5, self.velocity - self.deceleration)
+        elif abs(self.velocity) < 0.01:
+            self.velocity = 0
+        else:
+            self.velocity *= self.friction
+        if abs(self.velocity) > 0.1:
+            turn_factor = abs(self.velocity) / self.max_speed
+            if controls.get('left', False):
+                self.heading -= self.turn_rate * turn_factor
+            elif controls.get('right', False):
+                self.heading += self.turn_rate * turn_factor
+        self.heading = self.heading % 360
+        if abs(self.velocity) > 0.01:
+            angle_rad = math.radians(self.heading - 90)
+            self.x += self.velocity * math.cos(angle_rad)
+            self.y += self.velocity * math.sin(angle_rad)
+
+
+@benchmark("fisica_flota")
+def bench_fisica_flota() -> List[dict]:
+    """Pasos de física por segundo con 100/1k/10k camiones: objeto a objeto frente a motor por lotes"""
+    from fisica_flota import NUMPY_AVAILABLE, MotorFisicaFlota, TruckPhysics
+
+    pasos = 100
+    resultados = []
+    for n in (100, 1_000, 10_000):
+        rng = random.Random(11)
+        iniciales = [(rng.uniform(0, 800), rng.uniform(0, 600), rng.uniform(0, 360)) for _ in range(n)]
+        controles = [{"forward": rng.random() < 0.6, "backward": rng.random() < 0.2,
+                      "left": rng.random() < 0.3, "right": rng.random() < 0.3} for _ in range(n)]
+
+        fisicas = [_FisicaEscalar(*inicial) for inicial in iniciales]
+        motor = MotorFisicaFlota()
+        vistas = [TruckPhysics(_Punto(x, y), heading, motor) for x, y, heading in iniciales]
+        for vista, control in zip(vistas, controles):
+            vista.fijar_controles(control)
+
+        def escalar():
+            for _ in range(pasos):
+                for fisica, control in zip(fisicas, controles):
+                    fisica.update(control)
+
+        def por_lotes():
+            for _ in range(pasos):
+                motor.paso()
+
+        _, t_escalar = cronometrar(escalar)
+        _, t_lotes = cronometrar(por_lotes)
+        # El motor debe reproducir la física original
+        for fisica, vista in zip(fisicas, vistas):
+            assert abs(fisica.x - vista.position.x) < 1e-6 and abs(fisica.y - vista.position.y) < 1e-6
+            assert abs(fisica.velocity - vista.velocity) < 1e-9
+        resultados.append({"caso": f"escalar {n} camiones", "segundos": t_escalar,
+                           "ops_por_segundo": pasos / t_escalar})
+        resultados.append({"caso": f"motor {n} camiones", "segundos": t_lotes,
+                           "ops_por_segundo": pasos / t_lotes, "numpy": NUMPY_AVAILABLE,
+                           "aceleracion": round(t_escalar / t_lotes, 1)})
+    return resultados
+
+
+@benchmark("simulacion")
+def bench_simulacion() -> List[dict]:
+    """Ticks por segundo de la simulación sin interfaz con 10/100 camiones en autopiloto"""
+    resultados = []
+    ticks = 500
+    for n in (10, 100):
+        simulacion = _simulacion_pilotada(n, semilla=5)
+        segundos = simulacion.ejecutar(ticks)
+        resultados.append({"caso": f"{n} camiones", "segundos": segundos,
+                           "ops_por_segundo": ticks / segundos,
+                           "recogidas": simulacion.recogidas, "entregas": simulacion.entregas})
+    return resultados
+
+
+def _simulacion_pilotada(n: int, semilla: int, hz_fisica: float = 20.0):
+    from simulacion import BODEGA_ESTANDAR, PilotoDirecto, SimulacionNucleo
+
+    simulacion = SimulacionNucleo(eventos=None, hz_fisica=hz_fisica, semilla=semilla)
+    for i in range(n):
+        simulacion.add_truck(Camion(f"S{i:05d}", "Piloto", 8000.0, "Reparto", 90, 0,
+                                    bodega=BODEGA_ESTANDAR))
+        simulacion.pilotos[f"S{i:05d}"] = PilotoDirecto()
+    for _ in range(2 * n):
+        simulacion.crear_mision()
+    return simulacion
+
+
+@benchmark("reloj")
+def bench_reloj() -> List[dict]:
+    """Física a 120 Hz dibujada a 30 y 60 Hz con frames irregulares: mismo resultado"""
+    resultados, estados = [], []
+    segundos_simulados = 10.0
+    for hz_render in (30, 60):
+        simulacion = _simulacion_pilotada(20, semilla=9, hz_fisica=120.0)
+        jitter = random.Random(hz_render)
+        frames = 0
+
+        def operacion():
+            nonlocal frames
+            while simulacion.tiempo < segundos_simulados:
+                # Frames de duración irregular, como cuando Tk se retrasa
+                simulacion.avanzar_tiempo(jitter.uniform(0.5, 1.5) / hz_render)
+                frames += 1
+
+        _, segundos = cronometrar(operacion)
+        estados.append(simulacion)
+        resultados.append({"caso": f"render {hz_render} Hz", "segundos": segundos,
+                           "ops_por_segundo": simulacion.ticks / segundos,
+                           "frames": frames, "recogidas": simulacion.recogidas})
+
+    # Igualar el número de pasos (el último frame puede pasarse) y comparar
+    pasos = max(simulacion.ticks for simulacion in estados)
+    for simulacion in estados:
+        simulacion.ejecutar(pasos - simulacion.ticks)
+    assert estados[0].estado() == estados[1].estado(), "El ritmo de dibujo cambió la simulación"
+    assert estados[0].entregas == estados[1].entregas
+    return resultados
+
+
+@benchmark("planificador_frames")
+def bench_planificador_frames() -> List[dict]:
+    """Bucle de 20 FPS con frames caros, en un reloj simulado: after(50) fijo frente al planificador"""
+    from planificador_frames import PlanificadorFrames
+
+    # (simulación, dibujo, paneles) en segundos por frame
+    cargas = {"ligera": (0.003, 0.005, 0.004), "40 ms": (0.010, 0.025, 0.010),
+              "sobrecarga": (0.015, 0.045, 0.030)}
+    resultados = []
+    for nombre, costes in cargas.items():
+        fijo, t_fijo = cronometrar(_bucle_simulado, *costes, planificador=None)
+        adaptado, t_adaptado = cronometrar(_bucle_simulado, *costes, planificador=PlanificadorFrames(20.0, 5.0))
+        # La física va por tiempo real: con o sin planificador no se pierden pasos
+        assert adaptado["pasos_perdidos"] == fijo["pasos_perdidos"] == 0
+        assert adaptado["fps"] >= fijo["fps"] * 0.99 and adaptado["hueco_max_ms"] <= fijo["hueco_max_ms"] + 1e-6
+        if nombre == "40 ms":
+            assert adaptado["fps"] >= 19.5 and adaptado["sin_dibujar"] == 0
+        if nombre == "sobrecarga":
+            # Primero bajan los paneles y después se deja de dibujar algún frame
+            assert adaptado["paneles_hz"] < fijo["paneles_hz"] / 2 and adaptado["sin_dibujar"] > 0
+        for caso, medido, segundos in (("after(50)", fijo, t_fijo), ("planificador", adaptado, t_adaptado)):
+            resultados.append({"caso": f"{nombre}, {caso}", "segundos": segundos,
+                               "ops_por_segundo": medido["frames"] / segundos, **medido})
+    return resultados
+
+
+def _bucle_simulado(coste_sim: float, coste_dibujo: float, coste_paneles: float,
+                    planificador=None, segundos: float = 30.0) -> dict:
+    """Ejecuta el bucle de ej6_2 sobre un reloj simulado y mide lo que vería el usuario"""
+    from planificador_frames import DecisionFrame
+    from simulacion import RelojSimulacion
+
+    reloj = RelojSimulacion(20.0)
+    t, anterior, ultimo_panel, ultimo_dibujo = 0.0, 0.0, -1.0, 0.0
+    frames = dibujos = paneles = 0
+    hueco_max = 0.0
+    while t < segundos:
+        if planificador is not None:
+            decision = planificador.empezar_frame(t)
+        else:
+            decision = DecisionFrame(True, t - ultimo_panel >= 0.2)
+            if decision.paneles:
+                ultimo_panel = t
+        reloj.avanzar(t - anterior)
+        anterior = t
+        frames += 1
+        t += coste_sim
+        if decision.dibujar:
+            t += coste_dibujo
+            dibujos += 1
+            hueco_max = max(hueco_max, t - ultimo_dibujo)
+            ultimo_dibujo = t
+        if decision.paneles:
+            t += coste_paneles
+            paneles += 1
+        espera = planificador.terminar_frame(t) if planificador is not None else 50
+        t += espera / 1000
+    medido = {"frames": frames, "fps": round(dibujos / t, 1), "paneles_hz": round(paneles / t, 2),
+              "hueco_max_ms": round(hueco_max * 1000, 1), "pasos_perdidos": round(reloj.segundos_descartados * 20)}
+    if planificador is not None:
+        medido.update(sin_dibujar=planificador.descartados, tarde=planificador.tardios)
+    return medido
+
+
+@benchmark("indice_carreteras")
+def bench_indice_carreteras() -> List[dict]:
+    """Mantener 5k camiones sobre una ciudad de ~8k segmentos: rejilla frente a recorrer todos"""
+    from indice_espacial import IndiceCarreteras
+    from simulacion import Point, RoadSegment
+
+    # Cuadrícula de 64x64 manzanas de 100 px con calles de anchos variados
+    rng = random.Random(21)
+    segmentos = []
+    for i in range(64):
+        for j in range(64):
+            ancho = rng.choice([30, 35, 40, 50])
+            segmentos.append(RoadSegment(Point(j * 100, i * 100), Point((j + 1) * 100, i * 100), width=ancho))
+            segmentos.append(RoadSegment(Point(i * 100, j * 100), Point(i * 100, (j + 1) * 100), width=ancho))
+    puntos = [(rng.uniform(0, 6400), rng.uniform(0, 6400)) for _ in range(5_000)]
+
+    indice, t_construir = cronometrar(IndiceCarreteras, segmentos)
+
+    def ajustar_todos():
+        return [indice.ajustar(x, y) for x, y in puntos]
+
+    def en_carretera_todos():
+        return [indice.carretera_en(x, y) is not None for x, y in puntos]
+
+    def distancia_bruta(x, y):
+        return min(math.hypot(x - px, y - py) - segmento.width / 2
+                   for segmento in segmentos
+                   for px, py in [_proyeccion(segmento, x, y)])
+
+    def cercanos_recorriendo():
+        return [distancia_bruta(x, y) for x, y in puntos[:100]]
+
+    ajustados, t_ajustar = cronometrar(ajustar_todos)
+    dentro, t_dentro = cronometrar(en_carretera_todos)
+    brutas, t_recorrer = cronometrar(cercanos_recorriendo)
+    for (x, y), bruta, esta_dentro, ajustado in zip(puntos, brutas, dentro, ajustados):
+        assert abs(indice.mas_cercano(x, y)[1] - bruta) < 1e-9
+        assert esta_dentro == (bruta <= 0) and (ajustado is None) == esta_dentro
+        if ajustado is not None:
+            assert indice.carretera_en(*ajustado) is not None
+
+    return [
+        {"caso": f"construir ({len(segmentos)} segmentos)", "segundos": t_construir,
+         "ops_por_segundo": len(segmentos) / t_construir},
+        {"caso": "sobre el asfalto (rejilla)", "segundos": t_dentro, "ops_por_segundo": len(puntos) / t_dentro},
+        {"caso": "ajustar 5k camiones (rejilla)", "segundos": t_ajustar, "ops_por_segundo": len(puntos) / t_ajustar,
+         "fuera": sum(1 for ajustado in ajustados if ajustado is not None)},
+        {"caso": "más cercano (recorrer)", "segundos": t_recorrer, "ops_por_segundo": 100 / t_recorrer},
+    ]
+
+
+@benchmark("hash_paquetes")
+def bench_hash_paquetes() -> List[dict]:
+    """Paquetes cercanos entre 100k: hash espacial frente a recorrer la lista"""
+    from indice_espacial import HashEspacial
+
+    rng = random.Random(17)
+    n = 100_000
+    puntos = {f"PKG{i:06d}": (rng.uniform(0, 8000), rng.uniform(0, 6000)) for i in range(n)}
+    consultas = [(rng.uniform(0, 8000), rng.uniform(0, 6000)) for _ in range(2_000)]
+
+    def construir():
+        hash_espacial = HashEspacial()
+        for clave, (x, y) in puntos.items():
+            hash_espacial.insertar(clave, x, y)
+        return hash_espacial
+
+    hash_espacial, t_construir = cronometrar(construir)
+
+    def radio_hash():
+        return [hash_espacial.en_radio(x, y, 50) for x, y in consultas]
+
+    def cercanos_hash():
+        return [hash_espacial.mas_cercanos(x, y, k=3, radio_max=100) for x, y in consultas]
+
+    def cercanos_recorriendo():
+        resultado = []
+        for x, y in consultas[:20]:
+            distancias = [(math.sqrt((x - px) ** 2 + (y - py) ** 2), clave) for clave, (px, py) in puntos.items()]
+            resultado.append(sorted(d for d in distancias if d[0] < 100)[:3])
+        return resultado
+
+    en_radio, t_radio = cronometrar(radio_hash)
+    cercanos, t_cercanos = cronometrar(cercanos_hash)
+    recorridos, t_recorrer = cronometrar(cercanos_recorriendo)
+    for fila, esperada in zip(cercanos, recorridos):
+        assert len(fila) == len(esperada)
+        assert all(abs(d - e) < 1e-9 for (d, _), (e, _) in zip(fila, esperada))
+    assert all(d < 50 for fila in en_radio for d, _ in fila)
+
+    # Cambios de estado: sacar y volver a meter paquetes como al recogerlos/entregarlos
+    claves = list(puntos)[:20_000]
+
+    def actualizar():
+        for clave in claves:
+            hash_espacial.quitar(clave)
+        for clave in claves:
+            hash_espacial.insertar(clave, *puntos[clave])
+
+    _, t_actualizar = cronometrar(actualizar)
+    assert len(hash_espacial) == n
+
+    return [
+        {"caso": "construir (100k paquetes)", "segundos": t_construir, "ops_por_segundo": n / t_construir},
+        {"caso": "radio 50 px (hash)", "segundos": t_radio, "ops_por_segundo": len(consultas) / t_radio,
+         "resultados": sum(map(len, en_radio))},
+        {"caso": "3 más cercanos (hash)", "segundos": t_cercanos, "ops_por_segundo": len(consultas) / t_cercanos},
+        {"caso": "3 más cercanos (recorrer)", "segundos": t_recorrer, "ops_por_segundo": 20 / t_recorrer},
+        {"caso": "quitar + insertar", "segundos": t_actualizar, "ops_por_segundo": 2 * len(claves) / t_actualizar},
+    ]
+
+
+@benchmark("registro_paquetes")
+def bench_registro_paquetes() -> List[dict]:
+    """Consultas de cada frame sobre 100k paquetes: registro indexado frente a filtrar la lista"""
+    from registro_paquetes import RegistroPaquetes
+    from simulacion import Package, PackageState, Point
+
+    rng = random.Random(23)
+    n = 100_000
+    camiones = [f"TRK{i:03d}" for i in range(200)]
+    paquetes = [Package(f"PKG{i:06d}", Point(0, 0), Point(0, 0), rng.uniform(10, 100)) for i in range(n)]
+    registro, t_construir = cronometrar(RegistroPaquetes, paquetes)
+
+    # Transiciones como las de la simulación: asignar, recoger y entregar
+    def transiciones():
+        for paquete in paquetes[:60_000]:
+            registro.asignar(paquete, rng.choice(camiones))
+        for paquete in paquetes[:40_000]:
+            registro.cambiar_estado(paquete, PackageState.IN_TRANSIT)
+        for paquete in paquetes[:20_000]:
+            registro.cambiar_estado(paquete, PackageState.DELIVERED)
+
+    _, t_transiciones = cronometrar(transiciones)
+    version = registro.version
+
+    # Lo que se consulta en un frame: pendientes, lo que lleva el camión activo y lo que cambió
+    def frame_registro():
+        return (registro.cuantos(PackageState.WAREHOUSE), registro.del_camion("TRK007", PackageState.IN_TRANSIT),
+                registro.cambios_desde(version)[1])
+
+    def frame_lista():
+        return (sum(1 for p in paquetes if p.state == PackageState.WAREHOUSE),
+                [p for p in paquetes if p.assigned_truck == "TRK007" and p.state == PackageState.IN_TRANSIT],
+                [])
+
+    frames = 1_000
+    _, t_registro = cronometrar(lambda: [frame_registro() for _ in range(frames)])
+    _, t_lista = cronometrar(lambda: [frame_lista() for _ in range(10)])
+    assert frame_registro() == frame_lista()
+
+    # Los grupos coinciden con filtrar la lista
+    for estado in PackageState:
+        assert registro.en_estado(estado) == [p for p in paquetes if p.state == estado]
+    for matricula in camiones[:20]:
+        assert sorted(p.id for p in registro.del_camion(matricula)) == sorted(
+            p.id for p in paquetes if p.assigned_truck == matricula)
+    assert list(registro) == paquetes and len(registro) == n
+
+    return [
+        {"caso": "construir (100k paquetes)", "segundos": t_construir, "ops_por_segundo": n / t_construir},
+        {"caso": "120k transiciones", "segundos": t_transiciones, "ops_por_segundo": 120_000 / t_transiciones},
+        {"caso": "consultas de un frame (registro)", "segundos": t_registro, "ops_por_segundo": frames / t_registro},
+        {"caso": "consultas de un frame (lista)", "segundos": t_lista, "ops_por_segundo": 10 / t_lista},
+    ]
+
+
+def _dijkstra(grafo, origen: int) -> Dict[int, float]:
+    """Distancias desde un nodo con Dijkstra, para comprobar A*"""
+    import heapq
+
+    distancias = {origen: 0.0}
+    abiertos = [(0.0, origen)]
+    while abiertos:
+        distancia, nodo = heapq.heappop(abiertos)
+        if distancia > distancias[nodo]:
+            continue
+        for vecino, peso in grafo.vecinos[nodo]:
+            if distancia + peso < distancias.get(vecino, math.inf):
+                distancias[vecino] = distancia + peso
+                heapq.heappush(abiertos, (distancia + peso, vecino))
+    return distancias
+
+
+@benchmark("rutas")
+def bench_rutas() -> List[dict]:
+    """Rutas en una cuadrícula de 40x40 calles: 5k camiones replanificando hacia 20 edificios"""
+    from rutas import GrafoCarreteras
+    from simulacion import Point, RoadSegment
+
+    rng = random.Random(23)
+    lado, separacion = 40, 100
+    extremo = (lado - 1) * separacion
+    carreteras = [RoadSegment(Point(0, i * separacion), Point(extremo, i * separacion), width=30)
+                  for i in range(lado)]
+    carreteras += [RoadSegment(Point(i * separacion, 0), Point(i * separacion, extremo), width=30)
+                   for i in range(lado)]
+    lugares = {}
+    for k in range(20):
+        centro = Point(rng.randrange(lado) * separacion + 50, rng.randrange(lado) * separacion)
+        lugares[f"Edificio {k}"] = RoadSegment(centro, centro, width=80)  # Patio redondo
+
+    grafo, t_construir = cronometrar(GrafoCarreteras, carreteras, lugares)
+    nombres = list(lugares)
+    camiones = []
+    for _ in range(5_000):
+        carretera = rng.choice(carreteras)
+        t = rng.random()
+        camiones.append((carretera.start.x + t * (carretera.end.x - carretera.start.x),
+                         carretera.start.y + t * (carretera.end.y - carretera.start.y)))
+    destinos = [lugares[rng.choice(nombres)].start for _ in camiones]
+
+    def longitud(origen, ruta):
+        puntos = [origen] + ruta
+        return sum(math.dist(a, b) for a, b in zip(puntos, puntos[1:]))
+
+    def a_estrella_por_camion():
+        # Un A* por cada par de nodos de entrada y salida, sin caché (solo 500 camiones: es lento)
+        costes = []
+        for origen, destino in zip(camiones[:500], destinos):
+            mejor = math.inf
+            for entrada, coste_entrada in sin_cache.entradas(*origen):
+                for salida, coste_salida in sin_cache.entradas(destino.x, destino.y):
+                    encontrado = sin_cache.camino(entrada, salida)
+                    if encontrado is not None:
+                        mejor = min(mejor, coste_entrada + encontrado[0] + coste_salida)
+            costes.append(mejor)
+        return costes
+
+    def replanificar():
+        return [grafo.ruta(origen, (destino.x, destino.y)) for origen, destino in zip(camiones, destinos)]
+
+    sin_cache = GrafoCarreteras(carreteras, lugares, tamano_cache=0)
+    costes, t_a_estrella = cronometrar(a_estrella_por_camion)
+    rutas_fria, t_fria = cronometrar(replanificar)
+    rutas_caliente, t_caliente = cronometrar(replanificar)
+    assert rutas_fria == rutas_caliente
+    for origen, ruta, coste in zip(camiones, rutas_fria, costes):
+        assert abs(longitud(origen, ruta) - coste) < 1e-6
+
+    # Rutas entre todos los pares de edificios, dos veces: la segunda sale de la caché
+    pares = [(a, b) for a in nombres for b in nombres if a != b] * 2
+    _, t_lugares = cronometrar(lambda: [grafo.ruta_entre_lugares(a, b) for a, b in pares])
+
+    # A* debe dar el mismo coste que Dijkstra
+    for nombre in nombres[:5]:
+        origen = grafo.nodo_lugar[nombre]
+        distancias = _dijkstra(grafo, origen)
+        for destino in rng.sample(range(len(grafo)), 50):
+            assert abs(grafo.camino(origen, destino)[0] - distancias[destino]) < 1e-6
+
+    return [
+        {"caso": f"construir grafo ({len(grafo)} nodos)", "segundos": t_construir,
+         "ops_por_segundo": len(carreteras) / t_construir},
+        {"caso": "500 rutas, A* por camión", "segundos": t_a_estrella,
+         "ops_por_segundo": len(costes) / t_a_estrella},
+        {"caso": "5k rutas, árboles fríos", "segundos": t_fria, "ops_por_segundo": len(camiones) / t_fria},
+        {"caso": "5k rutas, árboles en caché", "segundos": t_caliente, "ops_por_segundo": len(camiones) / t_caliente},
+        {"caso": "A* entre edificios (caché)", "segundos": t_lugares, "ops_por_segundo": len(pares) / t_lugares,
+         "aciertos": grafo.aciertos, "fallos": grafo.fallos},
+    ]
+
+
+def _sonidos_por_bucle(tasa: int):
+    """Los tres sonidos de antes, como los creaba create_sounds: muestra a muestra en listas"""
+    sonidos = []
+    for duracion, frecuencia, amplitud in ((0.5, 800, 4096), (0.3, 1200, 2048)):
+        arr = []
+        for i in range(int(duracion * tasa)):
+            wave = amplitud * math.sin(frecuencia * 2 * math.pi * i / tasa)
+            arr.append([int(wave), int(wave)])
+        sonidos.append(arr)
+    arr = []
+    for i in range(int(0.6 * tasa)):
+        time_pos = i / tasa
+        wave = 2048 * math.sin(1000 * 2 * math.pi * time_pos) if time_pos < 0.2 or (0.3 < time_pos < 0.5) else 0
+        arr.append([int(wave), int(wave)])
+    sonidos.append(arr)
+    return sonidos
+
+
+@benchmark("sintesis_audio")
+def bench_sintesis_audio() -> List[dict]:
+    """Síntesis de los efectos a 44,1 kHz: bucle por muestra, vectorizada y desde la caché en disco"""
+    import sintesis_audio
+    from sintesis_audio import SONIDOS, CacheSonidos, pcm
+
+    tasa = 44_100
+    clasicos = {nombre: SONIDOS[nombre] for nombre in ("claxon", "recogida", "entrega")}
+    _, t_bucle = cronometrar(_sonidos_por_bucle, tasa)
+    buffers, t_sintesis = cronometrar(lambda: {nombre: pcm(sonido, tasa) for nombre, sonido in SONIDOS.items()})
+    for nombre, sonido in SONIDOS.items():
+        assert len(buffers[nombre]) == 2 * 2 * len(sintesis_audio.sintetizar(sonido, tasa))
+
+    # Sin NumPy debe salir lo mismo (salvo redondeos de la última muestra)
+    if sintesis_audio.NUMPY_AVAILABLE:
+        from array import array
+        sintesis_audio.NUMPY_AVAILABLE = False
+        try:
+            sin_numpy = {nombre: pcm(sonido, tasa) for nombre, sonido in clasicos.items()}
+        finally:
+            sintesis_audio.NUMPY_AVAILABLE = True
+        for nombre, datos in sin_numpy.items():
+            a, b = array('h', buffers[nombre]), array('h', datos)
+            assert len(a) == len(b) and max(abs(x - y) for x, y in zip(a, b)) <= 1
+
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CacheSonidos(directorio)
+        _, t_fallo = cronometrar(lambda: [cache.obtener(sonido, tasa) for sonido in SONIDOS.values()])
+        leidos, t_acierto = cronometrar(lambda: [cache.obtener(sonido, tasa) for sonido in SONIDOS.values()])
+        assert cache.fallos == cache.aciertos == len(SONIDOS)
+        assert leidos == list(buffers.values())
+
+    return [
+        {"caso": "bucle por muestra (3 sonidos)", "segundos": t_bucle, "ops_por_segundo": 3 / t_bucle},
+        {"caso": f"síntesis ({len(SONIDOS)} sonidos)", "segundos": t_sintesis,
+         "ops_por_segundo": len(SONIDOS) / t_sintesis, "numpy": sintesis_audio.NUMPY_AVAILABLE},
+        {"caso": "caché vacía (sintetiza y guarda)", "segundos": t_fallo, "ops_por_segundo": len(SONIDOS) / t_fallo},
+        {"caso": "caché llena (lee de disco)", "segundos": t_acierto, "ops_por_segundo": len(SONIDOS) / t_acierto},
+    ]
+
+
+@benchmark("despacho")
+def bench_despacho() -> List[dict]:
+    """Despacho de 5k paquetes a 20 camiones en el mapa del simulador y de 2k a puntos al azar"""
+    from despacho import PRESUPUESTO_FRAME, Despachador
+    from simulacion import Package, Point, SimulacionNucleo
+
+    # Mapa del simulador: distancias por carretera entre pocos edificios
+    simulacion = SimulacionNucleo(eventos=None, semilla=31)
+    simulacion.create_sample_trucks()
+    for i in range(len(simulacion.camiones), 20):
+        simulacion.add_truck(Camion(f"DSP{i:03d}", f"Conductor {i}", 6000.0 + 100 * i, "Reparto", 90, 0))
+    for _ in range(5_000):
+        simulacion.crear_mision()
+    for camion in simulacion.camiones:
+        simulacion.despachar(camion)
+    despacho = simulacion.despacho
+
+    def por_frames():
+        duraciones = []
+        while despacho.pendientes:
+            inicio = time.perf_counter()
+            despacho.planificar(PRESUPUESTO_FRAME)
+            duraciones.append(time.perf_counter() - inicio)
+        return duraciones
+
+    frames, t_frames = cronometrar(por_frames)
+    _comprobar_despacho(despacho)
+    assert not despacho.sin_asignar and len(despacho.asignacion) == len(simulacion.road_system.packages)
+    _, t_mejora = cronometrar(despacho.planificar, None)
+    _comprobar_despacho(despacho)
+
+    # Paquetes que llegan de uno en uno con la flota ya planificada
+    def nuevas_misiones():
+        for _ in range(200):
+            simulacion.crear_mision()
+            despacho.planificar(PRESUPUESTO_FRAME)
+    _, t_nuevas = cronometrar(nuevas_misiones)
+    _comprobar_despacho(despacho)
+
+    # Puntos al azar con distancia euclídea, frente a repartir por turnos sin agrupar
+    rng = random.Random(37)
+    paquetes = [Package(f"RND{i:05d}", Point(rng.uniform(0, 2000), rng.uniform(0, 2000)),
+                        Point(rng.uniform(0, 2000), rng.uniform(0, 2000)), rng.uniform(20, 150))
+                for i in range(2_000)]
+    origenes = {f"CAM{k:02d}": (rng.uniform(0, 2000), rng.uniform(0, 2000)) for k in range(20)}
+    al_azar = Despachador()
+    for matricula, origen in origenes.items():
+        al_azar.agregar_camion(matricula, 3000.0, posicion=origen)
+    for paquete in paquetes:
+        al_azar.agregar(paquete)
+    _, t_insercion = cronometrar(al_azar.planificar, None, False)
+    _comprobar_despacho(al_azar)
+    coste_insercion = al_azar.coste_total()
+    _, t_2opt = cronometrar(al_azar.planificar, None)
+    _comprobar_despacho(al_azar)
+    coste_2opt = al_azar.coste_total()
+    assert coste_2opt <= coste_insercion + 1e-6
+
+    por_turnos = 0.0
+    matriculas = list(origenes)
+    anteriores = dict(origenes)
+    for i, paquete in enumerate(paquetes):
+        matricula = matriculas[i % len(matriculas)]
+        recogida = (paquete.pickup_point.x, paquete.pickup_point.y)
+        entrega = (paquete.delivery_point.x, paquete.delivery_point.y)
+        por_turnos += math.dist(anteriores[matricula], recogida) + math.dist(recogida, entrega)
+        anteriores[matricula] = entrega
+
+    return [
+        {"caso": "5k paquetes, frames de 4 ms", "segundos": t_frames, "ops_por_segundo": 5_000 / t_frames,
+         "frames": len(frames), "frame_max_ms": round(max(frames) * 1000, 2)},
+        {"caso": "2-opt hasta óptimo local", "segundos": t_mejora, "ops_por_segundo": len(despacho.planes) / t_mejora,
+         "mejoras": despacho.mejoras_2opt},
+        {"caso": "200 paquetes nuevos", "segundos": t_nuevas, "ops_por_segundo": 200 / t_nuevas},
+        {"caso": "2k al azar, inserción", "segundos": t_insercion, "ops_por_segundo": len(paquetes) / t_insercion,
+         "km_por_turnos": round(por_turnos / 1000, 1), "km_insercion": round(coste_insercion / 1000, 1)},
+        {"caso": "2k al azar, 2-opt", "segundos": t_2opt, "ops_por_segundo": len(al_azar.planes) / t_2opt,
+         "km_2opt": round(coste_2opt / 1000, 1)},
+    ]
+
+
+def _comprobar_despacho(despacho):
+    """Cada paquete asignado está una vez, se recoge antes de entregarse y nunca se pasa de capacidad"""
+    vistos = set()
+    for matricula, plan in despacho.planes.items():
+        carga, recogidos = plan.carga_kg, set()
+        por_recoger = {paquete_id for visita in plan.visitas for paquete_id in visita.recoger}
+        for visita in plan.visitas:
+            for paquete_id in visita.entregar:
+                assert despacho.asignacion[paquete_id] == matricula and paquete_id not in vistos
+                assert paquete_id in recogidos or paquete_id not in por_recoger
+                vistos.add(paquete_id)
+                carga -= despacho.paquetes[paquete_id].weight
+            for paquete_id in visita.recoger:
+                assert despacho.paquetes[paquete_id].assigned_truck == matricula
+                recogidos.add(paquete_id)
+                carga += despacho.paquetes[paquete_id].weight
+            assert carga <= plan.capacidad_kg + 1e-6
+        assert recogidos <= vistos
+    assert vistos == set(despacho.asignacion)
+
+
+@benchmark("colisiones")
+def bench_colisiones() -> List[dict]:
+    """Choques entre camiones con la misma densidad de 500 a 5k camiones, frente a todos los pares"""
+    import colisiones
+    from colisiones import PIEZAS_CAMION, DetectorColisiones
+    from fisica_flota import MotorFisicaFlota
+
+    rng = random.Random(41)
+    detector = DetectorColisiones()
+
+    def flota(n: int):
+        lado = math.sqrt(n) * 90  # Unos 90x90 px por camión: hay colas y algún choque
+        return ([rng.uniform(0, lado) for _ in range(n)], [rng.uniform(0, lado) for _ in range(n)],
+                [rng.uniform(0, 360) for _ in range(n)])
+
+    # Todos los pares con los polígonos de _rotate_rectangle (solo 300 camiones: es O(n²))
+    xs, ys, headings = flota(300)
+    poligonos = [[_poligono_pieza(x, y, heading, *pieza) for pieza in PIEZAS_CAMION]
+                 for x, y, heading in zip(xs, ys, headings)]
+
+    def todos_los_pares():
+        return {(i, j) for i in range(len(xs)) for j in range(i + 1, len(xs))
+                if any(not _separados(a, b) for a in poligonos[i] for b in poligonos[j])}
+
+    bruto, t_bruto = cronometrar(todos_los_pares)
+    contactos = detector.detectar(xs, ys, headings)
+    assert {(c.a, c.b) for c in contactos} == bruto
+
+    resultados = [{"caso": "300 camiones, todos los pares", "segundos": t_bruto,
+                   "ops_por_segundo": len(xs) / t_bruto, "choques": len(bruto)}]
+    for n in (500, 1_000, 2_000, 5_000):
+        xs, ys, headings = flota(n)
+        contactos, segundos = cronometrar(detector.detectar, xs, ys, headings)
+        resultados.append({"caso": f"{n} camiones, rejilla + SAT", "segundos": segundos,
+                           "ops_por_segundo": n / segundos, "us_por_camion": round(segundos / n * 1e6, 2),
+                           "candidatos": detector.candidatos, "choques": len(contactos)})
+
+    # Sin NumPy deben salir los mismos choques
+    if colisiones.NUMPY_AVAILABLE:
+        colisiones.NUMPY_AVAILABLE = False
+        try:
+            sin_numpy, t_sin_numpy = cronometrar(detector.detectar, xs, ys, headings)
+        finally:
+            colisiones.NUMPY_AVAILABLE = True
+        assert len(sin_numpy) == len(contactos)
+        for a, b in zip(sin_numpy, contactos):
+            assert (a.a, a.b) == (b.a, b.b) and abs(a.profundidad - b.profundidad) < 1e-9
+        resultados.append({"caso": f"{len(xs)} camiones, sin NumPy", "segundos": t_sin_numpy,
+                           "ops_por_segundo": len(xs) / t_sin_numpy})
+
+    # Un paso de física con respuesta: después quedan menos solapes
+    motor = MotorFisicaFlota()
+    for x, y, heading in zip(xs, ys, headings):
+        motor.agregar(x, y, heading, velocity=rng.uniform(0, 3))
+    respuesta, t_respuesta = cronometrar(detector.resolver, motor)
+    c = motor.columnas
+    despues = detector.detectar(c["x"], c["y"], c["heading"])
+    assert sum(x.profundidad for x in despues) < sum(x.profundidad for x in respuesta)
+    resultados.append({"caso": f"{len(motor)} camiones, con respuesta", "segundos": t_respuesta,
+                       "ops_por_segundo": len(motor) / t_respuesta, "choques_despues": len(despues)})
+    return resultados
+
+
+@benchmark("perfilador")
+def bench_perfilador() -> List[dict]:
+    """Coste de las marcas del perfilador por frame, desactivado y activado"""
+    from perfilador import MAX_FRAMES, PerfiladorFrames
+
+    fases = ("despacho", "fisica", "paquetes", "camiones", "flota", "estado", "info", "misiones")
+    frames = 100_000
+
+    def sin_marcas():
+        for _ in range(frames):
+            for _ in fases:
+                pass
+
+    def con_marcas(perfil):
+        for _ in range(frames):
+            perfil.empezar_frame()
+            for fase in fases:
+                perfil.marca(fase)
+            perfil.terminar_frame(creados=0, actualizados=12)
+
+    apagado, encendido = PerfiladorFrames(), PerfiladorFrames()
+    encendido.activar()
+    _, t_base = cronometrar(sin_marcas)
+    _, t_apagado = cronometrar(con_marcas, apagado)
+    _, t_encendido = cronometrar(con_marcas, encendido)
+    assert not apagado.frames and len(encendido.frames) == MAX_FRAMES
+
+    # Un frame real de la simulación con 100 camiones, para comparar
+    simulacion = _simulacion_pilotada(100, semilla=5)
+    _, t_tick = cronometrar(lambda: [simulacion.tick() for _ in range(20)])
+    us_tick = t_tick / 20 * 1e6
+    us_apagado = (t_apagado - t_base) / frames * 1e6
+
+    traza, t_traza = cronometrar(encendido.traza)
+    eventos = traza["traceEvents"]
+    assert len(eventos) == MAX_FRAMES * (len(fases) + 2)
+    assert all(e["dur"] >= 0 for e in eventos if e["ph"] == "X")
+
+    return [
+        {"caso": "frame sin perfilador", "segundos": t_base, "ops_por_segundo": frames / t_base},
+        {"caso": "frame, perfilador apagado", "segundos": t_apagado, "ops_por_segundo": frames / t_apagado,
+         "us_por_frame": round(us_apagado, 3), "pct_tick_100_camiones": round(us_apagado / us_tick * 100, 3)},
+        {"caso": "frame, perfilador encendido", "segundos": t_encendido, "ops_por_segundo": frames / t_encendido,
+         "us_por_frame": round((t_encendido - t_base) / frames * 1e6, 3)},
+        {"caso": f"traza de Chrome ({MAX_FRAMES} frames)", "segundos": t_traza,
+         "ops_por_segundo": len(eventos) / t_traza},
+    ]
+
+
+def _poligono_pieza(x: float, y: float, heading: float, largo: float, ancho: float, desplazamiento: float):
+    """Esquinas de una pieza del camión, como las calcula _rotate_rectangle en ej6_2"""
+    angulo = math.radians(heading - 90)
+    cos_a, sin_a = math.cos(angulo), math.sin(angulo)
+    esquinas = ((-largo / 2 + desplazamiento, -ancho / 2), (largo / 2 + desplazamiento, -ancho / 2),
+                (largo / 2 + desplazamiento, ancho / 2), (-largo / 2 + desplazamiento, ancho / 2))
+    return [(x + px * cos_a - py * sin_a, y + px * sin_a + py * cos_a) for px, py in esquinas]
+
+
+def _separados(a, b) -> bool:
+    """Si dos polígonos convexos tienen un eje separador entre las normales de sus lados"""
+    for poligono in (a, b):
+        for (x1, y1), (x2, y2) in zip(poligono, poligono[1:] + poligono[:1]):
+            ex, ey = y1 - y2, x2 - x1
+            proyecciones_a = [ex * x + ey * y for x, y in a]
+            proyecciones_b = [ex * x + ey * y for x, y in b]
+            if max(proyecciones_a) <= min(proyecciones_b) or max(proyecciones_b) <= min(proyecciones_a):
+                return True
+    return False
+
+
+def _proyeccion(segmento, x: float, y: float):
+    dx, dy = segmento.end.x - segmento.start.x, segmento.end.y - segmento.start.y
+    longitud2 = dx * dx + dy * dy
+    t = max(0.0, min(1.0, ((x - segmento.start.x) * dx + (y - segmento.start.y) * dy) / longitud2)) if longitud2 else 0.0
+    return segmento.start.x + t * dx, segmento.start.y + t * dy
+
+
+class _Punto:
+    def __init__(self, x: float, y: float):
+        self.x, self.y = x, y
+
+
+def ejecutar(nombres: List[str], repeticiones: int = 1) -> Dict[str, List[dict]]:
+    """Ejecuta los benchmarks y se queda con la repetición más rápida de cada caso"""
+    resultados: Dict[str, List[dict]] = {}
+    for nombre in nombres:
+        if nombre not in BENCHMARKS:
+            print(f"⚠️ Benchmark desconocido: {nombre}")
+            continue
+        print(f"\n⏱️ {nombre}")
+        mejores: Dict[str, dict] = {}
+        for _ in range(max(1, repeticiones)):
+            for resultado in BENCHMARKS[nombre]():
+                anterior = mejores.get(resultado["caso"])
+                if anterior is None or resultado["segundos"] < anterior["segundos"]:
+                    mejores[resultado["caso"]] = resultado
+        for resultado in mejores.values():
+            extras = ", ".join(f"{k}={v}" for k, v in resultado.items()
+                               if k not in ("caso", "segundos", "ops_por_segundo"))
+            print(f"  {resultado['caso']:<28} {resultado['segundos'] * 1000:9.1f} ms"
+                  f"  {resultado['ops_por_segundo']:12.0f} ops/s  {extras}")
+        resultados[nombre] = list(mejores.values())
+    return resultados
+
+
+def guardar_resultados(ruta: str, resultados: Dict[str, List[dict]]):
+    """Guarda los resultados en JSON junto con los datos del entorno"""
+    with open(ruta, "w", encoding="utf-8") as fichero:
+        json.dump({"fecha": datetime.now().isoformat(timespec="seconds"),
+                   "python": platform.python_version(),
+                   "plataforma": platform.platform(),
+                   "resultados": resultados}, fichero, ensure_ascii=False, indent=2)
+
+
+def comparar(resultados: Dict[str, List[dict]], ruta_base: str,
+             tolerancia: float = 0.3, tolerancia_memoria: float = 0.3) -> List[str]:
+    """Compara con una base guardada y devuelve las regresiones encontradas.
+    
+    Es regresión perder más de `tolerancia` (fracción) de ops/s o aumentar
+    el pico de memoria más de `tolerancia_memoria`.
+    """
+    with open(ruta_base, encoding="utf-8") as fichero:
+        base = json.load(fichero)["resultados"]
+    regresiones = []
+    for nombre, casos in resultados.items():
+        anteriores = {resultado["caso"]: resultado for resultado in base.get(nombre, [])}
+        for resultado in casos:
+            anterior = anteriores.get(resultado["caso"])
+            if anterior is None or anterior["segundos"] < MIN_SEGUNDOS_COMPARABLES:
+                continue
+            clave = f"{nombre}/{resultado['caso']}"
+            if resultado["ops_por_segundo"] < anterior["ops_por_segundo"] * (1 - tolerancia):
+                regresiones.append(f"{clave}: {anterior['ops_por_segundo']:.0f} -> "
+                                   f"{resultado['ops_por_segundo']:.0f} ops/s")
+            pico, pico_base = resultado.get("pico_mb"), anterior.get("pico_mb")
+            # Los picos muy pequeños varían demasiado para compararlos
+            if pico is not None and pico_base and pico_base >= 0.1 and pico > pico_base * (1 + tolerancia_memoria):
+                regresiones.append(f"{clave}: {pico_base} -> {pico} MB de pico")
+    return regresiones
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    """Ejecuta los benchmarks indicados (o todos)"""
+    parser = argparse.ArgumentParser(description="Benchmarks del sistema de camiones")
+    parser.add_argument("nombres", nargs="*", help=f"Benchmarks a ejecutar: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--salida", help="Fichero JSON donde guardar los resultados")
+    parser.add_argument("--comparar", metavar="BASE", help="Fichero JSON de referencia para buscar regresiones")
+    parser.add_argument("--tolerancia", type=float, default=0.3,
+                        help="Pérdida de ops/s admitida frente a la base (fracción, 0.3 = 30%%)")
+    parser.add_argument("--repeticiones", type=int, default=1, help="Repeticiones; se toma la más rápida")
+    args = parser.parse_args(argumentos)
+
+    resultados = ejecutar(args.nombres or list(BENCHMARKS), args.repeticiones)
+    if args.salida:
+        guardar_resultados(args.salida, resultados)
+        print(f"\n💾 Resultados guardados en {args.salida}")
+    if args.comparar:
+        regresiones = comparar(resultados, args.comparar, args.tolerancia, args.tolerancia)
+        if regresiones:
+            print(f"\n🔴 {len(regresiones)} regresiones frente a {args.comparar}:")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            return 1
+        print(f"\n🟢 Sin regresiones frente a {args.comparar}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
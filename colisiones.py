@@ -0,0 +1,247 @@
+"""
+Colisiones entre camiones
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Cada camión es la cabina y el remolque que dibuja ej6_2: dos rectángulos
+orientados según su rumbo. Comprobar todos los pares es O(n²), así que la
+detección va en dos fases:
+
+- Fase amplia: una rejilla uniforme rehecha en cada paso, con celdas del
+  diámetro del círculo que envuelve a un camión. Solo se comparan camiones
+  de la misma celda o de celdas vecinas (la mitad de las vecinas, para ver
+  cada par una vez) y se descartan los que tienen los círculos separados.
+- Fase estrecha: teorema del eje separador (SAT) entre las piezas de los
+  dos camiones. Si se solapan, da la dirección y la profundidad mínimas
+  para separarlos.
+
+Con NumPy la fase estrecha se hace a la vez para todos los pares
+candidatos; sin NumPy, par a par.
+
+La respuesta es sencilla: cada camión se aparta la mitad de la
+profundidad y el que iba hacia el otro rebota (su velocidad se multiplica
+por `rebote`, como contra el borde del mapa). Además, el que lleva a otro
+justo delante y en su mismo sentido no pasa de la velocidad de este, para
+que las colas no se conviertan en una cadena de golpes.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Piezas del camión: (largo, ancho, desplazamiento hacia delante del centro) en px
+CABINA = (25, 12, 15)
+REMOLQUE = (35, 15, -20)
+PIEZAS_CAMION = (CABINA, REMOLQUE)
+
+# Celdas vecinas que mira cada celda: la mitad, para no ver dos veces cada par
+_VECINAS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+
+def radio_envolvente(piezas: Sequence[Tuple[float, float, float]] = PIEZAS_CAMION) -> float:
+    """Radio del círculo centrado en el camión que contiene todas sus piezas"""
+    return max(math.hypot(abs(desplazamiento) + largo / 2, ancho / 2)
+               for largo, ancho, desplazamiento in piezas)
+
+
+@dataclass
+class Contacto:
+    """Dos camiones solapados: n = (nx, ny) va de `a` hacia `b`"""
+    a: int
+    b: int
+    nx: float
+    ny: float
+    profundidad: float
+
+
+def _cajas(x: float, y: float, heading: float, piezas) -> List[tuple]:
+    """(cx, cy, ux, uy, medio largo, medio ancho) de cada pieza, con u hacia delante"""
+    angulo = math.radians(heading - 90)  # El mismo giro que al dibujar
+    ux, uy = math.cos(angulo), math.sin(angulo)
+    return [(x + desplazamiento * ux, y + desplazamiento * uy, ux, uy, largo / 2, ancho / 2)
+            for largo, ancho, desplazamiento in piezas]
+
+
+def solape(caja_a: tuple, caja_b: tuple) -> Optional[Tuple[float, float, float]]:
+    """(nx, ny, profundidad) mínimos para separar dos rectángulos orientados, o None"""
+    ax, ay, aux, auy, al, aw = caja_a
+    bx, by, bux, buy, bl, bw = caja_b
+    dx, dy = bx - ax, by - ay
+    mejor = None
+    # Ejes candidatos: largo y ancho de cada rectángulo (el ancho es u girado 90°)
+    for ex, ey in ((aux, auy), (-auy, aux), (bux, buy), (-buy, bux)):
+        radio_a = al * abs(aux * ex + auy * ey) + aw * abs(-auy * ex + aux * ey)
+        radio_b = bl * abs(bux * ex + buy * ey) + bw * abs(-buy * ex + bux * ey)
+        distancia = dx * ex + dy * ey
+        profundidad = radio_a + radio_b - abs(distancia)
+        if profundidad <= 0:
+            return None  # Eje separador
+        if mejor is None or profundidad < mejor[2]:
+            mejor = (ex, ey, profundidad) if distancia >= 0 else (-ex, -ey, profundidad)
+    return mejor
+
+
+class DetectorColisiones:
+    """Rejilla uniforme + SAT sobre las columnas de un MotorFisicaFlota"""
+
+    def __init__(self, piezas: Sequence[Tuple[float, float, float]] = PIEZAS_CAMION,
+                 rebote: float = -0.3):
+        self.piezas = tuple(piezas)
+        self.radio = radio_envolvente(self.piezas)
+        self.ancho = max(ancho for _, ancho, _ in self.piezas)
+        self.celda = 2 * self.radio
+        self.rebote = rebote
+        # Estadísticas del último paso
+        self.candidatos = 0
+        self.contactos = 0
+        self._pares: List[Tuple[int, int]] = []
+
+    def pares_candidatos(self, xs: Sequence[float], ys: Sequence[float]) -> List[Tuple[int, int]]:
+        """Pares (i, j), i < j, cuyos círculos envolventes se tocan"""
+        celda = self.celda
+        rejilla: Dict[Tuple[int, int], List[int]] = {}
+        for i in range(len(xs)):
+            clave = (int(xs[i] // celda), int(ys[i] // celda))
+            if clave in rejilla:
+                rejilla[clave].append(i)
+            else:
+                rejilla[clave] = [i]
+
+        alcance2 = celda * celda
+        pares = []
+        for (cx, cy), indices in rejilla.items():
+            vecinos = [rejilla.get((cx + dx, cy + dy)) for dx, dy in _VECINAS]
+            for k, i in enumerate(indices):
+                xi, yi = xs[i], ys[i]
+                for j in indices[k + 1:]:
+                    if (xs[j] - xi) ** 2 + (ys[j] - yi) ** 2 < alcance2:
+                        pares.append((i, j) if i < j else (j, i))
+                for otros in vecinos:
+                    if otros is None:
+                        continue
+                    for j in otros:
+                        if (xs[j] - xi) ** 2 + (ys[j] - yi) ** 2 < alcance2:
+                            pares.append((i, j) if i < j else (j, i))
+        self.candidatos = len(pares)
+        self._pares = pares
+        return pares
+
+    def detectar(self, xs: Sequence[float], ys: Sequence[float],
+                 headings: Sequence[float]) -> List[Contacto]:
+        """Contactos entre camiones; en cada par, el de las piezas más solapadas"""
+        pares = self.pares_candidatos(xs, ys)
+        if NUMPY_AVAILABLE and pares:
+            contactos = self._estrecha_numpy(xs, ys, headings, pares)
+        else:
+            contactos = self._estrecha_python(xs, ys, headings, pares)
+        self.contactos = len(contactos)
+        return contactos
+
+    def _estrecha_python(self, xs, ys, headings, pares) -> List[Contacto]:
+        cajas: Dict[int, List[tuple]] = {}
+        contactos = []
+        for i, j in pares:
+            if i not in cajas:
+                cajas[i] = _cajas(xs[i], ys[i], headings[i], self.piezas)
+            if j not in cajas:
+                cajas[j] = _cajas(xs[j], ys[j], headings[j], self.piezas)
+            peor = None
+            for caja_a in cajas[i]:
+                for caja_b in cajas[j]:
+                    encontrado = solape(caja_a, caja_b)
+                    if encontrado is not None and (peor is None or encontrado[2] > peor[2]):
+                        peor = encontrado
+            if peor is not None:
+                contactos.append(Contacto(i, j, *peor))
+        return contactos
+
+    def _estrecha_numpy(self, xs, ys, headings, pares) -> List[Contacto]:
+        """Lo mismo que _estrecha_python, con todos los pares en arrays"""
+        x = np.asarray(xs, dtype=np.float64)
+        y = np.asarray(ys, dtype=np.float64)
+        angulo = np.radians(np.asarray(headings, dtype=np.float64) - 90.0)
+        ux, uy = np.cos(angulo), np.sin(angulo)
+        par = np.array(pares, dtype=np.intp)
+        i, j = par[:, 0], par[:, 1]
+        uxa, uya, uxb, uyb = ux[i], uy[i], ux[j], uy[j]
+        ejes = ((uxa, uya), (-uya, uxa), (uxb, uyb), (-uyb, uxb))
+
+        peor = np.full(len(par), -np.inf)
+        peor_x, peor_y = np.zeros(len(par)), np.zeros(len(par))
+        for largo_a, ancho_a, desplazamiento_a in self.piezas:
+            cax, cay = x[i] + desplazamiento_a * uxa, y[i] + desplazamiento_a * uya
+            for largo_b, ancho_b, desplazamiento_b in self.piezas:
+                dx = x[j] + desplazamiento_b * uxb - cax
+                dy = y[j] + desplazamiento_b * uyb - cay
+                # Profundidad mínima sobre los cuatro ejes (<= 0: separados)
+                minima = np.full(len(par), np.inf)
+                nx, ny = np.zeros(len(par)), np.zeros(len(par))
+                for ex, ey in ejes:
+                    radio_a = (largo_a / 2 * np.abs(uxa * ex + uya * ey)
+                               + ancho_a / 2 * np.abs(-uya * ex + uxa * ey))
+                    radio_b = (largo_b / 2 * np.abs(uxb * ex + uyb * ey)
+                               + ancho_b / 2 * np.abs(-uyb * ex + uxb * ey))
+                    distancia = dx * ex + dy * ey
+                    profundidad = radio_a + radio_b - np.abs(distancia)
+                    menor = profundidad < minima
+                    signo = np.where(distancia >= 0, 1.0, -1.0)
+                    minima = np.where(menor, profundidad, minima)
+                    nx = np.where(menor, signo * ex, nx)
+                    ny = np.where(menor, signo * ey, ny)
+                mayor = (minima > 0) & (minima > peor)
+                peor = np.where(mayor, minima, peor)
+                peor_x = np.where(mayor, nx, peor_x)
+                peor_y = np.where(mayor, ny, peor_y)
+
+        chocan = np.flatnonzero(peor > 0)
+        return [Contacto(int(a), int(b), float(nx), float(ny), float(p))
+                for a, b, nx, ny, p in zip(i[chocan], j[chocan], peor_x[chocan], peor_y[chocan], peor[chocan])]
+
+    def resolver(self, motor) -> List[Contacto]:
+        """Detecta los choques de la flota del motor y separa a los camiones"""
+        c = motor.columnas
+        xs, ys, headings, velocidades = c["x"], c["y"], c["heading"], c["velocity"]
+        contactos = self.detectar(xs, ys, headings)
+        self._guardar_distancia(xs, ys, headings, velocidades)
+        rebotan = set()
+        for contacto in contactos:
+            mitad = contacto.profundidad / 2
+            nx, ny = contacto.nx, contacto.ny
+            xs[contacto.a] -= nx * mitad
+            ys[contacto.a] -= ny * mitad
+            xs[contacto.b] += nx * mitad
+            ys[contacto.b] += ny * mitad
+            # Rebota el que avanzaba hacia el otro (a hacia +n, b hacia -n)
+            for i, signo in ((contacto.a, 1.0), (contacto.b, -1.0)):
+                angulo = math.radians(headings[i] - 90)
+                if velocidades[i] * (math.cos(angulo) * nx + math.sin(angulo) * ny) * signo > 0:
+                    rebotan.add(i)
+        for i in rebotan:
+            velocidades[i] *= self.rebote
+        return contactos
+
+    def _guardar_distancia(self, xs, ys, headings, velocidades):
+        """El que lleva a otro justo delante, en su mismo sentido, no va más rápido que él"""
+        cos, sin, radians = math.cos, math.sin, math.radians
+        for i, j in self._pares:
+            dx, dy = xs[j] - xs[i], ys[j] - ys[i]
+            for a, b, signo in ((i, j, 1.0), (j, i, -1.0)):
+                angulo_a = radians(headings[a] - 90)
+                ux, uy = cos(angulo_a), sin(angulo_a)
+                delante = (ux * dx + uy * dy) * signo
+                lateral = abs(-uy * dx + ux * dy)
+                if delante <= 0 or lateral > self.ancho:
+                    continue
+                angulo_b = radians(headings[b] - 90)
+                alineado = ux * cos(angulo_b) + uy * sin(angulo_b)
+                if alineado > 0.5:
+                    limite = max(0.0, velocidades[b] * alineado)
+                    if velocidades[a] > limite:
+                        velocidades[a] = limite
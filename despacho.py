@@ -0,0 +1,507 @@
+"""
+Despacho automático de paquetes a toda la flota
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Cada camión despachado tiene un plan: una lista de visitas, cada una un
+punto donde primero se entregan y luego se recogen ciertos paquetes. Los
+paquetes pendientes se insertan uno a uno con la heurística de inserción
+más barata: para cada camión se recorre su plan una sola vez, llevando la
+mejor posición de recogida vista hasta el momento, y se elige el par
+(recogida, entrega) que menos distancia añade respetando que la recogida va
+antes que la entrega y que la carga nunca supera capacidad_kg. Después se
+mejoran los planes con 2-opt (invertir un tramo de visitas si acorta la
+ruta y sigue siendo factible).
+
+planificar() trabaja por trozos con un presupuesto de tiempo, así que
+miles de paquetes se reparten a lo largo de varios frames sin atascar la
+interfaz; los paquetes nuevos (agregar) se insertan en los planes que ya
+hay, sin rehacerlos.
+
+Los paquetes son cualquier objeto con id, pickup_point, delivery_point
+(con .x e .y), weight y assigned_truck, como Package de simulacion.py; el
+despachador escribe en assigned_truck el camión que recogerá cada uno (o
+llama a `asignar`, si el dueño de los paquetes mantiene algún índice).
+"""
+
+import math
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from asignacion_flota import MARGEN_CAPACIDAD
+
+Punto = Tuple[float, float]
+
+# Presupuesto por defecto de planificar() cuando se llama en cada frame (s)
+PRESUPUESTO_FRAME = 0.004
+
+# Peso, en el coste de una inserción, de la distancia que recorre el camión
+# hasta entregar el paquete frente a la distancia que se añade a su ruta: sin
+# él, un solo camión encadenaría todos los paquetes y el resto esperaría
+ESPERA = 0.5
+
+# Camiones que se evalúan como mucho al insertar un paquete (los de menor
+# cota); se sigue con más solo mientras ninguno tenga sitio para él
+MAX_CANDIDATOS = 2
+
+# Distancias entre puntos que se recuerdan como máximo
+MAX_DISTANCIAS_CACHE = 200_000
+
+
+def _punto(punto) -> Punto:
+    return (punto.x, punto.y)
+
+
+class _Distancias(dict):
+    """Memoria de distancias: medir(a, b) la calcula solo la primera vez"""
+
+    def __init__(self, distancia: Callable[[Punto, Punto], float]):
+        super().__init__()
+        self._distancia = distancia
+
+    def __missing__(self, clave: Tuple[Punto, Punto]) -> float:
+        if len(self) >= MAX_DISTANCIAS_CACHE:
+            self.clear()
+        distancia = self[clave] = self._distancia(*clave)
+        return distancia
+
+    def medir(self, a: Punto, b: Punto) -> float:
+        return self[(a, b)]
+
+
+class Visita:
+    """Parada de un plan: entregas y luego recogidas en un mismo punto"""
+    __slots__ = ("punto", "entregar", "recoger", "saldo")
+
+    def __init__(self, punto: Punto):
+        self.punto = punto
+        self.entregar: List[str] = []
+        self.recoger: List[str] = []
+        self.saldo = 0.0  # Variación de la carga al salir (kg)
+
+    def __bool__(self) -> bool:
+        return bool(self.entregar or self.recoger)
+
+    def __repr__(self) -> str:
+        return f"Visita({self.punto}, entregar={self.entregar}, recoger={self.recoger})"
+
+
+class PlanCamion:
+    """Visitas pendientes de un camión y su carga tras cada una"""
+
+    def __init__(self, matricula: str, capacidad_kg: float, carga_kg: float,
+                 distancia: Callable[[Punto, Punto], float]):
+        self.matricula = matricula
+        self.capacidad_kg = capacidad_kg
+        self.carga_kg = carga_kg  # Lo que lleva ahora mismo
+        self.visitas: List[Visita] = []
+        self.cargas: List[float] = []  # Carga al salir de cada visita
+        self.entregas_desde: List[int] = [0]  # Entregas de visitas[i:]
+        self.tramos: List[float] = []  # Distancia de la visita i - 1 a la i (la 0 depende del origen)
+        self.mejorado = True  # False si ha cambiado desde la última pasada de 2-opt
+        self._distancia = distancia
+
+    def recalcular(self):
+        """Rehace cargas, entregas pendientes y tramos tras cambiar las visitas"""
+        carga = self.carga_kg
+        self.cargas = []
+        for visita in self.visitas:
+            carga += visita.saldo
+            self.cargas.append(carga)
+        self.entregas_desde = [0] * (len(self.visitas) + 1)
+        for i in range(len(self.visitas) - 1, -1, -1):
+            self.entregas_desde[i] = self.entregas_desde[i + 1] + len(self.visitas[i].entregar)
+        self.tramos = [0.0] + [self._distancia(a.punto, b.punto) for a, b in zip(self.visitas, self.visitas[1:])]
+        self.mejorado = False
+
+
+def _escribir_asignacion(paquete, matricula: Optional[str]):
+    paquete.assigned_truck = matricula
+
+
+class Despachador:
+    """Reparte paquetes entre camiones con inserción más barata y 2-opt"""
+
+    def __init__(self, distancia: Callable[[Punto, Punto], float] = math.dist,
+                 posicion: Optional[Callable[[str], Punto]] = None,
+                 asignar: Optional[Callable[[object, Optional[str]], None]] = None):
+        # Distancia simétrica entre dos puntos. math.dist es más barata que
+        # buscarla en una memoria; las demás (por carretera) se recuerdan
+        self.distancia: Callable[[Punto, Punto], float] = (
+            distancia if distancia is math.dist else _Distancias(distancia).medir)
+        # Posición actual de cada camión (por defecto, la que tenía al añadirlo)
+        self.posicion = posicion
+        # asignar(paquete, matrícula o None); por defecto, escribir assigned_truck
+        self.asignar = asignar or _escribir_asignacion
+        self._origenes: Dict[str, Punto] = {}
+        self.planes: Dict[str, PlanCamion] = {}
+        self.paquetes: Dict[str, object] = {}  # id -> paquete, de todos los que conoce
+        self.pendientes: Deque[str] = deque()
+        self._en_cola: set = set()
+        self.sin_asignar: List[str] = []  # Más pesados que la capacidad de cualquier camión
+        self.asignacion: Dict[str, str] = {}  # id -> matrícula del plan en el que está
+        self.inserciones = 0
+        self.mejoras_2opt = 0
+        self.max_candidatos = MAX_CANDIDATOS
+
+    # ===== Costes =====
+
+    def _origen(self, matricula: str) -> Punto:
+        return self.posicion(matricula) if self.posicion is not None else self._origenes[matricula]
+
+    def coste(self, matricula: str) -> float:
+        """Distancia que le queda por recorrer al camión según su plan"""
+        anterior, total = self._origen(matricula), 0.0
+        for visita in self.planes[matricula].visitas:
+            total += self.distancia(anterior, visita.punto)
+            anterior = visita.punto
+        return total
+
+    def coste_total(self) -> float:
+        return sum(self.coste(matricula) for matricula in self.planes)
+
+    # ===== Flota y paquetes =====
+
+    def agregar_camion(self, matricula: str, capacidad_kg: float, carga_kg: float = 0.0,
+                       posicion: Punto = (0.0, 0.0), a_bordo: Iterable = ()):
+        """Añade un camión; a_bordo son los paquetes que ya lleva y debe entregar"""
+        plan = self.planes[matricula] = PlanCamion(matricula, capacidad_kg, carga_kg, self.distancia)
+        self._origenes[matricula] = posicion
+        for paquete in a_bordo:
+            self.paquetes[paquete.id] = paquete
+            self._insertar_entrega(plan, paquete)
+        # Con un camión más puede que ya quepan los que no cabían
+        for paquete_id in self.sin_asignar:
+            self._encolar(paquete_id)
+        self.sin_asignar = []
+
+    def quitar_camion(self, matricula: str) -> List[str]:
+        """Quita un camión y vuelve a poner en cola lo que aún no había recogido.
+
+        Los paquetes que ya lleva siguen siendo suyos. Devuelve los ids que
+        vuelven a la cola.
+        """
+        plan = self.planes.pop(matricula, None)
+        self._origenes.pop(matricula, None)
+        if plan is None:
+            return []
+        devueltos = []
+        for visita in plan.visitas:
+            for paquete_id in visita.entregar:
+                self.asignacion.pop(paquete_id, None)
+            for paquete_id in visita.recoger:
+                self.asignacion.pop(paquete_id, None)
+                self.asignar(self.paquetes[paquete_id], None)
+                devueltos.append(paquete_id)
+        for paquete_id in reversed(devueltos):
+            self._en_cola.add(paquete_id)
+            self.pendientes.appendleft(paquete_id)
+        return devueltos
+
+    def agregar(self, paquete):
+        """Pone en cola un paquete por recoger; se planifica en el próximo planificar()"""
+        self.paquetes[paquete.id] = paquete
+        self._encolar(paquete.id)
+
+    def _encolar(self, paquete_id: str):
+        if paquete_id not in self._en_cola and paquete_id not in self.asignacion:
+            self._en_cola.add(paquete_id)
+            self.pendientes.append(paquete_id)
+
+    def siguiente_parada(self, matricula: str) -> Optional[Punto]:
+        """Punto de la próxima visita del camión, o None si no tiene trabajo"""
+        plan = self.planes.get(matricula)
+        if plan is None:
+            return None
+        if plan.visitas and not plan.visitas[0]:
+            plan.visitas = [visita for visita in plan.visitas if visita]
+            plan.recalcular()
+        return plan.visitas[0].punto if plan.visitas else None
+
+    def toca_recoger(self, matricula: str, paquete_id: str) -> bool:
+        """Si el paquete se recoge en la próxima parada del camión"""
+        if self.siguiente_parada(matricula) is None:
+            return False
+        return paquete_id in self.planes[matricula].visitas[0].recoger
+
+    def completado(self, matricula: str, paquete, accion: str):
+        """Informa de que el camión ha recogido ("recoger") o entregado ("entregar") un paquete"""
+        self.paquetes.setdefault(paquete.id, paquete)
+        self._en_cola.discard(paquete.id)  # Por si lo coge antes de planificarlo
+        duenio = self.asignacion.get(paquete.id)
+        plan = self.planes.get(matricula)
+        if accion == "recoger" and duenio not in (None, matricula):
+            # Lo tenía planificado otro camión
+            self._quitar_de_plan(self.planes[duenio], paquete.id)
+            duenio = None
+        if plan is None:
+            return
+        if accion == "recoger":
+            plan.carga_kg += paquete.weight
+            if duenio == matricula:
+                self._quitar_de_plan(plan, paquete.id, accion)
+            else:
+                self._insertar_entrega(plan, paquete)
+        else:
+            plan.carga_kg -= paquete.weight
+            if duenio == matricula:
+                self._quitar_de_plan(plan, paquete.id, accion)
+        plan.recalcular()
+
+    def _quitar_de_plan(self, plan: PlanCamion, paquete_id: str, accion: Optional[str] = None):
+        """Quita la recogida o la entrega de un paquete, o las dos si accion es None"""
+        peso = self.paquetes[paquete_id].weight
+        for visita in plan.visitas:
+            if accion != "entregar" and paquete_id in visita.recoger:
+                visita.recoger.remove(paquete_id)
+                visita.saldo -= peso
+            elif accion != "recoger" and paquete_id in visita.entregar:
+                visita.entregar.remove(paquete_id)
+                visita.saldo += peso
+                break
+        if accion != "recoger":
+            self.asignacion.pop(paquete_id, None)
+        plan.recalcular()
+
+    # ===== Planificación =====
+
+    def planificar(self, presupuesto: Optional[float] = PRESUPUESTO_FRAME, mejorar: bool = True) -> int:
+        """Inserta paquetes de la cola y mejora los planes durante `presupuesto` segundos.
+
+        Con presupuesto None trabaja hasta vaciar la cola y (si `mejorar`)
+        dejar los planes en un óptimo local. Devuelve los paquetes insertados.
+
+        El presupuesto es aproximado: se mira entre paquetes, entre camiones
+        candidatos y entre pasos de 2-opt. Al agotarse, el paquete en curso
+        se inserta tras evaluar como mucho max_candidatos camiones más (o
+        hasta el primero con sitio), así que el frame se pasa como mucho lo
+        que cuesten esos planes y las distancias que aún no estén en memoria.
+        """
+        limite = math.inf if presupuesto is None else time.perf_counter() + presupuesto
+        insertados = 0
+        while self.pendientes and self.planes and time.perf_counter() < limite:
+            paquete_id = self.pendientes.popleft()
+            if paquete_id not in self._en_cola:
+                continue  # Ya recogido por otro camión
+            self._en_cola.discard(paquete_id)
+            if self._insertar(self.paquetes[paquete_id], limite):
+                insertados += 1
+            else:
+                self.sin_asignar.append(paquete_id)
+        for plan in self.planes.values():
+            if not mejorar or time.perf_counter() >= limite:
+                break
+            if not plan.mejorado:
+                self._dos_opt(plan, limite)
+        return insertados
+
+    def _insertar(self, paquete, limite: float = math.inf) -> bool:
+        """Inserta el paquete en el plan y la posición de menor coste.
+
+        Pasado `limite` deja de evaluar camiones en cuanto ha visto
+        max_candidatos y alguno tenía sitio: la inserción puede no ser la
+        más barata, pero el frame no se alarga más de unos pocos planes.
+        """
+        recogida, entrega = _punto(paquete.pickup_point), _punto(paquete.delivery_point)
+        d = self.distancia
+        tramo = d(recogida, entrega)
+        # Cota inferior de cada camión: ir derecho a recoger y entregar
+        cotas = sorted((ESPERA * (d(self._origen(matricula), recogida) + tramo), matricula)
+                       for matricula in self.planes)
+        mejor, mejor_plan = (math.inf, None, None), None
+        for evaluados, (cota, matricula) in enumerate(cotas):
+            if cota >= mejor[0]:
+                break
+            # Con el tiempo del frame agotado basta con los primeros candidatos
+            if (evaluados >= self.max_candidatos and mejor_plan is not None
+                    and time.perf_counter() >= limite):
+                break
+            plan = self.planes[matricula]
+            candidato = self._mejor_insercion(plan, recogida, entrega, paquete.weight, mejor[0])
+            if candidato[0] < mejor[0]:
+                mejor, mejor_plan = candidato, plan
+        if mejor_plan is None:
+            return False
+        _, en_recogida, en_entrega = mejor
+        # Primero la entrega (va detrás), para no mover el índice de la recogida
+        visita_entrega = self._visita(mejor_plan, en_entrega, entrega)
+        visita_recogida = self._visita(mejor_plan, en_recogida, recogida)
+        visita_recogida.recoger.append(paquete.id)
+        visita_recogida.saldo += paquete.weight
+        visita_entrega.entregar.append(paquete.id)
+        visita_entrega.saldo -= paquete.weight
+        mejor_plan.recalcular()
+        self.asignacion[paquete.id] = mejor_plan.matricula
+        self.asignar(paquete, mejor_plan.matricula)
+        self.inserciones += 1
+        return True
+
+    @staticmethod
+    def _visita(plan: PlanCamion, posicion: Tuple[str, int], punto: Punto) -> Visita:
+        """Visita existente ("unir", i) o nueva antes de la visita i ("nueva", i)"""
+        tipo, i = posicion
+        if tipo == "unir":
+            return plan.visitas[i]
+        visita = Visita(punto)
+        plan.visitas.insert(i, visita)
+        return visita
+
+    def _mejor_insercion(self, plan: PlanCamion, recogida: Punto, entrega: Punto, peso: float,
+                         cota: float = math.inf):
+        """(coste, posición de la recogida, posición de la entrega) en un solo recorrido del plan.
+
+        El coste es la distancia añadida más ESPERA veces lo que se retrasan
+        las entregas: la distancia hasta entregar este paquete y el rodeo que
+        se añade delante de cada entrega del plan. La posición es ("unir", i)
+        para añadirlo a la visita i o ("nueva", i) para una visita nueva antes
+        de la i. Solo se buscan costes menores que `cota`.
+        """
+        d = self.distancia
+        visitas, cargas, detras = plan.visitas, plan.cargas, plan.entregas_desde
+        limite = plan.capacidad_kg * (1 - MARGEN_CAPACIDAD) - peso
+        mejor = (cota, None, None)
+        # Mejor recogida hasta aquí desde la que el paquete cabe a bordo (su rodeo
+        # cuenta una vez, más ESPERA por cada entrega que retrasa, esta incluida)
+        coste_recogida, en_recogida = math.inf, None
+        anterior, carga = self._origen(plan.matricula), plan.carga_kg
+        recorrido = 0.0  # Distancia del plan hasta `anterior`
+        tramo = d(recogida, entrega)
+        # Distancias de anterior a la recogida y a la entrega; en el hueco
+        # siguiente se reaprovechan las de la visita i
+        hasta_recogida, desde_anterior = d(anterior, recogida), d(anterior, entrega)
+        n = len(visitas)
+        for i in range(n + 1):
+            if ESPERA * recorrido >= mejor[0]:
+                break  # Todo lo que queda entrega más tarde
+            # Coste de meter la entrega, la recogida o ambas entre anterior y la visita i
+            if i < n:
+                siguiente = visitas[i].punto
+                base = d(anterior, siguiente) if i == 0 else plan.tramos[i]
+                recogida_siguiente, entrega_siguiente = d(recogida, siguiente), d(entrega, siguiente)
+                solo_entrega = desde_anterior + entrega_siguiente - base
+                solo_recogida = hasta_recogida + recogida_siguiente - base
+                ambas = hasta_recogida + tramo + entrega_siguiente - base
+            else:
+                siguiente, base = None, 0.0
+                solo_entrega, solo_recogida = desde_anterior, hasta_recogida
+                ambas = hasta_recogida + tramo
+
+            # Hueco antes de la visita i (junto a una visita en el mismo punto, mejor unirse a ella)
+            if en_recogida is not None and entrega != siguiente and entrega != anterior:
+                coste = (coste_recogida + solo_entrega * (1 + ESPERA * detras[i])
+                         + ESPERA * (recorrido + desde_anterior))
+                if coste < mejor[0]:
+                    mejor = (coste, en_recogida, ("nueva", i))
+            if carga <= limite:
+                coste = ambas * (1 + ESPERA * detras[i]) + ESPERA * (recorrido + hasta_recogida + tramo)
+                if coste < mejor[0]:
+                    mejor = (coste,
+                             ("unir", i - 1) if i and recogida == anterior else ("nueva", i),
+                             ("unir", i) if entrega == siguiente else ("nueva", i))
+                coste = solo_recogida * (1 + ESPERA * (detras[i] + 1))
+                if coste < coste_recogida and recogida != siguiente and recogida != anterior:
+                    coste_recogida, en_recogida = coste, ("nueva", i)
+            if i == n:
+                break
+
+            # Visita i
+            visita = visitas[i]
+            recorrido += base
+            if visita.punto == entrega and en_recogida is not None:
+                coste = coste_recogida + ESPERA * recorrido
+                if coste < mejor[0]:
+                    mejor = (coste, en_recogida, ("unir", i))
+            carga = cargas[i]
+            if carga > limite:
+                # Nada recogido antes cabe al salir de esta visita
+                coste_recogida, en_recogida = math.inf, None
+            elif visita.punto == recogida and coste_recogida > 0.0:
+                coste_recogida, en_recogida = 0.0, ("unir", i)
+            anterior = visita.punto
+            hasta_recogida, desde_anterior = recogida_siguiente, entrega_siguiente
+        return mejor if mejor[1] is not None else (math.inf, None, None)
+
+    def _insertar_entrega(self, plan: PlanCamion, paquete):
+        """Añade solo la entrega de un paquete que el camión ya lleva"""
+        entrega = _punto(paquete.delivery_point)
+        d = self.distancia
+        mejor, en = math.inf, ("nueva", len(plan.visitas))
+        anterior = self._origen(plan.matricula)
+        for i, visita in enumerate(plan.visitas):
+            if visita.punto == entrega:
+                mejor, en = 0.0, ("unir", i)
+                break
+            coste = d(anterior, entrega) + d(entrega, visita.punto) - d(anterior, visita.punto)
+            if coste < mejor:
+                mejor, en = coste, ("nueva", i)
+            anterior = visita.punto
+        if plan.visitas and d(anterior, entrega) < mejor:
+            en = ("nueva", len(plan.visitas))
+        visita = self._visita(plan, en, entrega)
+        visita.entregar.append(paquete.id)
+        visita.saldo -= paquete.weight
+        plan.recalcular()
+        self.asignacion[paquete.id] = plan.matricula
+
+    # ===== Mejora =====
+
+    def _dos_opt(self, plan: PlanCamion, limite: float):
+        """Invierte tramos de visitas mientras acorte la ruta y la deje factible"""
+        d = self.distancia
+        capacidad = plan.capacidad_kg * (1 - MARGEN_CAPACIDAD)
+        mejorado = True
+        while mejorado:
+            mejorado = False
+            visitas = plan.visitas
+            puntos = [self._origen(plan.matricula)] + [visita.punto for visita in visitas]
+            n = len(visitas)
+            for i in range(1, n):
+                if time.perf_counter() >= limite:
+                    return
+                a, b = puntos[i - 1], puntos[i]
+                desde_a = d(a, b)
+                carga_previa = plan.cargas[i - 2] if i > 1 else plan.carga_kg
+                # Tramo visitas[i - 1:j], que se alarga de uno en uno
+                recogidos: set = set()
+                maxima = -math.inf  # Carga máxima dentro del tramo ya invertido
+                for j in range(i, n + 1):
+                    visita = visitas[j - 1]
+                    if not recogidos.isdisjoint(visita.entregar):
+                        break  # Se entregaría antes de recoger, y así con todo tramo más largo
+                    recogidos.update(visita.recoger)
+                    # Invertido, esta visita pasa a ser la primera del tramo
+                    maxima = visita.saldo + max(carga_previa, maxima)
+                    if j == i or maxima > capacidad:
+                        continue
+                    c = puntos[j]
+                    ganancia = desde_a - d(a, c)
+                    if j < n:
+                        e = puntos[j + 1]
+                        ganancia += d(c, e) - d(b, e)
+                    if ganancia > 1e-9:
+                        self._invertir(plan, i - 1, j)
+                        self.mejoras_2opt += 1
+                        mejorado = True
+                        break
+                if mejorado:
+                    break
+        plan.mejorado = True
+
+    @staticmethod
+    def _invertir(plan: PlanCamion, inicio: int, fin: int):
+        """Invierte visitas[inicio:fin] y funde las visitas seguidas en un mismo punto"""
+        tramo = plan.visitas[inicio:fin]
+        tramo.reverse()
+        visitas = plan.visitas[:inicio] + tramo + plan.visitas[fin:]
+        fundidas = [visitas[0]]
+        for visita in visitas[1:]:
+            previa = fundidas[-1]
+            if visita.punto == previa.punto and set(previa.recoger).isdisjoint(visita.entregar):
+                previa.entregar.extend(visita.entregar)
+                previa.recoger.extend(visita.recoger)
+                previa.saldo += visita.saldo
+            else:
+                fundidas.append(visita)
+        plan.visitas = fundidas
+        plan.recalcular()
@@ -4,6 +4,23 @@ Autor: [Tu nombre]
 Fecha: 17 de Noviembre de 2025
 """
 
+import asyncio
+import csv
+import json
+import threading
+from bisect import bisect_right, insort
+from dataclasses import dataclass, field
+from enum import Enum
+from io import StringIO
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from empaquetado_3d import EmpaquetadorBodega
+
+# Límite de bits (cajas x unidades de capacidad) para la búsqueda exacta
+# del mejor subconjunto; por encima se usa primer ajuste decreciente
+LIMITE_BITS_SUBCONJUNTO = 50_000_000
+
 
 class Caja:
     """Clase que representa una caja con sus dimensiones y características"""
@@ -17,20 +34,377 @@ class Caja:
         self.ancho = ancho
         self.altura = altura
     
+    def volumen(self) -> float:
+        """Calcula el volumen de la caja en cm³"""
+        return self.largo * self.ancho * self.altura
+    
     def __str__(self) -> str:
         """Representación en cadena de la caja"""
-        volumen = self.largo * self.ancho * self.altura
+        volumen = self.volumen()
         return (f"Caja {self.codigo}: {self.descripcion_carga}\n"
                 f"  Peso: {self.peso_kg} kg\n"
                 f"  Dimensiones: {self.largo}x{self.ancho}x{self.altura} cm\n"
                 f"  Volumen: {volumen:.2f} cm³")
 
 
+class FormatoInforme(Enum):
+    """Formato del informe de un camión"""
+    TEXTO = "texto"
+    CSV = "csv"
+    JSON = "json"
+
+
+CAMPOS_CSV = ["matricula", "codigo", "peso_kg", "descripcion_carga",
+              "largo", "ancho", "altura", "volumen"]
+
+
+class CajaDuplicadaError(ValueError):
+    """La caja ya está cargada (en este camión o en otro de la flota)"""
+
+
+class BodegaLlenaError(ValueError):
+    """La caja no cabe físicamente en la bodega del camión"""
+
+
+class ManifiestoCarga:
+    """Manifiesto de carga con totales acumulados e índice por código.
+    
+    Mantiene el orden de carga y se comporta como la antigua lista de cajas
+    (iteración, índices, len, append, remove), pero alta, baja, búsqueda y
+    totales son O(1). Si tiene un empaquetador, cada caja se coloca también
+    en la bodega y se rechaza la que no cabe físicamente.
+    
+    Los índices usan una lista con el orden de carga en la que las bajas
+    dejan un hueco; los huecos se compactan cuando son más de la mitad y,
+    mientras tanto, manifiesto[i] salta los huecos con una búsqueda binaria
+    (O(log² n)). Recorrerlo no copia nada: como valores(), modificar el
+    manifiesto mientras se recorre lanza RuntimeError; para eso se recorre
+    una copia, list(manifiesto).
+    
+    Los observadores son funciones observador(evento, caja) que se llaman
+    con "validar" antes de cada alta (pueden vetarla lanzando
+    CajaDuplicadaError), "alta" después de cada alta, "cancelar" si tras
+    validarla la caja no llega a entrar y "baja" después de cada baja.
+    """
+    
+    def __init__(self, cajas=(), empaquetador: Optional[EmpaquetadorBodega] = None,
+                 observadores: Optional[list] = None):
+        self._cajas = {}  # codigo -> Caja (conserva el orden de inserción)
+        self._orden: list = []  # Cajas en orden de carga; None donde hubo una baja
+        self._posiciones: Dict[str, int] = {}  # codigo -> posición en _orden
+        self._huecos: List[int] = []  # Posiciones de _orden con None, ordenadas
+        self.peso_total = 0.0
+        self.volumen_total = 0.0
+        self.empaquetador = empaquetador
+        self.observadores = observadores if observadores is not None else []
+        for caja in cajas:
+            self.agregar(caja)
+    
+    def _notificar(self, evento: str, caja):
+        for observador in self.observadores:
+            observador(evento, caja)
+    
+    def agregar(self, caja):
+        """Añade una caja al manifiesto (el código debe ser único)"""
+        if caja.codigo in self._cajas:
+            raise CajaDuplicadaError(f"La caja {caja.codigo} ya está en el manifiesto")
+        try:
+            self._notificar("validar", caja)
+            if self.empaquetador is not None and self.empaquetador.insertar(caja) is None:
+                raise BodegaLlenaError(f"La caja {caja.codigo} no cabe en la bodega")
+        except Exception:
+            self._notificar("cancelar", caja)
+            raise
+        self._cajas[caja.codigo] = caja
+        self._posiciones[caja.codigo] = len(self._orden)
+        self._orden.append(caja)
+        self.peso_total += caja.peso_kg
+        self.volumen_total += caja.volumen()
+        self._notificar("alta", caja)
+    
+    def quitar(self, codigo: str):
+        """Quita y devuelve la caja con ese código (KeyError si no existe)"""
+        caja = self._cajas.pop(codigo)
+        posicion = self._posiciones.pop(codigo)
+        self._orden[posicion] = None
+        insort(self._huecos, posicion)
+        if len(self._huecos) * 2 > len(self._orden):
+            self._compactar()
+        if self.empaquetador is not None and codigo in self.empaquetador:
+            self.empaquetador.quitar(codigo)
+        if self._cajas:
+            self.peso_total -= caja.peso_kg
+            self.volumen_total -= caja.volumen()
+        else:
+            # Sin cajas, reiniciar para no arrastrar error de redondeo
+            self.peso_total = 0.0
+            self.volumen_total = 0.0
+        self._notificar("baja", caja)
+        return caja
+    
+    def vaciar(self):
+        """Quita todas las cajas de una vez"""
+        cajas = list(self._cajas.values())
+        self._cajas.clear()
+        self._orden.clear()
+        self._posiciones.clear()
+        self._huecos.clear()
+        self.peso_total = 0.0
+        self.volumen_total = 0.0
+        if self.empaquetador is not None:
+            self.empaquetador.vaciar()
+        for caja in cajas:
+            self._notificar("baja", caja)
+    
+    def _compactar(self):
+        """Quita los huecos de la lista de orden"""
+        self._orden = list(self._cajas.values())
+        self._posiciones = {caja.codigo: posicion for posicion, caja in enumerate(self._orden)}
+        self._huecos = []
+    
+    def _posicion(self, indice: int) -> int:
+        """Posición en _orden de la caja indice-ésima (0 <= indice < len)"""
+        huecos = self._huecos
+        # Las cajas vivas hasta la posición p son p + 1 - huecos <= p, que
+        # crece con p: se busca la primera posición con indice + 1 de ellas
+        bajo, alto = indice, indice + len(huecos)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if medio + 1 - bisect_right(huecos, medio) > indice:
+                alto = medio
+            else:
+                bajo = medio + 1
+        return bajo
+    
+    def suscribir(self, observadores: list):
+        """Comparte la lista de observadores y les notifica las cajas actuales.
+        
+        Primero se valida cada caja, de modo que si alguno la veta no
+        queda nada a medias.
+        """
+        try:
+            for caja in self._cajas.values():
+                for observador in observadores:
+                    observador("validar", caja)
+        except Exception:
+            for caja in self._cajas.values():
+                for observador in observadores:
+                    observador("cancelar", caja)
+            raise
+        self.observadores = observadores
+        for caja in self._cajas.values():
+            self._notificar("alta", caja)
+    
+    def buscar(self, codigo: str):
+        """Devuelve la caja con ese código o None"""
+        return self._cajas.get(codigo)
+    
+    def contiene(self, codigo: str) -> bool:
+        """Indica si hay una caja con ese código"""
+        return codigo in self._cajas
+    
+    def valores(self):
+        """Vista en vivo de las cajas, sin copiar (no modificar mientras se recorre)"""
+        return self._cajas.values()
+    
+    def cabe(self, peso_kg: float, capacidad_kg: float) -> bool:
+        """Indica si una caja de ese peso cabe sin superar la capacidad"""
+        return self.peso_total + peso_kg <= capacidad_kg
+    
+    # Compatibilidad con la antigua lista Camion.cajas
+    def append(self, caja):
+        self.agregar(caja)
+    
+    def remove(self, caja):
+        if self._cajas.get(caja.codigo) is not caja:
+            raise ValueError(f"La caja {caja.codigo} no está en el manifiesto")
+        self.quitar(caja.codigo)
+    
+    def __contains__(self, caja) -> bool:
+        return self._cajas.get(caja.codigo) is caja
+    
+    def __getitem__(self, indice):
+        if not self._huecos:
+            return self._orden[indice]
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(len(self._cajas))
+            if paso != 1:
+                return [self[i] for i in range(inicio, fin, paso)]
+            if inicio >= fin:
+                return []
+            # Desde la primera, se recorre _orden saltando los huecos
+            tramo = islice((caja for caja in islice(self._orden, self._posicion(inicio), None)
+                            if caja is not None), fin - inicio)
+            return list(tramo)
+        if indice < 0:
+            indice += len(self._cajas)
+        if not 0 <= indice < len(self._cajas):
+            raise IndexError("Índice de caja fuera de rango")
+        return self._orden[self._posicion(indice)]
+    
+    def __iter__(self):
+        """Recorre las cajas en orden de carga sin copiarlas (no modificar mientras tanto)"""
+        return iter(self._cajas.values())
+    
+    def __len__(self) -> int:
+        return len(self._cajas)
+    
+    def __bool__(self) -> bool:
+        return bool(self._cajas)
+    
+    def __repr__(self) -> str:
+        return f"ManifiestoCarga({list(self._cajas.values())!r})"
+
+
+class PoliticaCarga(Enum):
+    """Política para cargar un lote de cajas"""
+    PRIMER_AJUSTE = "first_fit"  # En orden, mientras quepan
+    MEJOR_SUBCONJUNTO = "best_subset"  # Subconjunto que más peso aprovecha
+
+
+class MotivoRechazo(Enum):
+    """Motivo por el que no se cargó una caja"""
+    CAPACIDAD = "capacidad"
+    VOLUMEN = "volumen"
+    DUPLICADA = "duplicada"
+    PESO_INVALIDO = "peso_invalido"
+
+
+@dataclass
+class Rechazo:
+    """Caja rechazada junto con el motivo"""
+    caja: object
+    motivo: MotivoRechazo
+    detalle: str = ""
+
+
+@dataclass
+class ResultadoCarga:
+    """Resultado de cargar un lote de cajas en un camión"""
+    aceptadas: list = field(default_factory=list)
+    rechazadas: List[Rechazo] = field(default_factory=list)
+    
+    @property
+    def peso_aceptado(self) -> float:
+        return sum(caja.peso_kg for caja in self.aceptadas)
+    
+    @property
+    def completo(self) -> bool:
+        """True si se cargaron todas las cajas del lote"""
+        return not self.rechazadas
+
+
+class Reserva:
+    """Capacidad apartada en un camión para una caja que aún se va a cargar.
+    
+    Se confirma con confirmar(caja) o se libera con cancelar(). Usada con
+    `with`, la reserva que no se haya confirmado se cancela al salir.
+    """
+    
+    def __init__(self, camion: "Camion", peso_kg: float):
+        self.camion = camion
+        self.peso_kg = peso_kg
+        self.activa = True
+    
+    def confirmar(self, caja) -> bool:
+        """Carga la caja usando la capacidad reservada.
+        
+        Devuelve False si la bodega la rechaza o ya está cargada; en ese
+        caso la reserva sigue activa.
+        """
+        camion = self.camion
+        with camion.cerrojo:
+            if not self.activa:
+                raise RuntimeError("La reserva ya se confirmó o se canceló")
+            if caja.peso_kg > self.peso_kg:
+                raise ValueError(f"La caja {caja.codigo} pesa más de lo reservado ({self.peso_kg} kg)")
+            try:
+                camion.manifiesto.agregar(caja)
+            except ValueError:
+                return False
+            self.activa = False
+            camion.peso_reservado -= self.peso_kg
+            if not camion.peso_reservado > 1e-9:
+                camion.peso_reservado = 0.0
+            # La diferencia entre lo reservado y lo cargado queda libre
+            camion.capacidad_liberada.notify_all()
+            return True
+    
+    def cancelar(self):
+        """Libera la capacidad reservada (no hace nada si ya no está activa)"""
+        camion = self.camion
+        with camion.cerrojo:
+            if not self.activa:
+                return
+            self.activa = False
+            camion.peso_reservado -= self.peso_kg
+            if not camion.peso_reservado > 1e-9:
+                camion.peso_reservado = 0.0
+            camion.capacidad_liberada.notify_all()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.cancelar()
+
+
+def _mejor_subconjunto(pesos: List[float], capacidad_kg: float,
+                       resolucion_kg: float = 1.0) -> List[int]:
+    """Índices del subconjunto de pesos que más se acerca a la capacidad.
+    
+    Programación dinámica de suma de subconjuntos sobre un bitset (un int
+    de Python), con los pesos redondeados hacia arriba a la resolución, así
+    que el resultado nunca supera la capacidad real.
+    """
+    unidades_cap = int(capacidad_kg // resolucion_kg)
+    if unidades_cap <= 0 or not pesos:
+        return []
+    if len(pesos) * unidades_cap > LIMITE_BITS_SUBCONJUNTO:
+        # Demasiado grande para el bitset: primer ajuste decreciente
+        elegidos, restante = [], capacidad_kg
+        for i in sorted(range(len(pesos)), key=lambda i: pesos[i], reverse=True):
+            if pesos[i] <= restante:
+                elegidos.append(i)
+                restante -= pesos[i]
+        return sorted(elegidos)
+    
+    mascara = (1 << (unidades_cap + 1)) - 1
+    unidades = [int(-(-peso // resolucion_kg)) for peso in pesos]  # Redondeo hacia arriba
+    estados = [1]  # estados[i]: sumas alcanzables con las i primeras cajas
+    for u in unidades:
+        anterior = estados[-1]
+        estados.append((anterior | (anterior << u)) & mascara if u <= unidades_cap else anterior)
+    
+    objetivo = estados[-1].bit_length() - 1
+    elegidos = []
+    for i in range(len(pesos) - 1, -1, -1):
+        if not (estados[i] >> objetivo) & 1:
+            elegidos.append(i)
+            objetivo -= unidades[i]
+    elegidos.reverse()
+    
+    # Aprovechar el margen que deja el redondeo
+    restante = capacidad_kg - sum(pesos[i] for i in elegidos)
+    seleccion = set(elegidos)
+    for i, peso in enumerate(pesos):
+        if i not in seleccion and peso <= restante:
+            seleccion.add(i)
+            restante -= peso
+    return sorted(seleccion)
+
+
+def _cancelar_reserva_huerfana(futuro):
+    if not futuro.cancelled() and futuro.exception() is None and futuro.result() is not None:
+        futuro.result().cancelar()
+
+
 class Camion:
     """Clase que representa un camión con capacidad de carga"""
     
     def __init__(self, matricula: str, conductor: str, capacidad_kg: float, 
-                 descripcion_carga: str, rumbo: int, velocidad: int):
+                 descripcion_carga: str, rumbo: int, velocidad: int,
+                 bodega: Optional[Tuple[float, float, float]] = None):
         self.matricula = matricula
         self.conductor = conductor
         self.capacidad_kg = capacidad_kg
@@ -43,25 +417,208 @@ class Camion:
             raise ValueError("El rumbo debe estar entre 1 y 359 grados")
         
         self.velocidad = velocidad
-        self.cajas = []  # Lista de objetos Caja
+        self.bodega = bodega  # (largo, ancho, altura) en cm, o None si no se controla
+        # Observadores del manifiesto (p. ej. un IndiceFlota); se conservan
+        # aunque se sustituyan las cajas
+        self.observadores: List[Callable] = []
+        self.manifiesto = ManifiestoCarga(empaquetador=self._nuevo_empaquetador(),
+                                          observadores=self.observadores)
+        
+        # Carga concurrente: todas las modificaciones del manifiesto se hacen
+        # con el cerrojo, y las reservas cuentan como peso ya cargado
+        self.cerrojo = threading.RLock()
+        self.capacidad_liberada = threading.Condition(self.cerrojo)
+        self.peso_reservado = 0.0
+    
+    def _nuevo_empaquetador(self) -> Optional[EmpaquetadorBodega]:
+        return EmpaquetadorBodega(*self.bodega) if self.bodega else None
+    
+    @property
+    def cajas(self) -> ManifiestoCarga:
+        """Cajas cargadas (el manifiesto se comporta como una lista)"""
+        return self.manifiesto
+    
+    @cajas.setter
+    def cajas(self, cajas):
+        nuevo = ManifiestoCarga(cajas, self._nuevo_empaquetador())
+        with self.cerrojo:
+            # Validar antes de vaciar el manifiesto actual para no perder nada
+            # si algún observador rechaza una caja
+            try:
+                for caja in nuevo.valores():
+                    for observador in self.observadores:
+                        observador("validar", caja)
+            except Exception:
+                for caja in nuevo.valores():
+                    for observador in self.observadores:
+                        observador("cancelar", caja)
+                raise
+            self.manifiesto.vaciar()
+            nuevo.suscribir(self.observadores)
+            self.manifiesto = nuevo
+            self.capacidad_liberada.notify_all()
     
     def peso_total(self) -> float:
-        """Calcula la suma de pesos de todas las cajas cargadas"""
-        return sum(caja.peso_kg for caja in self.cajas)
+        """Devuelve la suma de pesos de todas las cajas cargadas"""
+        return self.manifiesto.peso_total
+    
+    def volumen_total(self) -> float:
+        """Devuelve la suma de volúmenes de todas las cajas cargadas"""
+        return self.manifiesto.volumen_total
+    
+    def puede_cargar(self, peso_kg: float) -> bool:
+        """Indica si se puede cargar ese peso sin superar la capacidad (contando reservas)"""
+        return self.manifiesto.cabe(peso_kg + self.peso_reservado, self.capacidad_kg)
+    
+    def buscar_caja(self, codigo: str):
+        """Devuelve la caja cargada con ese código o None"""
+        return self.manifiesto.buscar(codigo)
     
-    def add_caja(self, caja):
-        """Añade una caja si no supera la capacidad máxima"""
+    def quitar_caja(self, codigo: str):
+        """Descarga y devuelve la caja con ese código (None si no está)"""
+        with self.cerrojo:
+            if not self.manifiesto.contiene(codigo):
+                return None
+            caja = self.manifiesto.quitar(codigo)
+            self.capacidad_liberada.notify_all()
+            return caja
+    
+    # ===== Carga concurrente =====
+    
+    def reservar(self, peso_kg: float, timeout: Optional[float] = 0.0) -> Optional[Reserva]:
+        """Aparta capacidad para una caja de forma atómica.
+        
+        Si no hay sitio espera hasta `timeout` segundos (0 = no esperar,
+        None = sin límite) a que se libere. Devuelve la Reserva o None.
+        """
+        if not 0 <= peso_kg <= self.capacidad_kg:
+            return None
+        with self.capacidad_liberada:
+            if not self.capacidad_liberada.wait_for(lambda: self.puede_cargar(peso_kg), timeout):
+                return None
+            self.peso_reservado += peso_kg
+            return Reserva(self, peso_kg)
+    
+    async def reservar_async(self, peso_kg: float, timeout: Optional[float] = None) -> Optional[Reserva]:
+        """Como reservar(), pero la espera se hace en un hilo sin bloquear asyncio"""
+        futuro = asyncio.get_running_loop().run_in_executor(None, self.reservar, peso_kg, timeout)
+        try:
+            return await asyncio.shield(futuro)
+        except asyncio.CancelledError:
+            # Si la tarea se cancela, la reserva que llegue después se libera
+            futuro.add_done_callback(_cancelar_reserva_huerfana)
+            raise
+    
+    async def cargar_async(self, caja, timeout: Optional[float] = None) -> bool:
+        """Reserva capacidad y carga la caja; True si quedó cargada"""
+        reserva = await self.reservar_async(caja.peso_kg, timeout)
+        if reserva is None:
+            return False
+        with reserva:
+            return reserva.confirmar(caja)
+    
+    def add_caja(self, caja, eventos: Optional[Callable[[str], None]] = print) -> bool:
+        """Añade una caja si no supera la capacidad máxima.
+        
+        Devuelve True si la caja se cargó. Los mensajes se envían a
+        `eventos` (por defecto print); con None no se muestra nada.
+        Comprobar y cargar es atómico aunque varios hilos carguen a la vez.
+        """
+        with self.cerrojo:
+            return self._add_caja(caja, eventos)
+    
+    def _add_caja(self, caja, eventos: Optional[Callable[[str], None]]) -> bool:
         peso_actual = self.peso_total()
-        if peso_actual + caja.peso_kg <= self.capacidad_kg:
-            self.cajas.append(caja)
-            print(f"✓ Caja {caja.codigo} añadida al camión {self.matricula}")
-        else:
+        if self.manifiesto.contiene(caja.codigo):
+            if eventos:
+                eventos(f"⚠️ ERROR: La caja {caja.codigo} ya está cargada en el camión {self.matricula}")
+            return False
+        if self.puede_cargar(caja.peso_kg):
+            try:
+                self.manifiesto.agregar(caja)
+            except BodegaLlenaError:
+                if eventos:
+                    eventos(f"⚠️ ERROR: No se puede añadir la caja {caja.codigo}")
+                    eventos(f"   No cabe en la bodega del camión {self.matricula}")
+                return False
+            except CajaDuplicadaError as e:
+                if eventos:
+                    eventos(f"⚠️ ERROR: {e}")
+                return False
+            if eventos:
+                eventos(f"✓ Caja {caja.codigo} añadida al camión {self.matricula}")
+            return True
+        if eventos:
             peso_exceso = (peso_actual + caja.peso_kg) - self.capacidad_kg
-            print(f"⚠️ ERROR: No se puede añadir la caja {caja.codigo}")
-            print(f"   Excedería la capacidad en {peso_exceso:.2f} kg")
-            print(f"   Capacidad: {self.capacidad_kg} kg")
-            print(f"   Peso actual: {peso_actual:.2f} kg")
-            print(f"   Peso de la caja: {caja.peso_kg} kg")
+            eventos(f"⚠️ ERROR: No se puede añadir la caja {caja.codigo}")
+            eventos(f"   Excedería la capacidad en {peso_exceso:.2f} kg")
+            eventos(f"   Capacidad: {self.capacidad_kg} kg")
+            eventos(f"   Peso actual: {peso_actual:.2f} kg")
+            if self.peso_reservado:
+                eventos(f"   Peso reservado: {self.peso_reservado:.2f} kg")
+            eventos(f"   Peso de la caja: {caja.peso_kg} kg")
+        return False
+    
+    def add_cajas(self, cajas: Iterable, politica=PoliticaCarga.PRIMER_AJUSTE,
+                  eventos: Optional[Callable[[str], None]] = None) -> ResultadoCarga:
+        """Carga un lote de cajas comprobando la capacidad en una pasada.
+        
+        Con PRIMER_AJUSTE las cajas se cargan en orden mientras quepan; con
+        MEJOR_SUBCONJUNTO se elige el subconjunto que más peso aprovecha.
+        Por defecto no se imprime nada: `eventos` recibe un mensaje por caja.
+        El lote se carga de forma atómica respecto a otros hilos.
+        """
+        politica = PoliticaCarga(politica)
+        with self.cerrojo:
+            resultado = self._add_cajas(cajas, politica)
+        if eventos:
+            for caja in resultado.aceptadas:
+                eventos(f"✓ Caja {caja.codigo} añadida al camión {self.matricula}")
+            for rechazo in resultado.rechazadas:
+                eventos(f"⚠️ Caja {rechazo.caja.codigo} rechazada ({rechazo.motivo.value}): {rechazo.detalle}")
+        return resultado
+    
+    def _add_cajas(self, cajas: Iterable, politica: PoliticaCarga) -> ResultadoCarga:
+        resultado = ResultadoCarga()
+        candidatas = []
+        codigos_lote = set()
+        for caja in cajas:
+            if self.manifiesto.contiene(caja.codigo) or caja.codigo in codigos_lote:
+                resultado.rechazadas.append(Rechazo(caja, MotivoRechazo.DUPLICADA,
+                                                    f"Código {caja.codigo} repetido"))
+            elif not caja.peso_kg >= 0:
+                resultado.rechazadas.append(Rechazo(caja, MotivoRechazo.PESO_INVALIDO,
+                                                    f"Peso {caja.peso_kg} kg no válido"))
+            else:
+                codigos_lote.add(caja.codigo)
+                candidatas.append(caja)
+        
+        restante = self.capacidad_kg - self.peso_total() - self.peso_reservado
+        if politica is PoliticaCarga.MEJOR_SUBCONJUNTO:
+            elegidas = set(_mejor_subconjunto([caja.peso_kg for caja in candidatas], restante))
+        else:
+            elegidas = set()
+            for i, caja in enumerate(candidatas):
+                if caja.peso_kg <= restante:
+                    elegidas.add(i)
+                    restante -= caja.peso_kg
+        
+        for i, caja in enumerate(candidatas):
+            if i in elegidas:
+                try:
+                    self.manifiesto.agregar(caja)
+                except BodegaLlenaError:
+                    resultado.rechazadas.append(Rechazo(caja, MotivoRechazo.VOLUMEN,
+                                                        "No cabe en la bodega"))
+                    continue
+                except CajaDuplicadaError as e:
+                    resultado.rechazadas.append(Rechazo(caja, MotivoRechazo.DUPLICADA, str(e)))
+                    continue
+                resultado.aceptadas.append(caja)
+            else:
+                resultado.rechazadas.append(Rechazo(caja, MotivoRechazo.CAPACIDAD,
+                                                    f"Supera la capacidad de {self.capacidad_kg} kg"))
+        return resultado
     
     def setVelocidad(self, nueva_velocidad: int):
         """Establece una nueva velocidad"""
@@ -80,31 +637,94 @@ class Camion:
         """Toca el claxón del camión"""
         print(f"🔊 {self.matricula}: ¡¡¡PIIIIIII!!!")
     
-    def __str__(self) -> str:
-        """Representación completa del camión"""
+    def lineas_informe(self, limite: Optional[int] = None) -> Iterator[str]:
+        """Genera el informe en texto por fragmentos, sin construirlo entero.
+        
+        Con `limite` solo se detallan las primeras cajas y el resto se
+        resume en una línea.
+        """
         peso_total = self.peso_total()
         porcentaje_carga = (peso_total / self.capacidad_kg) * 100 if self.capacidad_kg > 0 else 0
         
-        info = f"\n{'='*50}\n"
-        info += f"🚛 CAMIÓN {self.matricula}\n"
-        info += f"{'='*50}\n"
-        info += f"Conductor: {self.conductor}\n"
-        info += f"Descripción de carga: {self.descripcion_carga}\n"
-        info += f"Rumbo: {self.rumbo}° | Velocidad: {self.velocidad} km/h\n"
-        info += f"Capacidad máxima: {self.capacidad_kg} kg\n"
-        info += f"Peso total cargado: {peso_total:.2f} kg ({porcentaje_carga:.1f}%)\n"
-        info += f"Número de cajas: {len(self.cajas)}\n"
+        yield f"\n{'='*50}\n"
+        yield f"🚛 CAMIÓN {self.matricula}\n"
+        yield f"{'='*50}\n"
+        yield f"Conductor: {self.conductor}\n"
+        yield f"Descripción de carga: {self.descripcion_carga}\n"
+        yield f"Rumbo: {self.rumbo}° | Velocidad: {self.velocidad} km/h\n"
+        yield f"Capacidad máxima: {self.capacidad_kg} kg\n"
+        yield f"Peso total cargado: {peso_total:.2f} kg ({porcentaje_carga:.1f}%)\n"
+        yield f"Número de cajas: {len(self.cajas)}\n"
+        if self.manifiesto.empaquetador is not None:
+            yield f"Ocupación de bodega: {self.manifiesto.empaquetador.ocupacion() * 100:.1f}%\n"
         
         if self.cajas:
-            info += f"\n📦 CAJAS CARGADAS:\n"
-            info += f"{'-'*30}\n"
-            for i, caja in enumerate(self.cajas, 1):
-                info += f"{i}. {caja}\n\n"
+            yield f"\n📦 CAJAS CARGADAS:\n"
+            yield f"{'-'*30}\n"
+            peso_mostrado = 0.0
+            mostradas = 0
+            for i, caja in enumerate(islice(self.manifiesto.valores(), limite), 1):
+                peso_mostrado += caja.peso_kg
+                mostradas = i
+                yield f"{i}. {caja}\n\n"
+            restantes = len(self.cajas) - mostradas
+            if restantes > 0:
+                yield f"... y {restantes} cajas más ({peso_total - peso_mostrado:.2f} kg)\n\n"
         else:
-            info += "\n📦 No hay cajas cargadas\n"
+            yield "\n📦 No hay cajas cargadas\n"
         
-        info += f"{'='*50}\n"
-        return info
+        yield f"{'='*50}\n"
+    
+    def escribir_informe(self, destino: TextIO, formato=FormatoInforme.TEXTO,
+                         limite: Optional[int] = None):
+        """Escribe el informe en cualquier objeto con write() (fichero, StringIO...)"""
+        formato = FormatoInforme(formato)
+        if formato is FormatoInforme.TEXTO:
+            for fragmento in self.lineas_informe(limite):
+                destino.write(fragmento)
+        elif formato is FormatoInforme.CSV:
+            escritor = csv.writer(destino)
+            escritor.writerow(CAMPOS_CSV)
+            for caja in islice(self.manifiesto.valores(), limite):
+                escritor.writerow([self.matricula, caja.codigo, caja.peso_kg, caja.descripcion_carga,
+                                   caja.largo, caja.ancho, caja.altura, caja.volumen()])
+        else:
+            # JSON escrito por partes para no tener todas las cajas en memoria
+            cabecera = {
+                "matricula": self.matricula,
+                "conductor": self.conductor,
+                "descripcion_carga": self.descripcion_carga,
+                "rumbo": self.rumbo,
+                "velocidad": self.velocidad,
+                "capacidad_kg": self.capacidad_kg,
+                "peso_total_kg": self.peso_total(),
+                "numero_cajas": len(self.cajas),
+            }
+            destino.write(json.dumps(cabecera, ensure_ascii=False)[:-1] + ', "cajas": [')
+            mostradas = 0
+            for caja in islice(self.manifiesto.valores(), limite):
+                if mostradas:
+                    destino.write(", ")
+                destino.write(json.dumps({
+                    "codigo": caja.codigo,
+                    "peso_kg": caja.peso_kg,
+                    "descripcion_carga": caja.descripcion_carga,
+                    "largo": caja.largo,
+                    "ancho": caja.ancho,
+                    "altura": caja.altura,
+                }, ensure_ascii=False))
+                mostradas += 1
+            destino.write(f'], "cajas_omitidas": {len(self.cajas) - mostradas}}}')
+    
+    def informe(self, formato=FormatoInforme.TEXTO, limite: Optional[int] = None) -> str:
+        """Devuelve el informe como cadena"""
+        destino = StringIO()
+        self.escribir_informe(destino, formato, limite)
+        return destino.getvalue()
+    
+    def __str__(self) -> str:
+        """Representación completa del camión"""
+        return "".join(self.lineas_informe())
 
 
 def main():
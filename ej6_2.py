@@ -19,18 +19,29 @@ Controles:
 - SPACE: Freno de mano/Claxón
 - Clic: Seleccionar camión
 - R: Recoger/Entregar paquetes
+- F3: Perfilador de frames
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import math
-import random
-from typing import List, Optional, Tuple, Dict
-from dataclasses import dataclass
-from enum import Enum
+import time
+from typing import Optional
 
 # Importar las clases del ejercicio 1
-from ej6_1 import Caja, Camion
+from ej6_1 import Camion
+from escena_canvas import EscenaCanvas
+from ingesta import cargar_camiones
+from panel_incremental import LineasTexto, ListaIncremental, ListaVirtual, TextosEtiquetas
+from perfilador import PerfiladorFrames
+from planificador_frames import PlanificadorFrames
+# Mapa, física y recogida/entrega viven en el núcleo sin interfaz
+from fisica_flota import FRECUENCIA_BASE
+from colisiones import CABINA, REMOLQUE
+from despacho import PRESUPUESTO_FRAME
+from simulacion import (BODEGA_ESTANDAR, Package, PackageState, Point,
+                        SimulacionNucleo)
+from sintesis_audio import SONIDOS, cargar_en_segundo_plano
 
 try:
     import pygame
@@ -41,287 +52,60 @@ except ImportError:
     print("⚠️ Pygame no disponible. Instala con: pip install pygame")
     SOUND_AVAILABLE = False
 
-# Nuevas clases para el sistema mejorado
-@dataclass
-class Point:
-    """Representa un punto en el mapa"""
-    x: float
-    y: float
+# Cajas que se detallan como máximo en los informes de la interfaz
+MAX_CAJAS_DETALLE = 50
+# Filas visibles de la lista de carga (solo se formatean esas)
+FILAS_CARGA = 8
 
-@dataclass
-class RoadSegment:
-    """Representa un segmento de carretera"""
-    start: Point
-    end: Point
-    width: float = 40
-    lanes: int = 2
+# Sonido de sintesis_audio -> atributo del simulador que lo guarda
+SONIDOS_SIMULADOR = {
+    "claxon": "claxon_sound",
+    "recogida": "pickup_sound",
+    "entrega": "delivery_sound",
+    "motor": "engine_sound",
+    "marcha_atras": "reverse_sound",
+}
 
-class PackageState(Enum):
-    """Estado de un paquete"""
-    WAREHOUSE = "warehouse"
-    IN_TRANSIT = "in_transit"
-    DELIVERED = "delivered"
+# Dibujo de los camiones: medidas (px) de cabina y remolque (las mismas con las que
+# chocan) y posición de las ruedas
+CAB_LENGTH, CAB_WIDTH, CAB_OFFSET = CABINA
+TRAILER_LENGTH, TRAILER_WIDTH, TRAILER_OFFSET = REMOLQUE
+WHEEL_POSITIONS = [
+    (10, 8), (10, -8),    # Ruedas delanteras
+    (-15, 10), (-15, -10), # Ruedas traseras delanteras
+    (-30, 10), (-30, -10)  # Ruedas traseras traseras
+]
 
-@dataclass
-class Package:
-    """Representa un paquete para entregar"""
-    id: str
-    pickup_point: Point
-    delivery_point: Point
-    weight: float
-    state: PackageState = PackageState.WAREHOUSE
-    assigned_truck: Optional[str] = None
 
-@dataclass
-class Building:
-    """Representa un edificio (almacén o punto de entrega)"""
-    position: Point
-    size: Tuple[float, float]
-    type: str  # "warehouse", "delivery"
-    name: str
-    color: str
-
-class TruckPhysics:
-    """Maneja la física realista de los camiones"""
-    
-    def __init__(self, position: Point, heading: float = 0):
-        self.position = position
-        self.heading = heading  # En grados
-        self.velocity = 0.0
-        self.max_speed = 3.0
-        self.acceleration = 0.1
-        self.deceleration = 0.15
-        self.turn_rate = 2.0  # Grados por frame
-        self.friction = 0.95
-        
-    def update(self, controls: Dict[str, bool]):
-        """Actualiza la física basada en los controles"""
-        # Acelerar/Frenar
-        if controls.get('forward', False):
-            self.velocity = min(self.max_speed, self.velocity + self.acceleration)
-        elif controls.get('backward', False):
-            self.velocity = max(-self.max_speed * 0.5, self.velocity - self.deceleration)
-        else:
-            # Fricción
-            if abs(self.velocity) < 0.01:
-                self.velocity = 0
-            else:
-                self.velocity *= self.friction
-        
-        # Girar (solo si se está moviendo)
-        if abs(self.velocity) > 0.1:
-            turn_factor = abs(self.velocity) / self.max_speed
-            if controls.get('left', False):
-                self.heading -= self.turn_rate * turn_factor
-            elif controls.get('right', False):
-                self.heading += self.turn_rate * turn_factor
-        
-        # Mantener heading entre 0-360
-        self.heading = self.heading % 360
-        
-        # Actualizar posición
-        if abs(self.velocity) > 0.01:
-            angle_rad = math.radians(self.heading - 90)  # -90 para que 0° sea arriba
-            self.position.x += self.velocity * math.cos(angle_rad)
-            self.position.y += self.velocity * math.sin(angle_rad)
-
-class RoadSystem:
-    """Sistema de carreteras mejorado"""
-    
-    def __init__(self, canvas_width: int, canvas_height: int):
-        self.canvas_width = canvas_width
-        self.canvas_height = canvas_height
-        self.roads = []
-        self.intersections = []
-        self.buildings = []
-        self.packages = []
-        self._create_road_network()
-        self._create_buildings()
-        self._create_packages()
-    
-    def _create_road_network(self):
-        """Crea una red de carreteras realista"""
-        margin = 50
-        
-        # Carretera principal horizontal
-        self.roads.append(RoadSegment(
-            Point(margin, self.canvas_height // 2),
-            Point(self.canvas_width - margin, self.canvas_height // 2),
-            width=50
-        ))
-        
-        # Carretera principal vertical
-        self.roads.append(RoadSegment(
-            Point(self.canvas_width // 2, margin),
-            Point(self.canvas_width // 2, self.canvas_height - margin),
-            width=50
-        ))
-        
-        # Carreteras secundarias
-        quarter_h = self.canvas_height // 4
-        quarter_w = self.canvas_width // 4
-        
-        # Horizontales secundarias
-        self.roads.append(RoadSegment(
-            Point(margin, quarter_h),
-            Point(self.canvas_width - margin, quarter_h),
-            width=35
-        ))
-        
-        self.roads.append(RoadSegment(
-            Point(margin, quarter_h * 3),
-            Point(self.canvas_width - margin, quarter_h * 3),
-            width=35
-        ))
-        
-        # Verticales secundarias
-        self.roads.append(RoadSegment(
-            Point(quarter_w, margin),
-            Point(quarter_w, self.canvas_height - margin),
-            width=35
-        ))
-        
-        self.roads.append(RoadSegment(
-            Point(quarter_w * 3, margin),
-            Point(quarter_w * 3, self.canvas_height - margin),
-            width=35
-        ))
-        
-        # Carretera curva (simulada con segmentos)
-        center_x, center_y = self.canvas_width * 0.75, self.canvas_height * 0.25
-        radius = 60
-        for i in range(8):
-            angle1 = (i / 8) * math.pi
-            angle2 = ((i + 1) / 8) * math.pi
-            
-            x1 = center_x + radius * math.cos(angle1)
-            y1 = center_y + radius * math.sin(angle1)
-            x2 = center_x + radius * math.cos(angle2)
-            y2 = center_y + radius * math.sin(angle2)
-            
-            self.roads.append(RoadSegment(
-                Point(x1, y1),
-                Point(x2, y2),
-                width=30
-            ))
-    
-    def _create_buildings(self):
-        """Crea almacenes y puntos de entrega"""
-        # Almacenes (color azul)
-        self.buildings.extend([
-            Building(Point(80, 80), (60, 40), "warehouse", "Almacén Central", "#3498db"),
-            Building(Point(720, 80), (50, 35), "warehouse", "Almacén Norte", "#3498db"),
-            Building(Point(80, 520), (55, 40), "warehouse", "Almacén Sur", "#3498db"),
-        ])
-        
-        # Puntos de entrega (color verde)
-        self.buildings.extend([
-            Building(Point(720, 520), (40, 30), "delivery", "Tienda 1", "#2ecc71"),
-            Building(Point(400, 120), (35, 30), "delivery", "Oficina A", "#2ecc71"),
-            Building(Point(600, 450), (40, 35), "delivery", "Tienda 2", "#2ecc71"),
-            Building(Point(200, 450), (45, 30), "delivery", "Centro Comercial", "#2ecc71"),
-        ])
-    
-    def _create_packages(self):
-        """Crea paquetes para entregar"""
-        for i in range(10):
-            warehouse = random.choice([b for b in self.buildings if b.type == "warehouse"])
-            delivery = random.choice([b for b in self.buildings if b.type == "delivery"])
-            
-            package = Package(
-                id=f"PKG{i+1:03d}",
-                pickup_point=warehouse.position,
-                delivery_point=delivery.position,
-                weight=random.uniform(10, 100)
-            )
-            self.packages.append(package)
-    
-    def draw_roads(self, canvas):
-        """Dibuja las carreteras en el canvas"""
-        canvas.delete("road")
-        
-        # Fondo verde (césped)
-        canvas.create_rectangle(0, 0, self.canvas_width, self.canvas_height, 
-                              fill="#27ae60", tags="road")
-        
-        # Dibujar carreteras
-        for road in self.roads:
-            # Asfalto
-            canvas.create_line(
-                road.start.x, road.start.y,
-                road.end.x, road.end.y,
-                width=road.width, fill="#34495e", tags="road",
-                capstyle=tk.ROUND, joinstyle=tk.ROUND
-            )
-            
-            # Líneas centrales (discontinuas)
-            if road.width > 35:
-                segments = 10
-                for i in range(segments):
-                    if i % 2 == 0:  # Línea discontinua
-                        start_ratio = i / segments
-                        end_ratio = (i + 0.5) / segments
-                        
-                        line_start_x = road.start.x + (road.end.x - road.start.x) * start_ratio
-                        line_start_y = road.start.y + (road.end.y - road.start.y) * start_ratio
-                        line_end_x = road.start.x + (road.end.x - road.start.x) * end_ratio
-                        line_end_y = road.start.y + (road.end.y - road.start.y) * end_ratio
-                        
-                        canvas.create_line(
-                            line_start_x, line_start_y,
-                            line_end_x, line_end_y,
-                            width=3, fill="#f1c40f", tags="road"
-                        )
-        
-        # Dibujar edificios
-        for building in self.buildings:
-            x, y = building.position.x, building.position.y
-            w, h = building.size
-            
-            # Edificio
-            canvas.create_rectangle(
-                x - w//2, y - h//2,
-                x + w//2, y + h//2,
-                fill=building.color, outline="#2c3e50", width=2, tags="road"
-            )
-            
-            # Icono según tipo
-            icon = "🏭" if building.type == "warehouse" else "🏪"
-            canvas.create_text(x, y - 5, text=icon, font=('Arial', 16), tags="road")
-            
-            # Nombre
-            canvas.create_text(x, y + h//2 + 15, text=building.name, 
-                             font=('Arial', 8), fill="#2c3e50", tags="road")
-
-class AdvancedTruckSimulator:
+class AdvancedTruckSimulator(SimulacionNucleo):
     """Simulador avanzado de camiones con carreteras y física realista"""
     
-    def __init__(self):
+    def __init__(self, hz_fisica: float = FRECUENCIA_BASE, hz_render: float = 20.0,
+                 hz_panel: float = 5.0, semilla=None):
         self.root = tk.Tk()
         self.root.title("🚛 Simulador Avanzado de Camiones - Con Carreteras")
         self.root.geometry("1400x900")
         self.root.configure(bg='#2c3e50')
         
-        # Variables del simulador
-        self.camiones: List[Camion] = []
-        self.truck_physics: Dict[str, TruckPhysics] = {}
-        self.camion_activo: Optional[Camion] = None
+        # Flota, física, carreteras y controles (núcleo sin interfaz)
+        # En la interfaz los camiones chocan entre sí (el que se conduce a mano, también)
+        SimulacionNucleo.__init__(self, canvas_width=800, canvas_height=600,
+                                  hz_fisica=hz_fisica, semilla=semilla, colisiones=True)
         self.running = False
-        self.canvas_width = 800
-        self.canvas_height = 600
-        
-        # Sistema de carreteras
-        self.road_system = RoadSystem(self.canvas_width, self.canvas_height)
+        # La física avanza en pasos fijos; el dibujo va a hz_render y los paneles
+        # a hz_panel (solo si cambian), bajando primero los paneles si no da tiempo
+        self.planificador = PlanificadorFrames(hz_render, hz_panel)
+        self._ultimo_frame = time.perf_counter()
+        self._cargas_cambiadas = set()  # Matrículas cuyo manifiesto cambió
+        self._panel_activo = None  # Camión activo en el último refresco
+        # Los camiones que no se conducen a mano se reparten los paquetes (despacho)
+        self._flota_pilotada = None  # (camión activo, nº de camiones) al repartir pilotos
+        # Tiempo de cada fase del frame (desactivado hasta pulsar F3)
+        self.perfilador = PerfiladorFrames()
+        self.perfil_items = None  # (fondo, texto) del overlay del perfilador
         
         # Controles de teclado
         self.keys_pressed = set()
-        self.controls = {
-            'forward': False,
-            'backward': False,
-            'left': False,
-            'right': False,
-            'brake': False
-        }
         
         # Crear interfaz
         self.create_widgets()
@@ -354,6 +138,11 @@ class AdvancedTruckSimulator:
                                bg='#27ae60', relief=tk.SUNKEN, borderwidth=2)
         self.canvas.pack()
         self.canvas.focus_set()  # Para recibir eventos de teclado
+        # Escena retenida: los elementos se crean una vez y luego se mueven
+        self.escena = EscenaCanvas(self.canvas)
+        self.truck_sprites = {}  # matrícula -> ids de sus elementos
+        self.package_sprites = {}  # id de paquete -> (estado dibujado, ids)
+        self._paquetes_dibujados = 0  # Posición en el diario de cambios del registro
         
         # Panel derecho - Información
         right_panel = ttk.Frame(self.root, width=250)
@@ -383,6 +172,7 @@ class AdvancedTruckSimulator:
 • D/→ : Girar derecha
 • SPACE : Claxón/Freno
 • R : Recoger/Entregar
+• F3 : Perfilador
 
 🖱️ CONTROLES DE RATÓN:
 • Clic izq: Seleccionar camión
@@ -407,6 +197,15 @@ class AdvancedTruckSimulator:
         self.cargo_label = ttk.Label(status_frame, text="Carga: 0 kg", font=('Arial', 10))
         self.cargo_label.pack(anchor=tk.W)
         
+        self.render_label = ttk.Label(status_frame, text="Elementos creados/frame: 0", font=('Arial', 8))
+        self.render_label.pack(anchor=tk.W)
+        
+        self.dispatch_label = ttk.Label(status_frame, text="Despacho: inactivo", font=('Arial', 8))
+        self.dispatch_label.pack(anchor=tk.W)
+        
+        self.frames_label = ttk.Label(status_frame, text="Frames: 0 FPS", font=('Arial', 8))
+        self.frames_label.pack(anchor=tk.W)
+        
         # Botones de acción
         action_frame = ttk.Frame(parent)
         action_frame.pack(fill=tk.X, pady=(10, 0))
@@ -414,11 +213,25 @@ class AdvancedTruckSimulator:
         ttk.Button(action_frame, text="🚛 Nuevo Camión", 
                   command=self.create_new_truck).pack(fill=tk.X, pady=2)
         
+        ttk.Button(action_frame, text="📥 Importar Flota", 
+                  command=self.import_fleet).pack(fill=tk.X, pady=2)
+        
         ttk.Button(action_frame, text="📦 Nueva Misión", 
                   command=self.create_new_mission).pack(fill=tk.X, pady=2)
         
         ttk.Button(action_frame, text="🔊 Claxón", 
                   command=self.play_claxon).pack(fill=tk.X, pady=2)
+        
+        self.autopilot_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(action_frame, text="🤖 Autopiloto (resto de la flota)",
+                        variable=self.autopilot_var, command=self.sync_autopilot).pack(anchor=tk.W, pady=2)
+        
+        self.profiler_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(action_frame, text="⏱️ Perfilador de frames (F3)",
+                        variable=self.profiler_var, command=self.sync_profiler).pack(anchor=tk.W, pady=2)
+        
+        ttk.Button(action_frame, text="💾 Exportar Traza", 
+                  command=self.export_trace).pack(fill=tk.X, pady=2)
     
     def create_right_panel(self, parent):
         """Crea el panel derecho con información detallada"""
@@ -429,6 +242,17 @@ class AdvancedTruckSimulator:
         self.truck_info_text = tk.Text(truck_info_frame, height=8, width=30, 
                                      font=('Consolas', 9), wrap=tk.WORD, state=tk.DISABLED)
         self.truck_info_text.pack(fill=tk.BOTH, expand=True)
+        self.truck_info = LineasTexto(self.truck_info_text)
+        
+        # Cajas del camión activo (lista virtual: solo se formatean las visibles)
+        cargo_frame = ttk.LabelFrame(parent, text="📦 Cajas Cargadas", padding=10)
+        cargo_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        cargo_scrollbar = ttk.Scrollbar(cargo_frame, orient=tk.VERTICAL)
+        cargo_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        cargo_listbox = tk.Listbox(cargo_frame, height=FILAS_CARGA, font=('Consolas', 8))
+        cargo_listbox.pack(fill=tk.X)
+        self.cargo_list = ListaVirtual(cargo_listbox, FILAS_CARGA, cargo_scrollbar)
         
         # Lista de camiones
         trucks_frame = ttk.LabelFrame(parent, text="🚚 Flota de Camiones", padding=10)
@@ -436,6 +260,7 @@ class AdvancedTruckSimulator:
         
         self.trucks_listbox = tk.Listbox(trucks_frame, height=4, font=('Arial', 9))
         self.trucks_listbox.pack(fill=tk.X)
+        self.trucks_list = ListaIncremental(self.trucks_listbox)
         self.trucks_listbox.bind("<<ListboxSelect>>", self.on_truck_select)
         
         # Misiones de entrega
@@ -444,6 +269,9 @@ class AdvancedTruckSimulator:
         
         self.missions_listbox = tk.Listbox(missions_frame, height=6, font=('Consolas', 8))
         self.missions_listbox.pack(fill=tk.BOTH, expand=True)
+        self.missions_list = ListaIncremental(self.missions_listbox)
+        self._misiones_en_transito = []
+        self.labels = TextosEtiquetas()
     
     def setup_keyboard_controls(self):
         """Configura los controles de teclado"""
@@ -469,6 +297,9 @@ class AdvancedTruckSimulator:
             self.handle_pickup_delivery()
         elif key == 'space':
             self.play_claxon()
+        elif key == 'f3':
+            self.profiler_var.set(not self.profiler_var.get())
+            self.sync_profiler()
     
     def on_key_release(self, event):
         """Maneja las teclas liberadas"""
@@ -484,30 +315,33 @@ class AdvancedTruckSimulator:
     
     def create_sample_trucks(self):
         """Crea camiones de ejemplo"""
-        # Camión 1
-        camion1 = Camion("TRK001", "Carlos Rodríguez", 8000.0, "Reparto urbano", 90, 0)
-        physics1 = TruckPhysics(Point(400, 300), 0)
-        self.truck_physics[camion1.matricula] = physics1
-        
-        # Camión 2  
-        camion2 = Camion("TRK002", "Ana López", 6000.0, "Entregas rápidas", 180, 0)
-        physics2 = TruckPhysics(Point(200, 150), 90)
-        self.truck_physics[camion2.matricula] = physics2
-        
-        self.camiones = [camion1, camion2]
-        self.camion_activo = camion1
-        
+        super().create_sample_trucks()
         self.update_truck_list()
         self.update_missions_list()
     
+    def add_truck(self, camion: Camion, position: Optional[Point] = None,
+                  heading: Optional[float] = None):
+        """Añade un camión y vigila su manifiesto para refrescar los paneles"""
+        super().add_truck(camion, position, heading)
+        
+        def observador(evento, caja, matricula=camion.matricula):
+            if evento in ("alta", "baja"):
+                self._cargas_cambiadas.add(matricula)
+        
+        camion.observadores.append(observador)
+    
     def draw_truck(self, canvas, camion: Camion):
-        """Dibuja un camión realista"""
+        """Dibuja un camión realista (crea sus elementos la primera vez y luego los mueve)"""
         if camion.matricula not in self.truck_physics:
             return
             
         physics = self.truck_physics[camion.matricula]
-        x, y = physics.position.x, physics.position.y
-        heading = physics.heading
+        # Posición entre los dos últimos pasos de física para un movimiento suave
+        x, y, heading = physics.interpolada(self.reloj.alfa)
+        
+        sprite = self.truck_sprites.get(camion.matricula)
+        if sprite is None:
+            sprite = self._create_truck_sprite(canvas, camion)
         
         # Color según si está activo
         if camion == self.camion_activo:
@@ -516,59 +350,59 @@ class AdvancedTruckSimulator:
         else:
             cab_color = "#3498db"
             trailer_color = "#2980b9"
+        canvas.configurar(sprite["cab"], fill=cab_color)
+        canvas.configurar(sprite["trailer"], fill=trailer_color)
         
         # Calcular puntos del camión rotado
         angle_rad = math.radians(heading - 90)
         cos_a, sin_a = math.cos(angle_rad), math.sin(angle_rad)
         
-        # Dimensiones del camión
-        cab_length, cab_width = 25, 12
-        trailer_length, trailer_width = 35, 15
-        
-        # Cabina (parte delantera)
-        cab_points = self._rotate_rectangle(x, y, cab_length, cab_width, cos_a, sin_a, offset_x=15)
-        canvas.create_polygon(cab_points, fill=cab_color, outline="#2c3e50", width=2, tags="truck")
-        
-        # Remolque (parte trasera)
-        trailer_points = self._rotate_rectangle(x, y, trailer_length, trailer_width, cos_a, sin_a, offset_x=-20)
-        canvas.create_polygon(trailer_points, fill=trailer_color, outline="#2c3e50", width=2, tags="truck")
+        # Cabina (parte delantera) y remolque (parte trasera)
+        canvas.mover(sprite["cab"], *self._rotate_rectangle(x, y, CAB_LENGTH, CAB_WIDTH, cos_a, sin_a,
+                                                            offset_x=CAB_OFFSET))
+        canvas.mover(sprite["trailer"], *self._rotate_rectangle(x, y, TRAILER_LENGTH, TRAILER_WIDTH,
+                                                                cos_a, sin_a, offset_x=TRAILER_OFFSET))
         
         # Ruedas
-        wheel_positions = [
-            (10, 8), (10, -8),    # Ruedas delanteras
-            (-15, 10), (-15, -10), # Ruedas traseras delanteras  
-            (-30, 10), (-30, -10)  # Ruedas traseras traseras
-        ]
-        
-        for wheel_x, wheel_y in wheel_positions:
+        for wheel, (wheel_x, wheel_y) in zip(sprite["wheels"], WHEEL_POSITIONS):
             # Rotar posición de la rueda
             rot_x = x + wheel_x * cos_a - wheel_y * sin_a
             rot_y = y + wheel_x * sin_a + wheel_y * cos_a
-            
-            canvas.create_oval(rot_x - 3, rot_y - 3, rot_x + 3, rot_y + 3,
-                             fill="#2c3e50", outline="#34495e", tags="truck")
+            canvas.mover(wheel, rot_x - 3, rot_y - 3, rot_x + 3, rot_y + 3)
         
         # Dirección (flecha en la cabina)
-        arrow_x = x + 20 * cos_a
-        arrow_y = y + 20 * sin_a
-        canvas.create_line(x, y, arrow_x, arrow_y,
-                         fill="#f1c40f", width=3, arrow=tk.LAST,
-                         arrowshape=(10, 15, 5), tags="truck")
+        canvas.mover(sprite["arrow"], x, y, x + 20 * cos_a, y + 20 * sin_a)
         
         # Etiqueta
-        canvas.create_text(x, y - 30, text=camion.matricula, 
-                         fill="#2c3e50", font=('Arial', 10, 'bold'), tags="truck")
+        canvas.mover(sprite["label"], x, y - 30)
         
         # Velocidad
         speed_kmh = abs(physics.velocity) * 20  # Conversión a km/h visual
-        canvas.create_text(x, y + 35, text=f"{speed_kmh:.0f} km/h", 
-                         fill="#7f8c8d", font=('Arial', 8), tags="truck")
+        canvas.mover(sprite["speed"], x, y + 35)
+        canvas.configurar(sprite["speed"], text=f"{speed_kmh:.0f} km/h")
         
         # Indicador de carga
         peso_actual = camion.peso_total()
-        if peso_actual > 0:
-            canvas.create_text(x + 25, y - 10, text=f"{peso_actual:.0f}kg", 
-                             fill="#e67e22", font=('Arial', 8, 'bold'), tags="truck")
+        canvas.mover(sprite["cargo"], x + 25, y - 10)
+        canvas.configurar(sprite["cargo"], text=f"{peso_actual:.0f}kg" if peso_actual > 0 else "")
+    
+    def _create_truck_sprite(self, canvas, camion: Camion) -> dict:
+        """Crea los elementos de un camión; draw_truck los coloca en cada frame"""
+        sprite = {
+            "cab": canvas.create_polygon(0, 0, 0, 0, 0, 0, outline="#2c3e50", width=2, tags="truck"),
+            "trailer": canvas.create_polygon(0, 0, 0, 0, 0, 0, outline="#2c3e50", width=2, tags="truck"),
+            "wheels": [canvas.create_oval(0, 0, 0, 0, fill="#2c3e50", outline="#34495e", tags="truck")
+                       for _ in WHEEL_POSITIONS],
+            "arrow": canvas.create_line(0, 0, 0, 0, fill="#f1c40f", width=3, arrow=tk.LAST,
+                                        arrowshape=(10, 15, 5), tags="truck"),
+            "label": canvas.create_text(0, 0, text=camion.matricula,
+                                        fill="#2c3e50", font=('Arial', 10, 'bold'), tags="truck"),
+            "speed": canvas.create_text(0, 0, text="", fill="#7f8c8d", font=('Arial', 8), tags="truck"),
+            "cargo": canvas.create_text(0, 0, text="", fill="#e67e22", font=('Arial', 8, 'bold'),
+                                        tags="truck"),
+        }
+        self.truck_sprites[camion.matricula] = sprite
+        return sprite
     
     def _rotate_rectangle(self, cx, cy, length, width, cos_a, sin_a, offset_x=0, offset_y=0):
         """Rota un rectángulo alrededor de un punto central"""
@@ -590,114 +424,42 @@ class AdvancedTruckSimulator:
         
         return rotated_points
     
-    def update_physics(self):
-        """Actualiza la física de todos los camiones"""
-        for camion in self.camiones:
-            if camion.matricula in self.truck_physics:
-                physics = self.truck_physics[camion.matricula]
-                
-                # Aplicar controles solo al camión activo
-                if camion == self.camion_activo:
-                    physics.update(self.controls)
-                    
-                    # Mantener en carreteras (opcional)
-                    self._keep_on_road(physics)
-                    
-                    # Actualizar velocidad del camión (para compatibilidad)
-                    camion.velocidad = int(abs(physics.velocity) * 20)  # Conversión visual
-                    camion.rumbo = int(physics.heading)
-    
-    def _keep_on_road(self, physics: TruckPhysics):
-        """Mantiene el camión cerca de las carreteras"""
-        current_pos = physics.position
-        
-        # Verificar límites del canvas
-        margin = 30
-        if current_pos.x < margin:
-            current_pos.x = margin
-            physics.velocity *= -0.5
-        elif current_pos.x > self.canvas_width - margin:
-            current_pos.x = self.canvas_width - margin  
-            physics.velocity *= -0.5
-            
-        if current_pos.y < margin:
-            current_pos.y = margin
-            physics.velocity *= -0.5
-        elif current_pos.y > self.canvas_height - margin:
-            current_pos.y = self.canvas_height - margin
-            physics.velocity *= -0.5
-    
     def draw_packages(self, canvas):
-        """Dibuja los paquetes en el mapa"""
-        for package in self.road_system.packages:
+        """Dibuja los paquetes en el mapa (solo recrea los que cambiaron de estado)"""
+        self._paquetes_dibujados, cambiados = self.road_system.packages.cambios_desde(self._paquetes_dibujados)
+        for package in cambiados:
+            dibujado = self.package_sprites.get(package.id)
+            if dibujado is not None and dibujado[0] == package.state:
+                continue
+            if dibujado is not None:
+                canvas.borrar(*dibujado[1])
+            
+            items = ()
             if package.state == PackageState.WAREHOUSE:
                 # Paquete en almacén
                 x, y = package.pickup_point.x, package.pickup_point.y
-                canvas.create_rectangle(x-8, y-8, x+8, y+8, 
-                                      fill="#f39c12", outline="#e67e22", width=2, tags="package")
-                canvas.create_text(x, y, text="📦", font=('Arial', 12), tags="package")
+                items = (canvas.create_rectangle(x-8, y-8, x+8, y+8, 
+                                                 fill="#f39c12", outline="#e67e22", width=2, tags="package"),
+                         canvas.create_text(x, y, text="📦", font=('Arial', 12), tags="package"))
             elif package.state == PackageState.DELIVERED:
                 # Paquete entregado
                 x, y = package.delivery_point.x, package.delivery_point.y
-                canvas.create_oval(x-6, y-6, x+6, y+6, 
-                                 fill="#2ecc71", outline="#27ae60", width=2, tags="package")
-                canvas.create_text(x, y, text="✓", font=('Arial', 10, 'bold'), 
-                                  fill="white", tags="package")
-    
-    def handle_pickup_delivery(self):
-        """Maneja la recogida y entrega de paquetes"""
-        if not self.camion_activo or self.camion_activo.matricula not in self.truck_physics:
-            return
-            
-        physics = self.truck_physics[self.camion_activo.matricula]
-        truck_pos = physics.position
-        
-        # Buscar paquetes cercanos para recoger
-        for package in self.road_system.packages:
-            if package.state == PackageState.WAREHOUSE:
-                distance = math.sqrt((truck_pos.x - package.pickup_point.x)**2 + 
-                                   (truck_pos.y - package.pickup_point.y)**2)
-                
-                if distance < 50:  # Radio de recogida
-                    # Crear caja correspondiente
-                    nueva_caja = Caja(
-                        package.id,
-                        package.weight,
-                        f"Entrega para {package.delivery_point.x:.0f},{package.delivery_point.y:.0f}",
-                        50, 40, 30
-                    )
-                    
-                    # Intentar añadir al camión
-                    peso_antes = self.camion_activo.peso_total()
-                    self.camion_activo.add_caja(nueva_caja)
-                    peso_despues = self.camion_activo.peso_total()
-                    
-                    if peso_despues > peso_antes:
-                        package.state = PackageState.IN_TRANSIT
-                        package.assigned_truck = self.camion_activo.matricula
-                        self.play_pickup_sound()
-                        print(f"📦 Paquete {package.id} recogido por {self.camion_activo.matricula}")
-                        self.update_missions_list()
-                        return
-        
-        # Buscar paquetes para entregar
-        for package in self.road_system.packages:
-            if (package.state == PackageState.IN_TRANSIT and 
-                package.assigned_truck == self.camion_activo.matricula):
-                
-                distance = math.sqrt((truck_pos.x - package.delivery_point.x)**2 + 
-                                   (truck_pos.y - package.delivery_point.y)**2)
-                
-                if distance < 50:  # Radio de entrega
-                    # Buscar y remover la caja del camión
-                    for caja in self.camion_activo.cajas:
-                        if caja.codigo == package.id:
-                            self.camion_activo.cajas.remove(caja)
-                            package.state = PackageState.DELIVERED
-                            self.play_delivery_sound()
-                            print(f"📦 Paquete {package.id} entregado por {self.camion_activo.matricula}")
-                            self.update_missions_list()
-                            return
+                items = (canvas.create_oval(x-6, y-6, x+6, y+6, 
+                                            fill="#2ecc71", outline="#27ae60", width=2, tags="package"),
+                         canvas.create_text(x, y, text="✓", font=('Arial', 10, 'bold'), 
+                                            fill="white", tags="package"))
+            self.package_sprites[package.id] = (package.state, items)
+            if items:
+                # Los camiones siempre por encima de los paquetes
+                canvas.tag_raise("truck")
+    
+    def on_pickup(self, camion: Camion, package: Package):
+        """Sonido tras recoger un paquete (los paneles se enteran por el manifiesto)"""
+        self.play_pickup_sound()
+    
+    def on_delivery(self, camion: Camion, package: Package):
+        """Sonido tras entregar un paquete (los paneles se enteran por el manifiesto)"""
+        self.play_delivery_sound()
     
     def update_status_labels(self):
         """Actualiza las etiquetas de estado"""
@@ -705,115 +467,204 @@ class AdvancedTruckSimulator:
             physics = self.truck_physics[self.camion_activo.matricula]
             speed_kmh = abs(physics.velocity) * 20
             
-            self.speed_label.config(text=f"Velocidad: {speed_kmh:.0f} km/h")
-            self.heading_label.config(text=f"Rumbo: {physics.heading:.0f}°")
-            self.position_label.config(text=f"Posición: ({physics.position.x:.0f}, {physics.position.y:.0f})")
-            self.cargo_label.config(text=f"Carga: {self.camion_activo.peso_total():.0f} kg")
+            self.labels.fijar(self.speed_label, f"Velocidad: {speed_kmh:.0f} km/h")
+            self.labels.fijar(self.heading_label, f"Rumbo: {physics.heading:.0f}°")
+            self.labels.fijar(self.position_label,
+                              f"Posición: ({physics.position.x:.0f}, {physics.position.y:.0f})")
+            self.labels.fijar(self.cargo_label, f"Carga: {self.camion_activo.peso_total():.0f} kg")
+        despacho = self.despacho
+        if despacho.planes:
+            self.labels.fijar(self.dispatch_label,
+                              f"Despacho: {len(despacho.planes)} camiones, {len(despacho.asignacion)} asignados, "
+                              f"{len(despacho.pendientes)} en cola")
+        else:
+            self.labels.fijar(self.dispatch_label, "Despacho: inactivo")
+        planificador = self.planificador
+        self.labels.fijar(self.frames_label,
+                          f"Frames: {planificador.fps:.0f} FPS, {planificador.descartados} sin dibujar, "
+                          f"{planificador.tardios} tarde, paneles a {planificador.hz_panel:g} Hz")
     
     def update_truck_list(self):
         """Actualiza la lista de camiones"""
-        self.trucks_listbox.delete(0, tk.END)
-        for i, camion in enumerate(self.camiones):
+        filas = []
+        for camion in self.camiones:
             peso = camion.peso_total()
             status = "🟢" if camion == self.camion_activo else "⚪"
-            info = f"{status} {camion.matricula} - {peso:.0f}kg"
-            self.trucks_listbox.insert(tk.END, info)
-            if camion == self.camion_activo:
-                self.trucks_listbox.selection_set(i)
-    
-    def update_missions_list(self):
-        """Actualiza la lista de misiones"""
-        self.missions_listbox.delete(0, tk.END)
+            filas.append(f"{status} {camion.matricula} - {peso:.0f}kg")
+        self.trucks_list.mostrar(filas)
+        if self.camion_activo in self.camiones:
+            self.trucks_listbox.selection_clear(0, tk.END)
+            self.trucks_listbox.selection_set(self.camiones.index(self.camion_activo))
+    
+    def update_missions_list(self, carga_cambiada: bool = True):
+        """Actualiza la lista de misiones.
+        
+        Los paquetes a bordo solo se recalculan si cambió la carga del camión
+        activo; los cercanos salen del índice espacial en O(resultados).
+        """
+        if not self.camion_activo:
+            self._misiones_en_transito = []
+            self.missions_list.mostrar([])
+            return
         
-        if self.camion_activo:
-            # Mostrar paquetes en el camión
-            for caja in self.camion_activo.cajas:
-                # Buscar el paquete correspondiente
-                package = next((p for p in self.road_system.packages 
-                              if p.id == caja.codigo and p.state == PackageState.IN_TRANSIT), None)
-                if package:
-                    info = f"🚛 {package.id} → Entregar en ({package.delivery_point.x:.0f}, {package.delivery_point.y:.0f})"
-                    self.missions_listbox.insert(tk.END, info)
+        if carga_cambiada:
+            # Mostrar paquetes en el camión (índice por camión y estado del registro)
+            self._misiones_en_transito = [
+                f"🚛 {package.id} → Entregar en ({package.delivery_point.x:.0f}, {package.delivery_point.y:.0f})"
+                for package in self.road_system.packages.del_camion(self.camion_activo.matricula,
+                                                                    PackageState.IN_TRANSIT)]
+        filas = list(self._misiones_en_transito)
+        
+        # Mostrar paquetes disponibles cercanos
+        if self.camion_activo.matricula in self.truck_physics:
+            truck_pos = self.truck_physics[self.camion_activo.matricula].position
             
-            # Mostrar paquetes disponibles cercanos
-            if self.camion_activo.matricula in self.truck_physics:
-                truck_pos = self.truck_physics[self.camion_activo.matricula].position
-                
-                nearby_packages = []
-                for package in self.road_system.packages:
-                    if package.state == PackageState.WAREHOUSE:
-                        distance = math.sqrt((truck_pos.x - package.pickup_point.x)**2 + 
-                                           (truck_pos.y - package.pickup_point.y)**2)
-                        if distance < 100:
-                            nearby_packages.append((package, distance))
-                
-                nearby_packages.sort(key=lambda x: x[1])  # Ordenar por distancia
-                
-                for package, distance in nearby_packages[:3]:  # Mostrar solo los 3 más cercanos
-                    info = f"📦 {package.id} - {distance:.0f}m (Recoger)"
-                    self.missions_listbox.insert(tk.END, info)
+            # Los 3 más cercanos a menos de 100 m, ya ordenados por el índice espacial
+            nearby_packages = self.road_system.por_recoger.mas_cercanos(
+                truck_pos.x, truck_pos.y, k=3, radio_max=100)
+            
+            for distance, package_id in nearby_packages:
+                filas.append(f"📦 {package_id} - {distance:.0f}m (Recoger)")
+        self.missions_list.mostrar(filas)
     
-    def update_truck_info(self):
-        """Actualiza la información detallada del camión"""
-        self.truck_info_text.config(state=tk.NORMAL)
-        self.truck_info_text.delete('1.0', tk.END)
+    def update_truck_info(self, carga_cambiada: bool = True):
+        """Actualiza la información detallada del camión (solo las líneas que cambian)"""
+        if not self.camion_activo:
+            self.truck_info.mostrar(["No hay camión seleccionado"])
+            self.cargo_list.fuente(0, lambda inicio, fin: [])
+            self.cargo_list.refrescar()
+            return
         
-        if self.camion_activo:
-            physics = self.truck_physics.get(self.camion_activo.matricula)
-            peso_total = self.camion_activo.peso_total()
-            porcentaje = (peso_total / self.camion_activo.capacidad_kg) * 100
-            
-            info = f"🚛 {self.camion_activo.matricula}\n"
-            info += f"👤 {self.camion_activo.conductor}\n"
-            info += f"📦 {self.camion_activo.descripcion_carga}\n\n"
-            
-            if physics:
-                speed_kmh = abs(physics.velocity) * 20
-                info += f"⚡ {speed_kmh:.1f} km/h\n"
-                info += f"🧭 {physics.heading:.0f}°\n"
-                info += f"📍 ({physics.position.x:.0f}, {physics.position.y:.0f})\n\n"
-            
-            info += f"⚖️ {peso_total:.1f}/{self.camion_activo.capacidad_kg} kg ({porcentaje:.1f}%)\n"
-            info += f"📦 {len(self.camion_activo.cajas)} cajas\n\n"
+        camion = self.camion_activo
+        physics = self.truck_physics.get(camion.matricula)
+        peso_total = camion.peso_total()
+        porcentaje = (peso_total / camion.capacidad_kg) * 100
+        
+        lineas = [f"🚛 {camion.matricula}", f"👤 {camion.conductor}", f"📦 {camion.descripcion_carga}", ""]
+        if physics:
+            speed_kmh = abs(physics.velocity) * 20
+            lineas += [f"⚡ {speed_kmh:.1f} km/h", f"🧭 {physics.heading:.0f}°",
+                       f"📍 ({physics.position.x:.0f}, {physics.position.y:.0f})", ""]
+        lineas += [f"⚖️ {peso_total:.1f}/{camion.capacidad_kg} kg ({porcentaje:.1f}%)",
+                   f"📦 {len(camion.cajas)} cajas"]
+        self.truck_info.mostrar(lineas)
+        
+        if carga_cambiada:
+            manifiesto = camion.manifiesto
             
-            if self.camion_activo.cajas:
-                info += "CAJAS CARGADAS:\n"
-                for i, caja in enumerate(self.camion_activo.cajas, 1):
-                    info += f"{i}. {caja.codigo}: {caja.peso_kg}kg\n"
+            def filas_carga(inicio, fin):
+                cajas = manifiesto[inicio:fin]
+                return [f"{i}. {caja.codigo}: {caja.peso_kg}kg" for i, caja in enumerate(cajas, inicio + 1)]
             
-            self.truck_info_text.insert(tk.END, info)
-        else:
-            self.truck_info_text.insert(tk.END, "No hay camión seleccionado")
+            self.cargo_list.fuente(len(manifiesto), filas_carga)
+        self.cargo_list.refrescar()
+    
+    def refresh_panels(self):
+        """Refresca los paneles laterales tocando solo los widgets cuyos datos cambiaron"""
+        activo = self.camion_activo.matricula if self.camion_activo else None
+        carga_cambiada = activo != self._panel_activo or activo in self._cargas_cambiadas
+        if self._cargas_cambiadas:
+            # Cambió el peso de algún camión de la lista
+            self.update_truck_list()
+            self._cargas_cambiadas.clear()
+        self._panel_activo = activo
+        self.perfilador.marca("flota")
         
-        self.truck_info_text.config(state=tk.DISABLED)
+        self.update_status_labels()
+        self.perfilador.marca("estado")
+        self.update_truck_info(carga_cambiada)
+        self.perfilador.marca("info")
+        self.update_missions_list(carga_cambiada)
+        self.perfilador.marca("misiones")
     
     def simulation_loop(self):
         """Bucle principal de la simulación mejorada"""
         if self.running:
-            # Actualizar física
-            self.update_physics()
+            perfil = self.perfilador
+            perfil.empezar_frame()
+            # Si no da tiempo, primero se refrescan menos los paneles y luego no se dibuja
+            decision = self.planificador.empezar_frame()
+            # El autopiloto sigue al resto de la flota aunque cambie el camión activo
+            if self._flota_pilotada != (self.camion_activo, len(self.camiones)):
+                self.sync_autopilot()
+            # Repartir los paquetes nuevos sin pasarse del presupuesto del frame
+            self.despacho.planificar(PRESUPUESTO_FRAME)
+            perfil.marca("despacho")
             
-            # Dibujar todo
-            self.canvas.delete("truck")
-            self.canvas.delete("package")
+            # Actualizar física: los pasos fijos que quepan en el tiempo real transcurrido
+            ahora = time.perf_counter()
+            self.avanzar_tiempo(ahora - self._ultimo_frame)
+            self._ultimo_frame = ahora
+            perfil.marca("fisica")
             
-            # Dibujar carreteras (solo si es necesario)
-            self.road_system.draw_roads(self.canvas)
+            # Dibujar: las carreteras ya están; paquetes y camiones se actualizan
+            self.escena.nuevo_frame()
+            if decision.dibujar:
+                self.draw_packages(self.escena)
+                perfil.marca("paquetes")
+                for camion in self.camiones:
+                    self.draw_truck(self.escena, camion)
+                self.labels.fijar(self.render_label, f"Elementos creados/frame: {self.escena.creados_frame} "
+                                  f"(actualizados: {self.escena.actualizados_frame})")
+                perfil.marca("camiones")
             
-            # Dibujar paquetes
-            self.draw_packages(self.canvas)
+            # Actualizar interfaz (a la frecuencia de paneles del planificador, no en cada frame)
+            if decision.paneles:
+                self.refresh_panels()
+                self.update_vehicle_sounds()
+                perfil.marca("sonido")
+                self.update_profiler_overlay()
+                perfil.marca("overlay")
+            perfil.terminar_frame(creados=self.escena.creados_frame,
+                                  actualizados=self.escena.actualizados_frame,
+                                  sin_dibujar=self.planificador.descartados, tarde=self.planificador.tardios)
             
-            # Dibujar camiones
-            for camion in self.camiones:
-                self.draw_truck(self.canvas, camion)
-            
-            # Actualizar interfaz
-            self.update_status_labels()
-            self.update_truck_info()
-            self.update_missions_list()
-            
-            # Continuar simulación
-            self.root.after(50, self.simulation_loop)  # 20 FPS
+            # Continuar simulación a la hora prevista del siguiente frame
+            self.root.after(self.planificador.terminar_frame(), self.simulation_loop)
+    
+    def sync_profiler(self):
+        """Activa o desactiva el perfilador según la casilla y muestra o quita el overlay"""
+        self.perfilador.activar(self.profiler_var.get())
+        self.update_profiler_overlay()
+    
+    def update_profiler_overlay(self):
+        """Escribe sobre el mapa FPS, ms por fase y elementos del canvas"""
+        if not self.perfilador.activo:
+            if self.perfil_items is not None:
+                self.escena.borrar(*self.perfil_items)
+                self.perfil_items = None
+            return
+        
+        lineas = self.perfilador.lineas_overlay(elementos=len(self.canvas.find_all()))
+        if self.perfil_items is None:
+            fondo = self.escena.create_rectangle(0, 0, 0, 0, fill="#2c3e50", outline="", tags="perfil")
+            texto = self.escena.create_text(10, 10, anchor=tk.NW, fill="white",
+                                            font=('Consolas', 9), tags="perfil")
+            self.perfil_items = (fondo, texto)
+        fondo, texto = self.perfil_items
+        self.escena.configurar(texto, text="\n".join(lineas))
+        x1, y1, x2, y2 = self.canvas.bbox(texto)
+        self.escena.mover(fondo, x1 - 4, y1 - 4, x2 + 4, y2 + 4)
+        self.canvas.tag_raise("perfil")
+    
+    def export_trace(self):
+        """Guarda los últimos frames medidos como traza de Chrome (chrome://tracing)"""
+        if not self.perfilador.frames:
+            messagebox.showinfo("Exportar Traza", "No hay frames medidos: activa el perfilador (F3)")
+            return
+        ruta = filedialog.asksaveasfilename(
+            title="💾 Exportar traza",
+            defaultextension=".json",
+            filetypes=[("Traza de Chrome", "*.json"), ("Todos", "*.*")]
+        )
+        if not ruta:
+            return
+        try:
+            frames = self.perfilador.exportar_traza(ruta)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo guardar la traza:\n{e}")
+            return
+        messagebox.showinfo("Exportar Traza", f"{frames} frames guardados en\n{ruta}")
     
     def on_canvas_click(self, event):
         """Maneja clics en el canvas para seleccionar camiones"""
@@ -851,7 +702,7 @@ class AdvancedTruckSimulator:
         if not self.camion_activo:
             return
             
-        details = str(self.camion_activo)
+        details = self.camion_activo.informe(limite=MAX_CAJAS_DETALLE)
         messagebox.showinfo(f"Detalles - {self.camion_activo.matricula}", details)
     
     def on_truck_select(self, event):
@@ -863,64 +714,36 @@ class AdvancedTruckSimulator:
                 self.camion_activo = self.camiones[index]
                 self.canvas.focus_set()  # Mantener foco para teclado
     
-    def load_sounds(self):
-        """Carga los archivos de audio"""
-        if SOUND_AVAILABLE:
-            try:
-                self.create_sounds()
-            except Exception as e:
-                print(f"⚠️ Error cargando sonidos: {e}")
-                self.claxon_sound = None
-                self.pickup_sound = None
-                self.delivery_sound = None
-        else:
-            self.claxon_sound = None
-            self.pickup_sound = None
-            self.delivery_sound = None
+    def sync_autopilot(self):
+        """Despacha todos los camiones menos el activo (o los saca del despacho)"""
+        activado = bool(self.autopilot_var.get())
+        for camion in self.camiones:
+            despachado = camion.matricula in self.despacho.planes
+            if activado and camion is not self.camion_activo:
+                if not despachado:
+                    self.despachar(camion)
+            elif despachado:
+                self.dejar_de_despachar(camion)
+        self._flota_pilotada = (self.camion_activo, len(self.camiones))
     
-    def create_sounds(self):
-        """Crea varios efectos de sonido"""
+    def load_sounds(self):
+        """Prepara los sonidos en segundo plano (sintetizados o desde la caché)"""
+        for atributo in SONIDOS_SIMULADOR.values():
+            setattr(self, atributo, None)
+        self._bucles = {}  # Atributo del sonido en bucle -> (canal, volumen)
         if not SOUND_AVAILABLE:
             return
-            
-        sample_rate = 22050
-        
-        # Sonido de claxón
-        duration = 0.5
-        frequency = 800
-        frames = int(duration * sample_rate)
-        arr = []
-        for i in range(frames):
-            wave = 4096 * math.sin(frequency * 2 * math.pi * i / sample_rate)
-            arr.append([int(wave), int(wave)])
-        sound_array = pygame.sndarray.array(arr)
-        self.claxon_sound = pygame.sndarray.make_sound(sound_array)
-        
-        # Sonido de recogida (pitch alto)
-        duration = 0.3
-        frequency = 1200
-        frames = int(duration * sample_rate)
-        arr = []
-        for i in range(frames):
-            wave = 2048 * math.sin(frequency * 2 * math.pi * i / sample_rate)
-            arr.append([int(wave), int(wave)])
-        sound_array = pygame.sndarray.array(arr)
-        self.pickup_sound = pygame.sndarray.make_sound(sound_array)
-        
-        # Sonido de entrega (doble beep)
-        duration = 0.6
-        frames = int(duration * sample_rate)
-        arr = []
-        for i in range(frames):
-            # Crear un patrón de doble beep
-            time_pos = i / sample_rate
-            if time_pos < 0.2 or (0.3 < time_pos < 0.5):
-                wave = 2048 * math.sin(1000 * 2 * math.pi * time_pos)
-            else:
-                wave = 0
-            arr.append([int(wave), int(wave)])
-        sound_array = pygame.sndarray.array(arr)
-        self.delivery_sound = pygame.sndarray.make_sound(sound_array)
+        formato_mezclador = pygame.mixer.get_init()
+        if formato_mezclador is None or formato_mezclador[1] != -16:
+            print("⚠️ El mezclador de audio no usa muestras de 16 bits; sin sonidos")
+            return
+        tasa, _, canales = formato_mezclador
+        
+        def al_cargar(nombre, datos):
+            setattr(self, SONIDOS_SIMULADOR[nombre], pygame.mixer.Sound(buffer=datos))
+        
+        cargar_en_segundo_plano({nombre: SONIDOS[nombre] for nombre in SONIDOS_SIMULADOR},
+                                tasa, canales, al_cargar)
     
     def play_claxon(self):
         """Reproduce el sonido del claxón"""
@@ -949,6 +772,35 @@ class AdvancedTruckSimulator:
             except Exception as e:
                 print(f"⚠️ Error reproduciendo delivery: {e}")
     
+    def update_vehicle_sounds(self):
+        """Motor y pitido de marcha atrás del camión activo, en bucle"""
+        physics = self.truck_physics.get(self.camion_activo.matricula) if self.camion_activo else None
+        velocidad = physics.velocity if physics else 0.0
+        # El motor suena más fuerte cuanto más rápido va el camión
+        volumen = 0.3 + 0.7 * min(1.0, abs(velocidad) / physics.max_speed) if physics else 0.0
+        self._sonar_en_bucle("engine_sound", physics is not None and self.running, round(volumen, 1))
+        self._sonar_en_bucle("reverse_sound", self.running and velocidad < -0.1)
+    
+    def _sonar_en_bucle(self, atributo: str, activo: bool, volumen: float = 1.0):
+        """Arranca o para un sonido en bucle solo cuando cambia su estado"""
+        sonido = getattr(self, atributo, None)
+        if not (sonido and SOUND_AVAILABLE):
+            return
+        try:
+            canal, volumen_actual = self._bucles.get(atributo, (None, None))
+            if activo and canal is None:
+                canal = sonido.play(loops=-1)
+            elif not activo and canal is not None:
+                canal.stop()
+                del self._bucles[atributo]
+                return
+            if activo:
+                if volumen != volumen_actual:
+                    sonido.set_volume(volumen)
+                self._bucles[atributo] = (canal, volumen)
+        except Exception as e:
+            print(f"⚠️ Error reproduciendo {atributo}: {e}")
+    
     def create_new_truck(self):
         """Crea un nuevo camión"""
         dialog = tk.Toplevel(self.root)
@@ -1004,16 +856,11 @@ class AdvancedTruckSimulator:
                 # Crear camión
                 nuevo_camion = Camion(
                     matricula, conductor, capacidad_var.get(),
-                    descripcion_var.get(), 90, 0
+                    descripcion_var.get(), 90, 0,
+                    bodega=BODEGA_ESTANDAR
                 )
                 
-                # Crear física
-                pos_x = random.randint(100, self.canvas_width - 100)
-                pos_y = random.randint(100, self.canvas_height - 100)
-                nueva_fisica = TruckPhysics(Point(pos_x, pos_y), random.randint(0, 359))
-                
-                self.truck_physics[matricula] = nueva_fisica
-                self.camiones.append(nuevo_camion)
+                self.add_truck(nuevo_camion)
                 self.camion_activo = nuevo_camion
                 
                 self.update_truck_list()
@@ -1033,24 +880,46 @@ class AdvancedTruckSimulator:
         ttk.Button(button_frame, text="✅ Crear Camión", command=crear_camion).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="❌ Cancelar", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
     
+    def import_fleet(self):
+        """Importa camiones desde un fichero CSV o JSONL"""
+        ruta = filedialog.askopenfilename(
+            title="📥 Importar flota",
+            filetypes=[("CSV o JSONL", "*.csv *.jsonl *.ndjson"), ("Todos", "*.*")]
+        )
+        if not ruta:
+            return
+        
+        rechazos = []
+        try:
+            camiones, estadisticas = cargar_camiones(ruta, rechazos.append)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"No se pudo importar la flota:\n{e}")
+            return
+        
+        importados = 0
+        for camion in camiones.values():
+            if camion.matricula in self.truck_physics:
+                rechazos.append(f"{camion.matricula}: ya existe")
+                continue
+            if camion.bodega is None:
+                camion.bodega = BODEGA_ESTANDAR
+                camion.cajas = []
+            self.add_truck(camion)
+            importados += 1
+        
+        self.update_truck_list()
+        messagebox.showinfo("Importar Flota",
+                           f"{importados} camiones importados\n"
+                           f"{len(rechazos)} filas rechazadas\n"
+                           f"({estadisticas.filas_por_segundo:.0f} filas/s)")
+    
     def create_new_mission(self):
         """Crea una nueva misión de entrega"""
         # Seleccionar puntos aleatoriamente
-        warehouse = random.choice([b for b in self.road_system.buildings if b.type == "warehouse"])
-        delivery = random.choice([b for b in self.road_system.buildings if b.type == "delivery"])
-        
-        package_id = f"PKG{len(self.road_system.packages)+1:03d}"
-        new_package = Package(
-            id=package_id,
-            pickup_point=warehouse.position,
-            delivery_point=delivery.position,
-            weight=random.uniform(20, 150)
-        )
-        
-        self.road_system.packages.append(new_package)
+        new_package, warehouse, delivery = self.crear_mision()
         
         messagebox.showinfo("Nueva Misión", 
-                           f"Misión {package_id} creada:\n"
+                           f"Misión {new_package.id} creada:\n"
                            f"Recoger en {warehouse.name}\n"
                            f"Entregar en {delivery.name}\n"
                            f"Peso: {new_package.weight:.1f} kg")
@@ -1058,8 +927,9 @@ class AdvancedTruckSimulator:
     def start_simulation(self):
         """Inicia la simulación"""
         self.running = True
-        # Dibujar carreteras inicialmente
-        self.road_system.draw_roads(self.canvas)
+        self._ultimo_frame = time.perf_counter()
+        # Dibujar carreteras una sola vez (capa estática)
+        self.road_system.draw_roads(self.escena)
         self.simulation_loop()
     
     def run(self):
@@ -1070,6 +940,7 @@ class AdvancedTruckSimulator:
         print("📦 Presiona R cerca de paquetes para recoger/entregar")
         self.root.mainloop()
         self.running = False
+        self.update_vehicle_sounds()
 
 
 def main():
@@ -0,0 +1,323 @@
+"""
+Empaquetado volumétrico 3D de cajas en la bodega de un camión
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Heurística de puntos extremos (extreme points): cada caja se coloca en el
+primer punto candidato, en orden "delante-abajo-izquierda" (x, z, y), donde
+cabe en alguna orientación sin solaparse con otras cajas y apoyada en el
+suelo o sobre otra caja. Al colocarla se generan tres nuevos puntos en sus
+esquinas. Una rejilla uniforme acelera la detección de solapes.
+
+Coordenadas en cm: x = largo de la bodega (desde la cabina), y = ancho,
+z = altura.
+"""
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from itertools import permutations
+from typing import Dict, List, Optional, Set, Tuple
+
+EPSILON = 1e-6
+MAX_FALLOS_RECORDADOS = 32
+
+
+@dataclass
+class Colocacion:
+    """Posición y dimensiones orientadas de una caja dentro de la bodega"""
+    codigo: str
+    x: float
+    y: float
+    z: float
+    largo: float
+    ancho: float
+    altura: float
+
+    def volumen(self) -> float:
+        return self.largo * self.ancho * self.altura
+
+
+class EmpaquetadorBodega:
+    """Empaquetador incremental de cajas en una bodega de largo x ancho x altura"""
+
+    def __init__(self, largo: float, ancho: float, altura: float,
+                 permitir_volteo: bool = False, celda: float = 50.0):
+        if largo <= 0 or ancho <= 0 or altura <= 0:
+            raise ValueError("Las dimensiones de la bodega deben ser positivas")
+        self.largo = largo
+        self.ancho = ancho
+        self.altura = altura
+        self.permitir_volteo = permitir_volteo  # Si False, la altura no se rota
+        self.celda = celda
+        self._reiniciar()
+
+    def _reiniciar(self):
+        self.colocaciones: Dict[str, Colocacion] = {}
+        self.volumen_ocupado = 0.0
+        self._rejilla: Dict[Tuple[int, int, int], Set[str]] = {}
+        # Puntos libres y apoyados, ordenados por (x, z, y); los libres sin
+        # apoyo esperan en _flotantes a que se coloque una caja debajo
+        self._puntos: List[Tuple[float, float, float]] = [(0.0, 0.0, 0.0)]
+        self._flotantes: Set[Tuple[float, float, float]] = set()
+        # Claves de cajas que no cupieron en cada punto (ver _clave_fallo)
+        self._fallos_punto: Dict[Tuple[float, float, float], list] = {}
+        # Espacio libre desde cada punto a lo largo de x, y, z. Solo puede
+        # disminuir al colocar cajas, así que un valor antiguo sigue siendo
+        # una cota superior válida hasta que se retire alguna caja
+        self._extensiones: Dict[Tuple[float, float, float], Tuple[float, float, float]] = {
+            (0.0, 0.0, 0.0): (self.largo, self.ancho, self.altura)}
+        self._fallos: List[Tuple[float, float, float]] = []
+
+    @property
+    def volumen(self) -> float:
+        return self.largo * self.ancho * self.altura
+
+    @property
+    def volumen_libre(self) -> float:
+        return self.volumen - self.volumen_ocupado
+
+    def ocupacion(self) -> float:
+        """Fracción del volumen de la bodega ocupada (0-1)"""
+        return self.volumen_ocupado / self.volumen
+
+    # ===== Operaciones públicas =====
+
+    def insertar(self, caja) -> Optional[Colocacion]:
+        """Coloca una caja y devuelve su colocación, o None si no cabe"""
+        if caja.codigo in self.colocaciones:
+            raise ValueError(f"La caja {caja.codigo} ya está en la bodega")
+        dimensiones = (caja.largo, caja.ancho, caja.altura)
+        if caja.largo * caja.ancho * caja.altura > self.volumen_libre + EPSILON:
+            return None
+        clave = self._clave_fallo(dimensiones)
+        if self._domina_fallo(clave):
+            return None
+
+        orientaciones = self._orientaciones(dimensiones)
+        fallos_punto = self._fallos_punto
+        extensiones = self._extensiones
+        for punto in self._puntos:
+            ex, ey, ez = extensiones[punto]
+            candidatas = [o for o in orientaciones
+                          if o[0] <= ex + EPSILON and o[1] <= ey + EPSILON and o[2] <= ez + EPSILON]
+            if not candidatas:
+                continue
+            fallos = fallos_punto.get(punto)
+            if fallos is not None and _domina(clave, fallos):
+                continue
+            x, z, y = punto
+            for largo, ancho, altura in candidatas:
+                if not self._solapa(x, y, z, largo, ancho, altura):
+                    colocacion = Colocacion(caja.codigo, x, y, z, largo, ancho, altura)
+                    self._colocar(colocacion)
+                    return colocacion
+            # Mientras no se retiren cajas, este punto tampoco admitirá cajas
+            # mayores; además la cota estaba desfasada y se recalcula
+            fallos_punto[punto] = _agregar_fallo(fallos or [], clave, 8)
+            extensiones[punto] = self._medir_extensiones(x, y, z)
+
+        self._fallos = _agregar_fallo(self._fallos, clave, MAX_FALLOS_RECORDADOS)
+        return None
+
+    def quitar(self, codigo: str) -> Colocacion:
+        """Retira una caja de la bodega (KeyError si no está)"""
+        colocacion = self.colocaciones.pop(codigo)
+        for celda in self._celdas(colocacion.x, colocacion.y, colocacion.z,
+                                  colocacion.largo, colocacion.ancho, colocacion.altura):
+            ocupantes = self._rejilla.get(celda)
+            if ocupantes is not None:
+                ocupantes.discard(codigo)
+                if not ocupantes:
+                    del self._rejilla[celda]
+        self.volumen_ocupado = max(0.0, self.volumen_ocupado - colocacion.volumen())
+
+        # Los puntos apoyados sobre la caja retirada se quedan sin apoyo
+        cima = colocacion.z + colocacion.altura
+        for punto in self._puntos_en_franja(colocacion):
+            x, z, y = punto
+            if (abs(z - cima) <= EPSILON and colocacion.y - EPSILON <= y < colocacion.y + colocacion.ancho - EPSILON
+                    and not self._apoyado(x, y, z)):
+                self._puntos.remove(punto)
+                self._extensiones.pop(punto, None)
+                self._flotantes.add(punto)
+        self._agregar_punto(colocacion.x, colocacion.y, colocacion.z)
+
+        # El hueco liberado puede admitir cajas rechazadas antes
+        self._fallos.clear()
+        self._fallos_punto.clear()
+        for punto in self._puntos:
+            x, z, y = punto
+            self._extensiones[punto] = self._medir_extensiones(x, y, z)
+        return colocacion
+
+    def cabe(self, caja) -> bool:
+        """Comprueba si la caja cabría sin colocarla realmente"""
+        colocacion = self.insertar(caja)
+        if colocacion is None:
+            return False
+        self.quitar(caja.codigo)
+        return True
+
+    def vaciar(self):
+        """Retira todas las cajas"""
+        self._reiniciar()
+
+    def __contains__(self, codigo: str) -> bool:
+        return codigo in self.colocaciones
+
+    def __len__(self) -> int:
+        return len(self.colocaciones)
+
+    # ===== Internos =====
+
+    def _orientaciones(self, dimensiones: Tuple[float, float, float]):
+        largo, ancho, altura = dimensiones
+        if self.permitir_volteo:
+            candidatas = permutations(dimensiones)
+        else:
+            candidatas = ((largo, ancho, altura), (ancho, largo, altura))
+        return list(dict.fromkeys(candidatas))
+
+    def _clave_fallo(self, dimensiones):
+        # Dos cajas son comparables por dimensiones si admiten las mismas rotaciones
+        if self.permitir_volteo:
+            return tuple(sorted(dimensiones))
+        largo, ancho, altura = dimensiones
+        return (altura, min(largo, ancho), max(largo, ancho))
+
+    def _domina_fallo(self, clave) -> bool:
+        """Una caja igual o mayor que otra que no cupo tampoco cabe"""
+        return _domina(clave, self._fallos)
+
+    def _celdas(self, x, y, z, largo, ancho, altura):
+        c = self.celda
+        for i in range(int(x // c), int((x + largo - EPSILON) // c) + 1):
+            for j in range(int(y // c), int((y + ancho - EPSILON) // c) + 1):
+                for k in range(int(z // c), int((z + altura - EPSILON) // c) + 1):
+                    yield (i, j, k)
+
+    def _solapa(self, x, y, z, largo, ancho, altura) -> bool:
+        x2, y2, z2 = x + largo, y + ancho, z + altura
+        colocaciones = self.colocaciones
+        for celda in self._celdas(x, y, z, largo, ancho, altura):
+            for codigo in self._rejilla.get(celda, ()):
+                otra = colocaciones[codigo]
+                if (x < otra.x + otra.largo - EPSILON and otra.x < x2 - EPSILON
+                        and y < otra.y + otra.ancho - EPSILON and otra.y < y2 - EPSILON
+                        and z < otra.z + otra.altura - EPSILON and otra.z < z2 - EPSILON):
+                    return True
+        return False
+
+    def _caja_en(self, x, y, z) -> Optional[Colocacion]:
+        """Caja que contiene el punto (caras mínimas incluidas), si la hay"""
+        c = self.celda
+        for codigo in self._rejilla.get((int(x // c), int(y // c), int(z // c)), ()):
+            otra = self.colocaciones[codigo]
+            if (otra.x - EPSILON <= x < otra.x + otra.largo - EPSILON
+                    and otra.y - EPSILON <= y < otra.y + otra.ancho - EPSILON
+                    and otra.z - EPSILON <= z < otra.z + otra.altura - EPSILON):
+                return otra
+        return None
+
+    def _apoyado(self, x, y, z) -> bool:
+        """El punto está en el suelo o sobre la cara superior de una caja"""
+        return z <= EPSILON or self._caja_en(x, y, z - 2 * EPSILON) is not None
+
+    def _puntos_en_franja(self, colocacion: Colocacion):
+        """Puntos apoyados con x dentro del largo de la colocación (copia)"""
+        inicio = bisect_left(self._puntos, (colocacion.x - EPSILON,))
+        fin = bisect_left(self._puntos, (colocacion.x + colocacion.largo - EPSILON,), inicio)
+        return self._puntos[inicio:fin]
+
+    def _medir_extensiones(self, x, y, z) -> Tuple[float, float, float]:
+        """Distancia libre desde el punto hasta el primer obstáculo en cada eje"""
+        return (self._rayo(x, y, z, 0, self.largo - x),
+                self._rayo(x, y, z, 1, self.ancho - y),
+                self._rayo(x, y, z, 2, self.altura - z))
+
+    def _rayo(self, x, y, z, eje: int, maximo: float) -> float:
+        """Recorre la rejilla a lo largo de un eje hasta chocar con una caja"""
+        c = self.celda
+        origen = (x, y, z)
+        celda = [int(x // c), int(y // c), int(z // c)]
+        # Los otros dos ejes, que deben caer dentro de la caja que corta el rayo
+        a, b = [e for e in range(3) if e != eje]
+        distancia = maximo
+        while celda[eje] * c - origen[eje] < distancia:
+            for codigo in self._rejilla.get(tuple(celda), ()):
+                otra = self.colocaciones[codigo]
+                minimos = (otra.x, otra.y, otra.z)
+                medidas = (otra.largo, otra.ancho, otra.altura)
+                if (minimos[a] - EPSILON <= origen[a] < minimos[a] + medidas[a] - EPSILON
+                        and minimos[b] - EPSILON <= origen[b] < minimos[b] + medidas[b] - EPSILON
+                        and minimos[eje] + medidas[eje] > origen[eje] + EPSILON):
+                    distancia = min(distancia, max(0.0, minimos[eje] - origen[eje]))
+            celda[eje] += 1
+        return distancia
+
+    def _colocar(self, colocacion: Colocacion):
+        self.colocaciones[colocacion.codigo] = colocacion
+        for celda in self._celdas(colocacion.x, colocacion.y, colocacion.z,
+                                  colocacion.largo, colocacion.ancho, colocacion.altura):
+            self._rejilla.setdefault(celda, set()).add(colocacion.codigo)
+        self.volumen_ocupado += colocacion.volumen()
+        x, y, z = colocacion.x, colocacion.y, colocacion.z
+        x2, y2, z2 = x + colocacion.largo, y + colocacion.ancho, z + colocacion.altura
+
+        # Descartar los puntos que la caja cubre (solo hay que mirar su franja en x)
+        for punto in self._puntos_en_franja(colocacion):
+            px, pz, py = punto
+            if y - EPSILON <= py < y2 - EPSILON and z - EPSILON <= pz < z2 - EPSILON:
+                self._puntos.remove(punto)
+                self._fallos_punto.pop(punto, None)
+                self._extensiones.pop(punto, None)
+        for punto in list(self._flotantes):
+            px, pz, py = punto
+            if not (x - EPSILON <= px < x2 - EPSILON and y - EPSILON <= py < y2 - EPSILON):
+                continue
+            if z - EPSILON <= pz < z2 - EPSILON:
+                self._flotantes.discard(punto)
+            elif abs(pz - z2) <= EPSILON:
+                # La caja nueva da apoyo a un punto que estaba en el aire
+                self._flotantes.discard(punto)
+                self._extensiones[punto] = self._medir_extensiones(px, py, pz)
+                insort(self._puntos, punto)
+
+        self._agregar_punto(x2, y, z)
+        self._agregar_punto(x, y2, z)
+        self._agregar_punto(x, y, z2)
+
+    def _agregar_punto(self, x, y, z):
+        if x >= self.largo - EPSILON or y >= self.ancho - EPSILON or z >= self.altura - EPSILON:
+            return
+        punto = (x, z, y)
+        if punto in self._flotantes:
+            return
+        indice = bisect_left(self._puntos, punto)
+        if indice < len(self._puntos) and self._puntos[indice] == punto:
+            return
+        if self._caja_en(x, y, z) is not None:
+            return
+        if self._apoyado(x, y, z):
+            self._extensiones[punto] = self._medir_extensiones(x, y, z)
+            self._puntos.insert(indice, punto)
+        else:
+            self._flotantes.add(punto)
+
+
+def _domina(clave, fallos) -> bool:
+    """True si la clave es mayor o igual, en todas sus medidas, que algún fallo"""
+    for fallo in fallos:
+        if clave[0] >= fallo[0] and clave[1] >= fallo[1] and clave[2] >= fallo[2]:
+            return True
+    return False
+
+
+def _agregar_fallo(fallos: list, clave, maximo: int) -> list:
+    """Añade un fallo conservando solo los minimales (los que descartan más)"""
+    fallos = [f for f in fallos
+              if not (f[0] >= clave[0] and f[1] >= clave[1] and f[2] >= clave[2])]
+    fallos.append(clave)
+    if len(fallos) > maximo:
+        fallos.pop(0)
+    return fallos
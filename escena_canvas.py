@@ -0,0 +1,68 @@
+"""
+Escena retenida sobre un tk.Canvas
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+En vez de borrar y volver a crear los dibujos en cada frame, los elementos
+se crean una vez y luego solo se mueven (canvas.coords) o se reconfiguran
+(canvas.itemconfigure). EscenaCanvas envuelve el canvas, cuenta los
+elementos creados y actualizados en cada frame y se salta las llamadas que
+no cambiarían nada (mismas coordenadas o mismas opciones que la última vez).
+
+Cualquier otro atributo se pasa al canvas, así que se puede usar en lugar de
+él (por ejemplo en RoadSystem.draw_roads).
+"""
+
+from typing import Dict
+
+
+class EscenaCanvas:
+    """Canvas con elementos persistentes y contadores por frame"""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.creados_frame = 0
+        self.actualizados_frame = 0
+        self.creados_total = 0
+        self._coords: Dict[int, tuple] = {}
+        self._opciones: Dict[int, dict] = {}
+
+    def __getattr__(self, nombre):
+        atributo = getattr(self.canvas, nombre)
+        if not nombre.startswith("create_"):
+            return atributo
+
+        def crear(*args, **kwargs):
+            self.creados_frame += 1
+            self.creados_total += 1
+            return atributo(*args, **kwargs)
+
+        return crear
+
+    def nuevo_frame(self):
+        """Pone a cero los contadores del frame"""
+        self.creados_frame = 0
+        self.actualizados_frame = 0
+
+    def mover(self, item: int, *coords: float):
+        """Cambia las coordenadas de un elemento si son distintas de las anteriores"""
+        if self._coords.get(item) != coords:
+            self.canvas.coords(item, *coords)
+            self._coords[item] = coords
+            self.actualizados_frame += 1
+
+    def configurar(self, item: int, **opciones):
+        """Cambia solo las opciones que difieren de las últimas aplicadas"""
+        previas = self._opciones.setdefault(item, {})
+        cambios = {clave: valor for clave, valor in opciones.items() if previas.get(clave) != valor}
+        if cambios:
+            self.canvas.itemconfigure(item, **cambios)
+            previas.update(cambios)
+            self.actualizados_frame += 1
+
+    def borrar(self, *items: int):
+        """Elimina elementos del canvas y olvida su estado"""
+        for item in items:
+            self.canvas.delete(item)
+            self._coords.pop(item, None)
+            self._opciones.pop(item, None)
@@ -0,0 +1,310 @@
+"""
+Motor de física por lotes para toda la flota
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Guarda posición, rumbo, velocidad, parámetros y controles de todos los
+camiones en columnas de arrays tipados y los avanza a la vez con paso().
+Con NumPy el paso es vectorizado (vistas np.frombuffer sobre las columnas,
+sin copiar); sin NumPy se recorre la flota en un bucle de Python.
+
+TruckPhysics es ahora una vista de un camión dentro del motor: lee y
+escribe en las columnas, así que el código que usa physics.position.x,
+physics.heading o physics.update(controles) sigue funcionando igual.
+
+Los parámetros están expresados por frame de 1/20 s (FRECUENCIA_BASE); con
+paso(dt) se escalan al intervalo indicado, de modo que la simulación puede
+avanzar a otra frecuencia fija. Antes de cada paso se guarda la posición y
+el rumbo anteriores para interpolar al dibujar.
+"""
+
+import math
+from array import array
+from typing import Dict, Iterable, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Frecuencia (Hz) a la que están expresados los parámetros: un frame = 1/20 s
+FRECUENCIA_BASE = 20.0
+
+# Columnas de coma flotante y su valor por defecto
+COLUMNAS = {
+    "x": 0.0,
+    "y": 0.0,
+    "heading": 0.0,  # En grados
+    "velocity": 0.0,
+    "max_speed": 3.0,
+    "acceleration": 0.1,
+    "deceleration": 0.15,
+    "turn_rate": 2.0,  # Grados por frame
+    "friction": 0.95,
+}
+
+
+def codificar_controles(controls: Dict[str, bool]):
+    """Convierte el dict de controles en (acelerador, giro) con valores -1, 0, 1"""
+    if controls.get('forward', False):
+        acelerador = 1
+    elif controls.get('backward', False):
+        acelerador = -1
+    else:
+        acelerador = 0
+    if controls.get('left', False):
+        giro = -1
+    elif controls.get('right', False):
+        giro = 1
+    else:
+        giro = 0
+    return acelerador, giro
+
+
+class MotorFisicaFlota:
+    """Física de muchos camiones en columnas (struct-of-arrays)"""
+
+    def __init__(self):
+        self.columnas: Dict[str, array] = {nombre: array('d') for nombre in COLUMNAS}
+        self.acelerador = array('b')  # 1 acelerar, -1 frenar/reversa, 0 nada
+        self.giro = array('b')  # -1 izquierda, 1 derecha, 0 recto
+        # Estado antes del último paso, para interpolar al dibujar
+        self.anteriores: Dict[str, array] = {nombre: array('d') for nombre in ("x", "y", "heading")}
+
+    def __len__(self) -> int:
+        return len(self.acelerador)
+
+    def agregar(self, x: float, y: float, heading: float = 0.0, **parametros) -> int:
+        """Añade un camión y devuelve su índice en el motor"""
+        desconocidos = set(parametros) - set(COLUMNAS)
+        if desconocidos:
+            raise TypeError(f"Parámetros desconocidos: {', '.join(sorted(desconocidos))}")
+        valores = dict(COLUMNAS, x=x, y=y, heading=heading, **parametros)
+        for nombre, columna in self.columnas.items():
+            columna.append(valores[nombre])
+        for nombre, columna in self.anteriores.items():
+            columna.append(valores[nombre])
+        self.acelerador.append(0)
+        self.giro.append(0)
+        return len(self) - 1
+
+    def vista(self, indice: int) -> "TruckPhysics":
+        """TruckPhysics enlazado al camión `indice`"""
+        if not 0 <= indice < len(self):
+            raise IndexError("Camión fuera de rango")
+        vista = TruckPhysics.__new__(TruckPhysics)
+        vista._motor = self
+        vista._indice = indice
+        return vista
+
+    # ===== Controles =====
+
+    def fijar_controles(self, indice: int, controls: Dict[str, bool]):
+        self.acelerador[indice], self.giro[indice] = codificar_controles(controls)
+
+    def soltar_controles(self):
+        """Pone a cero los controles de todos los camiones"""
+        ceros = bytes(len(self))
+        self.acelerador = array('b', ceros)
+        self.giro = array('b', ceros)
+
+    # ===== Simulación =====
+
+    def paso(self, dt: Optional[float] = None):
+        """Avanza todos los camiones `dt` segundos (por defecto, un frame base)"""
+        factor = 1.0 if dt is None else dt * FRECUENCIA_BASE
+        for nombre, columna in self.anteriores.items():
+            columna[:] = self.columnas[nombre]
+        if NUMPY_AVAILABLE and len(self):
+            self._paso_numpy(factor)
+        else:
+            self._paso_python(range(len(self)), factor)
+
+    def interpolar(self, indice: int, alfa: float):
+        """(x, y, heading) entre el estado anterior (alfa=0) y el actual (alfa=1)"""
+        c, a = self.columnas, self.anteriores
+        x0, y0, h0 = a["x"][indice], a["y"][indice], a["heading"][indice]
+        x1, y1, h1 = c["x"][indice], c["y"][indice], c["heading"][indice]
+        giro = (h1 - h0 + 540) % 360 - 180  # Por el camino corto
+        return x0 + (x1 - x0) * alfa, y0 + (y1 - y0) * alfa, (h0 + giro * alfa) % 360
+
+    def _vistas_numpy(self):
+        return {nombre: np.frombuffer(columna, dtype=np.float64) for nombre, columna in self.columnas.items()}
+
+    def _paso_numpy(self, factor: float):
+        c = self._vistas_numpy()
+        acelerador = np.frombuffer(self.acelerador, dtype=np.int8)
+        giro = np.frombuffer(self.giro, dtype=np.int8)
+        v, vmax = c["velocity"], c["max_speed"]
+
+        # Acelerar/Frenar, o fricción si no hay acelerador
+        friccion = c["friction"] if factor == 1.0 else c["friction"] ** factor
+        libre = np.where(np.abs(v) < 0.01, 0.0, v * friccion)
+        nueva = np.where(acelerador > 0, np.minimum(vmax, v + c["acceleration"] * factor),
+                         np.where(acelerador < 0, np.maximum(-vmax * 0.5, v - c["deceleration"] * factor),
+                                  libre))
+        v[:] = nueva
+
+        # Girar (solo si se está moviendo)
+        rapidez = np.abs(v)
+        girando = (rapidez > 0.1) & (giro != 0)
+        giro_grados = np.where(girando, giro * c["turn_rate"] * rapidez / vmax * factor, 0.0)
+        c["heading"][:] = np.mod(c["heading"] + giro_grados, 360.0)
+
+        # Actualizar posición (-90 para que 0° sea arriba)
+        angulo = np.radians(c["heading"] - 90.0)
+        avance = np.where(rapidez > 0.01, v * factor, 0.0)
+        c["x"] += avance * np.cos(angulo)
+        c["y"] += avance * np.sin(angulo)
+
+    def _paso_python(self, indices: Iterable[int], factor: float = 1.0):
+        c = self.columnas
+        xs, ys, headings, velocidades = c["x"], c["y"], c["heading"], c["velocity"]
+        maximas, aceleraciones, deceleraciones = c["max_speed"], c["acceleration"], c["deceleration"]
+        giros, fricciones = c["turn_rate"], c["friction"]
+        acelerador, giro = self.acelerador, self.giro
+        cos, sin, radians = math.cos, math.sin, math.radians
+        for i in indices:
+            v = velocidades[i]
+            vmax = maximas[i]
+            if acelerador[i] > 0:
+                v = min(vmax, v + aceleraciones[i] * factor)
+            elif acelerador[i] < 0:
+                v = max(-vmax * 0.5, v - deceleraciones[i] * factor)
+            elif abs(v) < 0.01:
+                v = 0.0
+            else:
+                v *= fricciones[i] if factor == 1.0 else fricciones[i] ** factor
+            velocidades[i] = v
+
+            heading = headings[i]
+            if giro[i] and abs(v) > 0.1:
+                heading += giro[i] * giros[i] * abs(v) / vmax * factor
+            heading %= 360
+            headings[i] = heading
+
+            if abs(v) > 0.01:
+                angulo = radians(heading - 90)
+                xs[i] += v * factor * cos(angulo)
+                ys[i] += v * factor * sin(angulo)
+
+    def limitar(self, x_min: float, y_min: float, x_max: float, y_max: float,
+                rebote: float = -0.5):
+        """Devuelve dentro del rectángulo a los camiones que se salen.
+
+        La velocidad de los que chocan con el borde se multiplica por `rebote`
+        una vez por cada eje en el que se salen.
+        """
+        if not len(self):
+            return
+        c = self.columnas
+        if NUMPY_AVAILABLE:
+            x = np.frombuffer(c["x"], dtype=np.float64)
+            y = np.frombuffer(c["y"], dtype=np.float64)
+            v = np.frombuffer(c["velocity"], dtype=np.float64)
+            fuera_x = (x < x_min) | (x > x_max)
+            fuera_y = (y < y_min) | (y > y_max)
+            np.clip(x, x_min, x_max, out=x)
+            np.clip(y, y_min, y_max, out=y)
+            v *= np.where(fuera_x, rebote, 1.0) * np.where(fuera_y, rebote, 1.0)
+            return
+        xs, ys, velocidades = c["x"], c["y"], c["velocity"]
+        for i in range(len(self)):
+            x, y = xs[i], ys[i]
+            if x < x_min or x > x_max:
+                xs[i] = x_min if x < x_min else x_max
+                velocidades[i] *= rebote
+            if y < y_min or y > y_max:
+                ys[i] = y_min if y < y_min else y_max
+                velocidades[i] *= rebote
+
+
+class PuntoVista:
+    """Posición (x, y) de un camión, leída y escrita en el motor"""
+    __slots__ = ("_motor", "_indice")
+
+    def __init__(self, motor: MotorFisicaFlota, indice: int):
+        self._motor = motor
+        self._indice = indice
+
+    @property
+    def x(self) -> float:
+        return self._motor.columnas["x"][self._indice]
+
+    @x.setter
+    def x(self, valor: float):
+        self._motor.columnas["x"][self._indice] = valor
+
+    @property
+    def y(self) -> float:
+        return self._motor.columnas["y"][self._indice]
+
+    @y.setter
+    def y(self, valor: float):
+        self._motor.columnas["y"][self._indice] = valor
+
+    def __repr__(self) -> str:
+        return f"PuntoVista(x={self.x}, y={self.y})"
+
+
+def _columna(nombre: str):
+    def leer(self):
+        return self._motor.columnas[nombre][self._indice]
+
+    def escribir(self, valor):
+        self._motor.columnas[nombre][self._indice] = valor
+
+    return property(leer, escribir)
+
+
+class TruckPhysics:
+    """Maneja la física realista de los camiones (vista de un MotorFisicaFlota)"""
+    __slots__ = ("_motor", "_indice")
+
+    def __init__(self, position, heading: float = 0, motor: Optional[MotorFisicaFlota] = None):
+        # Sin motor compartido, el camión tiene uno propio de un solo elemento
+        self._motor = motor if motor is not None else MotorFisicaFlota()
+        self._indice = self._motor.agregar(position.x, position.y, heading)
+
+    heading = _columna("heading")
+    velocity = _columna("velocity")
+    max_speed = _columna("max_speed")
+    acceleration = _columna("acceleration")
+    deceleration = _columna("deceleration")
+    turn_rate = _columna("turn_rate")
+    friction = _columna("friction")
+
+    @property
+    def motor(self) -> MotorFisicaFlota:
+        return self._motor
+
+    @property
+    def indice(self) -> int:
+        return self._indice
+
+    @property
+    def position(self) -> PuntoVista:
+        return PuntoVista(self._motor, self._indice)
+
+    @position.setter
+    def position(self, punto):
+        self._motor.columnas["x"][self._indice] = punto.x
+        self._motor.columnas["y"][self._indice] = punto.y
+
+    def fijar_controles(self, controls: Dict[str, bool]):
+        """Fija los controles que usará el próximo paso() del motor"""
+        self._motor.fijar_controles(self._indice, controls)
+
+    def interpolada(self, alfa: float):
+        """(x, y, heading) interpolados entre el paso anterior y el actual"""
+        return self._motor.interpolar(self._indice, alfa)
+
+    def update(self, controls: Dict[str, bool], dt: Optional[float] = None):
+        """Actualiza la física de este camión basada en los controles"""
+        motor, indice = self._motor, self._indice
+        motor.fijar_controles(indice, controls)
+        for nombre, columna in motor.anteriores.items():
+            columna[indice] = motor.columnas[nombre][indice]
+        motor._paso_python((indice,), 1.0 if dt is None else dt * FRECUENCIA_BASE)
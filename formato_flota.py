@@ -0,0 +1,235 @@
+"""
+Formato binario de flotas (camiones + cajas) con carga mediante mmap
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Estructura del fichero (little-endian):
+
+    Cabecera      magia, versión, nº de camiones/cajas/cadenas y offsets
+    Camiones      un registro de ancho fijo por camión (REGISTRO_CAMION)
+    Cajas         un registro de ancho fijo por caja (REGISTRO_CAJA), con las
+                  cajas de cada camión contiguas
+    Cadenas       tabla de offsets (u64) + textos UTF-8 sin separadores
+
+Los textos (matrículas, conductores, códigos, descripciones) se guardan una
+sola vez en la tabla de cadenas y los registros solo llevan su índice. Los
+números se guardan como double junto con una máscara de los que eran
+enteros, para devolverlos con el mismo tipo (50 y no 50.0).
+FlotaMapeada abre el fichero con mmap y decodifica bajo demanda: consultar un
+camión solo toca las páginas de su registro, de sus cajas y de sus cadenas.
+"""
+
+import mmap
+import struct
+from typing import Dict, Iterable, List, Optional
+
+from almacen_cajas import TablaCadenas
+from ej6_1 import BodegaLlenaError, Caja, Camion, ManifiestoCarga
+
+MAGIA = b"EDESFLOT"
+# 2: velocidad y rumbo como double y máscara de enteros en camiones y cajas
+VERSION = 2
+
+# magia, versión, reservado, nº camiones, nº cajas, nº cadenas,
+# offset camiones, offset cajas, offset cadenas
+CABECERA = struct.Struct("<8sHHIQQQQQ")
+# matrícula, conductor, descripción (índices de cadena), capacidad, rumbo,
+# velocidad, bodega (largo, ancho, altura; 0 = sin bodega), primera caja,
+# nº de cajas, máscara de enteros (capacidad, rumbo, velocidad, bodega)
+REGISTRO_CAMION = struct.Struct("<IIIddd3dQIB3x")
+# código, descripción (índices de cadena), peso, largo, ancho, altura,
+# máscara de enteros (peso, largo, ancho, altura)
+REGISTRO_CAJA = struct.Struct("<IIddddB3x")
+OFFSET_CADENA = struct.Struct("<Q")
+
+
+class FormatoFlotaError(ValueError):
+    """El fichero no es una flota válida o su versión no está soportada"""
+
+
+def _enteros(*valores) -> int:
+    """Máscara con el bit i a 1 si el valor i es un int"""
+    return sum(1 << i for i, valor in enumerate(valores) if isinstance(valor, int))
+
+
+def _con_tipo(valores: tuple, mascara: int) -> tuple:
+    """Devuelve como int los valores marcados en la máscara"""
+    return tuple(int(valor) if mascara >> i & 1 else valor for i, valor in enumerate(valores))
+
+
+def guardar_flota(ruta: str, camiones: Iterable[Camion]):
+    """Guarda los camiones y sus cajas en formato binario"""
+    camiones = list(camiones)
+    cadenas = TablaCadenas()
+    offset_camiones = CABECERA.size
+    offset_cajas = offset_camiones + REGISTRO_CAMION.size * len(camiones)
+
+    with open(ruta, "wb") as fichero:
+        fichero.write(b"\0" * CABECERA.size)
+
+        primera = 0
+        for camion in camiones:
+            bodega = camion.bodega or (0.0, 0.0, 0.0)
+            numeros = (camion.capacidad_kg, camion.rumbo, camion.velocidad, *bodega)
+            fichero.write(REGISTRO_CAMION.pack(
+                cadenas.internar(camion.matricula), cadenas.internar(camion.conductor),
+                cadenas.internar(camion.descripcion_carga), *numeros,
+                primera, len(camion.cajas), _enteros(*numeros)))
+            primera += len(camion.cajas)
+
+        empaquetar = REGISTRO_CAJA.pack
+        for camion in camiones:
+            fichero.write(b"".join(
+                empaquetar(cadenas.internar(caja.codigo), cadenas.internar(caja.descripcion_carga),
+                           caja.peso_kg, caja.largo, caja.ancho, caja.altura,
+                           _enteros(caja.peso_kg, caja.largo, caja.ancho, caja.altura))
+                for caja in camion.manifiesto.valores()))
+
+        offset_cadenas = fichero.tell()
+        textos = [texto.encode("utf-8") for texto in cadenas.cadenas]
+        posicion = 0
+        offsets = bytearray()
+        for texto in textos:
+            offsets += OFFSET_CADENA.pack(posicion)
+            posicion += len(texto)
+        offsets += OFFSET_CADENA.pack(posicion)
+        fichero.write(offsets)
+        fichero.write(b"".join(textos))
+
+        fichero.seek(0)
+        fichero.write(CABECERA.pack(MAGIA, VERSION, 0, len(camiones), primera, len(textos),
+                                    offset_camiones, offset_cajas, offset_cadenas))
+
+
+class FlotaMapeada:
+    """Flota abierta con mmap y decodificada bajo demanda"""
+
+    def __init__(self, ruta: str):
+        self._fichero = open(ruta, "rb")
+        try:
+            self._mapa = mmap.mmap(self._fichero.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._fichero.close()
+            raise FormatoFlotaError(f"{ruta} está vacío")
+        if len(self._mapa) < CABECERA.size:
+            self.cerrar()
+            raise FormatoFlotaError(f"{ruta} no es un fichero de flota")
+        (magia, version, _, self.n_camiones, self.n_cajas, self.n_cadenas,
+         self._off_camiones, self._off_cajas, self._off_cadenas) = CABECERA.unpack_from(self._mapa, 0)
+        if magia != MAGIA:
+            self.cerrar()
+            raise FormatoFlotaError(f"{ruta} no es un fichero de flota")
+        if version != VERSION:
+            self.cerrar()
+            raise FormatoFlotaError(f"Versión {version} no soportada (se esperaba {VERSION})")
+        self._off_textos = self._off_cadenas + OFFSET_CADENA.size * (self.n_cadenas + 1)
+        tamano = len(self._mapa)
+        if (self._off_camiones + REGISTRO_CAMION.size * self.n_camiones > tamano
+                or self._off_cajas + REGISTRO_CAJA.size * self.n_cajas > tamano
+                or self._off_textos > tamano
+                or self._off_textos + OFFSET_CADENA.unpack_from(self._mapa, self._off_textos - OFFSET_CADENA.size)[0] > tamano):
+            self.cerrar()
+            raise FormatoFlotaError(f"{ruta} está truncado")
+        self._indice: Optional[Dict[str, int]] = None
+
+    # ===== Acceso bajo demanda =====
+
+    def cadena(self, indice: int) -> str:
+        """Decodifica una cadena de la tabla"""
+        inicio, fin = struct.unpack_from("<QQ", self._mapa, self._off_cadenas + OFFSET_CADENA.size * indice)
+        return self._mapa[self._off_textos + inicio:self._off_textos + fin].decode("utf-8")
+
+    def _registro_camion(self, indice: int) -> tuple:
+        if not 0 <= indice < self.n_camiones:
+            raise IndexError("Camión fuera de rango")
+        registro = REGISTRO_CAMION.unpack_from(self._mapa, self._off_camiones + REGISTRO_CAMION.size * indice)
+        if registro[9] + registro[10] > self.n_cajas:
+            raise FormatoFlotaError(f"Las cajas del camión {indice} se salen de la tabla")
+        return registro
+
+    def matricula(self, indice: int) -> str:
+        return self.cadena(self._registro_camion(indice)[0])
+
+    def buscar(self, matricula: str) -> Optional[int]:
+        """Índice del camión con esa matrícula (el índice se crea la primera vez)"""
+        if self._indice is None:
+            self._indice = {self.matricula(i): i for i in range(self.n_camiones)}
+        return self._indice.get(matricula)
+
+    def peso_total(self, indice: int) -> float:
+        """Peso cargado en un camión, leyendo solo los pesos de sus cajas"""
+        registro = self._registro_camion(indice)
+        primera, n = registro[9], registro[10]
+        inicio = self._off_cajas + REGISTRO_CAJA.size * primera
+        tramo = memoryview(self._mapa)[inicio:inicio + REGISTRO_CAJA.size * n]
+        try:
+            return sum(int(campos[2]) if campos[6] & 1 else campos[2]
+                       for campos in REGISTRO_CAJA.iter_unpack(tramo))
+        finally:
+            tramo.release()
+
+    def cajas(self, indice: int) -> List[Caja]:
+        """Decodifica las cajas de un camión"""
+        registro = self._registro_camion(indice)
+        primera, n = registro[9], registro[10]
+        inicio = self._off_cajas + REGISTRO_CAJA.size * primera
+        tramo = memoryview(self._mapa)[inicio:inicio + REGISTRO_CAJA.size * n]
+        cadena = self.cadena
+        try:
+            cajas = []
+            for codigo, descripcion, peso, largo, ancho, altura, mascara in REGISTRO_CAJA.iter_unpack(tramo):
+                if mascara:
+                    peso, largo, ancho, altura = _con_tipo((peso, largo, ancho, altura), mascara)
+                cajas.append(Caja(cadena(codigo), peso, cadena(descripcion), largo, ancho, altura))
+            return cajas
+        finally:
+            tramo.release()
+
+    def camion(self, indice: int) -> Camion:
+        """Reconstruye un Camion con todas sus cajas"""
+        (matricula, conductor, descripcion, *numeros, _, _, mascara) = self._registro_camion(indice)
+        capacidad, rumbo, velocidad, largo, ancho, altura = _con_tipo(tuple(numeros), mascara)
+        bodega = (largo, ancho, altura) if largo > 0 else None
+        camion = Camion(self.cadena(matricula), self.cadena(conductor), capacidad,
+                        self.cadena(descripcion), 1, velocidad, bodega=bodega)
+        # El rumbo se restaura tal cual, sin volver a validarlo: el simulador
+        # lo pone con int(heading) y puede valer 0
+        camion.rumbo = rumbo
+        cajas = self.cajas(indice)
+        try:
+            camion.cajas = cajas
+        except BodegaLlenaError:
+            # Otro orden de carga puede no caber igual: se conservan los datos
+            # guardados y el camión deja de controlar la bodega, que ya no
+            # refleja la colocación real
+            camion.bodega = None
+            camion.manifiesto = ManifiestoCarga(cajas, observadores=camion.observadores)
+        return camion
+
+    def __getitem__(self, indice: int) -> Camion:
+        return self.camion(indice)
+
+    def __iter__(self):
+        for indice in range(self.n_camiones):
+            yield self.camion(indice)
+
+    def __len__(self) -> int:
+        return self.n_camiones
+
+    # ===== Cierre =====
+
+    def cerrar(self):
+        self._mapa.close()
+        self._fichero.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def cargar_flota(ruta: str) -> List[Camion]:
+    """Carga todos los camiones de un fichero de flota"""
+    with FlotaMapeada(ruta) as flota:
+        return list(flota)
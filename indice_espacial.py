@@ -0,0 +1,263 @@
+"""
+Índice espacial de la red de carreteras
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Rejilla uniforme sobre las cajas envolventes de los segmentos (ensanchadas
+con la mitad del ancho de la carretera): cada celda guarda los segmentos
+que pueden cubrirla. Saber si un punto está sobre el asfalto solo mira los
+pocos segmentos de su celda, y el segmento más cercano se busca en anillos
+de celdas alrededor del punto, parando en cuanto ninguna celda más lejana
+puede mejorar el resultado.
+
+Los segmentos son cualquier objeto con start, end (con .x e .y) y width,
+como RoadSegment. El asfalto de un segmento son los puntos a menos de
+width / 2 de su eje (extremos redondeados, igual que se dibujan).
+
+HashEspacial indexa puntos sueltos (por ejemplo, paquetes por su punto de
+recogida) en una rejilla de diccionarios que se actualiza al insertar o
+quitar cada punto. Las consultas por radio y de los k más cercanos solo
+recorren las celdas que pueden contener resultados.
+"""
+
+import heapq
+import math
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Lado (px) de las celdas de la rejilla
+TAMANO_CELDA = 64.0
+
+
+def _anillo(cx: int, cy: int, radio: int):
+    """Celdas a distancia de Chebyshev exactamente `radio` de (cx, cy)"""
+    if radio == 0:
+        yield cx, cy
+        return
+    for dx in range(-radio, radio + 1):
+        yield cx + dx, cy - radio
+        yield cx + dx, cy + radio
+    for dy in range(-radio + 1, radio):
+        yield cx - radio, cy + dy
+        yield cx + radio, cy + dy
+
+
+class IndiceCarreteras:
+    """Rejilla uniforme de segmentos de carretera"""
+
+    def __init__(self, segmentos: Iterable = (), celda: float = TAMANO_CELDA):
+        if celda <= 0:
+            raise ValueError("El tamaño de celda debe ser positivo")
+        self.celda = celda
+        self.segmentos: List = []
+        # Por segmento: x1, y1, dx, dy, 1/longitud², semiancho
+        self._geometria: List[Tuple[float, float, float, float, float, float]] = []
+        self._celdas: Dict[Tuple[int, int], List[int]] = {}
+        self._limites: Optional[List[int]] = None  # Celdas ocupadas: [cx_min, cy_min, cx_max, cy_max]
+        for segmento in segmentos:
+            self.agregar(segmento)
+
+    def __len__(self) -> int:
+        return len(self.segmentos)
+
+    def agregar(self, segmento) -> int:
+        """Indexa un segmento y devuelve su posición en self.segmentos"""
+        x1, y1 = segmento.start.x, segmento.start.y
+        dx, dy = segmento.end.x - x1, segmento.end.y - y1
+        longitud2 = dx * dx + dy * dy
+        semiancho = segmento.width / 2
+        indice = len(self.segmentos)
+        self.segmentos.append(segmento)
+        self._geometria.append((x1, y1, dx, dy, 1.0 / longitud2 if longitud2 else 0.0, semiancho))
+
+        celda = self.celda
+        cx0 = math.floor((min(x1, x1 + dx) - semiancho) / celda)
+        cx1 = math.floor((max(x1, x1 + dx) + semiancho) / celda)
+        cy0 = math.floor((min(y1, y1 + dy) - semiancho) / celda)
+        cy1 = math.floor((max(y1, y1 + dy) + semiancho) / celda)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self._celdas.setdefault((cx, cy), []).append(indice)
+
+        if self._limites is None:
+            self._limites = [cx0, cy0, cx1, cy1]
+        else:
+            limites = self._limites
+            limites[0], limites[1] = min(limites[0], cx0), min(limites[1], cy0)
+            limites[2], limites[3] = max(limites[2], cx1), max(limites[3], cy1)
+        return indice
+
+    # ===== Consultas =====
+
+    def _proyectar(self, indice: int, x: float, y: float) -> Tuple[float, float, float]:
+        """(distancia al eje, x, y del punto del eje más cercano)"""
+        x1, y1, dx, dy, inverso, _ = self._geometria[indice]
+        t = ((x - x1) * dx + (y - y1) * dy) * inverso
+        t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+        px, py = x1 + t * dx, y1 + t * dy
+        return math.hypot(x - px, y - py), px, py
+
+    def carretera_en(self, x: float, y: float):
+        """Segmento sobre cuyo asfalto está el punto, o None"""
+        clave = (math.floor(x / self.celda), math.floor(y / self.celda))
+        for indice in self._celdas.get(clave, ()):
+            if self._proyectar(indice, x, y)[0] <= self._geometria[indice][5]:
+                return self.segmentos[indice]
+        return None
+
+    def mas_cercano(self, x: float, y: float, radio_max: float = math.inf):
+        """(segmento, distancia al asfalto, punto del eje más cercano) o None.
+
+        La distancia es 0 o negativa si el punto ya está sobre el asfalto.
+        Solo se buscan segmentos a menos de `radio_max` del punto.
+        """
+        if self._limites is None:
+            return None
+        celda = self.celda
+        cx, cy = math.floor(x / celda), math.floor(y / celda)
+        cx_min, cy_min, cx_max, cy_max = self._limites
+        # Anillo a partir del cual ya no queda ninguna celda ocupada
+        ultimo = max(cx - cx_min, cx_max - cx, cy - cy_min, cy_max - cy, 0)
+        mejor, mejor_distancia, mejor_punto = None, math.inf, None
+        vistos = set()
+        anillo = 0
+        while anillo <= ultimo:
+            # Todo lo que quede más allá de este anillo está a más de (anillo * celda)
+            if min(mejor_distancia, radio_max) <= (anillo - 1) * celda:
+                break
+            for clave in _anillo(cx, cy, anillo):
+                for indice in self._celdas.get(clave, ()):
+                    if indice in vistos:
+                        continue
+                    vistos.add(indice)
+                    distancia, px, py = self._proyectar(indice, x, y)
+                    distancia -= self._geometria[indice][5]
+                    if distancia < mejor_distancia:
+                        mejor, mejor_distancia, mejor_punto = indice, distancia, (px, py)
+            anillo += 1
+        if mejor is None or mejor_distancia > radio_max:
+            return None
+        return self.segmentos[mejor], mejor_distancia, mejor_punto
+
+    def ajustar(self, x: float, y: float, holgura: float = 0.5) -> Optional[Tuple[float, float]]:
+        """Punto del asfalto más cercano si (x, y) está fuera; None si ya está dentro.
+
+        El punto devuelto queda `holgura` px dentro del borde.
+        """
+        if self.carretera_en(x, y) is not None:
+            return None
+        cercano = self.mas_cercano(x, y)
+        if cercano is None:
+            return None
+        segmento, distancia, (px, py) = cercano
+        dentro = segmento.width / 2 - holgura
+        eje = distancia + segmento.width / 2
+        if eje <= 0:
+            return px, py
+        return px + (x - px) * dentro / eje, py + (y - py) * dentro / eje
+
+
+class HashEspacial:
+    """Rejilla de puntos con clave, actualizable punto a punto"""
+
+    def __init__(self, celda: float = TAMANO_CELDA):
+        if celda <= 0:
+            raise ValueError("El tamaño de celda debe ser positivo")
+        self.celda = celda
+        self._puntos: Dict[Hashable, Tuple[float, float]] = {}
+        # Celda -> claves (dict y no set para que el orden sea reproducible)
+        self._celdas: Dict[Tuple[int, int], Dict[Hashable, None]] = {}
+        # Celdas ocupadas alguna vez: [cx_min, cy_min, cx_max, cy_max] (solo crece)
+        self._limites: Optional[List[int]] = None
+
+    def _celda(self, x: float, y: float) -> Tuple[int, int]:
+        return math.floor(x / self.celda), math.floor(y / self.celda)
+
+    def __len__(self) -> int:
+        return len(self._puntos)
+
+    def __contains__(self, clave) -> bool:
+        return clave in self._puntos
+
+    def posicion(self, clave) -> Tuple[float, float]:
+        return self._puntos[clave]
+
+    def insertar(self, clave, x: float, y: float):
+        """Añade un punto (o lo mueve si la clave ya estaba)"""
+        if clave in self._puntos:
+            self.quitar(clave)
+        self._puntos[clave] = (x, y)
+        cx, cy = self._celda(x, y)
+        self._celdas.setdefault((cx, cy), {})[clave] = None
+        if self._limites is None:
+            self._limites = [cx, cy, cx, cy]
+        else:
+            limites = self._limites
+            limites[0], limites[1] = min(limites[0], cx), min(limites[1], cy)
+            limites[2], limites[3] = max(limites[2], cx), max(limites[3], cy)
+
+    def quitar(self, clave) -> bool:
+        """Quita un punto; devuelve False si no estaba"""
+        punto = self._puntos.pop(clave, None)
+        if punto is None:
+            return False
+        celda = self._celda(*punto)
+        claves = self._celdas[celda]
+        del claves[clave]
+        if not claves:
+            del self._celdas[celda]
+        if not self._puntos:
+            self._limites = None
+        return True
+
+    # ===== Consultas =====
+
+    def en_radio(self, x: float, y: float, radio: float) -> List[Tuple[float, Hashable]]:
+        """(distancia, clave) de los puntos a menos de `radio`, del más cercano al más lejano"""
+        cx0, cy0 = self._celda(x - radio, y - radio)
+        cx1, cy1 = self._celda(x + radio, y + radio)
+        puntos, celdas = self._puntos, self._celdas
+        resultado = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for clave in celdas.get((cx, cy), ()):
+                    px, py = puntos[clave]
+                    distancia = math.hypot(px - x, py - y)
+                    if distancia < radio:
+                        resultado.append((distancia, clave))
+        resultado.sort(key=lambda par: par[0])
+        return resultado
+
+    def mas_cercanos(self, x: float, y: float, k: int = 1, radio_max: float = math.inf,
+                     filtro: Optional[Callable[[Hashable], bool]] = None) -> List[Tuple[float, Hashable]]:
+        """(distancia, clave) de los k puntos más cercanos que pasan el filtro.
+
+        Recorre anillos de celdas desde la del punto y para en cuanto el
+        siguiente anillo ya no puede mejorar los k encontrados.
+        """
+        if k <= 0 or self._limites is None:
+            return []
+        puntos, celdas, celda = self._puntos, self._celdas, self.celda
+        cx, cy = self._celda(x, y)
+        cx_min, cy_min, cx_max, cy_max = self._limites
+        # Anillo a partir del cual ya no puede quedar ninguna celda ocupada
+        ultimo = max(cx - cx_min, cx_max - cx, cy - cy_min, cy_max - cy, 0)
+        mejores: List[Tuple[float, int, Hashable]] = []  # Montículo con la distancia negada
+        orden = 0  # Desempata por orden de llegada para que el resultado sea reproducible
+        anillo = 0
+        while anillo <= ultimo:
+            limite = radio_max if len(mejores) < k else min(radio_max, -mejores[0][0])
+            if (anillo - 1) * celda >= limite:
+                break
+            for clave_celda in _anillo(cx, cy, anillo):
+                for clave in celdas.get(clave_celda, ()):
+                    px, py = puntos[clave]
+                    distancia = math.hypot(px - x, py - y)
+                    if distancia >= radio_max or (filtro is not None and not filtro(clave)):
+                        continue
+                    orden += 1
+                    if len(mejores) < k:
+                        heapq.heappush(mejores, (-distancia, -orden, clave))
+                    elif distancia < -mejores[0][0]:
+                        heapq.heapreplace(mejores, (-distancia, -orden, clave))
+            anillo += 1
+        return [(-distancia, clave) for distancia, _, clave in sorted(mejores, reverse=True)]
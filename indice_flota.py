@@ -0,0 +1,209 @@
+"""
+Índice global de cajas de toda la flota
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Responde en O(1) a "¿qué camión lleva la caja C123?" sin recorrer los
+manifiestos. El índice se suscribe a los manifiestos de los camiones
+registrados, así que se mantiene al día con cualquier alta o baja (add_caja,
+add_cajas, quitar_caja, sustituir Camion.cajas...), y además impide que un
+mismo código esté cargado en dos camiones a la vez.
+
+Cada camión solo tiene su propio cerrojo, así que dos hilos pueden estar
+cargando el mismo código en dos camiones a la vez. Para que no pasen los
+dos, al validar una caja el código queda reservado para ese camión (con el
+cerrojo del índice) hasta el "alta" o hasta que la carga se cancela; otro
+camión que lo intente mientras tanto recibe CajaDuplicadaError.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional
+
+from ej6_1 import BodegaLlenaError, CajaDuplicadaError, Camion
+
+
+@dataclass
+class UbicacionCaja:
+    """Dónde está una caja: camión y caja cargada"""
+    camion: Camion
+    caja: object
+
+    @property
+    def colocacion(self):
+        """Posición dentro de la bodega, o None si el camión no la controla"""
+        empaquetador = self.camion.manifiesto.empaquetador
+        if empaquetador is None:
+            return None
+        return empaquetador.colocaciones.get(self.caja.codigo)
+
+
+class IndiceFlota:
+    """Índice codigo -> (camión, caja) de todos los camiones registrados"""
+
+    def __init__(self, camiones: Iterable[Camion] = ()):
+        self._ubicaciones: Dict[str, UbicacionCaja] = {}
+        self._camiones: Dict[str, Camion] = {}
+        self._observadores: Dict[str, callable] = {}
+        # Protege ubicaciones, reservas y transferencias entre hilos
+        self._cerrojo = threading.RLock()
+        self._reservas: Dict[str, Camion] = {}  # Código validado y aún sin alta -> camión
+        self._transfiriendo: Dict[str, Camion] = {}  # Código en transferencia -> camión destino
+        for camion in camiones:
+            self.registrar(camion)
+
+    # ===== Camiones =====
+
+    def registrar(self, camion: Camion):
+        """Empieza a indexar un camión y las cajas que ya lleva"""
+        with camion.cerrojo, self._cerrojo:
+            if camion.matricula in self._camiones:
+                raise ValueError(f"El camión {camion.matricula} ya está en el índice")
+            # Comprobar todas las cajas antes de indexar ninguna
+            for caja in camion.manifiesto.valores():
+                self._comprobar(camion, caja.codigo)
+
+            def observador(evento: str, caja, camion=camion):
+                self._al_cambiar(camion, evento, caja)
+
+            camion.observadores.append(observador)
+            self._camiones[camion.matricula] = camion
+            self._observadores[camion.matricula] = observador
+            for caja in camion.manifiesto.valores():
+                self._ubicaciones[caja.codigo] = UbicacionCaja(camion, caja)
+
+    def retirar(self, camion: Camion):
+        """Deja de indexar un camión (sus cajas desaparecen del índice)"""
+        with camion.cerrojo, self._cerrojo:
+            if self._camiones.get(camion.matricula) is not camion:
+                raise KeyError(camion.matricula)
+            camion.observadores.remove(self._observadores.pop(camion.matricula))
+            del self._camiones[camion.matricula]
+            for caja in camion.manifiesto.valores():
+                ubicacion = self._ubicaciones.get(caja.codigo)
+                if ubicacion is not None and ubicacion.camion is camion:
+                    del self._ubicaciones[caja.codigo]
+
+    def reconstruir(self, camiones: Optional[Iterable[Camion]] = None):
+        """Reconstruye el índice desde cero (por defecto, con los mismos camiones)"""
+        camiones = list(self._camiones.values() if camiones is None else camiones)
+        for camion in list(self._camiones.values()):
+            self.retirar(camion)
+        self._ubicaciones.clear()
+        for camion in camiones:
+            self.registrar(camion)
+
+    @property
+    def camiones(self) -> Dict[str, Camion]:
+        """Camiones registrados por matrícula (no modificar)"""
+        return self._camiones
+
+    # ===== Consultas =====
+
+    def ubicacion(self, codigo: str) -> Optional[UbicacionCaja]:
+        """Camión y caja con ese código, o None si no está cargada"""
+        return self._ubicaciones.get(codigo)
+
+    def localizar(self, codigo: str) -> Optional[Camion]:
+        """Camión que lleva la caja con ese código, o None"""
+        ubicacion = self._ubicaciones.get(codigo)
+        return ubicacion.camion if ubicacion is not None else None
+
+    def __contains__(self, codigo: str) -> bool:
+        return codigo in self._ubicaciones
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ubicaciones)
+
+    def __len__(self) -> int:
+        return len(self._ubicaciones)
+
+    # ===== Transferencias =====
+
+    def transferir(self, codigo: str, destino: Camion,
+                   eventos=None) -> bool:
+        """Pasa una caja de su camión actual a `destino`.
+
+        Primero se carga en el destino y solo si lo acepta (capacidad, bodega
+        y código libre) se descarga del origen, así que nunca queda a medias.
+        Devuelve True si la caja acabó en el destino.
+        """
+        if self._camiones.get(destino.matricula) is not destino:
+            raise ValueError(f"El camión {destino.matricula} no está en el índice")
+        while True:
+            ubicacion = self._ubicaciones.get(codigo)
+            if ubicacion is None:
+                raise KeyError(f"La caja {codigo} no está en ningún camión")
+            origen, caja = ubicacion.camion, ubicacion.caja
+            if origen is destino:
+                return True
+            # Cerrojos siempre en el mismo orden para no bloquearse con otra transferencia
+            primero, segundo = sorted((origen, destino), key=lambda camion: camion.matricula)
+            with primero.cerrojo, segundo.cerrojo:
+                # Otra transferencia pudo mover la caja antes de tener los cerrojos:
+                # se vuelve a empezar desde donde esté ahora
+                actual = self._ubicaciones.get(codigo)
+                if actual is None or actual.camion is not origen:
+                    continue
+                if not destino.puede_cargar(caja.peso_kg):
+                    if eventos:
+                        eventos(f"⚠️ La caja {codigo} excede la capacidad del camión {destino.matricula}")
+                    return False
+
+                # Solo el destino puede validar el código mientras sigue en el origen
+                with self._cerrojo:
+                    self._transfiriendo[codigo] = destino
+                try:
+                    destino.manifiesto.agregar(caja)
+                except BodegaLlenaError:
+                    if eventos:
+                        eventos(f"⚠️ La caja {codigo} no cabe en la bodega del camión {destino.matricula}")
+                    return False
+                except CajaDuplicadaError as e:
+                    if eventos:
+                        eventos(f"⚠️ {e}")
+                    return False
+                finally:
+                    with self._cerrojo:
+                        self._transfiriendo.pop(codigo, None)
+                origen.quitar_caja(codigo)
+            if eventos:
+                eventos(f"🔁 Caja {codigo} pasada de {origen.matricula} a {destino.matricula}")
+            return True
+
+    # ===== Observador de manifiestos =====
+
+    def _comprobar(self, camion: Camion, codigo: str):
+        """CajaDuplicadaError si el código está en otro camión o reservado por otro"""
+        ubicacion = self._ubicaciones.get(codigo)
+        if (ubicacion is not None and ubicacion.camion is not camion
+                and self._transfiriendo.get(codigo) is not camion):
+            raise CajaDuplicadaError(
+                f"La caja {codigo} ya está cargada en el camión {ubicacion.camion.matricula}")
+        reservada = self._reservas.get(codigo)
+        if reservada is not None and reservada is not camion:
+            raise CajaDuplicadaError(f"La caja {codigo} se está cargando en el camión {reservada.matricula}")
+
+    def _validar(self, camion: Camion, caja):
+        """Comprueba el código y lo reserva para el camión hasta el alta o la cancelación"""
+        with self._cerrojo:
+            self._comprobar(camion, caja.codigo)
+            self._reservas[caja.codigo] = camion
+
+    def _al_cambiar(self, camion: Camion, evento: str, caja):
+        if evento == "validar":
+            self._validar(camion, caja)
+            return
+        with self._cerrojo:
+            if evento == "alta":
+                self._ubicaciones[caja.codigo] = UbicacionCaja(camion, caja)
+                if self._reservas.get(caja.codigo) is camion:
+                    del self._reservas[caja.codigo]
+            elif evento == "cancelar":
+                if self._reservas.get(caja.codigo) is camion:
+                    del self._reservas[caja.codigo]
+            elif evento == "baja":
+                ubicacion = self._ubicaciones.get(caja.codigo)
+                # Durante una transferencia el código ya apunta al destino
+                if ubicacion is not None and ubicacion.camion is camion:
+                    del self._ubicaciones[caja.codigo]
@@ -0,0 +1,306 @@
+"""
+Ingesta en streaming de cajas y camiones desde CSV o JSONL
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Cadena de generadores: leer filas -> validar -> agrupar en lotes -> cargar.
+Nunca se materializa el fichero completo, así que la memoria no depende del
+número de filas. Las filas inválidas o rechazadas se envían a un canal
+aparte (cualquier función que reciba un RechazoIngesta).
+
+Columnas de cajas: codigo, peso_kg, descripcion_carga, largo, ancho, altura
+y, opcionalmente, matricula (camión en el que cargarla).
+Columnas de camiones: matricula, conductor, capacidad_kg, descripcion_carga,
+rumbo, velocidad y, opcionalmente, largo_bodega, ancho_bodega, altura_bodega.
+"""
+
+import csv
+import json
+import math
+import os
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ej6_1 import Caja, Camion
+
+TAMANO_LOTE = 10_000
+
+
+@dataclass
+class RechazoIngesta:
+    """Fila que no se pudo cargar"""
+    linea: int
+    fila: dict
+    motivo: str
+
+
+@dataclass
+class EstadisticasIngesta:
+    """Resumen de una ingesta"""
+    filas: int = 0
+    cargadas: int = 0
+    rechazadas: int = 0
+    segundos: float = 0.0
+
+    @property
+    def filas_por_segundo(self) -> float:
+        return self.filas / self.segundos if self.segundos > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"📥 {self.filas} filas: {self.cargadas} cargadas, {self.rechazadas} rechazadas "
+                f"en {self.segundos:.2f} s ({self.filas_por_segundo:.0f} filas/s)")
+
+
+class ArchivoRechazos:
+    """Canal de rechazos que los escribe en un fichero JSONL"""
+
+    def __init__(self, ruta: str):
+        self._fichero = open(ruta, "w", encoding="utf-8")
+
+    def __call__(self, rechazo: RechazoIngesta):
+        self._fichero.write(json.dumps({"linea": rechazo.linea, "motivo": rechazo.motivo,
+                                        "fila": rechazo.fila}, ensure_ascii=False) + "\n")
+
+    def cerrar(self):
+        self._fichero.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+# ===== Etapas =====
+
+def leer_filas(ruta: str) -> Iterator[Tuple[int, dict, Optional[str]]]:
+    """Genera (nº de línea, fila, error) de un CSV con cabecera o de un JSONL.
+
+    `error` es None salvo en las líneas JSONL que no son un objeto válido;
+    entonces la fila solo lleva el texto original ({"_texto": ...}).
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    with open(ruta, newline="", encoding="utf-8") as fichero:
+        if extension == ".csv":
+            for linea, fila in enumerate(csv.DictReader(fichero), 2):
+                yield linea, fila, None
+        elif extension in (".jsonl", ".ndjson"):
+            for linea, texto in enumerate(fichero, 1):
+                if not texto.strip():
+                    continue
+                try:
+                    fila = json.loads(texto)
+                except json.JSONDecodeError as e:
+                    yield linea, {"_texto": texto.rstrip("\n")}, str(e)
+                    continue
+                # Cada línea tiene que ser un objeto (no una lista, texto o número)
+                if not isinstance(fila, dict):
+                    yield linea, {"_texto": texto.rstrip("\n")}, f"se esperaba un objeto, no {type(fila).__name__}"
+                    continue
+                yield linea, fila, None
+        else:
+            raise ValueError(f"Formato no soportado: {ruta} (usa .csv o .jsonl)")
+
+
+def _numero(fila: dict, campo: str, tipo=float, minimo: Optional[float] = None,
+            positivo: bool = False):
+    """Número finito del campo; con positivo=True, además mayor que 0.
+
+    Con tipo=int se aceptan también "90" o "90.0", pero no 90.5.
+    """
+    valor = fila.get(campo)
+    if valor is None or valor == "":
+        raise ValueError(f"Falta el campo {campo}")
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{campo} no es un número: {valor!r}")
+    if (not math.isfinite(numero) or (minimo is not None and numero < minimo)
+            or (positivo and numero <= 0)):
+        raise ValueError(f"{campo} fuera de rango: {valor!r}")
+    if tipo is int:
+        if not numero.is_integer():
+            raise ValueError(f"{campo} no es un entero: {valor!r}")
+        return int(numero)
+    return numero
+
+
+def _texto(fila: dict, campo: str, obligatorio: bool = True) -> str:
+    valor = fila.get(campo)
+    texto = "" if valor is None else str(valor).strip()
+    if obligatorio and not texto:
+        raise ValueError(f"Falta el campo {campo}")
+    return texto
+
+
+def validar_cajas(filas: Iterable[Tuple[int, dict, Optional[str]]],
+                  rechazos: Callable[[RechazoIngesta], None]) -> Iterator[Tuple[int, dict, Caja]]:
+    """Convierte filas en Caja; las inválidas van al canal de rechazos"""
+    for linea, fila, error in filas:
+        try:
+            if error is not None:
+                raise ValueError(f"JSON inválido: {error}")
+            caja = Caja(_texto(fila, "codigo"), _numero(fila, "peso_kg", minimo=0),
+                        _texto(fila, "descripcion_carga", obligatorio=False),
+                        _numero(fila, "largo", minimo=0), _numero(fila, "ancho", minimo=0),
+                        _numero(fila, "altura", minimo=0))
+        except ValueError as e:
+            rechazos(RechazoIngesta(linea, fila, str(e)))
+            continue
+        yield linea, fila, caja
+
+
+def validar_camiones(filas: Iterable[Tuple[int, dict, Optional[str]]],
+                     rechazos: Callable[[RechazoIngesta], None]) -> Iterator[Tuple[int, dict, Camion]]:
+    """Convierte filas en Camion; las inválidas van al canal de rechazos"""
+    for linea, fila, error in filas:
+        try:
+            if error is not None:
+                raise ValueError(f"JSON inválido: {error}")
+            bodega = None
+            if _texto(fila, "largo_bodega", obligatorio=False):
+                bodega = (_numero(fila, "largo_bodega", minimo=0), _numero(fila, "ancho_bodega", minimo=0),
+                          _numero(fila, "altura_bodega", minimo=0))
+            camion = Camion(_texto(fila, "matricula"), _texto(fila, "conductor"),
+                            _numero(fila, "capacidad_kg", positivo=True),
+                            _texto(fila, "descripcion_carga", obligatorio=False),
+                            _numero(fila, "rumbo", int), _numero(fila, "velocidad", int, minimo=0),
+                            bodega=bodega)
+        except ValueError as e:
+            rechazos(RechazoIngesta(linea, fila, str(e)))
+            continue
+        yield linea, fila, camion
+
+
+def en_lotes(elementos: Iterable, tamano: int = TAMANO_LOTE) -> Iterator[list]:
+    """Agrupa un iterable en listas de como mucho `tamano` elementos"""
+    iterador = iter(elementos)
+    while True:
+        lote = list(islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+class _Contador:
+    """Envuelve el canal de rechazos para contar lo que pasa por él"""
+
+    def __init__(self, destino: Optional[Callable[[RechazoIngesta], None]]):
+        self.destino = destino
+        self.total = 0
+
+    def __call__(self, rechazo: RechazoIngesta):
+        self.total += 1
+        if self.destino is not None:
+            self.destino(rechazo)
+
+
+def _contar_filas(filas: Iterable[Tuple[int, dict, Optional[str]]], estadisticas: EstadisticasIngesta):
+    for elemento in filas:
+        estadisticas.filas += 1
+        yield elemento
+
+
+# ===== Cargas completas =====
+
+def cargar_camiones(ruta: str, rechazos: Optional[Callable[[RechazoIngesta], None]] = None
+                    ) -> Tuple[Dict[str, Camion], EstadisticasIngesta]:
+    """Carga los camiones de un fichero (matrícula -> Camion)"""
+    estadisticas = EstadisticasIngesta()
+    contador = _Contador(rechazos)
+    inicio = time.perf_counter()
+    camiones: Dict[str, Camion] = {}
+    for linea, fila, camion in validar_camiones(_contar_filas(leer_filas(ruta), estadisticas), contador):
+        if camion.matricula in camiones:
+            contador(RechazoIngesta(linea, fila, f"Matrícula {camion.matricula} repetida"))
+            continue
+        camiones[camion.matricula] = camion
+        estadisticas.cargadas += 1
+    estadisticas.rechazadas = contador.total
+    estadisticas.segundos = time.perf_counter() - inicio
+    return camiones, estadisticas
+
+
+def cargar_cajas(ruta: str, destino, rechazos: Optional[Callable[[RechazoIngesta], None]] = None,
+                 tamano_lote: int = TAMANO_LOTE,
+                 progreso: Optional[Callable[[EstadisticasIngesta], None]] = None) -> EstadisticasIngesta:
+    """Carga las cajas de un fichero por lotes en memoria constante.
+
+    `destino` puede ser:
+    - un Camion: cada lote se carga con add_cajas;
+    - un dict matrícula -> Camion: cada caja va al camión de su columna matricula;
+    - cualquier objeto con extender() (por ejemplo un AlmacenCajas).
+    `progreso` se llama tras cada lote con las estadísticas acumuladas.
+    """
+    estadisticas = EstadisticasIngesta()
+    contador = _Contador(rechazos)
+    inicio = time.perf_counter()
+    validadas = validar_cajas(_contar_filas(leer_filas(ruta), estadisticas), contador)
+
+    for lote in en_lotes(validadas, tamano_lote):
+        if isinstance(destino, Camion):
+            _cargar_en_camion(destino, lote, contador)
+        elif isinstance(destino, dict):
+            por_camion: Dict[str, List[tuple]] = {}
+            for linea, fila, caja in lote:
+                matricula = _texto(fila, "matricula", obligatorio=False)
+                if matricula not in destino:
+                    contador(RechazoIngesta(linea, fila, f"Camión desconocido: {matricula!r}"))
+                    continue
+                por_camion.setdefault(matricula, []).append((linea, fila, caja))
+            for matricula, elementos in por_camion.items():
+                _cargar_en_camion(destino[matricula], elementos, contador)
+        else:
+            for linea, fila, caja in lote:
+                try:
+                    destino.extender([caja])
+                except ValueError as e:
+                    contador(RechazoIngesta(linea, fila, str(e)))
+        estadisticas.rechazadas = contador.total
+        estadisticas.cargadas = estadisticas.filas - contador.total
+        estadisticas.segundos = time.perf_counter() - inicio
+        if progreso is not None:
+            progreso(estadisticas)
+
+    estadisticas.rechazadas = contador.total
+    estadisticas.cargadas = estadisticas.filas - contador.total
+    estadisticas.segundos = time.perf_counter() - inicio
+    return estadisticas
+
+
+def _cargar_en_camion(camion: Camion, elementos: List[tuple], rechazos: _Contador):
+    resultado = camion.add_cajas(caja for _, _, caja in elementos)
+    if resultado.rechazadas:
+        origen = {id(caja): (linea, fila) for linea, fila, caja in elementos}
+        for rechazo in resultado.rechazadas:
+            linea, fila = origen[id(rechazo.caja)]
+            rechazos(RechazoIngesta(linea, fila, f"{rechazo.motivo.value}: {rechazo.detalle}"))
+
+
+def main():
+    """Carga un fichero de camiones y otro de cajas e informa del rendimiento"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingesta de camiones y cajas desde CSV/JSONL")
+    parser.add_argument("camiones", help="Fichero de camiones (.csv o .jsonl)")
+    parser.add_argument("cajas", help="Fichero de cajas con columna matricula (.csv o .jsonl)")
+    parser.add_argument("--rechazos", help="Fichero JSONL donde guardar las filas rechazadas")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="Filas por lote")
+    args = parser.parse_args()
+
+    canal = ArchivoRechazos(args.rechazos) if args.rechazos else None
+    try:
+        camiones, estadisticas = cargar_camiones(args.camiones, canal)
+        print(f"🚛 Camiones: {estadisticas}")
+        estadisticas = cargar_cajas(args.cajas, camiones, canal, args.lote,
+                                    progreso=lambda e: print(f"   ... {e}"))
+        print(f"📦 Cajas: {estadisticas}")
+    finally:
+        if canal is not None:
+            canal.cerrar()
+
+
+if __name__ == "__main__":
+    main()
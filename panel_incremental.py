@@ -0,0 +1,150 @@
+"""
+Actualización incremental de los widgets de los paneles laterales
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Cada clase recuerda lo que muestra su widget y, al recibir el contenido
+nuevo, solo toca lo que ha cambiado: una etiqueta no se reconfigura si el
+texto es el mismo, un Text solo reescribe las líneas distintas y un Listbox
+solo las filas distintas. ListaVirtual muestra una secuencia enorme (por
+ejemplo, las cajas de un camión) formateando únicamente las filas visibles.
+
+Todas cuentan las operaciones hechas sobre los widgets en `cambios`, para
+poder comprobar que el coste depende de lo que cambia y no del tamaño.
+"""
+
+import tkinter as tk
+from typing import Callable, Dict, List, Sequence
+
+
+class TextosEtiquetas:
+    """Fija el texto de etiquetas solo cuando cambia"""
+
+    def __init__(self):
+        self._textos: Dict[int, str] = {}
+        self.cambios = 0
+
+    def fijar(self, etiqueta, texto: str):
+        if self._textos.get(id(etiqueta)) != texto:
+            etiqueta.config(text=texto)
+            self._textos[id(etiqueta)] = texto
+            self.cambios += 1
+
+
+class LineasTexto:
+    """Text de solo lectura que se actualiza línea a línea"""
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.lineas: List[str] = []
+        self.cambios = 0
+
+    def mostrar(self, lineas: Sequence[str]):
+        """Muestra `lineas` (sin saltos de línea) reescribiendo solo las distintas"""
+        anteriores = self.lineas
+        distintas = [i for i, linea in enumerate(lineas[:len(anteriores)]) if anteriores[i] != linea]
+        if not distintas and len(lineas) == len(anteriores):
+            return
+        widget = self.widget
+        widget.config(state=tk.NORMAL)
+        for i in distintas:
+            widget.delete(f"{i + 1}.0", f"{i + 1}.end")
+            widget.insert(f"{i + 1}.0", lineas[i])
+            self.cambios += 1
+        if len(lineas) > len(anteriores):
+            nuevas = "\n".join(lineas[len(anteriores):])
+            widget.insert(tk.END, ("\n" if anteriores else "") + nuevas)
+            self.cambios += 1
+        elif len(lineas) < len(anteriores):
+            # Borrar desde el final de la última línea que queda
+            widget.delete(f"{len(lineas)}.end" if lineas else "1.0", tk.END)
+            self.cambios += 1
+        widget.config(state=tk.DISABLED)
+        self.lineas = list(lineas)
+
+
+class ListaIncremental:
+    """Listbox que solo reemplaza las filas que cambian"""
+
+    def __init__(self, listbox):
+        self.listbox = listbox
+        self.filas: List[str] = []
+        self.cambios = 0
+
+    def mostrar(self, filas: Sequence[str]):
+        anteriores = self.filas
+        for i, fila in enumerate(filas):
+            if i < len(anteriores):
+                if anteriores[i] == fila:
+                    continue
+                self.listbox.delete(i)
+            self.listbox.insert(i, fila)
+            self.cambios += 1
+        if len(filas) < len(anteriores):
+            self.listbox.delete(len(filas), tk.END)
+            self.cambios += 1
+        self.filas = list(filas)
+
+
+class ListaVirtual:
+    """Listbox de altura fija sobre una secuencia de cualquier tamaño.
+
+    Solo se piden y formatean las filas visibles: obtener(inicio, fin)
+    devuelve los textos de ese tramo. El desplazamiento lo lleva la propia
+    clase (rueda del ratón y barra de desplazamiento opcional).
+    """
+
+    def __init__(self, listbox, filas_visibles: int, barra=None):
+        self.lista = ListaIncremental(listbox)
+        self.filas_visibles = filas_visibles
+        self.barra = barra
+        self.inicio = 0
+        self.total = 0
+        self._obtener: Callable[[int, int], List[str]] = lambda inicio, fin: []
+        self._sucia = True
+        listbox.bind("<MouseWheel>", lambda evento: self.desplazar(-1 if evento.delta > 0 else 1))
+        listbox.bind("<Button-4>", lambda evento: self.desplazar(-1))
+        listbox.bind("<Button-5>", lambda evento: self.desplazar(1))
+        if barra is not None:
+            barra.config(command=self.yview)
+
+    @property
+    def cambios(self) -> int:
+        return self.lista.cambios
+
+    def fuente(self, total: int, obtener: Callable[[int, int], List[str]]):
+        """Cambia la secuencia mostrada; se redibuja en el próximo refrescar()"""
+        self.total = total
+        self._obtener = obtener
+        self.inicio = max(0, min(self.inicio, total - self.filas_visibles))
+        self._sucia = True
+
+    def desplazar(self, filas: int):
+        self._mover_a(self.inicio + filas)
+
+    def yview(self, accion, cantidad, unidad=None):
+        """Comando de la barra de desplazamiento ("moveto" o "scroll")"""
+        if accion == "moveto":
+            self._mover_a(round(float(cantidad) * self.total))
+        elif accion == "scroll":
+            paso = self.filas_visibles if unidad == "pages" else 1
+            self._mover_a(self.inicio + int(cantidad) * paso)
+
+    def _mover_a(self, inicio: int):
+        inicio = max(0, min(inicio, self.total - self.filas_visibles))
+        if inicio != self.inicio:
+            self.inicio = inicio
+            self._sucia = True
+            self.refrescar()
+
+    def refrescar(self):
+        """Vuelve a pedir las filas visibles si la fuente cambió o se desplazó"""
+        if not self._sucia:
+            return
+        fin = min(self.total, self.inicio + self.filas_visibles)
+        self.lista.mostrar(self._obtener(self.inicio, fin))
+        if self.barra is not None and self.total:
+            self.barra.set(self.inicio / self.total, fin / self.total)
+        elif self.barra is not None:
+            self.barra.set(0.0, 1.0)
+        self._sucia = False
@@ -0,0 +1,153 @@
+"""
+Perfilador de frames del simulador
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Mide cuánto tarda cada fase de un frame (física, dibujo, paneles...) con
+marcas consecutivas:
+
+    perfil.empezar_frame()
+    ...física...
+    perfil.marca("fisica")      # Desde la marca anterior hasta ahora
+    ...dibujo...
+    perfil.marca("dibujo")
+    perfil.terminar_frame(creados=3)
+
+Se guardan los últimos frames (MAX_FRAMES) para mostrar medias en pantalla
+(lineas_overlay) y para exportarlos como traza de Chrome (chrome://tracing
+o https://ui.perfetto.dev), con un evento por frame y por fase y los
+contadores de cada frame.
+
+Desactivado, cada llamada solo comprueba que no hay frame en curso, así
+que se puede dejar en el bucle principal sin coste apreciable.
+"""
+
+import json
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+# Frames que se recuerdan (a 20 Hz, unos 25 segundos)
+MAX_FRAMES = 500
+# Frames con los que se calculan las medias del overlay
+FRAMES_MEDIA = 30
+
+
+@dataclass
+class Frame:
+    """Un frame medido: fases como (nombre, inicio, fin) en segundos del reloj"""
+    inicio: float
+    fin: float = 0.0
+    fases: List[Tuple[str, float, float]] = field(default_factory=list)
+    contadores: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def duracion(self) -> float:
+        return self.fin - self.inicio
+
+
+class PerfiladorFrames:
+    """Tiempos por fase de los últimos frames, activable en cualquier momento"""
+
+    def __init__(self, max_frames: int = MAX_FRAMES, reloj: Callable[[], float] = time.perf_counter):
+        self.reloj = reloj
+        self.activo = False
+        self.frames: Deque[Frame] = deque(maxlen=max_frames)
+        self._frame: Optional[Frame] = None  # Frame en curso (None si está desactivado)
+        self._ultima = 0.0
+
+    def activar(self, activo: bool = True):
+        """Activa o desactiva la medición; al desactivar se descarta el frame en curso"""
+        self.activo = activo
+        if not activo:
+            self._frame = None
+
+    # ===== Medición =====
+
+    def empezar_frame(self):
+        if not self.activo:
+            return
+        self._ultima = self.reloj()
+        self._frame = Frame(self._ultima)
+
+    def marca(self, fase: str):
+        """Cierra la fase `fase`: desde la marca anterior (o el inicio del frame) hasta ahora"""
+        if self._frame is None:
+            return
+        ahora = self.reloj()
+        self._frame.fases.append((fase, self._ultima, ahora))
+        self._ultima = ahora
+
+    def terminar_frame(self, **contadores: float):
+        """Cierra el frame y lo guarda con sus contadores (elementos dibujados, etc.)"""
+        frame = self._frame
+        if frame is None:
+            return
+        frame.fin = self.reloj()
+        frame.contadores = contadores
+        self.frames.append(frame)
+        self._frame = None
+
+    # ===== Resumen =====
+
+    def resumen(self, ultimos: int = FRAMES_MEDIA) -> Dict[str, float]:
+        """fps, ms de frame (media y máximo) y ms medios de cada fase en los últimos frames"""
+        frames = list(self.frames)[-ultimos:]
+        if not frames:
+            return {}
+        resumen = {"fps": 0.0, "frame_ms": 0.0, "frame_max_ms": 0.0}
+        if len(frames) > 1 and frames[-1].inicio > frames[0].inicio:
+            resumen["fps"] = (len(frames) - 1) / (frames[-1].inicio - frames[0].inicio)
+        fases: Dict[str, float] = {}
+        for frame in frames:
+            for nombre, inicio, fin in frame.fases:
+                fases[nombre] = fases.get(nombre, 0.0) + fin - inicio
+        resumen["frame_ms"] = sum(frame.duracion for frame in frames) / len(frames) * 1000
+        resumen["frame_max_ms"] = max(frame.duracion for frame in frames) * 1000
+        for nombre, total in fases.items():
+            resumen[nombre] = total / len(frames) * 1000
+        return resumen
+
+    def lineas_overlay(self, ultimos: int = FRAMES_MEDIA, **extras: float) -> List[str]:
+        """Texto para mostrar sobre el mapa: FPS, ms por fase y contadores del último frame (y extras)"""
+        resumen = self.resumen(ultimos)
+        if not resumen:
+            return ["⏱️ Midiendo..."]
+        lineas = [f"⏱️ {resumen.pop('fps'):.1f} FPS  {resumen.pop('frame_ms'):.2f} ms "
+                  f"(máx {resumen.pop('frame_max_ms'):.2f})"]
+        lineas += [f"{nombre:<13}{ms:6.2f} ms" for nombre, ms in resumen.items()]
+        contadores = {**self.frames[-1].contadores, **extras}
+        lineas += [f"{nombre:<13}{valor:6.0f}" for nombre, valor in contadores.items()]
+        return lineas
+
+    # ===== Traza de Chrome =====
+
+    def traza(self) -> dict:
+        """Los frames guardados en el formato JSON de eventos de traza de Chrome"""
+        if not self.frames:
+            return {"traceEvents": [], "displayTimeUnit": "ms"}
+        origen, pid = self.frames[0].inicio, os.getpid()
+
+        def us(segundos: float) -> float:
+            return round((segundos - origen) * 1e6, 3)
+
+        eventos = []
+        for numero, frame in enumerate(self.frames):
+            eventos.append({"name": "frame", "cat": "frame", "ph": "X", "pid": pid, "tid": 1,
+                            "ts": us(frame.inicio), "dur": round(frame.duracion * 1e6, 3),
+                            "args": {"frame": numero}})
+            for nombre, inicio, fin in frame.fases:
+                eventos.append({"name": nombre, "cat": "fase", "ph": "X", "pid": pid, "tid": 1,
+                                "ts": us(inicio), "dur": round((fin - inicio) * 1e6, 3)})
+            if frame.contadores:
+                eventos.append({"name": "contadores", "ph": "C", "pid": pid, "tid": 1,
+                                "ts": us(frame.inicio), "args": dict(frame.contadores)})
+        return {"traceEvents": eventos, "displayTimeUnit": "ms"}
+
+    def exportar_traza(self, ruta: str) -> int:
+        """Escribe la traza en `ruta` y devuelve los frames exportados"""
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(self.traza(), archivo)
+        return len(self.frames)
@@ -0,0 +1,156 @@
+"""
+Planificador adaptativo de los frames de la interfaz
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Con root.after(periodo) fijo, un frame que tarda 40 ms de 50 deja el bucle
+a 11 FPS: la espera empieza a contar cuando el frame termina. Aquí cada
+frame tiene una hora prevista (una cada 1/fps_objetivo segundos) y la
+espera es lo que falta hasta la siguiente, así que el coste del frame no
+se suma al periodo.
+
+Cuando no da tiempo, por orden:
+
+1. Los paneles laterales se refrescan menos: si el coste medio de un frame
+   pasa de CARGA_ALTA del periodo, su frecuencia se divide por dos (como
+   mucho una vez por segundo y hasta hz_panel_min); con poca carga vuelve
+   a subir.
+2. Si los paneles ya van al mínimo y el frame empieza con más de un
+   periodo de retraso, no se dibuja (la física avanza igual, porque va por
+   tiempo real), pero nunca más de max_sin_dibujar frames seguidos.
+3. Si el retraso pasa de MAX_RETRASO periodos, se da por perdido y el
+   calendario vuelve a empezar desde ahora, para no acumular retardo en
+   la respuesta a los controles.
+
+empezar_frame() dice qué hacer en el frame y terminar_frame() devuelve los
+ms que hay que esperar hasta el siguiente (lo que se pasa a root.after).
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional
+
+# Fracción del periodo a partir de la cual se considera que hay carga
+CARGA_ALTA = 0.8
+# Por debajo de esta fracción se vuelven a subir los paneles
+CARGA_BAJA = 0.5
+# Peso de cada frame nuevo en la media del coste
+SUAVIZADO = 0.2
+# Segundos mínimos entre dos cambios de la frecuencia de los paneles
+PAUSA_AJUSTE = 1.0
+# Frames seguidos sin dibujar como máximo
+MAX_FRAMES_SIN_DIBUJAR = 4
+# Retraso (en periodos) a partir del cual se reinicia el calendario
+MAX_RETRASO = 4
+
+
+@dataclass(frozen=True)
+class DecisionFrame:
+    """Qué hacer en este frame además de avanzar la simulación"""
+    dibujar: bool
+    paneles: bool
+
+
+class PlanificadorFrames:
+    """Calendario de frames a fps_objetivo que reparte la carga entre dibujo y paneles"""
+
+    def __init__(self, fps_objetivo: float = 20.0, hz_panel: float = 5.0, hz_panel_min: float = 1.0,
+                 max_sin_dibujar: int = MAX_FRAMES_SIN_DIBUJAR,
+                 reloj: Callable[[], float] = time.perf_counter):
+        if fps_objetivo <= 0 or hz_panel <= 0 or hz_panel_min <= 0:
+            raise ValueError("Las frecuencias deben ser positivas")
+        self.fps_objetivo = fps_objetivo
+        self.periodo = 1.0 / fps_objetivo
+        self.hz_panel_max = hz_panel
+        self.hz_panel_min = min(hz_panel_min, hz_panel)
+        self.hz_panel = hz_panel  # Frecuencia actual de los paneles
+        self.max_sin_dibujar = max_sin_dibujar
+        self.reloj = reloj
+
+        self.coste_medio = 0.0  # Media suavizada de los frames dibujados (s)
+        self._proximo: Optional[float] = None  # Hora prevista del próximo frame
+        self._inicio = 0.0
+        self._decision = DecisionFrame(True, True)
+        self._ultimo_panel: Optional[float] = None
+        self._ultimo_ajuste = 0.0
+        self._sin_dibujar = 0
+        self._dibujos: Deque[float] = deque(maxlen=max(2, int(fps_objetivo * 2)))
+
+        # Estadísticas
+        self.frames = 0
+        self.dibujados = 0
+        self.descartados = 0  # Frames en los que no se dibujó
+        self.tardios = 0  # Frames que empezaron más de un periodo tarde
+        self.reinicios = 0  # Veces que se dio por perdido el retraso
+
+    def empezar_frame(self, ahora: Optional[float] = None) -> DecisionFrame:
+        """Registra el inicio del frame y decide si se dibuja y si tocan los paneles"""
+        ahora = self.reloj() if ahora is None else ahora
+        if self._proximo is None:
+            self._proximo = ahora
+        retraso = ahora - self._proximo
+        if retraso > MAX_RETRASO * self.periodo:
+            self._proximo = ahora
+            self.reinicios += 1
+        tarde = retraso > self.periodo
+        self.tardios += tarde
+        self.frames += 1
+        self._inicio = ahora
+
+        # Sin dibujar solo si ya no queda nada que quitar a los paneles
+        dibujar = not (tarde and self.hz_panel <= self.hz_panel_min
+                       and self._sin_dibujar < self.max_sin_dibujar)
+        if dibujar:
+            self._sin_dibujar = 0
+            self.dibujados += 1
+            self._dibujos.append(ahora)
+        else:
+            self._sin_dibujar += 1
+            self.descartados += 1
+
+        # Medio periodo de margen: las esperas se redondean a ms y un frame que
+        # llega un poco antes no debe dejar los paneles para el siguiente
+        paneles = (self._ultimo_panel is None or
+                   ahora - self._ultimo_panel >= 1.0 / self.hz_panel - self.periodo / 2)
+        if paneles:
+            self._ultimo_panel = ahora
+        self._decision = DecisionFrame(dibujar, paneles)
+        return self._decision
+
+    def terminar_frame(self, ahora: Optional[float] = None) -> int:
+        """Mide el frame, adapta los paneles y devuelve los ms hasta el siguiente (>= 1)"""
+        ahora = self.reloj() if ahora is None else ahora
+        if self._decision.dibujar:
+            coste = ahora - self._inicio
+            self.coste_medio = coste if self.dibujados == 1 else (
+                SUAVIZADO * coste + (1 - SUAVIZADO) * self.coste_medio)
+
+        if ahora - self._ultimo_ajuste >= PAUSA_AJUSTE:
+            carga = self.carga
+            if carga > CARGA_ALTA and self.hz_panel > self.hz_panel_min:
+                self.hz_panel = max(self.hz_panel_min, self.hz_panel / 2)
+                self._ultimo_ajuste = ahora
+            elif carga < CARGA_BAJA and self.hz_panel < self.hz_panel_max:
+                self.hz_panel = min(self.hz_panel_max, self.hz_panel * 2)
+                self._ultimo_ajuste = ahora
+
+        self._proximo += self.periodo
+        return max(1, int((self._proximo - ahora) * 1000))
+
+    @property
+    def carga(self) -> float:
+        """Coste medio de un frame dibujado como fracción del periodo"""
+        return self.coste_medio / self.periodo
+
+    @property
+    def fps(self) -> float:
+        """Frames dibujados por segundo (en los dos últimos segundos)"""
+        if len(self._dibujos) < 2 or self._dibujos[-1] <= self._dibujos[0]:
+            return 0.0
+        return (len(self._dibujos) - 1) / (self._dibujos[-1] - self._dibujos[0])
+
+    def estadisticas(self) -> Dict[str, float]:
+        return {"fps": self.fps, "frames": self.frames, "dibujados": self.dibujados,
+                "descartados": self.descartados, "tardios": self.tardios, "reinicios": self.reinicios,
+                "coste_ms": self.coste_medio * 1000, "carga": self.carga, "hz_panel": self.hz_panel}
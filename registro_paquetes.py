@@ -0,0 +1,135 @@
+"""
+Registro indexado de los paquetes del mapa
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Guarda los paquetes en orden de alta, como la lista que sustituye (se puede
+iterar, indexar, medir con len y hacer append), y además los agrupa por
+estado y por (camión, estado). Los grupos se mantienen al cambiar el estado
+o el camión con cambiar_estado() y asignar(), así que "¿qué paquetes están
+en el almacén?" o "¿qué lleva TRK001?" cuestan lo que mide la respuesta, no
+recorren todos los paquetes.
+
+Los grupos son diccionarios id -> paquete usados como conjuntos ordenados:
+recorrerlos sale siempre en el mismo orden, y la simulación con semilla
+sigue siendo reproducible.
+
+Cada alta, cambio de estado o de camión se anota en un diario; quien
+necesite enterarse de los cambios (por ejemplo, para redibujar solo esos
+paquetes) guarda su posición y llama a cambios_desde().
+
+Los paquetes son cualquier objeto con id, state y assigned_truck, como
+Package de simulacion.py.
+"""
+
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class RegistroPaquetes:
+    """Paquetes por id, por estado y por (camión, estado)"""
+
+    def __init__(self, paquetes=()):
+        self.por_id: Dict[str, object] = {}
+        self._orden: List[object] = []
+        self._por_estado: Dict[Hashable, Dict[str, object]] = {}
+        self._por_camion: Dict[Tuple[str, Hashable], Dict[str, object]] = {}
+        self._diario: List[str] = []  # Ids en el orden en que cambiaron
+        for paquete in paquetes:
+            self.agregar(paquete)
+
+    # ===== Como una lista =====
+
+    def __len__(self) -> int:
+        return len(self._orden)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._orden)
+
+    def __getitem__(self, indice):
+        return self._orden[indice]
+
+    def __contains__(self, paquete) -> bool:
+        return self.por_id.get(getattr(paquete, "id", None)) is paquete
+
+    def append(self, paquete):
+        self.agregar(paquete)
+
+    # ===== Altas y transiciones =====
+
+    def agregar(self, paquete):
+        """Da de alta un paquete con el estado y el camión que ya tenga"""
+        if paquete.id in self.por_id:
+            raise ValueError(f"El paquete {paquete.id} ya está registrado")
+        self.por_id[paquete.id] = paquete
+        self._orden.append(paquete)
+        self._meter(paquete)
+        self._diario.append(paquete.id)
+
+    def cambiar_estado(self, paquete, estado, camion: Optional[str] = None):
+        """Cambia el estado (y el camión, si se indica) moviéndolo de grupo"""
+        self._sacar(paquete)
+        paquete.state = estado
+        if camion is not None:
+            paquete.assigned_truck = camion
+        self._meter(paquete)
+        self._diario.append(paquete.id)
+
+    def asignar(self, paquete, camion: Optional[str]):
+        """Cambia el camión de un paquete (None = ninguno)"""
+        if paquete.assigned_truck == camion:
+            return
+        self._sacar_de_camion(paquete)
+        paquete.assigned_truck = camion
+        self._meter_en_camion(paquete)
+        self._diario.append(paquete.id)
+
+    def _meter(self, paquete):
+        self._por_estado.setdefault(paquete.state, {})[paquete.id] = paquete
+        self._meter_en_camion(paquete)
+
+    def _meter_en_camion(self, paquete):
+        if paquete.assigned_truck is not None:
+            self._por_camion.setdefault((paquete.assigned_truck, paquete.state), {})[paquete.id] = paquete
+
+    def _sacar(self, paquete):
+        grupo = self._por_estado.get(paquete.state)
+        if grupo is not None:
+            grupo.pop(paquete.id, None)
+        self._sacar_de_camion(paquete)
+
+    def _sacar_de_camion(self, paquete):
+        if paquete.assigned_truck is not None:
+            clave = (paquete.assigned_truck, paquete.state)
+            grupo = self._por_camion.get(clave)
+            if grupo is not None:
+                grupo.pop(paquete.id, None)
+                if not grupo:
+                    del self._por_camion[clave]
+
+    # ===== Consultas =====
+
+    def en_estado(self, estado) -> List:
+        """Paquetes en un estado, en orden de llegada al estado"""
+        return list(self._por_estado.get(estado, {}).values())
+
+    def cuantos(self, estado) -> int:
+        return len(self._por_estado.get(estado, ()))
+
+    def del_camion(self, matricula: str, estado=None) -> List:
+        """Paquetes asignados a un camión (solo los de `estado`, si se indica)"""
+        if estado is not None:
+            return list(self._por_camion.get((matricula, estado), {}).values())
+        return [paquete for estado in self._por_estado
+                for paquete in self._por_camion.get((matricula, estado), {}).values()]
+
+    # ===== Diario de cambios =====
+
+    @property
+    def version(self) -> int:
+        """Posición actual del diario: cambios_desde(version) estará vacío"""
+        return len(self._diario)
+
+    def cambios_desde(self, version: int) -> Tuple[int, List]:
+        """(nueva versión, paquetes dados de alta o cambiados desde `version`), sin repetir"""
+        ids = dict.fromkeys(self._diario[version:])
+        return len(self._diario), [self.por_id[paquete_id] for paquete_id in ids]
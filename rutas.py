@@ -0,0 +1,315 @@
+"""
+Grafo de la red de carreteras y rutas más cortas con A*
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Los nodos son los extremos de los segmentos, los cruces entre sus ejes y
+los accesos a los lugares (edificios con su patio); las aristas son los
+tramos de carretera entre nodos consecutivos de un mismo segmento, con su
+longitud como peso. Como los pesos son distancias reales, la distancia en
+línea recta al destino es una heurística admisible y A* da el camino más
+corto.
+
+camino() da el más corto entre dos nodos (por ejemplo, entre dos
+edificios) y lo guarda en una caché LRU en los dos sentidos.
+
+Un punto cualquiera del asfalto entra al grafo por los dos nodos que lo
+rodean en su segmento. Como casi todos los camiones van a unos pocos
+almacenes y destinos, ruta() no lanza un A* por camión: usa el árbol de
+caminos más cortos hacia el nodo de destino (un Dijkstra desde él, también
+en caché LRU), y cada camión que replanifica solo recorre su rama.
+
+Los segmentos son cualquier objeto con start, end (con .x e .y) y width,
+como RoadSegment; un lugar es un segmento de longitud 0 (su patio), con el
+centro en start y el diámetro en width.
+"""
+
+import bisect
+import heapq
+import math
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from indice_espacial import HashEspacial, IndiceCarreteras
+
+# Puntos a menos de esta distancia (px) son el mismo nodo
+TOLERANCIA_NODO = 1.0
+
+# Caminos entre nodos y árboles hacia un destino que se recuerdan como máximo
+TAMANO_CACHE_RUTAS = 4096
+TAMANO_CACHE_ARBOLES = 64
+
+Punto = Tuple[float, float]
+
+
+def _cruce(a, b) -> Optional[Tuple[float, float]]:
+    """Parámetros (t sobre a, u sobre b), entre 0 y 1, del cruce de sus ejes, o None"""
+    x1, y1 = a.start.x, a.start.y
+    dx1, dy1 = a.end.x - x1, a.end.y - y1
+    x2, y2 = b.start.x, b.start.y
+    dx2, dy2 = b.end.x - x2, b.end.y - y2
+    denominador = dx1 * dy2 - dy1 * dx2
+    if abs(denominador) < 1e-12:
+        return None  # Paralelos
+    t = ((x2 - x1) * dy2 - (y2 - y1) * dx2) / denominador
+    u = ((x2 - x1) * dy1 - (y2 - y1) * dx1) / denominador
+    if -1e-9 <= t <= 1 + 1e-9 and -1e-9 <= u <= 1 + 1e-9:
+        return min(1.0, max(0.0, t)), min(1.0, max(0.0, u))
+    return None
+
+
+def _proyectar(segmento, x: float, y: float) -> Tuple[float, float]:
+    """(t de la proyección del punto sobre el eje, distancia al eje)"""
+    x1, y1 = segmento.start.x, segmento.start.y
+    dx, dy = segmento.end.x - x1, segmento.end.y - y1
+    longitud2 = dx * dx + dy * dy
+    t = 0.0 if not longitud2 else min(1.0, max(0.0, ((x - x1) * dx + (y - y1) * dy) / longitud2))
+    return t, math.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
+
+
+def _punto(segmento, t: float) -> Punto:
+    return (segmento.start.x + t * (segmento.end.x - segmento.start.x),
+            segmento.start.y + t * (segmento.end.y - segmento.start.y))
+
+
+class GrafoCarreteras:
+    """Grafo no dirigido de la red de carreteras con consultas A* cacheadas"""
+
+    def __init__(self, carreteras: Iterable, lugares: Optional[Mapping[str, object]] = None,
+                 tamano_cache: int = TAMANO_CACHE_RUTAS, tamano_cache_arboles: int = TAMANO_CACHE_ARBOLES):
+        self.carreteras = list(carreteras)
+        lugares = dict(lugares or {})
+        self.nodos: List[Punto] = []
+        self.vecinos: List[List[Tuple[int, float]]] = []
+        self.nodo_lugar: Dict[str, int] = {}
+        self._por_posicion = HashEspacial()
+        # Por segmento (carreteras y luego patios): [(t, nodo)] ordenado por t
+        self._tramos: List[List[Tuple[float, int]]] = []
+        self._cache: "OrderedDict[Tuple[int, int], Optional[Tuple[float, Tuple[int, ...]]]]" = OrderedDict()
+        self.tamano_cache = tamano_cache
+        # Nodo de destino -> (distancias hacia él, siguiente nodo hacia él)
+        self._arboles: "OrderedDict[int, Tuple[Dict[int, float], Dict[int, int]]]" = OrderedDict()
+        self.tamano_cache_arboles = tamano_cache_arboles
+        self.aciertos = 0
+        self.fallos = 0
+        self._construir(lugares)
+        self._indice = IndiceCarreteras(self.carreteras + list(lugares.values()))
+        self._posicion_segmento = {id(segmento): i for i, segmento in enumerate(self._indice.segmentos)}
+
+    def __len__(self) -> int:
+        return len(self.nodos)
+
+    # ===== Construcción =====
+
+    def _nodo(self, x: float, y: float) -> int:
+        """Nodo en (x, y), reutilizando uno existente a menos de TOLERANCIA_NODO"""
+        cercanos = self._por_posicion.en_radio(x, y, TOLERANCIA_NODO)
+        if cercanos:
+            return cercanos[0][1]
+        nodo = len(self.nodos)
+        self.nodos.append((x, y))
+        self.vecinos.append([])
+        self._por_posicion.insertar(nodo, x, y)
+        return nodo
+
+    def _unir(self, a: int, b: int):
+        if a == b or any(vecino == b for vecino, _ in self.vecinos[a]):
+            return
+        (xa, ya), (xb, yb) = self.nodos[a], self.nodos[b]
+        coste = math.hypot(xb - xa, yb - ya)
+        self.vecinos[a].append((b, coste))
+        self.vecinos[b].append((a, coste))
+
+    def _construir(self, lugares: Dict[str, object]):
+        carreteras = self.carreteras
+        puntos: List[List[float]] = [[0.0, 1.0] for _ in carreteras]
+        accesos: List[Tuple[int, int, float]] = []  # (carretera tocada, id del extremo que la toca, t)
+
+        for i, a in enumerate(carreteras):
+            for j in range(i + 1, len(carreteras)):
+                b = carreteras[j]
+                cruce = _cruce(a, b)
+                if cruce is not None:
+                    puntos[i].append(cruce[0])
+                    puntos[j].append(cruce[1])
+                    continue
+                # Extremo de uno que toca el asfalto del otro sin cruzar los ejes
+                for desde, hacia in ((a, j), (b, i)):
+                    for extremo in (desde.start, desde.end):
+                        t, distancia = _proyectar(carreteras[hacia], extremo.x, extremo.y)
+                        if 0.0 < t < 1.0 and distancia <= carreteras[hacia].width / 2:
+                            puntos[hacia].append(t)
+                            accesos.append((hacia, id(extremo), t))
+
+        # Cada lugar se une a las carreteras que tocan su patio
+        enlaces_lugares: List[Tuple[str, int, float]] = []
+        for nombre, patio in lugares.items():
+            for i, carretera in enumerate(carreteras):
+                t, distancia = _proyectar(carretera, patio.start.x, patio.start.y)
+                if distancia <= (patio.width + carretera.width) / 2:
+                    puntos[i].append(t)
+                    enlaces_lugares.append((nombre, i, t))
+
+        for i, carretera in enumerate(carreteras):
+            tramo = sorted((t, self._nodo(*_punto(carretera, t))) for t in set(puntos[i]))
+            self._tramos.append(tramo)
+            for (_, a), (_, b) in zip(tramo, tramo[1:]):
+                self._unir(a, b)
+
+        extremos = {id(c.start): c.start for c in carreteras}
+        extremos.update({id(c.end): c.end for c in carreteras})
+        for hacia, extremo, t in accesos:
+            punto = extremos[extremo]
+            self._unir(self._nodo(punto.x, punto.y), self._nodo(*_punto(carreteras[hacia], t)))
+
+        for nombre, patio in lugares.items():
+            self.nodo_lugar[nombre] = self._nodo(patio.start.x, patio.start.y)
+            self._tramos.append([(0.0, self.nodo_lugar[nombre])])
+        for nombre, i, t in enlaces_lugares:
+            self._unir(self.nodo_lugar[nombre], self._nodo(*_punto(carreteras[i], t)))
+
+    # ===== Consultas =====
+
+    def entradas(self, x: float, y: float) -> List[Tuple[int, float]]:
+        """(nodo, distancia) por los que un punto del asfalto entra al grafo.
+
+        Son los dos nodos que lo rodean en su segmento (o el del lugar, si
+        está en un patio). Un punto fuera del asfalto usa el segmento más
+        cercano. Lista vacía si no hay carreteras.
+        """
+        segmento = self._indice.carretera_en(x, y)
+        if segmento is None:
+            cercano = self._indice.mas_cercano(x, y)
+            if cercano is None:
+                return []
+            segmento = cercano[0]
+        tramo = self._tramos[self._posicion_segmento[id(segmento)]]
+        if len(tramo) == 1:
+            rodean = tramo
+        else:
+            t, _ = _proyectar(segmento, x, y)
+            k = min(max(bisect.bisect_left(tramo, (t, -1)), 1), len(tramo) - 1)
+            rodean = tramo[k - 1:k + 1]
+        return [(nodo, math.hypot(self.nodos[nodo][0] - x, self.nodos[nodo][1] - y)) for _, nodo in rodean]
+
+    def camino(self, origen: int, destino: int) -> Optional[Tuple[float, Tuple[int, ...]]]:
+        """(coste, nodos) del camino más corto entre dos nodos, o None si no hay"""
+        clave = (origen, destino)
+        if clave in self._cache:
+            self._cache.move_to_end(clave)
+            self.aciertos += 1
+            return self._cache[clave]
+        self.fallos += 1
+        resultado = self._a_estrella(origen, destino)
+        self._guardar(clave, resultado)
+        if resultado is not None:
+            # El camino de vuelta es el mismo al revés
+            self._guardar((destino, origen), (resultado[0], resultado[1][::-1]))
+        return resultado
+
+    def _guardar(self, clave, resultado):
+        self._cache[clave] = resultado
+        self._cache.move_to_end(clave)
+        while len(self._cache) > self.tamano_cache:
+            self._cache.popitem(last=False)
+
+    def _a_estrella(self, origen: int, destino: int) -> Optional[Tuple[float, Tuple[int, ...]]]:
+        nodos, vecinos = self.nodos, self.vecinos
+        bx, by = nodos[destino]
+        costes = {origen: 0.0}
+        padres: Dict[int, int] = {}
+        abiertos = [(math.hypot(nodos[origen][0] - bx, nodos[origen][1] - by), 0.0, origen)]
+        cerrados = set()
+        while abiertos:
+            _, coste, nodo = heapq.heappop(abiertos)
+            if nodo == destino:
+                camino = [nodo]
+                while nodo in padres:
+                    nodo = padres[nodo]
+                    camino.append(nodo)
+                return coste, tuple(reversed(camino))
+            if nodo in cerrados:
+                continue
+            cerrados.add(nodo)
+            for vecino, peso in vecinos[nodo]:
+                nuevo = coste + peso
+                if nuevo < costes.get(vecino, math.inf):
+                    costes[vecino] = nuevo
+                    padres[vecino] = nodo
+                    x, y = nodos[vecino]
+                    heapq.heappush(abiertos, (nuevo + math.hypot(x - bx, y - by), nuevo, vecino))
+        return None
+
+    def arbol_hacia(self, destino: int) -> Tuple[Dict[int, float], Dict[int, int]]:
+        """(distancia, siguiente nodo) hacia `destino` desde cada nodo alcanzable"""
+        if destino in self._arboles:
+            self._arboles.move_to_end(destino)
+            self.aciertos += 1
+            return self._arboles[destino]
+        self.fallos += 1
+        # Dijkstra desde el destino: el grafo no es dirigido
+        vecinos = self.vecinos
+        distancias = {destino: 0.0}
+        siguientes: Dict[int, int] = {}
+        abiertos = [(0.0, destino)]
+        while abiertos:
+            distancia, nodo = heapq.heappop(abiertos)
+            if distancia > distancias[nodo]:
+                continue
+            for vecino, peso in vecinos[nodo]:
+                nueva = distancia + peso
+                if nueva < distancias.get(vecino, math.inf):
+                    distancias[vecino] = nueva
+                    siguientes[vecino] = nodo
+                    heapq.heappush(abiertos, (nueva, vecino))
+        self._arboles[destino] = (distancias, siguientes)
+        while len(self._arboles) > self.tamano_cache_arboles:
+            self._arboles.popitem(last=False)
+        return distancias, siguientes
+
+    def _mejor_enlace(self, origen: Punto, destino: Punto):
+        """(coste, nodo de entrada, árbol hacia la salida) de la mejor combinación.
+
+        Prueba los nodos de entrada y salida y se queda con la de menor coste
+        total. El árbol es None si los dos puntos están en el mismo tramo
+        (se va directo); el resultado es None si no hay camino.
+        """
+        entradas, salidas = self.entradas(*origen), self.entradas(*destino)
+        if not entradas or not salidas:
+            return None
+        if {nodo for nodo, _ in entradas} == {nodo for nodo, _ in salidas}:
+            return math.hypot(destino[0] - origen[0], destino[1] - origen[1]), None, None
+        mejor = None
+        for salida, coste_salida in salidas:
+            distancias, siguientes = self.arbol_hacia(salida)
+            for entrada, coste_entrada in entradas:
+                coste = coste_entrada + distancias.get(entrada, math.inf) + coste_salida
+                if coste < (mejor[0] if mejor else math.inf):
+                    mejor = (coste, entrada, siguientes)
+        return mejor
+
+    def distancia(self, origen: Punto, destino: Punto) -> float:
+        """Longitud de la ruta más corta por carretera (inf si no hay)"""
+        mejor = self._mejor_enlace(origen, destino)
+        return math.inf if mejor is None else mejor[0]
+
+    def ruta(self, origen: Punto, destino: Punto) -> Optional[List[Punto]]:
+        """Puntos por los que pasar para ir de origen a destino (este incluido), o None"""
+        mejor = self._mejor_enlace(origen, destino)
+        if mejor is None:
+            return None
+        _, nodo, siguientes = mejor
+        if siguientes is None:
+            return [destino]
+        puntos = [self.nodos[nodo]]
+        while nodo in siguientes:
+            nodo = siguientes[nodo]
+            puntos.append(self.nodos[nodo])
+        if math.hypot(puntos[-1][0] - destino[0], puntos[-1][1] - destino[1]) > TOLERANCIA_NODO:
+            puntos.append(destino)
+        return puntos
+
+    def ruta_entre_lugares(self, origen: str, destino: str) -> Optional[List[Punto]]:
+        """Puntos de la ruta más corta entre dos lugares por su nombre"""
+        encontrado = self.camino(self.nodo_lugar[origen], self.nodo_lugar[destino])
+        return None if encontrado is None else [self.nodos[nodo] for nodo in encontrado[1]]
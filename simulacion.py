@@ -0,0 +1,913 @@
+"""
+Núcleo de la simulación de camiones, sin interfaz gráfica
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Contiene el mapa (carreteras, edificios y paquetes), la física de la flota
+y la lógica de recogida y entrega que antes vivían dentro del simulador de
+Tk (ej6_2). SimulacionNucleo avanza la simulación tick a tick tan rápido
+como permita la CPU; AdvancedTruckSimulator hereda de él y solo añade el
+dibujo, los controles de teclado y el sonido.
+
+El tiempo simulado avanza en pasos fijos de 1/hz_fisica segundos y el
+azar sale de un random.Random con semilla propio, así que dos ejecuciones
+con la misma semilla y la misma frecuencia de física dan el mismo
+resultado aunque se dibujen a ritmos distintos o la interfaz se atasque.
+RelojSimulacion convierte el tiempo real entre frames en pasos de física.
+
+Uso:
+    python simulacion.py --ticks 10000 --camiones 50 --piloto directo
+    python simulacion.py --ticks 10000 --camiones 50 --piloto ruta --misiones 100
+    python simulacion.py --ticks 10000 --camiones 20 --piloto despacho --misiones 2000
+    python simulacion.py --ticks 2000 --guion "forward:40,left:15,forward:40"
+    python simulacion.py --ticks 12000 --hz 120 --semilla 7
+"""
+
+import math
+import random
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+
+from colisiones import DetectorColisiones
+from despacho import Despachador
+from ej6_1 import Caja, Camion
+from fisica_flota import FRECUENCIA_BASE, MotorFisicaFlota, TruckPhysics
+from indice_espacial import HashEspacial, IndiceCarreteras
+from indice_flota import IndiceFlota
+from registro_paquetes import RegistroPaquetes
+from rutas import GrafoCarreteras
+
+# Bodega estándar de los camiones del simulador (largo, ancho, altura en cm)
+BODEGA_ESTANDAR = (600, 240, 250)
+
+# Radio (px) alrededor de un almacén o destino en el que se recoge/entrega
+RADIO_RECOGIDA = 50
+
+# Pasos de física como máximo por frame: si la interfaz se atasca más, el
+# tiempo sobrante se descarta en vez de encadenar frames cada vez más lentos
+MAX_PASOS_POR_FRAME = 10
+
+# Margen (px) alrededor de cada edificio que también es asfalto (su patio)
+MARGEN_PATIO = 50
+# Velocidad que conserva un camión al rozar el bordillo
+ROCE_BORDILLO = 0.9
+
+# Nuevas clases para el sistema mejorado
+@dataclass
+class Point:
+    """Representa un punto en el mapa"""
+    x: float
+    y: float
+
+@dataclass
+class RoadSegment:
+    """Representa un segmento de carretera"""
+    start: Point
+    end: Point
+    width: float = 40
+    lanes: int = 2
+
+class PackageState(Enum):
+    """Estado de un paquete"""
+    WAREHOUSE = "warehouse"
+    IN_TRANSIT = "in_transit"
+    DELIVERED = "delivered"
+
+@dataclass
+class Package:
+    """Representa un paquete para entregar"""
+    id: str
+    pickup_point: Point
+    delivery_point: Point
+    weight: float
+    state: PackageState = PackageState.WAREHOUSE
+    assigned_truck: Optional[str] = None
+
+@dataclass
+class Building:
+    """Representa un edificio (almacén o punto de entrega)"""
+    position: Point
+    size: Tuple[float, float]
+    type: str  # "warehouse", "delivery"
+    name: str
+    color: str
+
+class RoadSystem:
+    """Sistema de carreteras mejorado"""
+    
+    def __init__(self, canvas_width: int, canvas_height: int,
+                 rng: Optional[random.Random] = None):
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+        self.rng = rng or random.Random()
+        self.roads = []
+        self.intersections = []
+        self.buildings = []
+        # Edificios por tipo ("warehouse", "delivery"), para no filtrarlos en cada misión
+        self.buildings_by_type: Dict[str, List[Building]] = {}
+        # Paquetes por id, por estado y por camión (se recorre como una lista)
+        self.packages = RegistroPaquetes()
+        self.packages_by_id: Dict[str, Package] = self.packages.por_id
+        # Paquetes pendientes por posición: en almacén por su punto de
+        # recogida y en tránsito por su punto de entrega
+        self.por_recoger = HashEspacial()
+        self.por_entregar = HashEspacial()
+        # Patios asfaltados alrededor de los edificios (segmentos de longitud 0)
+        self.patios: List[RoadSegment] = []
+        self._create_road_network()
+        self._create_buildings()
+        self._create_yards()
+        # Índice de la red para saber en O(1) si un punto está sobre el asfalto
+        self.indice = IndiceCarreteras(self.roads + self.patios)
+        # Cruces y tramos, para calcular rutas por carretera entre edificios
+        self.grafo = GrafoCarreteras(self.roads, {building.name: patio for building, patio
+                                                  in zip(self.buildings, self.patios)})
+        self._create_packages()
+    
+    def _create_road_network(self):
+        """Crea una red de carreteras realista"""
+        margin = 50
+        
+        # Carretera principal horizontal
+        self.roads.append(RoadSegment(
+            Point(margin, self.canvas_height // 2),
+            Point(self.canvas_width - margin, self.canvas_height // 2),
+            width=50
+        ))
+        
+        # Carretera principal vertical
+        self.roads.append(RoadSegment(
+            Point(self.canvas_width // 2, margin),
+            Point(self.canvas_width // 2, self.canvas_height - margin),
+            width=50
+        ))
+        
+        # Carreteras secundarias
+        quarter_h = self.canvas_height // 4
+        quarter_w = self.canvas_width // 4
+        
+        # Horizontales secundarias
+        self.roads.append(RoadSegment(
+            Point(margin, quarter_h),
+            Point(self.canvas_width - margin, quarter_h),
+            width=35
+        ))
+        
+        self.roads.append(RoadSegment(
+            Point(margin, quarter_h * 3),
+            Point(self.canvas_width - margin, quarter_h * 3),
+            width=35
+        ))
+        
+        # Verticales secundarias
+        self.roads.append(RoadSegment(
+            Point(quarter_w, margin),
+            Point(quarter_w, self.canvas_height - margin),
+            width=35
+        ))
+        
+        self.roads.append(RoadSegment(
+            Point(quarter_w * 3, margin),
+            Point(quarter_w * 3, self.canvas_height - margin),
+            width=35
+        ))
+        
+        # Carretera curva (simulada con segmentos)
+        center_x, center_y = self.canvas_width * 0.75, self.canvas_height * 0.25
+        radius = 60
+        for i in range(8):
+            angle1 = (i / 8) * math.pi
+            angle2 = ((i + 1) / 8) * math.pi
+            
+            x1 = center_x + radius * math.cos(angle1)
+            y1 = center_y + radius * math.sin(angle1)
+            x2 = center_x + radius * math.cos(angle2)
+            y2 = center_y + radius * math.sin(angle2)
+            
+            self.roads.append(RoadSegment(
+                Point(x1, y1),
+                Point(x2, y2),
+                width=30
+            ))
+    
+    def _create_buildings(self):
+        """Crea almacenes y puntos de entrega"""
+        # Almacenes (color azul)
+        self.buildings.extend([
+            Building(Point(80, 80), (60, 40), "warehouse", "Almacén Central", "#3498db"),
+            Building(Point(720, 80), (50, 35), "warehouse", "Almacén Norte", "#3498db"),
+            Building(Point(80, 520), (55, 40), "warehouse", "Almacén Sur", "#3498db"),
+        ])
+        
+        # Puntos de entrega (color verde)
+        self.buildings.extend([
+            Building(Point(720, 520), (40, 30), "delivery", "Tienda 1", "#2ecc71"),
+            Building(Point(400, 120), (35, 30), "delivery", "Oficina A", "#2ecc71"),
+            Building(Point(600, 450), (40, 35), "delivery", "Tienda 2", "#2ecc71"),
+            Building(Point(200, 450), (45, 30), "delivery", "Centro Comercial", "#2ecc71"),
+        ])
+        for building in self.buildings:
+            self.buildings_by_type.setdefault(building.type, []).append(building)
+    
+    def _create_yards(self):
+        """Crea un patio circular alrededor de cada edificio, unido a la carretera"""
+        for building in self.buildings:
+            radio = max(building.size) / 2 + MARGEN_PATIO
+            self.patios.append(RoadSegment(building.position, building.position, width=2 * radio))
+    
+    def _create_packages(self):
+        """Crea paquetes para entregar"""
+        for i in range(10):
+            warehouse = self.rng.choice(self.buildings_by_type["warehouse"])
+            delivery = self.rng.choice(self.buildings_by_type["delivery"])
+            
+            package = Package(
+                id=f"PKG{i+1:03d}",
+                pickup_point=warehouse.position,
+                delivery_point=delivery.position,
+                weight=self.rng.uniform(10, 100)
+            )
+            self.add_package(package)
+    
+    def add_package(self, package: Package):
+        """Añade un paquete manteniendo los índices del registro y por posición"""
+        self.packages.agregar(package)
+        self._indexar(package)
+    
+    def update_package_state(self, package: Package, state: PackageState,
+                             truck: Optional[str] = None):
+        """Cambia el estado de un paquete manteniendo los índices del registro y por posición"""
+        self.packages.cambiar_estado(package, state, truck)
+        self._indexar(package)
+    
+    def assign_package(self, package: Package, truck: Optional[str]):
+        """Cambia el camión asignado a un paquete manteniendo el índice por camión"""
+        self.packages.asignar(package, truck)
+    
+    def _indexar(self, package: Package):
+        self.por_recoger.quitar(package.id)
+        self.por_entregar.quitar(package.id)
+        if package.state == PackageState.WAREHOUSE:
+            self.por_recoger.insertar(package.id, package.pickup_point.x, package.pickup_point.y)
+        elif package.state == PackageState.IN_TRANSIT:
+            self.por_entregar.insertar(package.id, package.delivery_point.x, package.delivery_point.y)
+    
+    def draw_roads(self, canvas):
+        """Dibuja las carreteras en el canvas"""
+        canvas.delete("road")
+        
+        # Fondo verde (césped)
+        canvas.create_rectangle(0, 0, self.canvas_width, self.canvas_height, 
+                              fill="#27ae60", tags="road")
+        
+        # Patios de los edificios
+        for patio in self.patios:
+            radio = patio.width / 2
+            canvas.create_oval(patio.start.x - radio, patio.start.y - radio,
+                               patio.start.x + radio, patio.start.y + radio,
+                               fill="#34495e", outline="", tags="road")
+        
+        # Dibujar carreteras
+        for road in self.roads:
+            # Asfalto
+            canvas.create_line(
+                road.start.x, road.start.y,
+                road.end.x, road.end.y,
+                width=road.width, fill="#34495e", tags="road",
+                capstyle="round", joinstyle="round"
+            )
+            
+            # Líneas centrales (discontinuas)
+            if road.width > 35:
+                segments = 10
+                for i in range(segments):
+                    if i % 2 == 0:  # Línea discontinua
+                        start_ratio = i / segments
+                        end_ratio = (i + 0.5) / segments
+                        
+                        line_start_x = road.start.x + (road.end.x - road.start.x) * start_ratio
+                        line_start_y = road.start.y + (road.end.y - road.start.y) * start_ratio
+                        line_end_x = road.start.x + (road.end.x - road.start.x) * end_ratio
+                        line_end_y = road.start.y + (road.end.y - road.start.y) * end_ratio
+                        
+                        canvas.create_line(
+                            line_start_x, line_start_y,
+                            line_end_x, line_end_y,
+                            width=3, fill="#f1c40f", tags="road"
+                        )
+        
+        # Dibujar edificios
+        for building in self.buildings:
+            x, y = building.position.x, building.position.y
+            w, h = building.size
+            
+            # Edificio
+            canvas.create_rectangle(
+                x - w//2, y - h//2,
+                x + w//2, y + h//2,
+                fill=building.color, outline="#2c3e50", width=2, tags="road"
+            )
+            
+            # Icono según tipo
+            icon = "🏭" if building.type == "warehouse" else "🏪"
+            canvas.create_text(x, y - 5, text=icon, font=('Arial', 16), tags="road")
+            
+            # Nombre
+            canvas.create_text(x, y + h//2 + 15, text=building.name, 
+                             font=('Arial', 8), fill="#2c3e50", tags="road")
+        
+        # La capa estática siempre queda debajo de paquetes y camiones
+        canvas.tag_lower("road")
+
+
+# ===== Pilotos =====
+
+Controles = Dict[str, bool]
+SIN_CONTROLES: Controles = {'forward': False, 'backward': False, 'left': False,
+                            'right': False, 'brake': False}
+
+
+def rumbo_hacia(origen, destino) -> float:
+    """Rumbo (grados, 0 = arriba, sentido horario) para ir de origen a destino"""
+    return math.degrees(math.atan2(destino.x - origen.x, -(destino.y - origen.y))) % 360
+
+
+def controles_hacia(physics: TruckPhysics, destino, distancia_parada: float = 25,
+                    evitar_orbita: bool = True) -> Controles:
+    """Controles para conducir un camión hacia un punto.
+
+    Con evitar_orbita=False se gira siempre hacia el punto (para puntos de
+    paso, que se dejan atrás antes de poder orbitar alrededor).
+    """
+    posicion = physics.position
+    distancia = math.hypot(destino.x - posicion.x, destino.y - posicion.y)
+    diferencia = (rumbo_hacia(posicion, destino) - physics.heading + 540) % 360 - 180
+    controles = dict(SIN_CONTROLES)
+    if distancia > distancia_parada:
+        # El radio de giro no depende de la velocidad (el giro es proporcional
+        # a ella): si el destino cae dentro del círculo de giro, girando solo
+        # se orbitaría alrededor, así que primero se sigue recto
+        radio_giro = physics.max_speed / math.radians(physics.turn_rate)
+        dentro_del_giro = evitar_orbita and distancia < 2.1 * radio_giro * abs(math.sin(math.radians(diferencia)))
+        controles['forward'] = True
+        controles['left'] = diferencia < -5 and not dentro_del_giro
+        controles['right'] = diferencia > 5 and not dentro_del_giro
+    return controles
+
+
+class PilotoGuion:
+    """Repite una secuencia de (ticks, controles) en bucle"""
+
+    def __init__(self, pasos: List[Tuple[int, Controles]]):
+        if not pasos:
+            raise ValueError("El guion no tiene pasos")
+        self.pasos = pasos
+        self._total = sum(ticks for ticks, _ in pasos)
+        self._tick = 0
+
+    @classmethod
+    def desde_texto(cls, texto: str) -> "PilotoGuion":
+        """Crea un guion desde "forward:40,left+forward:10,none:5" """
+        pasos = []
+        for parte in texto.split(","):
+            nombres, ticks = parte.strip().rsplit(":", 1)
+            controles = dict(SIN_CONTROLES)
+            for nombre in nombres.split("+"):
+                if nombre != "none":
+                    if nombre not in controles:
+                        raise ValueError(f"Control desconocido: {nombre}")
+                    controles[nombre] = True
+            pasos.append((int(ticks), controles))
+        return cls(pasos)
+
+    def __call__(self, simulacion: "SimulacionNucleo", camion: Camion) -> Controles:
+        resto = self._tick % self._total
+        self._tick += 1
+        for ticks, controles in self.pasos:
+            if resto < ticks:
+                return controles
+            resto -= ticks
+        return SIN_CONTROLES
+
+
+class PilotoDirecto:
+    """Autopiloto: va en línea recta al paquete pendiente más cercano y lo entrega"""
+
+    # Conduce campo a través: la simulación no lo ciñe a las carreteras
+    todoterreno = True
+
+    TICKS_MARCHA_ATRAS = 25  # En frames base de 1/20 s
+
+    def __init__(self):
+        self._marcha_atras: Dict[str, int] = {}  # matrícula -> ticks de maniobra restantes
+        self._acelerando: Dict[str, bool] = {}
+
+    def __call__(self, simulacion: "SimulacionNucleo", camion: Camion) -> Controles:
+        physics = simulacion.truck_physics[camion.matricula]
+        destino = self.objetivo(simulacion, camion)
+        if destino is None:
+            return SIN_CONTROLES
+
+        matricula = camion.matricula
+        restantes = self._marcha_atras.get(matricula, 0)
+        if restantes:
+            # Atrás girando hacia el destino para despegarse del obstáculo
+            self._marcha_atras[matricula] = restantes - 1
+            controles = self.guiar(physics, destino, matricula)
+            controles['forward'] = False
+            controles['backward'] = True
+            return controles
+
+        controles = self.guiar(physics, destino, matricula)
+        # Acelerando sin moverse: está atascado contra el borde del mapa
+        # (umbral y maniobra escalados a la frecuencia de la física)
+        factor = simulacion.reloj.dt * FRECUENCIA_BASE
+        if controles['forward'] and self.atascado(physics, matricula, factor):
+            self._marcha_atras[matricula] = round(self.TICKS_MARCHA_ATRAS / factor)
+        self._acelerando[matricula] = controles['forward']
+        return controles
+
+    def atascado(self, physics: TruckPhysics, matricula: str, factor: float) -> bool:
+        """Si el camión, que ya aceleraba en el tick anterior, sigue sin moverse"""
+        return bool(self._acelerando.get(matricula)) and abs(physics.velocity) < 0.05 * factor
+
+    def objetivo(self, simulacion: "SimulacionNucleo", camion: Camion):
+        """Punto hacia el que conducir ahora mismo (en línea recta, el destino)"""
+        return self.destino(simulacion, camion)
+
+    def guiar(self, physics: TruckPhysics, punto, matricula: str) -> Controles:
+        """Controles para acercarse al punto devuelto por objetivo()"""
+        return controles_hacia(physics, punto)
+
+    def destino(self, simulacion: "SimulacionNucleo", camion: Camion):
+        """Punto de entrega del primer paquete a bordo o, si no lleva, almacén más cercano"""
+        for caja in camion.manifiesto.valores():
+            package = simulacion.road_system.packages_by_id.get(caja.codigo)
+            if package is not None and package.state == PackageState.IN_TRANSIT:
+                return package.delivery_point
+        posicion = simulacion.truck_physics[camion.matricula].position
+        packages = simulacion.road_system.packages_by_id
+        cercanos = simulacion.road_system.por_recoger.mas_cercanos(
+            posicion.x, posicion.y, filtro=lambda package_id: camion.puede_cargar(packages[package_id].weight))
+        return packages[cercanos[0][1]].pickup_point if cercanos else None
+
+
+def _sobre_tramo(a, b, x: float, y: float) -> Tuple[float, float]:
+    """(t de la proyección de (x, y) sobre la recta a-b, distancia al tramo)"""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    longitud2 = dx * dx + dy * dy
+    t = ((x - a[0]) * dx + (y - a[1]) * dy) / longitud2 if longitud2 else 1.0
+    limitado = min(1.0, max(0.0, t))
+    return t, math.hypot(x - a[0] - limitado * dx, y - a[1] - limitado * dy)
+
+
+class PilotoRuta(PilotoDirecto):
+    """Autopiloto por carretera: sigue la ruta más corta del grafo hasta el destino.
+
+    La ruta se calcula (con la caché del grafo) solo al cambiar de destino,
+    al desviarse de ella o tras una maniobra. En cada tick se apunta a un
+    punto de la ruta ADELANTO px por delante del camión (persecución pura),
+    así que empieza a girar antes de llegar a cada cruce.
+    """
+
+    todoterreno = False
+
+    ADELANTO = 60  # px
+    # Distancia del eje de la carretera al centro del carril derecho, para
+    # no chocar de frente con los que vienen en sentido contrario
+    CARRIL = 7  # px
+    # Más lejos que esto del tramo actual, se da por perdida la ruta
+    DESVIO_MAXIMO = 120  # px
+    # Ticks (en frames base) acelerando sin pasar del 40 % de la velocidad máxima:
+    # está empujando contra el bordillo
+    TICKS_ATASCO = 40
+
+    def __init__(self):
+        super().__init__()
+        # matrícula -> [destino, puntos de la ruta, índice del tramo actual]
+        self._planes: Dict[str, list] = {}
+        self._lentos: Dict[str, float] = {}
+
+    def objetivo(self, simulacion: "SimulacionNucleo", camion: Camion):
+        matricula = camion.matricula
+        destino = self.destino(simulacion, camion)
+        if destino is None:
+            self._planes.pop(matricula, None)
+            return None
+        posicion = simulacion.truck_physics[matricula].position
+        x, y = posicion.x, posicion.y
+        plan = self._planes.get(matricula)
+        if (plan is None or plan[0] != (destino.x, destino.y)
+                or _sobre_tramo(plan[1][plan[2]], plan[1][plan[2] + 1], x, y)[1] > self.DESVIO_MAXIMO):
+            puntos = simulacion.road_system.grafo.ruta((x, y), (destino.x, destino.y))
+            if not puntos:
+                self._planes.pop(matricula, None)
+                return destino
+            plan = self._planes[matricula] = [(destino.x, destino.y), [(x, y)] + puntos, 0]
+        return Point(*self._adelantado(plan, x, y))
+
+    def _adelantado(self, plan: list, x: float, y: float) -> Tuple[float, float]:
+        """Punto de la ruta ADELANTO px más allá de la proyección del camión, en su carril"""
+        puntos, i = plan[1], plan[2]
+        # Pasar al tramo siguiente si ya se rebasó el actual o si el siguiente queda más cerca
+        while i < len(puntos) - 2:
+            t, distancia = _sobre_tramo(puntos[i], puntos[i + 1], x, y)
+            if t < 1.0 and distancia <= _sobre_tramo(puntos[i + 1], puntos[i + 2], x, y)[1]:
+                break
+            i += 1
+        plan[2] = i
+
+        t, _ = _sobre_tramo(puntos[i], puntos[i + 1], x, y)
+        t = min(1.0, max(0.0, t))
+        (ax, ay), (bx, by) = puntos[i], puntos[i + 1]
+        px, py = ax + t * (bx - ax), ay + t * (by - ay)
+        restante = self.ADELANTO
+        for qx, qy in puntos[i + 1:]:
+            largo = math.hypot(qx - px, qy - py)
+            if largo >= restante:
+                # Desplazado CARRIL px a la derecha del sentido de la marcha (y crece hacia abajo)
+                dx, dy = (qx - px) / largo, (qy - py) / largo
+                return (px + dx * restante - dy * self.CARRIL,
+                        py + dy * restante + dx * self.CARRIL)
+            restante -= largo
+            px, py = qx, qy
+        return puntos[-1]
+
+    def guiar(self, physics: TruckPhysics, punto, matricula: str) -> Controles:
+        # El punto se mueve con el camión, así que no hay órbita que evitar
+        return controles_hacia(physics, punto, evitar_orbita=False)
+
+    def atascado(self, physics: TruckPhysics, matricula: str, factor: float) -> bool:
+        """Si lleva TICKS_ATASCO acelerando sin coger velocidad (rozando el bordillo)"""
+        lento = self._acelerando.get(matricula) and abs(physics.velocity) < 0.4 * physics.max_speed
+        lentos = self._lentos.get(matricula, 0.0) + factor if lento else 0.0
+        if lentos >= self.TICKS_ATASCO:
+            # Tras la maniobra se vuelve a calcular la ruta desde donde quede
+            self._lentos[matricula] = 0.0
+            self._planes.pop(matricula, None)
+            return True
+        self._lentos[matricula] = lentos
+        return False
+
+
+class PilotoDespacho(PilotoRuta):
+    """Autopiloto por carretera que sigue las paradas que le asigna el despachador"""
+
+    def destino(self, simulacion: "SimulacionNucleo", camion: Camion):
+        parada = simulacion.despacho.siguiente_parada(camion.matricula)
+        return Point(*parada) if parada is not None else None
+
+
+# ===== Reloj =====
+
+class RelojSimulacion:
+    """Reloj de paso fijo: acumula tiempo real y lo reparte en pasos de física"""
+
+    def __init__(self, hz_fisica: float = FRECUENCIA_BASE, max_pasos: int = MAX_PASOS_POR_FRAME):
+        if hz_fisica <= 0:
+            raise ValueError("La frecuencia de la física debe ser positiva")
+        self.hz = hz_fisica
+        self.dt = 1.0 / hz_fisica
+        self.max_pasos = max_pasos
+        self.acumulado = 0.0
+        self.segundos_descartados = 0.0
+
+    def avanzar(self, segundos: float) -> int:
+        """Suma `segundos` de tiempo real y devuelve cuántos pasos de física tocan"""
+        self.acumulado += max(0.0, segundos)
+        # El pequeño margen evita perder un paso por redondeo (0.1 / 0.05 = 1.999...)
+        pasos = int(self.acumulado / self.dt + 1e-9)
+        if pasos > self.max_pasos:
+            self.segundos_descartados += (pasos - self.max_pasos) * self.dt
+            self.acumulado -= (pasos - self.max_pasos) * self.dt
+            pasos = self.max_pasos
+        self.acumulado = max(0.0, self.acumulado - pasos * self.dt)
+        return pasos
+
+    @property
+    def alfa(self) -> float:
+        """Fracción del siguiente paso ya transcurrida (para interpolar al dibujar)"""
+        return min(1.0, self.acumulado / self.dt)
+
+
+# ===== Núcleo =====
+
+class SimulacionNucleo:
+    """Simulación de la flota sin interfaz: mapa, física y recogida/entrega"""
+
+    def __init__(self, canvas_width: int = 800, canvas_height: int = 600,
+                 eventos: Optional[Callable[[str], None]] = print,
+                 hz_fisica: float = FRECUENCIA_BASE, semilla: Optional[int] = None,
+                 colisiones: bool = False):
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+        self.eventos = eventos  # Mensajes de la simulación (None = silencio)
+        # Todo el azar de la simulación sale de aquí (reproducible con semilla)
+        self.rng = random.Random(semilla)
+        self.reloj = RelojSimulacion(hz_fisica)
+
+        self.camiones: List[Camion] = []
+        self.truck_physics: Dict[str, TruckPhysics] = {}
+        # Física de todos los camiones, avanzada en un solo paso por frame
+        self.motor_fisica = MotorFisicaFlota()
+        # Choques entre camiones (None = se atraviesan). Los autopilotos no
+        # esquivan a otros camiones, así que con flotas grandes se atascan
+        self.colisiones = DetectorColisiones() if colisiones else None
+        self.choques = 0
+        self.camion_activo: Optional[Camion] = None
+        # Índice global caja -> camión de toda la flota
+        self.indice_flota = IndiceFlota()
+        # Camiones conducidos por un piloto (matrícula -> piloto)
+        self.pilotos: Dict[str, Callable[["SimulacionNucleo", Camion], Controles]] = {}
+        self.ticks = 0
+        self.recogidas = 0
+        self.entregas = 0
+
+        # Sistema de carreteras
+        self.road_system = RoadSystem(self.canvas_width, self.canvas_height, self.rng)
+
+        # Reparto automático de los paquetes entre los camiones despachados
+        self.despacho = Despachador(self.road_system.grafo.distancia, posicion=self._posicion,
+                                    asignar=self.road_system.assign_package)
+        self.piloto_despacho = PilotoDespacho()
+        for package in self.road_system.packages.en_estado(PackageState.WAREHOUSE):
+            self.despacho.agregar(package)
+
+        # Controles del camión activo
+        self.controls = dict(SIN_CONTROLES)
+
+    # ===== Hooks (la interfaz los sobrescribe) =====
+
+    def on_pickup(self, camion: Camion, package: Package):
+        """Se llama tras recoger un paquete"""
+
+    def on_delivery(self, camion: Camion, package: Package):
+        """Se llama tras entregar un paquete"""
+
+    # ===== Flota =====
+
+    def create_sample_trucks(self):
+        """Crea camiones de ejemplo"""
+        camion1 = Camion("TRK001", "Carlos Rodríguez", 8000.0, "Reparto urbano", 90, 0,
+                         bodega=BODEGA_ESTANDAR)
+        self.add_truck(camion1, Point(400, 300), 0)
+
+        camion2 = Camion("TRK002", "Ana López", 6000.0, "Entregas rápidas", 180, 0,
+                         bodega=BODEGA_ESTANDAR)
+        self.add_truck(camion2, Point(200, 150), 90)
+
+        self.camion_activo = camion1
+
+    def add_truck(self, camion: Camion, position: Optional[Point] = None,
+                  heading: Optional[float] = None):
+        """Añade un camión a la flota (en una posición aleatoria si no se indica)"""
+        if position is None:
+            position = Point(self.rng.randint(100, self.canvas_width - 100),
+                             self.rng.randint(100, self.canvas_height - 100))
+            # Empezar sobre el asfalto
+            ajustado = self.road_system.indice.ajustar(position.x, position.y)
+            if ajustado is not None:
+                position = Point(*ajustado)
+        if heading is None:
+            heading = self.rng.randint(0, 359)
+        self.truck_physics[camion.matricula] = TruckPhysics(position, heading, self.motor_fisica)
+        self.camiones.append(camion)
+        self.indice_flota.registrar(camion)
+
+    def crear_mision(self) -> Tuple[Package, Building, Building]:
+        """Crea un paquete entre un almacén y un destino al azar"""
+        warehouse = self.rng.choice(self.road_system.buildings_by_type["warehouse"])
+        delivery = self.rng.choice(self.road_system.buildings_by_type["delivery"])
+
+        package_id = f"PKG{len(self.road_system.packages)+1:03d}"
+        new_package = Package(
+            id=package_id,
+            pickup_point=warehouse.position,
+            delivery_point=delivery.position,
+            weight=self.rng.uniform(20, 150)
+        )
+        self.road_system.add_package(new_package)
+        self.despacho.agregar(new_package)
+        return new_package, warehouse, delivery
+
+    def _posicion(self, matricula: str) -> Tuple[float, float]:
+        posicion = self.truck_physics[matricula].position
+        return posicion.x, posicion.y
+
+    def despachar(self, camion: Camion):
+        """Pone el camión a las órdenes del despachador (con PilotoDespacho).
+
+        Los paquetes se le asignan en despacho.planificar(), que hay que
+        llamar después (la interfaz lo hace en cada frame).
+        """
+        a_bordo = self.road_system.packages.del_camion(camion.matricula, PackageState.IN_TRANSIT)
+        self.despacho.agregar_camion(camion.matricula, camion.capacidad_kg,
+                                     camion.peso_total() + camion.peso_reservado,
+                                     self._posicion(camion.matricula), a_bordo)
+        self.pilotos[camion.matricula] = self.piloto_despacho
+
+    def dejar_de_despachar(self, camion: Camion):
+        """Quita el camión del despachador; lo que no había recogido vuelve a la cola"""
+        self.despacho.quitar_camion(camion.matricula)
+        if self.pilotos.get(camion.matricula) is self.piloto_despacho:
+            del self.pilotos[camion.matricula]
+
+    # ===== Simulación =====
+
+    def tick(self):
+        """Avanza un paso fijo: pilotos, física y recogida/entrega automática"""
+        self.update_physics()
+        for matricula in self.pilotos:
+            camion = self.indice_flota.camiones.get(matricula)
+            if camion is not None:
+                self.handle_pickup_delivery(camion)
+        self.ticks += 1
+
+    def ejecutar(self, ticks: int) -> float:
+        """Ejecuta `ticks` pasos sin pausas y devuelve los segundos empleados"""
+        inicio = time.perf_counter()
+        for _ in range(ticks):
+            self.tick()
+        return time.perf_counter() - inicio
+
+    @property
+    def tiempo(self) -> float:
+        """Segundos simulados"""
+        return self.ticks * self.reloj.dt
+
+    def avanzar_tiempo(self, segundos: float) -> int:
+        """Avanza los pasos fijos que caben en `segundos` de tiempo real.
+
+        Es lo que hace la interfaz en cada frame; devuelve los pasos dados.
+        """
+        pasos = self.reloj.avanzar(segundos)
+        for _ in range(pasos):
+            self.tick()
+        return pasos
+
+    def estado(self) -> List[Tuple[str, float, float, float, float]]:
+        """(matrícula, x, y, rumbo, velocidad) de cada camión, para comparar ejecuciones"""
+        return [(matricula, physics.position.x, physics.position.y, physics.heading, physics.velocity)
+                for matricula, physics in self.truck_physics.items()]
+
+    def update_physics(self):
+        """Actualiza la física de todos los camiones"""
+        # Solo el camión activo y los pilotados reciben controles; el resto
+        # sigue por inercia
+        self.motor_fisica.soltar_controles()
+        for matricula, piloto in self.pilotos.items():
+            camion = self.indice_flota.camiones.get(matricula)
+            if camion is not None:
+                self.truck_physics[matricula].fijar_controles(piloto(self, camion))
+        physics = None
+        if self.camion_activo and self.camion_activo.matricula in self.truck_physics:
+            physics = self.truck_physics[self.camion_activo.matricula]
+            if self.camion_activo.matricula not in self.pilotos:
+                physics.fijar_controles(self.controls)
+
+        self.motor_fisica.paso(self.reloj.dt)
+        if self.colisiones is not None:
+            self.choques += len(self.colisiones.resolver(self.motor_fisica))
+
+        # Mantener en carreteras (opcional)
+        self._keep_on_road()
+
+        if physics is not None:
+            # Actualizar velocidad del camión (para compatibilidad)
+            self.camion_activo.velocidad = int(abs(physics.velocity) * 20)  # Conversión visual
+            self.camion_activo.rumbo = int(physics.heading)
+
+    def _keep_on_road(self):
+        """Mantiene los camiones dentro del mapa y sobre el asfalto.
+
+        Contra el borde del mapa rebotan; al salirse de la carretera vuelven
+        al punto más cercano del asfalto y pierden algo de velocidad, así que
+        se deslizan a lo largo del bordillo. Los camiones con un piloto
+        todoterreno solo quedan limitados por el borde del mapa.
+        """
+        margin = 30
+        self.motor_fisica.limitar(margin, margin, self.canvas_width - margin,
+                                  self.canvas_height - margin)
+        indice = self.road_system.indice
+        if not len(indice):
+            return
+        libres = {self.truck_physics[matricula].indice for matricula, piloto in self.pilotos.items()
+                  if getattr(piloto, "todoterreno", False)}
+        columnas = self.motor_fisica.columnas
+        xs, ys, velocidades = columnas["x"], columnas["y"], columnas["velocity"]
+        for i in range(len(self.motor_fisica)):
+            if i in libres:
+                continue
+            ajustado = indice.ajustar(xs[i], ys[i])
+            if ajustado is not None:
+                xs[i], ys[i] = ajustado
+                velocidades[i] *= ROCE_BORDILLO
+
+    def handle_pickup_delivery(self, camion: Optional[Camion] = None) -> Optional[Package]:
+        """Recoge o entrega un paquete cerca del camión (por defecto, el activo).
+
+        Devuelve el paquete recogido o entregado, o None.
+        """
+        camion = camion or self.camion_activo
+        if not camion or camion.matricula not in self.truck_physics:
+            return None
+
+        physics = self.truck_physics[camion.matricula]
+        truck_pos = physics.position
+        road_system = self.road_system
+
+        # Buscar paquetes cercanos para recoger (solo los del radio, por el índice espacial)
+        despachado = camion.matricula in self.despacho.planes
+        for _, package_id in road_system.por_recoger.en_radio(truck_pos.x, truck_pos.y, RADIO_RECOGIDA):
+            # Un camión despachado solo recoge lo que le toca en esta parada
+            if despachado and not self.despacho.toca_recoger(camion.matricula, package_id):
+                continue
+            package = road_system.packages_by_id[package_id]
+            # Crear caja correspondiente
+            nueva_caja = Caja(
+                package.id,
+                package.weight,
+                f"Entrega para {package.delivery_point.x:.0f},{package.delivery_point.y:.0f}",
+                50, 40, 30
+            )
+
+            # Intentar añadir al camión
+            if camion.add_caja(nueva_caja, eventos=self.eventos):
+                road_system.update_package_state(package, PackageState.IN_TRANSIT, camion.matricula)
+                self.despacho.completado(camion.matricula, package, "recoger")
+                self.recogidas += 1
+                if self.eventos:
+                    self.eventos(f"📦 Paquete {package.id} recogido por {camion.matricula}")
+                self.on_pickup(camion, package)
+                return package
+
+        # Buscar paquetes para entregar
+        for _, package_id in road_system.por_entregar.en_radio(truck_pos.x, truck_pos.y, RADIO_RECOGIDA):
+            package = road_system.packages_by_id[package_id]
+            if package.assigned_truck == camion.matricula:
+                # Remover la caja del camión (búsqueda O(1) por código)
+                if camion.quitar_caja(package.id) is not None:
+                    road_system.update_package_state(package, PackageState.DELIVERED)
+                    self.despacho.completado(camion.matricula, package, "entregar")
+                    self.entregas += 1
+                    if self.eventos:
+                        self.eventos(f"📦 Paquete {package.id} entregado por {camion.matricula}")
+                    self.on_delivery(camion, package)
+                    return package
+        return None
+
+
+def main():
+    """Ejecuta la simulación sin interfaz e informa del rendimiento"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulación de camiones sin interfaz gráfica")
+    parser.add_argument("--ticks", type=int, default=1000, help="Pasos de física a simular")
+    parser.add_argument("--camiones", type=int, default=2, help="Camiones en la flota")
+    parser.add_argument("--misiones", type=int, default=0, help="Paquetes extra además de los 10 iniciales")
+    parser.add_argument("--piloto", choices=["directo", "ruta", "despacho", "ninguno"], default="directo",
+                        help="Autopiloto de todos los camiones")
+    parser.add_argument("--guion", help='Controles en bucle, p. ej. "forward:40,left+forward:10"')
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla aleatoria")
+    parser.add_argument("--hz", type=float, default=FRECUENCIA_BASE, help="Pasos de física por segundo simulado")
+    parser.add_argument("--colisiones", action="store_true", help="Los camiones chocan entre sí")
+    parser.add_argument("--verbose", action="store_true", help="Muestra los mensajes de la simulación")
+    args = parser.parse_args()
+
+    simulacion = SimulacionNucleo(eventos=print if args.verbose else None, hz_fisica=args.hz,
+                                  semilla=args.semilla, colisiones=args.colisiones)
+    simulacion.create_sample_trucks()
+    for i in range(len(simulacion.camiones), args.camiones):
+        simulacion.add_truck(Camion(f"SIM{i:05d}", f"Piloto {i}", 8000.0, "Simulación", 90, 0,
+                                    bodega=BODEGA_ESTANDAR))
+    for _ in range(args.misiones):
+        simulacion.crear_mision()
+
+    for camion in simulacion.camiones:
+        if args.guion:
+            simulacion.pilotos[camion.matricula] = PilotoGuion.desde_texto(args.guion)
+        elif args.piloto == "directo":
+            simulacion.pilotos[camion.matricula] = PilotoDirecto()
+        elif args.piloto == "ruta":
+            simulacion.pilotos[camion.matricula] = PilotoRuta()
+        elif args.piloto == "despacho":
+            simulacion.despachar(camion)
+    if args.piloto == "despacho" and not args.guion:
+        inicio = time.perf_counter()
+        simulacion.despacho.planificar(presupuesto=None)
+        print(f"🗺️ {simulacion.despacho.inserciones} paquetes planificados en "
+              f"{time.perf_counter() - inicio:.2f} s "
+              f"(ruta total {simulacion.despacho.coste_total():.0f} px)")
+
+    segundos = simulacion.ejecutar(args.ticks)
+    ticks_por_segundo = args.ticks / segundos if segundos > 0 else float('inf')
+    print(f"🚛 {len(simulacion.camiones)} camiones, {len(simulacion.road_system.packages)} paquetes")
+    print(f"⏱️ {args.ticks} ticks ({simulacion.tiempo:.1f} s simulados) en {segundos:.2f} s "
+          f"({ticks_por_segundo:.0f} ticks/s)")
+    print(f"📦 {simulacion.recogidas} recogidas, {simulacion.entregas} entregas, {simulacion.choques} choques")
+
+
+if __name__ == "__main__":
+    main()
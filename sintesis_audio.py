@@ -0,0 +1,231 @@
+"""
+Síntesis de los efectos de sonido del simulador
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+
+Los sonidos se describen con Tono (una onda con envolvente de ataque y
+relajación) y Pitidos (un tono repetido con pausas) y se renderizan de una
+vez a PCM de 16 bits con signo, listo para pygame.mixer.Sound(buffer=...).
+Con NumPy la onda entera se calcula con operaciones vectorizadas; sin NumPy
+con comprensiones de listas, aplicando la envolvente solo en los extremos y
+copiando el canal mono a los demás de una vez. Las dos vías dan los mismos
+bytes.
+
+Los buffers se guardan en disco (CacheSonidos) con el nombre del SHA-1 de la
+descripción, la frecuencia de muestreo y los canales, así que solo se
+sintetizan la primera vez. cargar_en_segundo_plano() los prepara en un hilo
+para que la ventana aparezca sin esperar al audio.
+"""
+
+import hashlib
+import math
+import os
+import sys
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Cambiar si cambia la forma de sintetizar, para invalidar la caché
+VERSION_SINTESIS = 1
+
+DIRECTORIO_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache_sonidos")
+
+# Formas de onda en función de la fase (en ciclos, 0 <= fase < 1)
+FORMAS = ("seno", "cuadrada", "sierra")
+
+
+@dataclass(frozen=True)
+class Tono:
+    """Onda de frecuencia fija con envolvente lineal de ataque y relajación"""
+    frecuencia: float  # Hz
+    duracion: float  # Segundos
+    amplitud: int = 2048  # Pico en unidades de muestra de 16 bits
+    forma: str = "seno"
+    ataque: float = 0.005  # Segundos hasta la amplitud máxima
+    relajacion: float = 0.02  # Segundos de caída al final
+
+    def __post_init__(self):
+        if self.forma not in FORMAS:
+            raise ValueError(f"Forma de onda desconocida: {self.forma}")
+        if self.duracion <= 0 or not 0 <= self.amplitud <= 32767:
+            raise ValueError("Duración o amplitud fuera de rango")
+
+
+@dataclass(frozen=True)
+class Pitidos:
+    """Un tono repetido, cada vez seguido de `pausa` segundos de silencio"""
+    tono: Tono
+    repeticiones: int = 2
+    pausa: float = 0.1
+
+
+Sonido = Union[Tono, Pitidos]
+
+# Efectos del simulador. El motor y la marcha atrás se reproducen en bucle:
+# el motor dura un número entero de ciclos y no lleva envolvente.
+SONIDOS: Dict[str, Sonido] = {
+    "claxon": Tono(800, 0.5, 4096),
+    "recogida": Tono(1200, 0.3, 2048),
+    "entrega": Pitidos(Tono(1000, 0.2, 2048), repeticiones=2, pausa=0.1),
+    "motor": Tono(55, 1.0, 1200, forma="sierra", ataque=0.0, relajacion=0.0),
+    "marcha_atras": Pitidos(Tono(1100, 0.25, 1800), repeticiones=1, pausa=0.25),
+}
+
+
+# ===== Síntesis =====
+
+def _tono_numpy(tono: Tono, tasa: int):
+    t = np.arange(int(tono.duracion * tasa)) / tasa
+    if tono.forma == "seno":
+        onda = np.sin(2 * math.pi * tono.frecuencia * t)
+    else:
+        fase = np.mod(tono.frecuencia * t, 1.0)
+        onda = np.where(fase < 0.5, 1.0, -1.0) if tono.forma == "cuadrada" else 2 * fase - 1
+    envolvente = np.ones_like(t)
+    if tono.ataque > 0:
+        envolvente = np.minimum(envolvente, t / tono.ataque)
+    if tono.relajacion > 0:
+        envolvente = np.minimum(envolvente, (tono.duracion - t) / tono.relajacion)
+    return tono.amplitud * onda * envolvente
+
+
+def _tono_python(tono: Tono, tasa: int) -> list:
+    n = int(tono.duracion * tasa)
+    # Misma fórmula y orden de operaciones que con NumPy, para que el PCM
+    # salga idéntico con y sin NumPy
+    if tono.forma == "seno":
+        omega = 2 * math.pi * tono.frecuencia
+        ondas = [math.sin(omega * (i / tasa)) for i in range(n)]
+    else:
+        frecuencia = tono.frecuencia
+        fases = [(frecuencia * (i / tasa)) % 1.0 for i in range(n)]
+        if tono.forma == "cuadrada":
+            ondas = [1.0 if fase < 0.5 else -1.0 for fase in fases]
+        else:
+            ondas = [2 * fase - 1 for fase in fases]
+    amplitud = tono.amplitud
+    muestras = [amplitud * onda for onda in ondas]
+
+    # La envolvente solo vale menos de 1 al principio y al final: el resto
+    # de muestras se quedan como están (multiplicar por 1.0 no cambia nada)
+    extremos = set()
+    if tono.ataque > 0:
+        extremos.update(range(min(n, int(tono.ataque * tasa) + 2)))
+    if tono.relajacion > 0:
+        extremos.update(range(max(0, n - int(tono.relajacion * tasa) - 2), n))
+    for i in extremos:
+        t = i / tasa
+        envolvente = 1.0
+        if tono.ataque > 0:
+            envolvente = min(envolvente, t / tono.ataque)
+        if tono.relajacion > 0:
+            envolvente = min(envolvente, (tono.duracion - t) / tono.relajacion)
+        muestras[i] = amplitud * ondas[i] * envolvente
+    return muestras
+
+
+def sintetizar(sonido: Sonido, tasa: int):
+    """Muestras mono (floats en unidades de 16 bits): array de NumPy o lista"""
+    tono = sonido.tono if isinstance(sonido, Pitidos) else sonido
+    if NUMPY_AVAILABLE:
+        muestras = _tono_numpy(tono, tasa)
+        if isinstance(sonido, Pitidos):
+            silencio = np.zeros(int(sonido.pausa * tasa))
+            muestras = np.tile(np.concatenate((muestras, silencio)), sonido.repeticiones)
+        return muestras
+    muestras = _tono_python(tono, tasa)
+    if isinstance(sonido, Pitidos):
+        muestras = (muestras + [0.0] * int(sonido.pausa * tasa)) * sonido.repeticiones
+    return muestras
+
+
+def pcm(sonido: Sonido, tasa: int, canales: int = 2) -> bytes:
+    """PCM de 16 bits con signo, little-endian y canales intercalados"""
+    muestras = sintetizar(sonido, tasa)
+    if NUMPY_AVAILABLE:
+        enteros = np.clip(np.rint(muestras), -32768, 32767).astype("<i2")
+        return np.repeat(enteros, canales).tobytes()
+    # Sin recortar: |onda| y la envolvente no pasan de 1 y la amplitud de 32767
+    mono = array('h', map(round, muestras))
+    if canales == 1:
+        enteros = mono
+    else:
+        # Cada canal es la misma señal: se copia entera con una asignación por canal
+        enteros = array('h', bytes(mono.itemsize * len(mono) * canales))
+        for canal in range(canales):
+            enteros[canal::canales] = mono
+    if sys.byteorder == "big":
+        enteros.byteswap()
+    return enteros.tobytes()
+
+
+# ===== Caché en disco =====
+
+def clave_cache(sonido: Sonido, tasa: int, canales: int) -> str:
+    """SHA-1 de la descripción del sonido y del formato de salida"""
+    return hashlib.sha1(repr((VERSION_SINTESIS, sonido, tasa, canales)).encode("utf-8")).hexdigest()
+
+
+class CacheSonidos:
+    """Buffers PCM ya renderizados, un archivo .pcm por sonido"""
+
+    def __init__(self, directorio: str = DIRECTORIO_CACHE):
+        self.directorio = directorio
+        self.aciertos = 0
+        self.fallos = 0
+
+    def ruta(self, sonido: Sonido, tasa: int, canales: int) -> str:
+        return os.path.join(self.directorio, clave_cache(sonido, tasa, canales) + ".pcm")
+
+    def obtener(self, sonido: Sonido, tasa: int, canales: int = 2) -> bytes:
+        """Buffer del sonido: de la caché si está, sintetizado (y guardado) si no"""
+        ruta = self.ruta(sonido, tasa, canales)
+        try:
+            with open(ruta, "rb") as archivo:
+                datos = archivo.read()
+            self.aciertos += 1
+            return datos
+        except OSError:
+            pass
+
+        datos = pcm(sonido, tasa, canales)
+        self.fallos += 1
+        # Escribir aparte y renombrar, para no dejar nunca un archivo a medias
+        temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            with open(temporal, "wb") as archivo:
+                archivo.write(datos)
+            os.replace(temporal, ruta)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el sonido en caché: {e}")
+        return datos
+
+
+def cargar_en_segundo_plano(sonidos: Dict[str, Sonido], tasa: int, canales: int,
+                            al_cargar: Callable[[str, bytes], None],
+                            cache: Optional[CacheSonidos] = None) -> threading.Thread:
+    """Prepara los buffers en un hilo y llama a al_cargar(nombre, datos) con cada uno.
+
+    al_cargar se ejecuta en el hilo de carga, no en el de la interfaz.
+    """
+    cache = cache if cache is not None else CacheSonidos()
+
+    def trabajar():
+        for nombre, sonido in sonidos.items():
+            try:
+                al_cargar(nombre, cache.obtener(sonido, tasa, canales))
+            except Exception as e:
+                print(f"⚠️ Error preparando el sonido {nombre}: {e}")
+
+    hilo = threading.Thread(target=trabajar, name="sintesis-audio", daemon=True)
+    hilo.start()
+    return hilo
@@ -0,0 +1,61 @@
+"""
+Pruebas del almacén columnar de cajas
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import unittest
+
+from almacen_cajas import AlmacenCajas
+from ej6_1 import Caja
+
+
+def almacen_de_prueba(n: int = 4) -> AlmacenCajas:
+    return AlmacenCajas(Caja(f"C{i}", 10 + i, "Libros" if i % 2 else "Ropa", 50, 40, 30 + i) for i in range(n))
+
+
+class TestAlmacenCajas(unittest.TestCase):
+
+    def test_las_vistas_siguen_a_su_caja_tras_quitar(self):
+        almacen = almacen_de_prueba()
+        vistas = {vista.codigo: vista for vista in almacen}
+        almacen.quitar("C1")  # C3 pasa a la fila 1
+        self.assertEqual(almacen.buscar("C3")._fila, 1)
+        for codigo in ("C0", "C2", "C3"):
+            caja = vistas[codigo]
+            self.assertEqual((caja.peso_kg, caja.altura), (10 + int(codigo[1]), 30 + int(codigo[1])))
+        self.assertEqual(vistas["C3"].descripcion_carga, "Libros")
+        self.assertEqual(len(almacen), 3)
+
+    def test_la_vista_de_una_caja_quitada_falla(self):
+        almacen = almacen_de_prueba()
+        vista = almacen.buscar("C1")
+        caja = almacen.quitar("C1")
+        self.assertEqual((caja.codigo, caja.peso_kg, caja.descripcion_carga, caja.altura), ("C1", 11, "Libros", 31))
+        with self.assertRaises(KeyError):
+            vista.peso_kg
+        self.assertEqual(vista.codigo, "C1")
+        self.assertNotIn("C1", almacen)
+        self.assertIsNone(almacen.buscar("C1"))
+
+    def test_quitar_la_ultima_y_volver_a_agregar(self):
+        almacen = almacen_de_prueba()
+        almacen.quitar("C3")
+        with self.assertRaises(KeyError):
+            almacen.quitar("C3")
+        fila = almacen.agregar(Caja("C3", 99, "Vidrio", 1, 2, 3))
+        self.assertEqual(fila, 3)
+        self.assertEqual(almacen.buscar("C3").peso_kg, 99)
+        with self.assertRaises(ValueError):
+            almacen.agregar(Caja("C3", 1, "Vidrio", 1, 2, 3))
+        self.assertEqual(len(almacen.codigos), 4)
+
+    def test_agregados_tras_quitar(self):
+        almacen = almacen_de_prueba()
+        almacen.quitar("C0")
+        self.assertEqual(almacen.peso_total(), 11 + 12 + 13)
+        self.assertEqual(sorted(vista.codigo for vista in almacen), ["C1", "C2", "C3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
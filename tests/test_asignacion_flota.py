@@ -0,0 +1,65 @@
+"""
+Pruebas de la asignación de cajas a la flota
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import unittest
+
+from asignacion_flota import AsignacionFlota, Heuristica, Objetivo, asignar_flota
+from ej6_1 import Caja, Camion
+
+
+def flota(capacidades, prefijo="T"):
+    return [Camion(f"{prefijo}{i}", "Ana", capacidad, "Reparto", 90, 0) for i, capacidad in enumerate(capacidades)]
+
+
+def cajas(pesos, prefijo="C"):
+    return [Caja(f"{prefijo}{i}", peso, "Libros", 10, 10, 10) for i, peso in enumerate(pesos)]
+
+
+class TestAsignacionFlota(unittest.TestCase):
+
+    def comprobar(self, asignacion: AsignacionFlota, n_cajas: int):
+        self.assertEqual(len(asignacion.asignacion) + len(asignacion.sin_asignar), n_cajas)
+        for matricula, asignadas in asignacion.cajas_por_camion.items():
+            self.assertLessEqual(sum(caja.peso_kg for caja in asignadas), asignacion.capacidad_kg[matricula])
+
+    def test_busqueda_local_reduce_camiones(self):
+        # FFD deja 7+6 | 5+4 | 3; cabe en dos: 7+4+3 | 6+5
+        lote, camiones = cajas([3, 7, 5, 4, 6]), flota([12, 12, 15, 12])
+        sin = asignar_flota(lote, camiones)
+        con = asignar_flota(lote, camiones, busqueda_local=True)
+        self.assertEqual((sin.camiones_usados, con.camiones_usados), (3, 2))
+        self.assertFalse(con.sin_asignar)
+        self.comprobar(con, len(lote))
+
+    def test_el_presupuesto_cuenta_movimientos_no_camiones(self):
+        # 500 camiones llenos no gastan el presupuesto de la búsqueda local
+        lote = cajas([3, 7, 5, 4, 6]) + cajas([99.5] * 500, "L")
+        camiones = flota([12, 12, 15, 12]) + flota([100] * 500, "F")
+        sin = asignar_flota(lote, camiones)
+        con = asignar_flota(lote, camiones, busqueda_local=True, iteraciones_max=50)
+        self.assertEqual(con.camiones_usados, sin.camiones_usados - 1)
+        self.comprobar(con, len(lote))
+
+    def test_sin_iteraciones_no_cambia_nada(self):
+        lote, camiones = cajas([3, 7, 5, 4, 6]), flota([12, 12, 15, 12])
+        sin = asignar_flota(lote, camiones)
+        con = asignar_flota(lote, camiones, busqueda_local=True, iteraciones_max=0)
+        self.assertEqual(con.asignacion, sin.asignacion)
+
+    def test_ffd_segun_objetivo(self):
+        # Para minimizar camiones el 6 abre el grande; para maximizar carga va al pequeño
+        lote, camiones = cajas([6, 5, 5]), flota([11, 7])
+        minimo = asignar_flota(lote, camiones, Objetivo.MINIMIZAR_CAMIONES, Heuristica.PRIMER_AJUSTE_DECRECIENTE)
+        maximo = asignar_flota(lote, camiones, Objetivo.MAXIMIZAR_CARGA, Heuristica.PRIMER_AJUSTE_DECRECIENTE)
+        self.assertEqual(len(minimo.sin_asignar), 1)
+        self.assertFalse(maximo.sin_asignar)
+        self.assertEqual(maximo.asignacion, {"C0": "T1", "C1": "T0", "C2": "T0"})
+        self.assertEqual(list(maximo.cajas_por_camion), list(minimo.cajas_por_camion))
+        self.comprobar(maximo, len(lote))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Pruebas de la carga concurrente de camiones
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import asyncio
+import threading
+import unittest
+
+from ej6_1 import Caja, Camion
+from indice_flota import IndiceFlota
+
+
+def camion(matricula: str, capacidad_kg: float = 100) -> Camion:
+    return Camion(matricula, "Ana", capacidad_kg, "Reparto", 90, 0)
+
+
+def caja(codigo: str, peso_kg: float = 10) -> Caja:
+    return Caja(codigo, peso_kg, "Libros", 10, 10, 10)
+
+
+class TestCargaEnParalelo(unittest.TestCase):
+
+    def test_muchos_hilos_no_pasan_de_la_capacidad(self):
+        destino = camion("A", capacidad_kg=105)
+        barrera = threading.Barrier(20)
+
+        def cargar(i):
+            barrera.wait()
+            destino.add_caja(caja(f"K{i}"), eventos=None)
+
+        hilos = [threading.Thread(target=cargar, args=(i,)) for i in range(20)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(len(destino.cajas), 10)
+        self.assertLessEqual(destino.peso_total(), 105)
+
+    def test_transferencias_simultaneas_de_la_misma_caja(self):
+        origen = camion("A")
+        origen.add_caja(caja("K"), eventos=None)
+        destinos = [camion(f"D{i}") for i in range(8)]
+        indice = IndiceFlota([origen] + destinos)
+        barrera = threading.Barrier(len(destinos))
+        resultados = []
+
+        def transferir(destino):
+            barrera.wait()
+            resultados.append(indice.transferir("K", destino))
+
+        for _ in range(20):
+            hilos = [threading.Thread(target=transferir, args=(d,)) for d in destinos]
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+            con_k = [c for c in [origen] + destinos if c.manifiesto.contiene("K")]
+            self.assertEqual(len(con_k), 1)
+            self.assertIs(indice.localizar("K"), con_k[0])
+        self.assertTrue(all(resultados))
+
+
+class TestReserva(unittest.TestCase):
+
+    def setUp(self):
+        self.camion = camion("A", capacidad_kg=100)
+
+    def test_sin_sitio_vence_el_plazo(self):
+        llena = self.camion.reservar(100)
+        self.assertIsNotNone(llena)
+        self.assertIsNone(self.camion.reservar(10))
+        self.assertIsNone(self.camion.reservar(10, timeout=0.05))
+        llena.cancelar()
+        self.assertIsNotNone(self.camion.reservar(10))
+
+    def test_liberar_despierta_al_que_espera(self):
+        reserva = self.camion.reservar(95)
+        obtenidas = []
+        hilo = threading.Thread(target=lambda: obtenidas.append(self.camion.reservar(50, timeout=5)))
+        hilo.start()
+        with reserva:
+            pass
+        hilo.join()
+        self.assertIsNotNone(obtenidas[0])
+        self.assertEqual(self.camion.peso_reservado, 50)
+
+    def test_confirmar_devuelve_lo_que_sobra(self):
+        reserva = self.camion.reservar(60)
+        hilo_espera = []
+        hilo = threading.Thread(target=lambda: hilo_espera.append(self.camion.reservar(70, timeout=5)))
+        hilo.start()
+        self.assertTrue(reserva.confirmar(caja("K1", 20)))
+        hilo.join()
+        self.assertIsNotNone(hilo_espera[0])
+        with self.assertRaises(RuntimeError):
+            reserva.confirmar(caja("K2", 20))
+        hilo_espera[0].cancelar()
+        self.assertEqual(self.camion.peso_reservado, 0)
+
+    def test_confirmar_duplicada_mantiene_la_reserva(self):
+        self.camion.add_caja(caja("K1"), eventos=None)
+        reserva = self.camion.reservar(10)
+        self.assertFalse(reserva.confirmar(caja("K1")))
+        self.assertTrue(reserva.activa)
+        reserva.cancelar()
+        self.assertEqual(self.camion.peso_reservado, 0)
+
+    def test_cargar_async_con_espera(self):
+        ocupada = self.camion.reservar(95)
+
+        async def escenario():
+            tarea = asyncio.ensure_future(self.camion.cargar_async(caja("K1", 30), timeout=5))
+            await asyncio.sleep(0.05)
+            ocupada.cancelar()
+            return await tarea
+
+        self.assertTrue(asyncio.run(escenario()))
+        self.assertTrue(self.camion.manifiesto.contiene("K1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
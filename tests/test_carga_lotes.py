@@ -0,0 +1,126 @@
+"""
+Pruebas de la carga de cajas una a una y por lotes
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import itertools
+import unittest
+from unittest import mock
+
+import ej6_1
+from ej6_1 import Caja, Camion, MotivoRechazo, PoliticaCarga, _mejor_subconjunto
+
+
+def camion(capacidad_kg: float = 100, **extra) -> Camion:
+    return Camion("TRK001", "Ana", capacidad_kg, "Reparto", 90, 0, **extra)
+
+
+def cajas(*pesos, prefijo: str = "C") -> list:
+    return [Caja(f"{prefijo}{i}", peso, "Libros", 10, 10, 10) for i, peso in enumerate(pesos)]
+
+
+class TestAddCaja(unittest.TestCase):
+
+    def test_carga_y_avisa_por_eventos(self):
+        destino = camion()
+        mensajes = []
+        self.assertTrue(destino.add_caja(cajas(40)[0], eventos=mensajes.append))
+        self.assertIn("añadida", mensajes[0])
+
+    def test_rechaza_exceso_duplicada_y_sin_sitio_en_bodega(self):
+        destino = camion(bodega=(10, 10, 10))
+        primera, = cajas(40)
+        self.assertTrue(destino.add_caja(primera, eventos=None))
+        mensajes = []
+        self.assertFalse(destino.add_caja(primera, eventos=mensajes.append))
+        self.assertIn("ya está cargada", mensajes[0])
+        self.assertFalse(destino.add_caja(Caja("P", 80, "Piedra", 1, 1, 1), eventos=mensajes.append))
+        self.assertTrue(any("Excedería" in m for m in mensajes))
+        self.assertFalse(destino.add_caja(Caja("G", 1, "Grande", 10, 10, 10), eventos=mensajes.append))
+        self.assertTrue(any("bodega" in m for m in mensajes))
+        self.assertEqual([c.codigo for c in destino.cajas], ["C0"])
+
+    def test_sin_eventos_no_imprime(self):
+        with mock.patch("builtins.print") as imprimir:
+            camion().add_caja(cajas(500)[0], eventos=None)
+        imprimir.assert_not_called()
+
+
+class TestAddCajas(unittest.TestCase):
+
+    def test_primer_ajuste_en_orden(self):
+        destino = camion()
+        resultado = destino.add_cajas(cajas(60, 50, 30, 10))
+        self.assertEqual([c.codigo for c in resultado.aceptadas], ["C0", "C2", "C3"])
+        self.assertEqual([(r.caja.codigo, r.motivo) for r in resultado.rechazadas],
+                         [("C1", MotivoRechazo.CAPACIDAD)])
+        self.assertEqual(resultado.peso_aceptado, 100)
+        self.assertFalse(resultado.completo)
+
+    def test_mejor_subconjunto_aprovecha_mas(self):
+        lote = cajas(60, 50, 50, 10)
+        primero = camion().add_cajas(lote, PoliticaCarga.PRIMER_AJUSTE)
+        mejor = camion().add_cajas(lote, PoliticaCarga.MEJOR_SUBCONJUNTO)
+        self.assertEqual(primero.peso_aceptado, 70)
+        self.assertEqual(mejor.peso_aceptado, 100)
+        self.assertEqual([c.codigo for c in mejor.aceptadas], ["C1", "C2"])
+        self.assertEqual(camion().add_cajas(lote, "best_subset").peso_aceptado, 100)
+
+    def test_motivos_de_rechazo(self):
+        destino = camion(bodega=(10, 10, 10))
+        destino.add_caja(Caja("YA", 1, "Libros", 1, 1, 1), eventos=None)
+        lote = [Caja("YA", 1, "Libros", 1, 1, 1), Caja("N", float("nan"), "Libros", 1, 1, 1),
+                Caja("D", 1, "Libros", 1, 1, 1), Caja("D", 1, "Libros", 1, 1, 1),
+                Caja("G", 1, "Grande", 10, 10, 10)]
+        resultado = destino.add_cajas(lote)
+        self.assertEqual([c.codigo for c in resultado.aceptadas], ["D"])
+        self.assertEqual([r.motivo for r in resultado.rechazadas],
+                         [MotivoRechazo.DUPLICADA, MotivoRechazo.PESO_INVALIDO,
+                          MotivoRechazo.DUPLICADA, MotivoRechazo.VOLUMEN])
+
+    def test_cuenta_las_reservas(self):
+        destino = camion()
+        reserva = destino.reservar(70)
+        resultado = destino.add_cajas(cajas(20, 20))
+        self.assertEqual(len(resultado.aceptadas), 1)
+        reserva.cancelar()
+
+    def test_eventos_una_linea_por_caja(self):
+        mensajes = []
+        camion().add_cajas(cajas(60, 50), eventos=mensajes.append)
+        self.assertEqual(len(mensajes), 2)
+        self.assertIn("rechazada (capacidad)", mensajes[1])
+
+
+class TestMejorSubconjunto(unittest.TestCase):
+
+    def mejor_a_fuerza_bruta(self, pesos, capacidad):
+        return max(sum(pesos[i] for i in combinacion)
+                   for n in range(len(pesos) + 1)
+                   for combinacion in itertools.combinations(range(len(pesos)), n)
+                   if sum(pesos[i] for i in combinacion) <= capacidad)
+
+    def test_coincide_con_la_busqueda_exhaustiva(self):
+        casos = [([7, 5, 4, 3], 10), ([31, 29, 17, 13, 11, 5], 60), ([8, 8, 8], 7), ([1, 2, 3, 4, 5, 6], 100)]
+        for pesos, capacidad in casos:
+            indices = _mejor_subconjunto(pesos, capacidad)
+            self.assertEqual(indices, sorted(indices))
+            self.assertEqual(sum(pesos[i] for i in indices), self.mejor_a_fuerza_bruta(pesos, capacidad))
+
+    def test_pesos_decimales_no_superan_la_capacidad(self):
+        pesos = [2.4, 2.4, 2.4, 2.9]
+        indices = _mejor_subconjunto(pesos, 7.5)
+        self.assertLessEqual(sum(pesos[i] for i in indices), 7.5)
+        self.assertEqual(_mejor_subconjunto(pesos, 0.5), [])
+        self.assertEqual(_mejor_subconjunto([], 10), [])
+
+    def test_problemas_grandes_usan_primer_ajuste_decreciente(self):
+        pesos = [5, 4, 3, 3]
+        self.assertEqual(_mejor_subconjunto(pesos, 10), [1, 2, 3])
+        with mock.patch.object(ej6_1, "LIMITE_BITS_SUBCONJUNTO", 10):
+            self.assertEqual(_mejor_subconjunto(pesos, 10), [0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Pruebas de la detección de colisiones entre camiones
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import math
+import random
+import unittest
+from unittest import mock
+
+import colisiones
+from colisiones import NUMPY_AVAILABLE, DetectorColisiones, solape
+from fisica_flota import MotorFisicaFlota
+
+
+def rectangulo(cx, cy, grados, largo, ancho) -> tuple:
+    angulo = math.radians(grados)
+    return (cx, cy, math.cos(angulo), math.sin(angulo), largo / 2, ancho / 2)
+
+
+def desplazado(caja: tuple, dx: float, dy: float) -> tuple:
+    return (caja[0] + dx, caja[1] + dy) + caja[2:]
+
+
+def flota_aleatoria(semilla: int, n: int, lado: float):
+    azar = random.Random(semilla)
+    return ([azar.uniform(0, lado) for _ in range(n)], [azar.uniform(0, lado) for _ in range(n)],
+            [azar.uniform(0, 360) for _ in range(n)])
+
+
+class TestSolape(unittest.TestCase):
+
+    def test_rectangulos_alineados(self):
+        a = rectangulo(0, 0, 0, 20, 10)
+        nx, ny, profundidad = solape(a, rectangulo(15, 2, 0, 20, 10))
+        self.assertEqual((round(nx, 9), round(ny, 9)), (1, 0))
+        self.assertAlmostEqual(profundidad, 5)
+        self.assertIsNone(solape(a, rectangulo(21, 0, 0, 20, 10)))
+        self.assertIsNone(solape(a, rectangulo(0, 10, 0, 20, 10)))
+
+    def test_girado_cerca_de_la_esquina_no_choca(self):
+        # Las cajas envolventes se tocan, pero el rombo pasa por fuera de la esquina
+        a = rectangulo(0, 0, 0, 10, 10)
+        b = rectangulo(12.5, 12.5, 45, 10, 10)
+        self.assertIsNone(solape(a, b))
+
+    def test_separar_por_la_normal_basta(self):
+        azar = random.Random(3)
+        for _ in range(500):
+            a = rectangulo(0, 0, azar.uniform(0, 360), azar.uniform(5, 40), azar.uniform(5, 20))
+            b = rectangulo(azar.uniform(-30, 30), azar.uniform(-30, 30), azar.uniform(0, 360),
+                           azar.uniform(5, 40), azar.uniform(5, 20))
+            encontrado = solape(a, b)
+            if encontrado is None:
+                continue
+            nx, ny, profundidad = encontrado
+            self.assertAlmostEqual(math.hypot(nx, ny), 1)
+            self.assertIsNone(solape(a, desplazado(b, nx * (profundidad + 1e-6), ny * (profundidad + 1e-6))))
+            self.assertIsNotNone(solape(a, desplazado(b, nx * profundidad * 0.9, ny * profundidad * 0.9)))
+
+
+class TestDetectorColisiones(unittest.TestCase):
+
+    def test_fase_amplia_igual_que_todos_los_pares(self):
+        detector = DetectorColisiones()
+        xs, ys, _ = flota_aleatoria(1, 400, 1500)
+        alcance = detector.celda
+        esperado = {(i, j) for i in range(len(xs)) for j in range(i + 1, len(xs))
+                    if math.hypot(xs[j] - xs[i], ys[j] - ys[i]) < alcance}
+        pares = detector.pares_candidatos(xs, ys)
+        self.assertEqual(len(pares), len(set(pares)))
+        self.assertEqual(set(pares), esperado)
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "NumPy no está instalado")
+    def test_numpy_y_python_dan_los_mismos_contactos(self):
+        xs, ys, headings = flota_aleatoria(2, 300, 800)
+        con_numpy = DetectorColisiones().detectar(xs, ys, headings)
+        with mock.patch.object(colisiones, "NUMPY_AVAILABLE", False):
+            sin_numpy = DetectorColisiones().detectar(xs, ys, headings)
+        self.assertEqual([(c.a, c.b) for c in con_numpy], [(c.a, c.b) for c in sin_numpy])
+        for a, b in zip(con_numpy, sin_numpy):
+            self.assertAlmostEqual(a.profundidad, b.profundidad)
+            self.assertAlmostEqual(a.nx, b.nx)
+            self.assertAlmostEqual(a.ny, b.ny)
+
+    def test_resolver_separa_y_rebota(self):
+        motor = MotorFisicaFlota()
+        motor.agregar(100, 100, 90, velocity=2.0)  # Hacia la derecha
+        motor.agregar(150, 100, 270, velocity=1.0)  # Hacia la izquierda, cabina contra cabina
+        detector = DetectorColisiones()
+        contactos = detector.resolver(motor)
+        self.assertEqual(len(contactos), 1)
+        c = motor.columnas
+        self.assertLess(c["velocity"][0], 0)
+        self.assertLess(c["velocity"][1], 0)
+        self.assertGreater(c["x"][1] - c["x"][0], 50)
+        self.assertEqual(detector.detectar(c["x"], c["y"], c["heading"]), [])
+
+    def test_el_de_detras_no_adelanta_al_de_delante(self):
+        motor = MotorFisicaFlota()
+        motor.agregar(100, 100, 90, velocity=3.0)
+        motor.agregar(170, 100, 90, velocity=1.0)
+        DetectorColisiones().resolver(motor)
+        self.assertEqual(list(motor.columnas["velocity"]), [1.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
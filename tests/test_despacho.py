@@ -0,0 +1,138 @@
+"""
+Pruebas del despacho automático de paquetes
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import math
+import random
+import unittest
+from dataclasses import dataclass
+from typing import Optional
+
+from asignacion_flota import MARGEN_CAPACIDAD
+from despacho import Despachador
+
+
+@dataclass
+class Punto:
+    x: float
+    y: float
+
+
+@dataclass
+class Paquete:
+    id: str
+    pickup_point: Punto
+    delivery_point: Punto
+    weight: float
+    assigned_truck: Optional[str] = None
+
+
+def paquetes_aleatorios(azar: random.Random, n: int, almacenes: int = 4, destinos: int = 12) -> list:
+    puntos_almacen = [Punto(azar.uniform(0, 800), azar.uniform(0, 600)) for _ in range(almacenes)]
+    puntos_destino = [Punto(azar.uniform(0, 800), azar.uniform(0, 600)) for _ in range(destinos)]
+    return [Paquete(f"P{i:03d}", azar.choice(puntos_almacen), azar.choice(puntos_destino),
+                    azar.uniform(20, 150)) for i in range(n)]
+
+
+class TestDespachador(unittest.TestCase):
+
+    def setUp(self):
+        self.azar = random.Random(21)
+        self.despacho = Despachador()
+        self.capacidades = {"A": 300.0, "B": 500.0, "C": 200.0}
+        for matricula, capacidad in self.capacidades.items():
+            self.despacho.agregar_camion(matricula, capacidad,
+                                         posicion=(self.azar.uniform(0, 800), self.azar.uniform(0, 600)))
+        self.paquetes = paquetes_aleatorios(self.azar, 60)
+        for paquete in self.paquetes:
+            self.despacho.agregar(paquete)
+
+    def comprobar_planes(self, cargados=None):
+        """Cada paquete planificado se recoge antes de entregarse y nunca se pasa de la capacidad.
+
+        `cargados` son los paquetes que lleva ya cada camión (matrícula -> ids).
+        """
+        vistos = set()
+        for matricula, plan in self.despacho.planes.items():
+            limite = plan.capacidad_kg * (1 - MARGEN_CAPACIDAD)
+            carga, a_bordo = plan.carga_kg, set((cargados or {}).get(matricula, ()))
+            for i, visita in enumerate(plan.visitas):
+                for paquete_id in visita.entregar:
+                    self.assertIn(paquete_id, a_bordo, f"{paquete_id} se entrega antes de recogerlo")
+                    a_bordo.discard(paquete_id)
+                    carga -= self.despacho.paquetes[paquete_id].weight
+                for paquete_id in visita.recoger:
+                    a_bordo.add(paquete_id)
+                    vistos.add(paquete_id)
+                    carga += self.despacho.paquetes[paquete_id].weight
+                    self.assertEqual(self.despacho.paquetes[paquete_id].assigned_truck, matricula)
+                self.assertLessEqual(carga, limite + 1e-9, f"{matricula} se pasa en la visita {i}")
+                self.assertAlmostEqual(plan.cargas[i], carga)
+            self.assertFalse(a_bordo, f"{matricula} no entrega {a_bordo}")
+        return vistos
+
+    def test_todos_planificados_y_factibles(self):
+        self.assertEqual(self.despacho.planificar(presupuesto=None), 60)
+        self.assertEqual(self.comprobar_planes(), {p.id for p in self.paquetes})
+        self.assertFalse(self.despacho.pendientes)
+
+    def test_dos_opt_acorta_sin_romper_la_factibilidad(self):
+        self.despacho.planificar(presupuesto=None, mejorar=False)
+        antes = self.despacho.coste_total()
+        for plan in self.despacho.planes.values():
+            self.despacho._dos_opt(plan, math.inf)
+        self.assertLessEqual(self.despacho.coste_total(), antes + 1e-9)
+        self.assertEqual(len(self.comprobar_planes()), 60)
+
+    def test_presupuesto_agotado_no_inserta(self):
+        self.assertEqual(self.despacho.planificar(presupuesto=0), 0)
+        self.assertEqual(len(self.despacho.pendientes), 60)
+        self.despacho.max_candidatos = 1
+        self.assertEqual(self.despacho.planificar(presupuesto=None), 60)
+        self.comprobar_planes()
+
+    def test_demasiado_pesado_espera_a_un_camion_mayor(self):
+        enorme = Paquete("GRANDE", Punto(0, 0), Punto(10, 10), 1000)
+        self.despacho.agregar(enorme)
+        self.despacho.planificar(presupuesto=None)
+        self.assertEqual(self.despacho.sin_asignar, ["GRANDE"])
+        self.assertIsNone(enorme.assigned_truck)
+        self.despacho.agregar_camion("D", 2000, posicion=(0, 0))
+        self.despacho.planificar(presupuesto=None)
+        self.assertEqual(enorme.assigned_truck, "D")
+
+    def test_seguir_los_planes_entrega_todo(self):
+        self.despacho.planificar(presupuesto=None)
+        entregados, cargados = set(), {matricula: set() for matricula in self.capacidades}
+        for _ in range(1000):
+            activos = [m for m in self.despacho.planes if self.despacho.siguiente_parada(m) is not None]
+            if not activos:
+                break
+            matricula = activos[0]
+            visita = self.despacho.planes[matricula].visitas[0]
+            for paquete_id in list(visita.entregar):
+                self.despacho.completado(matricula, self.despacho.paquetes[paquete_id], "entregar")
+                cargados[matricula].remove(paquete_id)
+                entregados.add(paquete_id)
+            for paquete_id in list(visita.recoger):
+                self.assertTrue(self.despacho.toca_recoger(matricula, paquete_id))
+                self.despacho.completado(matricula, self.despacho.paquetes[paquete_id], "recoger")
+                cargados[matricula].add(paquete_id)
+            self.comprobar_planes(cargados)
+        self.assertEqual(entregados, {p.id for p in self.paquetes})
+        self.assertTrue(all(plan.carga_kg < 1e-6 for plan in self.despacho.planes.values()))
+
+    def test_quitar_camion_devuelve_lo_no_recogido(self):
+        self.despacho.planificar(presupuesto=None)
+        suyos = {p.id for p in self.paquetes if p.assigned_truck == "B"}
+        devueltos = self.despacho.quitar_camion("B")
+        self.assertEqual(set(devueltos), suyos)
+        self.assertTrue(all(self.despacho.paquetes[i].assigned_truck is None for i in devueltos))
+        self.despacho.planificar(presupuesto=None)
+        self.assertEqual(len(self.comprobar_planes()), 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Pruebas del empaquetado 3D de cajas en la bodega
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import random
+import unittest
+
+from ej6_1 import Caja
+from empaquetado_3d import EPSILON, EmpaquetadorBodega
+
+
+def caja(codigo: str, largo: float, ancho: float, altura: float) -> Caja:
+    return Caja(codigo, 1, "Libros", largo, ancho, altura)
+
+
+def solapan(a, b) -> bool:
+    return (a.x < b.x + b.largo - EPSILON and b.x < a.x + a.largo - EPSILON
+            and a.y < b.y + b.ancho - EPSILON and b.y < a.y + a.ancho - EPSILON
+            and a.z < b.z + b.altura - EPSILON and b.z < a.z + a.altura - EPSILON)
+
+
+class TestEmpaquetadorBodega(unittest.TestCase):
+
+    def comprobar(self, bodega: EmpaquetadorBodega):
+        """Todas dentro de la bodega, sin solapes y con el volumen bien sumado"""
+        colocaciones = list(bodega.colocaciones.values())
+        for i, a in enumerate(colocaciones):
+            self.assertGreaterEqual(min(a.x, a.y, a.z), -EPSILON)
+            self.assertLessEqual(a.x + a.largo, bodega.largo + EPSILON)
+            self.assertLessEqual(a.y + a.ancho, bodega.ancho + EPSILON)
+            self.assertLessEqual(a.z + a.altura, bodega.altura + EPSILON)
+            for b in colocaciones[i + 1:]:
+                self.assertFalse(solapan(a, b), f"{a.codigo} se solapa con {b.codigo}")
+        self.assertAlmostEqual(bodega.volumen_ocupado, sum(c.volumen() for c in colocaciones))
+
+    def test_llena_la_bodega_exactamente(self):
+        bodega = EmpaquetadorBodega(100, 100, 100)
+        for i in range(8):
+            self.assertIsNotNone(bodega.insertar(caja(f"C{i}", 50, 50, 50)))
+        self.assertIsNone(bodega.insertar(caja("X", 1, 1, 1)))
+        self.assertAlmostEqual(bodega.ocupacion(), 1.0)
+        self.comprobar(bodega)
+
+    def test_rota_en_planta_pero_no_voltea(self):
+        bodega = EmpaquetadorBodega(100, 40, 30)
+        colocacion = bodega.insertar(caja("A", 40, 100, 30))
+        self.assertEqual((colocacion.largo, colocacion.ancho), (100, 40))
+        self.assertIsNone(bodega.insertar(caja("B", 30, 40, 100)))
+        volteo = EmpaquetadorBodega(100, 40, 30, permitir_volteo=True)
+        self.assertIsNotNone(volteo.insertar(caja("B", 30, 40, 100)))
+
+    def test_quitar_libera_el_hueco(self):
+        bodega = EmpaquetadorBodega(100, 50, 50)
+        bodega.insertar(caja("A", 50, 50, 50))
+        bodega.insertar(caja("B", 50, 50, 50))
+        self.assertIsNone(bodega.insertar(caja("C", 50, 50, 50)))
+        self.assertEqual(bodega.quitar("A").codigo, "A")
+        self.assertNotIn("A", bodega)
+        self.assertEqual(bodega.insertar(caja("C", 50, 50, 50)).x, 0)
+        self.comprobar(bodega)
+        with self.assertRaises(KeyError):
+            bodega.quitar("A")
+
+    def test_no_deja_cajas_flotando_al_quitar_la_de_debajo(self):
+        bodega = EmpaquetadorBodega(50, 50, 100)
+        bodega.insertar(caja("ABAJO", 50, 50, 50))
+        self.assertEqual(bodega.insertar(caja("ENCIMA", 20, 20, 20)).z, 50)
+        bodega.quitar("ENCIMA")
+        bodega.quitar("ABAJO")
+        self.assertEqual(bodega.insertar(caja("OTRA", 10, 10, 10)).z, 0)
+
+    def test_cabe_no_cambia_la_bodega_y_duplicada_falla(self):
+        bodega = EmpaquetadorBodega(100, 100, 100)
+        bodega.insertar(caja("A", 50, 50, 50))
+        self.assertTrue(bodega.cabe(caja("B", 50, 50, 50)))
+        self.assertFalse(bodega.cabe(caja("G", 200, 10, 10)))
+        self.assertEqual(len(bodega), 1)
+        with self.assertRaises(ValueError):
+            bodega.insertar(caja("A", 1, 1, 1))
+        with self.assertRaises(ValueError):
+            EmpaquetadorBodega(0, 10, 10)
+
+    def test_altas_y_bajas_aleatorias_mantienen_la_bodega_valida(self):
+        azar = random.Random(7)
+        bodega = EmpaquetadorBodega(300, 200, 200)
+        dentro = []
+        for i in range(400):
+            if dentro and azar.random() < 0.4:
+                bodega.quitar(dentro.pop(azar.randrange(len(dentro))))
+            else:
+                medidas = [azar.choice((20, 30, 40, 50, 60)) for _ in range(3)]
+                if bodega.insertar(caja(f"C{i}", *medidas)) is not None:
+                    dentro.append(f"C{i}")
+        self.assertEqual(sorted(bodega.colocaciones), sorted(dentro))
+        self.comprobar(bodega)
+        bodega.vaciar()
+        self.assertEqual((len(bodega), bodega.volumen_ocupado), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Pruebas de la escena retenida sobre el canvas
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import unittest
+
+from escena_canvas import EscenaCanvas
+
+
+class CanvasFalso:
+    """Apunta las llamadas que recibiría un tk.Canvas"""
+
+    def __init__(self):
+        self.llamadas = []
+        self.siguiente = 0
+
+    def _crear(self, tipo, *args, **kwargs):
+        self.siguiente += 1
+        self.llamadas.append((tipo, args, kwargs))
+        return self.siguiente
+
+    def create_rectangle(self, *args, **kwargs):
+        return self._crear("create_rectangle", *args, **kwargs)
+
+    def create_text(self, *args, **kwargs):
+        return self._crear("create_text", *args, **kwargs)
+
+    def coords(self, item, *coords):
+        self.llamadas.append(("coords", (item,) + coords, {}))
+
+    def itemconfigure(self, item, **opciones):
+        self.llamadas.append(("itemconfigure", (item,), opciones))
+
+    def delete(self, item):
+        self.llamadas.append(("delete", (item,), {}))
+
+    def winfo_width(self):
+        return 800
+
+
+class TestEscenaCanvas(unittest.TestCase):
+
+    def setUp(self):
+        self.canvas = CanvasFalso()
+        self.escena = EscenaCanvas(self.canvas)
+
+    def test_crea_una_vez_y_cuenta(self):
+        camion = self.escena.create_rectangle(0, 0, 10, 10, fill="red")
+        self.escena.create_text(5, 5, text="TRK001")
+        self.assertEqual((self.escena.creados_frame, self.escena.creados_total), (2, 2))
+        self.escena.nuevo_frame()
+        self.escena.mover(camion, 5, 5, 15, 15)
+        self.assertEqual((self.escena.creados_frame, self.escena.actualizados_frame), (0, 1))
+        self.assertEqual(self.escena.creados_total, 2)
+        self.assertEqual(self.escena.winfo_width(), 800)
+
+    def test_frames_sin_cambios_no_tocan_el_canvas(self):
+        camion = self.escena.create_rectangle(0, 0, 10, 10)
+        for _ in range(3):
+            self.escena.nuevo_frame()
+            self.escena.mover(camion, 1, 2, 11, 12)
+            self.escena.configurar(camion, fill="red", outline="black")
+        llamadas = [nombre for nombre, _, _ in self.canvas.llamadas]
+        self.assertEqual(llamadas, ["create_rectangle", "coords", "itemconfigure"])
+        self.assertEqual(self.escena.actualizados_frame, 0)
+
+    def test_configurar_solo_envia_lo_que_cambia(self):
+        texto = self.escena.create_text(0, 0)
+        self.escena.configurar(texto, text="a", fill="red")
+        self.escena.configurar(texto, text="b", fill="red")
+        self.assertEqual(self.canvas.llamadas[-1], ("itemconfigure", (texto,), {"text": "b"}))
+
+    def test_borrar_olvida_el_estado(self):
+        item = self.escena.create_rectangle(0, 0, 1, 1)
+        self.escena.mover(item, 1, 1, 2, 2)
+        self.escena.borrar(item)
+        self.assertEqual(self.canvas.llamadas[-1][0], "delete")
+        self.escena.mover(item, 1, 1, 2, 2)
+        self.assertEqual(self.canvas.llamadas[-1][0], "coords")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Pruebas del motor de física por lotes
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import random
+import unittest
+from unittest import mock
+
+import fisica_flota
+from fisica_flota import NUMPY_AVAILABLE, MotorFisicaFlota, TruckPhysics
+
+CONTROLES = [{}, {"forward": True}, {"backward": True}, {"forward": True, "left": True},
+             {"forward": True, "right": True}, {"backward": True, "right": True}, {"left": True}]
+
+
+class Punto:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+
+def flota_aleatoria(semilla: int, n: int = 60) -> MotorFisicaFlota:
+    azar = random.Random(semilla)
+    motor = MotorFisicaFlota()
+    for _ in range(n):
+        motor.agregar(azar.uniform(0, 800), azar.uniform(0, 600), azar.uniform(0, 360),
+                      velocity=azar.uniform(-1.5, 3), max_speed=azar.uniform(2, 4),
+                      turn_rate=azar.uniform(1, 3), friction=azar.uniform(0.9, 0.99))
+    return motor
+
+
+def simular(motor: MotorFisicaFlota, semilla: int, pasos: int = 200, dt=None):
+    azar = random.Random(semilla)
+    for _ in range(pasos):
+        for i in range(len(motor)):
+            motor.fijar_controles(i, azar.choice(CONTROLES))
+        motor.paso(dt)
+        motor.limitar(0, 0, 800, 600)
+
+
+class TestMotorFisicaFlota(unittest.TestCase):
+
+    def comparar(self, a: MotorFisicaFlota, b: MotorFisicaFlota):
+        for nombre in ("x", "y", "heading", "velocity"):
+            for i, (va, vb) in enumerate(zip(a.columnas[nombre], b.columnas[nombre])):
+                self.assertAlmostEqual(va, vb, places=6, msg=f"{nombre}[{i}]")
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "NumPy no está instalado")
+    def test_numpy_y_python_dan_lo_mismo(self):
+        for dt in (None, 1 / 60):
+            con_numpy, sin_numpy = flota_aleatoria(1), flota_aleatoria(1)
+            simular(con_numpy, 2, dt=dt)
+            with mock.patch.object(fisica_flota, "NUMPY_AVAILABLE", False):
+                simular(sin_numpy, 2, dt=dt)
+            self.comparar(con_numpy, sin_numpy)
+
+    def test_vista_y_motor_compartido_coinciden(self):
+        motor = flota_aleatoria(3, n=5)
+        sueltos = [TruckPhysics(Punto(motor.columnas["x"][i], motor.columnas["y"][i]),
+                                motor.columnas["heading"][i]) for i in range(5)]
+        for suelto, i in zip(sueltos, range(5)):
+            for nombre in ("velocity", "max_speed", "turn_rate", "friction"):
+                setattr(suelto, nombre, motor.columnas[nombre][i])
+        for paso in range(50):
+            controles = CONTROLES[paso % len(CONTROLES)]
+            for i, suelto in enumerate(sueltos):
+                motor.fijar_controles(i, controles)
+                suelto.update(controles)
+            motor.paso()
+        for i, suelto in enumerate(sueltos):
+            vista = motor.vista(i)
+            self.assertAlmostEqual(vista.position.x, suelto.position.x)
+            self.assertAlmostEqual(vista.heading, suelto.heading)
+
+    def test_pasos_cortos_equivalen_a_uno_base(self):
+        largo, corto = MotorFisicaFlota(), MotorFisicaFlota()
+        for motor in (largo, corto):
+            motor.agregar(100, 100, 90)
+            motor.fijar_controles(0, {"forward": True})
+        largo.paso()
+        corto.paso(1 / 40)
+        corto.paso(1 / 40)
+        self.assertAlmostEqual(largo.columnas["velocity"][0], corto.columnas["velocity"][0])
+        self.assertAlmostEqual(largo.columnas["x"][0], corto.columnas["x"][0], delta=0.05)
+
+    def test_interpolar_por_el_giro_corto(self):
+        motor = MotorFisicaFlota()
+        motor.agregar(0, 0, 350)
+        motor.paso()
+        motor.columnas["heading"][0] = 10
+        motor.columnas["x"][0] = 10
+        x, _, heading = motor.interpolar(0, 0.5)
+        self.assertAlmostEqual(x, 5)
+        self.assertAlmostEqual(heading, 0)
+
+    def test_limitar_rebota(self):
+        motor = MotorFisicaFlota()
+        motor.agregar(-5, 700, velocity=2.0)
+        motor.limitar(0, 0, 800, 600)
+        self.assertEqual((motor.columnas["x"][0], motor.columnas["y"][0]), (0, 600))
+        self.assertAlmostEqual(motor.columnas["velocity"][0], 0.5)
+
+    def test_parametro_desconocido(self):
+        with self.assertRaises(TypeError):
+            MotorFisicaFlota().agregar(0, 0, velocidad=3)
+        with self.assertRaises(IndexError):
+            MotorFisicaFlota().vista(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
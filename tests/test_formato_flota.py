@@ -0,0 +1,118 @@
+"""
+Pruebas del formato binario de flotas
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import os
+import struct
+import tempfile
+import unittest
+
+from ej6_1 import Caja, Camion
+from formato_flota import CABECERA, FlotaMapeada, FormatoFlotaError, cargar_flota, guardar_flota
+
+
+def camion_de_prueba(**cambios) -> Camion:
+    datos = dict(matricula="TRK001", conductor="Ana", capacidad_kg=1000, descripcion_carga="Reparto",
+                 rumbo=90, velocidad=0)
+    datos.update(cambios)
+    bodega = datos.pop("bodega", None)
+    return Camion(**datos, bodega=bodega)
+
+
+class TestFormatoFlota(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "flota.bin")
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def ida_y_vuelta(self, camiones):
+        guardar_flota(self.ruta, camiones)
+        return cargar_flota(self.ruta)
+
+    def test_magia_incorrecta(self):
+        guardar_flota(self.ruta, [camion_de_prueba()])
+        with open(self.ruta, "r+b") as fichero:
+            fichero.write(b"NOFLOTA!")
+        with self.assertRaises(FormatoFlotaError):
+            FlotaMapeada(self.ruta)
+
+    def test_version_no_soportada(self):
+        guardar_flota(self.ruta, [camion_de_prueba()])
+        with open(self.ruta, "r+b") as fichero:
+            fichero.seek(8)
+            fichero.write(struct.pack("<H", 1))
+        with self.assertRaisesRegex(FormatoFlotaError, "Versión 1"):
+            FlotaMapeada(self.ruta)
+
+    def test_fichero_vacio_o_truncado(self):
+        for contenido in (b"", b"EDESFLOT"):
+            with open(self.ruta, "wb") as fichero:
+                fichero.write(contenido)
+            with self.assertRaises(FormatoFlotaError):
+                FlotaMapeada(self.ruta)
+
+    def test_cuerpo_o_tabla_de_cadenas_truncados(self):
+        camion = camion_de_prueba()
+        camion.cajas.agregar(Caja("C1", 10, "Libros", 50, 40, 30))
+        guardar_flota(self.ruta, [camion])
+        tamano = os.path.getsize(self.ruta)
+        for corte in (CABECERA.size + 8, tamano - 1):
+            guardar_flota(self.ruta, [camion])
+            with open(self.ruta, "r+b") as fichero:
+                fichero.truncate(corte)
+            with self.assertRaisesRegex(FormatoFlotaError, "truncado"):
+                FlotaMapeada(self.ruta)
+
+    def test_cajas_que_ya_no_caben_en_la_bodega(self):
+        camion = camion_de_prueba(bodega=(100, 100, 100))
+        camion.cajas.agregar(Caja("C1", 10, "Libros", 50, 40, 30))
+        camion.bodega = (20, 20, 20)
+        copia, = self.ida_y_vuelta([camion])
+        self.assertIsNone(copia.bodega)
+        self.assertEqual([c.codigo for c in copia.cajas], ["C1"])
+        self.assertTrue(copia.add_caja(Caja("C2", 10, "Libros", 50, 40, 30), eventos=None))
+
+    def test_flota_vacia(self):
+        self.assertEqual(self.ida_y_vuelta([]), [])
+        self.assertGreaterEqual(os.path.getsize(self.ruta), CABECERA.size)
+
+    def test_camion_sin_bodega(self):
+        camion = camion_de_prueba()
+        camion.cajas.agregar(Caja("C1", 10, "Libros", 50, 40, 30))
+        copia, = self.ida_y_vuelta([camion])
+        self.assertIsNone(copia.bodega)
+        self.assertEqual([c.codigo for c in copia.cajas], ["C1"])
+
+    def test_camion_con_bodega(self):
+        copia, = self.ida_y_vuelta([camion_de_prueba(bodega=(1360, 245, 270))])
+        self.assertEqual(copia.bodega, (1360, 245, 270))
+
+    def test_rumbo_cero_del_simulador(self):
+        camion = camion_de_prueba()
+        camion.rumbo = 0  # Lo que deja int(heading) en el simulador
+        copia, = self.ida_y_vuelta([camion])
+        self.assertEqual(copia.rumbo, 0)
+
+    def test_velocidad_decimal(self):
+        copia, = self.ida_y_vuelta([camion_de_prueba(velocidad=37.5)])
+        self.assertEqual(copia.velocidad, 37.5)
+
+    def test_enteros_siguen_siendo_enteros(self):
+        camion = camion_de_prueba()
+        camion.cajas.agregar(Caja("C1", 10, "Libros", 50, 40, 30))
+        camion.cajas.agregar(Caja("C2", 2.5, "Vidrio", 20.5, 10, 10))
+        copia, = self.ida_y_vuelta([camion])
+        self.assertEqual([str(c) for c in copia.cajas], [str(c) for c in camion.cajas])
+        self.assertIsInstance(copia.capacidad_kg, int)
+        self.assertIsInstance(copia.cajas[1].peso_kg, float)
+        with FlotaMapeada(self.ruta) as flota:
+            self.assertEqual(flota.peso_total(0), 12.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Pruebas del hash espacial de puntos
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import math
+import random
+import unittest
+
+from indice_espacial import HashEspacial
+
+
+class TestHashEspacial(unittest.TestCase):
+
+    def setUp(self):
+        self.azar = random.Random(9)
+        self.hash = HashEspacial(celda=50)
+        self.puntos = {}
+        for i in range(300):
+            self.mover(f"P{i}")
+
+    def mover(self, clave):
+        x, y = self.azar.uniform(-300, 900), self.azar.uniform(-300, 700)
+        self.hash.insertar(clave, x, y)
+        self.puntos[clave] = (x, y)
+
+    def distancias(self, x, y):
+        return sorted((math.hypot(px - x, py - y), clave) for clave, (px, py) in self.puntos.items())
+
+    def test_radio_igual_que_fuerza_bruta(self):
+        for _ in range(100):
+            x, y, radio = self.azar.uniform(-300, 900), self.azar.uniform(-300, 700), self.azar.uniform(1, 200)
+            esperado = [clave for distancia, clave in self.distancias(x, y) if distancia < radio]
+            obtenido = self.hash.en_radio(x, y, radio)
+            self.assertEqual(sorted(clave for _, clave in obtenido), sorted(esperado))
+            self.assertEqual([d for d, _ in obtenido], sorted(d for d, _ in obtenido))
+
+    def test_k_mas_cercanos_con_filtro(self):
+        pares = lambda clave: int(clave[1:]) % 2 == 0
+        for _ in range(100):
+            x, y = self.azar.uniform(-600, 1200), self.azar.uniform(-600, 1000)
+            k = self.azar.randint(1, 8)
+            esperado = [d for d, clave in self.distancias(x, y) if pares(clave)][:k]
+            obtenido = self.hash.mas_cercanos(x, y, k, filtro=pares)
+            self.assertEqual(len(obtenido), k)
+            for (distancia, clave), referencia in zip(obtenido, esperado):
+                self.assertAlmostEqual(distancia, referencia)
+                self.assertTrue(pares(clave))
+
+    def test_mover_y_quitar(self):
+        for i in range(0, 300, 3):
+            self.mover(f"P{i}")
+        for i in range(1, 300, 3):
+            self.assertTrue(self.hash.quitar(f"P{i}"))
+            del self.puntos[f"P{i}"]
+        self.assertFalse(self.hash.quitar("P1"))
+        self.assertEqual(len(self.hash), len(self.puntos))
+        self.assertEqual(self.hash.posicion("P0"), self.puntos["P0"])
+        self.assertNotIn("P1", self.hash)
+        self.test_radio_igual_que_fuerza_bruta()
+
+    def test_radio_maximo_y_vacio(self):
+        vacio = HashEspacial()
+        self.assertEqual(vacio.mas_cercanos(0, 0, 3), [])
+        self.assertEqual(vacio.en_radio(0, 0, 100), [])
+        vacio.insertar("A", 10, 0)
+        self.assertEqual(vacio.mas_cercanos(0, 0, 3), [(10, "A")])
+        self.assertEqual(vacio.mas_cercanos(0, 0, 3, radio_max=5), [])
+        self.assertEqual(vacio.mas_cercanos(0, 0, 0), [])
+        vacio.quitar("A")
+        self.assertEqual(vacio.mas_cercanos(0, 0, 1), [])
+        with self.assertRaises(ValueError):
+            HashEspacial(celda=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
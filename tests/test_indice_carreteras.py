@@ -0,0 +1,79 @@
+"""
+Pruebas del índice espacial de la red de carreteras
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import math
+import random
+import unittest
+
+from indice_espacial import IndiceCarreteras
+from simulacion import Point, RoadSegment, RoadSystem
+
+
+def distancia_al_eje(segmento: RoadSegment, x: float, y: float) -> float:
+    ax, ay, bx, by = segmento.start.x, segmento.start.y, segmento.end.x, segmento.end.y
+    dx, dy = bx - ax, by - ay
+    longitud2 = dx * dx + dy * dy
+    t = 0.0 if not longitud2 else max(0.0, min(1.0, ((x - ax) * dx + (y - ay) * dy) / longitud2))
+    return math.hypot(x - (ax + t * dx), y - (ay + t * dy))
+
+
+def segmentos_aleatorios(azar: random.Random, n: int) -> list:
+    return [RoadSegment(Point(azar.uniform(0, 1000), azar.uniform(0, 800)),
+                        Point(azar.uniform(0, 1000), azar.uniform(0, 800)), azar.choice((20, 40, 60)))
+            for _ in range(n)]
+
+
+class TestIndiceCarreteras(unittest.TestCase):
+
+    def comparar_con_fuerza_bruta(self, segmentos, puntos):
+        indice = IndiceCarreteras(segmentos)
+        for x, y in puntos:
+            holguras = [distancia_al_eje(s, x, y) - s.width / 2 for s in segmentos]
+            encontrado = indice.carretera_en(x, y)
+            if min(holguras) <= -1e-9:
+                self.assertIsNotNone(encontrado, (x, y))
+            if encontrado is not None:
+                self.assertLessEqual(distancia_al_eje(encontrado, x, y), encontrado.width / 2 + 1e-9)
+            segmento, distancia, _ = indice.mas_cercano(x, y)
+            self.assertAlmostEqual(distancia, min(holguras))
+            ajustado = indice.ajustar(x, y)
+            if ajustado is not None:
+                self.assertIsNotNone(indice.carretera_en(*ajustado), (x, y))
+
+    def test_segmentos_aleatorios(self):
+        azar = random.Random(5)
+        segmentos = segmentos_aleatorios(azar, 40)
+        puntos = [(azar.uniform(-200, 1200), azar.uniform(-200, 1000)) for _ in range(500)]
+        self.comparar_con_fuerza_bruta(segmentos, puntos)
+
+    def test_red_del_simulador(self):
+        carreteras = RoadSystem(800, 600, random.Random(1))
+        azar = random.Random(2)
+        puntos = [(azar.uniform(0, 800), azar.uniform(0, 600)) for _ in range(500)]
+        self.comparar_con_fuerza_bruta(carreteras.roads + carreteras.patios, puntos)
+
+    def test_radio_maximo_e_indice_vacio(self):
+        indice = IndiceCarreteras([RoadSegment(Point(0, 0), Point(100, 0), 20)])
+        self.assertIsNone(indice.mas_cercano(50, 500, radio_max=100))
+        segmento, distancia, punto = indice.mas_cercano(50, 500)
+        self.assertAlmostEqual(distancia, 490)
+        self.assertEqual(punto, (50, 0))
+        self.assertIsNone(indice.ajustar(50, 5))
+        self.assertEqual(indice.ajustar(50, 30), (50, 9.5))
+        vacio = IndiceCarreteras()
+        self.assertIsNone(vacio.mas_cercano(0, 0))
+        self.assertIsNone(vacio.ajustar(0, 0))
+        with self.assertRaises(ValueError):
+            IndiceCarreteras(celda=0)
+
+    def test_segmento_de_longitud_cero(self):
+        indice = IndiceCarreteras([RoadSegment(Point(10, 10), Point(10, 10), 20)])
+        self.assertIsNotNone(indice.carretera_en(15, 10))
+        self.assertAlmostEqual(indice.mas_cercano(40, 10)[1], 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
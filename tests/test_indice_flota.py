@@ -0,0 +1,109 @@
+"""
+Pruebas del índice global de cajas de la flota
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import threading
+import time
+import unittest
+
+from ej6_1 import Caja, CajaDuplicadaError, Camion
+from indice_flota import IndiceFlota
+
+
+def camion(matricula: str, capacidad_kg: float = 1000, **extra) -> Camion:
+    return Camion(matricula, "Ana", capacidad_kg, "Reparto", 90, 0, **extra)
+
+
+def caja(codigo: str, peso_kg: float = 10) -> Caja:
+    return Caja(codigo, peso_kg, "Libros", 10, 10, 10)
+
+
+class TestIndiceFlota(unittest.TestCase):
+
+    def setUp(self):
+        self.a, self.b, self.c = camion("A"), camion("B"), camion("C")
+        self.a.add_cajas([caja("K1"), caja("K2")])
+        self.indice = IndiceFlota([self.a, self.b, self.c])
+
+    def test_localiza_y_sigue_altas_y_bajas(self):
+        self.assertIs(self.indice.localizar("K1"), self.a)
+        self.b.add_caja(caja("K3"), eventos=None)
+        self.assertIs(self.indice.localizar("K3"), self.b)
+        self.a.quitar_caja("K1")
+        self.assertIsNone(self.indice.localizar("K1"))
+        self.b.cajas = [caja("K4")]
+        self.assertEqual(sorted(self.indice), ["K2", "K4"])
+
+    def test_rechaza_el_mismo_codigo_en_otro_camion(self):
+        self.assertFalse(self.b.add_caja(caja("K1"), eventos=None))
+        resultado = self.b.add_cajas([caja("K1"), caja("K5")])
+        self.assertEqual([c.codigo for c in resultado.aceptadas], ["K5"])
+        with self.assertRaises(CajaDuplicadaError):
+            self.indice.registrar(self._con_caja("D", "K2"))
+        self.assertIs(self.indice.localizar("K1"), self.a)
+
+    def _con_caja(self, matricula: str, codigo: str) -> Camion:
+        nuevo = camion(matricula)
+        nuevo.add_caja(caja(codigo), eventos=None)
+        return nuevo
+
+    def test_transferir(self):
+        self.assertTrue(self.indice.transferir("K1", self.b))
+        self.assertIs(self.indice.localizar("K1"), self.b)
+        self.assertFalse(self.a.manifiesto.contiene("K1"))
+        self.assertTrue(self.indice.transferir("K1", self.b))
+        with self.assertRaises(KeyError):
+            self.indice.transferir("NOEXISTE", self.b)
+
+    def test_transferir_sin_capacidad_no_mueve_nada(self):
+        pequeno = camion("P", capacidad_kg=5)
+        self.indice.registrar(pequeno)
+        self.assertFalse(self.indice.transferir("K1", pequeno))
+        self.assertIs(self.indice.localizar("K1"), self.a)
+
+    def test_transferir_con_codigo_vetado_devuelve_false(self):
+        def vetar(evento, caja_vetada):
+            if evento == "validar":
+                raise CajaDuplicadaError(f"La caja {caja_vetada.codigo} está vetada")
+        self.b.observadores.append(vetar)
+        mensajes = []
+        self.assertFalse(self.indice.transferir("K1", self.b, mensajes.append))
+        self.assertIn("vetada", mensajes[0])
+        self.assertIs(self.indice.localizar("K1"), self.a)
+        self.assertTrue(self.a.manifiesto.contiene("K1"))
+
+    def test_transferencias_cruzadas_dejan_la_caja_en_un_solo_camion(self):
+        # La primera transferencia se para dentro de los cerrojos; la segunda
+        # lee el origen antiguo y tiene que volver a mirarlo al entrar
+        dentro = threading.Event()
+
+        class Lento(Camion):
+            def puede_cargar(self, peso_kg):
+                dentro.set()
+                time.sleep(0.05)
+                return super().puede_cargar(peso_kg)
+
+        lento = Lento("L", "Ana", 1000, "Reparto", 90, 0)
+        self.indice.registrar(lento)
+        hilo = threading.Thread(target=self.indice.transferir, args=("K1", lento))
+        hilo.start()
+        dentro.wait()
+        self.assertTrue(self.indice.transferir("K1", self.c))
+        hilo.join()
+        con_k1 = [x.matricula for x in (self.a, self.b, self.c, lento) if x.manifiesto.contiene("K1")]
+        self.assertEqual(con_k1, ["C"])
+        self.assertIs(self.indice.localizar("K1"), self.c)
+
+    def test_retirar_y_reconstruir(self):
+        self.indice.retirar(self.a)
+        self.assertNotIn("K1", self.indice)
+        self.assertTrue(self.b.add_caja(caja("K1"), eventos=None))
+        self.indice.reconstruir([self.b, self.c])
+        self.assertIs(self.indice.localizar("K1"), self.b)
+        self.assertEqual(len(self.indice), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
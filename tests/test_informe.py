@@ -0,0 +1,77 @@
+"""
+Pruebas del informe de un camión en texto, CSV y JSON
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import csv
+import json
+import unittest
+from io import StringIO
+
+from ej6_1 import CAMPOS_CSV, Caja, Camion, FormatoInforme
+
+
+def camion_con_cajas(n: int) -> Camion:
+    camion = Camion("TRK001", "Ana \"la rápida\"", 10_000, "Reparto, urgente", 90, 50)
+    camion.add_cajas(Caja(f"C{i}", 10 + i, "Libros, revistas", 50, 40, 30) for i in range(n))
+    return camion
+
+
+class TestInforme(unittest.TestCase):
+
+    def test_texto_completo_igual_que_str(self):
+        camion = camion_con_cajas(3)
+        texto = camion.informe()
+        self.assertEqual(texto, str(camion))
+        self.assertIn("Número de cajas: 3", texto)
+        self.assertIn("3. Caja C2", texto)
+        self.assertNotIn("cajas más", texto)
+
+    def test_texto_paginado_resume_el_resto(self):
+        texto = camion_con_cajas(5).informe(limite=2)
+        self.assertIn("2. Caja C1", texto)
+        self.assertNotIn("Caja C2", texto)
+        self.assertIn("... y 3 cajas más (39.00 kg)", texto)
+
+    def test_sin_cajas(self):
+        self.assertIn("No hay cajas cargadas", camion_con_cajas(0).informe())
+
+    def test_csv_con_comas_y_limite(self):
+        filas = list(csv.reader(StringIO(camion_con_cajas(4).informe("csv", limite=3))))
+        self.assertEqual(filas[0], CAMPOS_CSV)
+        self.assertEqual(len(filas), 4)
+        self.assertEqual(filas[1][:4], ["TRK001", "C0", "10", "Libros, revistas"])
+        self.assertEqual(float(filas[1][-1]), 50 * 40 * 30)
+
+    def test_json_valido_con_omitidas(self):
+        camion = camion_con_cajas(4)
+        datos = json.loads(camion.informe(FormatoInforme.JSON, limite=1))
+        self.assertEqual(datos["conductor"], "Ana \"la rápida\"")
+        self.assertEqual(datos["numero_cajas"], 4)
+        self.assertEqual([c["codigo"] for c in datos["cajas"]], ["C0"])
+        self.assertEqual(datos["cajas_omitidas"], 3)
+        completo = json.loads(camion.informe(FormatoInforme.JSON))
+        self.assertEqual((len(completo["cajas"]), completo["cajas_omitidas"]), (4, 0))
+        self.assertEqual(completo["peso_total_kg"], sum(c["peso_kg"] for c in completo["cajas"]))
+        self.assertEqual(json.loads(camion_con_cajas(0).informe("json"))["cajas"], [])
+
+    def test_escribe_por_partes(self):
+        class Destino:
+            def __init__(self):
+                self.partes = []
+
+            def write(self, texto):
+                self.partes.append(texto)
+
+        destino = Destino()
+        camion_con_cajas(50).escribir_informe(destino)
+        self.assertGreater(len(destino.partes), 50)
+
+    def test_formato_desconocido(self):
+        with self.assertRaises(ValueError):
+            camion_con_cajas(1).informe("xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Pruebas de la ingesta de cajas y camiones
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from ej6_1 import Camion
+from ingesta import cargar_cajas, cargar_camiones, leer_filas
+
+CAMION = {"matricula": "TRK001", "conductor": "Ana", "capacidad_kg": 1000, "descripcion_carga": "Reparto",
+          "rumbo": 90, "velocidad": 0}
+CAJA = {"codigo": "C1", "peso_kg": 10, "descripcion_carga": "Libros", "largo": 50, "ancho": 40, "altura": 30}
+
+
+class TestIngesta(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def jsonl(self, nombre: str, lineas) -> str:
+        ruta = os.path.join(self.directorio.name, nombre)
+        with open(ruta, "w", encoding="utf-8") as fichero:
+            for linea in lineas:
+                fichero.write((linea if isinstance(linea, str) else json.dumps(linea)) + "\n")
+        return ruta
+
+    def test_lineas_que_no_son_objetos_van_a_rechazos(self):
+        rechazos = []
+        ruta = self.jsonl("camiones.jsonl", ["[1, 2]", '"x"', "3", "null", CAMION])
+        camiones, estadisticas = cargar_camiones(ruta, rechazos.append)
+        self.assertEqual(list(camiones), ["TRK001"])
+        self.assertEqual([r.linea for r in rechazos], [1, 2, 3, 4])
+        self.assertTrue(all("objeto" in r.motivo for r in rechazos))
+        self.assertEqual((estadisticas.cargadas, estadisticas.rechazadas), (1, 4))
+
+    def test_cajas_que_no_son_objetos_van_a_rechazos(self):
+        rechazos = []
+        ruta = self.jsonl("cajas.jsonl", ["[1, 2]", CAJA])
+        camion = Camion("TRK001", "Ana", 1000.0, "Reparto", 90, 0)
+        estadisticas = cargar_cajas(ruta, camion, rechazos.append)
+        self.assertEqual((estadisticas.cargadas, estadisticas.rechazadas), (1, 1))
+        self.assertEqual(len(camion.cajas), 1)
+
+    def test_capacidad_infinita_o_cero_se_rechaza(self):
+        rechazos = []
+        filas = [dict(CAMION, matricula=f"T{i}", capacidad_kg=valor)
+                 for i, valor in enumerate(["inf", "-inf", "nan", 0, "1e400", -5])]
+        camiones, _ = cargar_camiones(self.jsonl("camiones.jsonl", filas + [CAMION]), rechazos.append)
+        self.assertEqual(list(camiones), ["TRK001"])
+        self.assertEqual(len(rechazos), len(filas))
+        self.assertTrue(all("capacidad_kg" in r.motivo for r in rechazos))
+
+    def test_numeros_no_finitos_en_cajas_se_rechazan(self):
+        rechazos = []
+        filas = [dict(CAJA, codigo="C2", peso_kg="inf"), dict(CAJA, codigo="C3", largo="nan"), CAJA]
+        camion = Camion("TRK001", "Ana", 1000.0, "Reparto", 90, 0)
+        estadisticas = cargar_cajas(self.jsonl("cajas.jsonl", filas), camion, rechazos.append)
+        self.assertEqual(estadisticas.cargadas, 1)
+        self.assertEqual([r.linea for r in rechazos], [1, 2])
+
+    def test_velocidad_enorme_no_rompe_la_ingesta(self):
+        rechazos = []
+        ruta = self.jsonl("camiones.jsonl", ['{"matricula": "T1", "conductor": "A", "capacidad_kg": 10, '
+                                             '"rumbo": 90, "velocidad": 1e400}', CAMION])
+        camiones, _ = cargar_camiones(ruta, rechazos.append)
+        self.assertEqual(list(camiones), ["TRK001"])
+        self.assertIn("velocidad", rechazos[0].motivo)
+
+    def test_rumbo_y_velocidad_enteros_escritos_como_decimales(self):
+        rechazos = []
+        filas = [dict(CAMION, matricula="T1", rumbo="90.0", velocidad=30.0),
+                 dict(CAMION, matricula="T2", rumbo=90.5),
+                 dict(CAMION, matricula="T3", velocidad="12.25")]
+        camiones, _ = cargar_camiones(self.jsonl("camiones.jsonl", filas), rechazos.append)
+        self.assertEqual(list(camiones), ["T1"])
+        self.assertEqual((camiones["T1"].rumbo, camiones["T1"].velocidad), (90, 30))
+        self.assertIsInstance(camiones["T1"].rumbo, int)
+        self.assertEqual([r.linea for r in rechazos], [2, 3])
+        self.assertIn("rumbo no es un entero", rechazos[0].motivo)
+        self.assertIn("velocidad no es un entero", rechazos[1].motivo)
+
+    def test_json_invalido_lleva_el_error_aparte(self):
+        ruta = self.jsonl("cajas.jsonl", ["{roto", {"_error": "dato del usuario", **CAJA}])
+        (_, fila, error), (_, valida, sin_error) = leer_filas(ruta)
+        self.assertEqual(fila, {"_texto": "{roto"})
+        self.assertIsNotNone(error)
+        self.assertIsNone(sin_error)
+        rechazos = []
+        camion = Camion("TRK001", "Ana", 1000.0, "Reparto", 90, 0)
+        estadisticas = cargar_cajas(ruta, camion, rechazos.append)
+        # Una fila con una clave "_error" propia ya no se confunde con una línea rota
+        self.assertEqual((estadisticas.cargadas, estadisticas.rechazadas), (1, 1))
+        self.assertIn("JSON inválido", rechazos[0].motivo)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Pruebas del manifiesto de carga
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import unittest
+
+from ej6_1 import Caja, ManifiestoCarga
+
+
+def manifiesto_de_prueba(n: int = 6) -> ManifiestoCarga:
+    return ManifiestoCarga(Caja(f"C{i}", 10 + i, "Libros", 50, 40, 30) for i in range(n))
+
+
+class TestManifiestoCarga(unittest.TestCase):
+
+    def codigos(self, cajas) -> list:
+        return [caja.codigo for caja in cajas]
+
+    def test_indices_en_orden_de_carga(self):
+        manifiesto = manifiesto_de_prueba()
+        self.assertEqual(self.codigos(manifiesto[i] for i in range(len(manifiesto))),
+                         ["C0", "C1", "C2", "C3", "C4", "C5"])
+        self.assertEqual(manifiesto[-1].codigo, "C5")
+        self.assertEqual(self.codigos(manifiesto[1:3]), ["C1", "C2"])
+        with self.assertRaises(IndexError):
+            manifiesto[6]
+
+    def test_indices_tras_bajas_y_altas(self):
+        manifiesto = manifiesto_de_prueba()
+        manifiesto.quitar("C1")
+        manifiesto.quitar("C4")
+        manifiesto.agregar(Caja("C6", 1, "Vidrio", 1, 1, 1))
+        esperado = ["C0", "C2", "C3", "C5", "C6"]
+        self.assertEqual(self.codigos(manifiesto[i] for i in range(len(manifiesto))), esperado)
+        self.assertEqual(self.codigos(manifiesto), esperado)
+        self.assertEqual(manifiesto[-2].codigo, "C5")
+
+    def test_muchas_bajas_compactan_el_orden(self):
+        manifiesto = manifiesto_de_prueba(100)
+        for i in range(90):
+            manifiesto.quitar(f"C{i}")
+        self.assertLess(len(manifiesto._orden), 100)
+        self.assertEqual(manifiesto[0].codigo, "C90")
+        manifiesto.vaciar()
+        self.assertEqual(len(manifiesto), 0)
+        with self.assertRaises(IndexError):
+            manifiesto[0]
+
+    def test_bajas_alternas_con_indices_no_compactan(self):
+        manifiesto = manifiesto_de_prueba(200)
+        esperado = [f"C{i}" for i in range(200)]
+        for i in range(0, 90, 3):
+            manifiesto.quitar(f"C{i}")
+            esperado.remove(f"C{i}")
+            orden = manifiesto._orden
+            self.assertEqual(manifiesto[i // 3].codigo, esperado[i // 3])
+            self.assertIs(manifiesto._orden, orden)
+        self.assertEqual(self.codigos(manifiesto[i] for i in range(len(manifiesto))), esperado)
+        self.assertEqual(manifiesto[-len(esperado)].codigo, esperado[0])
+        self.assertEqual(self.codigos(manifiesto[5:40]), esperado[5:40])
+        self.assertEqual(self.codigos(manifiesto[150:]), esperado[150:])
+        self.assertEqual(self.codigos(manifiesto[::7]), esperado[::7])
+        self.assertEqual(manifiesto[40:5], [])
+        with self.assertRaises(IndexError):
+            manifiesto[len(esperado)]
+
+    def test_modificar_mientras_se_recorre(self):
+        manifiesto = manifiesto_de_prueba()
+        with self.assertRaises(RuntimeError):
+            for caja in manifiesto:
+                manifiesto.quitar(caja.codigo)
+        manifiesto = manifiesto_de_prueba()
+        for caja in list(manifiesto):
+            manifiesto.quitar(caja.codigo)
+        self.assertEqual(len(manifiesto), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
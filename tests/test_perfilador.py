@@ -0,0 +1,94 @@
+"""
+Pruebas del perfilador de frames
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from perfilador import PerfiladorFrames
+
+
+class RelojFalso:
+    """Reloj que avanza lo que se le diga"""
+
+    def __init__(self):
+        self.ahora = 100.0
+
+    def __call__(self) -> float:
+        return self.ahora
+
+    def avanzar(self, segundos: float):
+        self.ahora += segundos
+
+
+class TestPerfiladorFrames(unittest.TestCase):
+
+    def setUp(self):
+        self.reloj = RelojFalso()
+        self.perfil = PerfiladorFrames(max_frames=5, reloj=self.reloj)
+
+    def frame(self, fisica: float, dibujo: float, espera: float = 0.0, **contadores):
+        self.perfil.empezar_frame()
+        self.reloj.avanzar(fisica)
+        self.perfil.marca("fisica")
+        self.reloj.avanzar(dibujo)
+        self.perfil.marca("dibujo")
+        self.perfil.terminar_frame(**contadores)
+        self.reloj.avanzar(espera)
+
+    def test_desactivado_no_guarda_nada(self):
+        self.frame(0.01, 0.01)
+        self.assertEqual(len(self.perfil.frames), 0)
+        self.assertEqual(self.perfil.lineas_overlay(), ["⏱️ Midiendo..."])
+        self.perfil.activar()
+        self.perfil.empezar_frame()
+        self.perfil.activar(False)
+        self.perfil.terminar_frame()
+        self.assertEqual(len(self.perfil.frames), 0)
+
+    def test_fases_y_resumen(self):
+        self.perfil.activar()
+        for _ in range(4):
+            self.frame(0.002, 0.008, espera=0.04, creados=3)
+        resumen = self.perfil.resumen()
+        self.assertAlmostEqual(resumen["fps"], 20)
+        self.assertAlmostEqual(resumen["frame_ms"], 10)
+        self.assertAlmostEqual(resumen["fisica"], 2)
+        self.assertAlmostEqual(resumen["dibujo"], 8)
+        lineas = self.perfil.lineas_overlay(camiones=2)
+        self.assertIn("20.0 FPS", lineas[0])
+        self.assertTrue(any(l.startswith("creados") for l in lineas))
+        self.assertTrue(any(l.startswith("camiones") for l in lineas))
+
+    def test_solo_recuerda_los_ultimos_frames(self):
+        self.perfil.activar()
+        for i in range(8):
+            self.frame(0.001 * (i + 1), 0.0)
+        self.assertEqual(len(self.perfil.frames), 5)
+        self.assertAlmostEqual(self.perfil.resumen(ultimos=1)["frame_max_ms"], 8)
+
+    def test_traza_de_chrome(self):
+        self.perfil.activar()
+        self.frame(0.002, 0.003, espera=0.01, creados=4)
+        self.frame(0.001, 0.001)
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "traza.json")
+            self.assertEqual(self.perfil.exportar_traza(ruta), 2)
+            with open(ruta, encoding="utf-8") as archivo:
+                eventos = json.load(archivo)["traceEvents"]
+        self.assertEqual([e["name"] for e in eventos],
+                         ["frame", "fisica", "dibujo", "contadores", "frame", "fisica", "dibujo"])
+        primero, dibujo = eventos[0], eventos[2]
+        self.assertEqual((primero["ts"], primero["dur"]), (0, 5000))
+        self.assertEqual((dibujo["ts"], dibujo["dur"]), (2000, 3000))
+        self.assertEqual(eventos[3]["args"], {"creados": 4})
+        self.assertEqual(eventos[4]["ts"], 15000)
+        self.assertEqual(PerfiladorFrames().traza()["traceEvents"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Pruebas del planificador adaptativo de frames
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import unittest
+
+from planificador_frames import MAX_RETRASO, PlanificadorFrames
+
+
+def simular(planificador: PlanificadorFrames, n_frames: int, coste_dibujo: float,
+            coste_fisica: float = 0.002, inicio: float = 100.0):
+    """Ejecuta n_frames respetando las esperas; devuelve (decisión, hz_panel al empezar) por frame"""
+    ahora = inicio
+    historial = []
+    for _ in range(n_frames):
+        hz = planificador.hz_panel
+        decision = planificador.empezar_frame(ahora)
+        ahora += coste_fisica + (coste_dibujo if decision.dibujar else 0.0)
+        espera = planificador.terminar_frame(ahora)
+        historial.append((decision, hz))
+        ahora += espera / 1000
+    return historial, ahora
+
+
+class TestPlanificadorFrames(unittest.TestCase):
+
+    def test_frecuencias_no_positivas(self):
+        with self.assertRaises(ValueError):
+            PlanificadorFrames(fps_objetivo=0)
+        with self.assertRaises(ValueError):
+            PlanificadorFrames(hz_panel_min=-1)
+
+    def test_espera_descuenta_el_coste_del_frame(self):
+        planificador = PlanificadorFrames(fps_objetivo=20)
+        planificador.empezar_frame(10.0)
+        self.assertEqual(planificador.terminar_frame(10.03), 20)
+        # Con un frame más largo que el periodo la espera no baja de 1 ms
+        planificador.empezar_frame(10.05)
+        self.assertEqual(planificador.terminar_frame(10.2), 1)
+
+    def test_carga_baja_dibuja_todo(self):
+        planificador = PlanificadorFrames(fps_objetivo=20, hz_panel=5)
+        historial, _ = simular(planificador, 100, coste_dibujo=0.01)
+        self.assertTrue(all(decision.dibujar for decision, _ in historial))
+        self.assertEqual(planificador.descartados, 0)
+        self.assertEqual(planificador.tardios, 0)
+        self.assertEqual(planificador.hz_panel, 5)
+        self.assertAlmostEqual(planificador.fps, 20, delta=0.5)
+        # Las esperas redondeadas a ms no retrasan los paneles: 5 Hz son uno de cada cuatro
+        self.assertEqual(sum(decision.paneles for decision, _ in historial), 25)
+
+    def test_paneles_a_su_frecuencia(self):
+        planificador = PlanificadorFrames(fps_objetivo=20, hz_panel=5)
+        paneles = []
+        for i in range(40):
+            ahora = i * 0.05
+            paneles.append(planificador.empezar_frame(ahora).paneles)
+            planificador.terminar_frame(ahora + 0.01)
+        # Paneles a 5 Hz con frames cada 50 ms: uno de cada cuatro
+        self.assertEqual([i for i, panel in enumerate(paneles) if panel], list(range(0, 40, 4)))
+
+    def test_orden_de_degradacion(self):
+        planificador = PlanificadorFrames(fps_objetivo=20, hz_panel=4, hz_panel_min=1)
+        historial, _ = simular(planificador, 120, coste_dibujo=0.07)
+
+        # Primero se bajan los paneles, un paso por segundo como mucho
+        niveles = []
+        for _, hz in historial:
+            if not niveles or niveles[-1] != hz:
+                niveles.append(hz)
+        self.assertEqual(niveles, [4, 2, 1])
+
+        # No se descarta ningún frame mientras los paneles puedan bajar más
+        descartes = [i for i, (decision, _) in enumerate(historial) if not decision.dibujar]
+        self.assertTrue(descartes)
+        self.assertTrue(all(historial[i][1] == 1 for i in descartes))
+        self.assertGreater(planificador.tardios, 0)
+
+        # Y nunca más de max_sin_dibujar seguidos
+        seguidos = maximo = 0
+        for decision, _ in historial:
+            seguidos = 0 if decision.dibujar else seguidos + 1
+            maximo = max(maximo, seguidos)
+        self.assertLessEqual(maximo, planificador.max_sin_dibujar)
+        self.assertEqual(planificador.frames, planificador.dibujados + planificador.descartados)
+
+    def test_recupera_los_paneles_con_poca_carga(self):
+        planificador = PlanificadorFrames(fps_objetivo=20, hz_panel=4, hz_panel_min=1)
+        _, ahora = simular(planificador, 80, coste_dibujo=0.07)
+        self.assertEqual(planificador.hz_panel, 1)
+        simular(planificador, 200, coste_dibujo=0.005, inicio=ahora)
+        self.assertEqual(planificador.hz_panel, 4)
+        self.assertLess(planificador.carga, 0.5)
+
+    def test_retraso_excesivo_reinicia_el_calendario(self):
+        planificador = PlanificadorFrames(fps_objetivo=20)
+        planificador.empezar_frame(0.0)
+        planificador.terminar_frame(0.01)
+        # Un parón de un segundo: se da por perdido y no se intenta recuperar
+        planificador.empezar_frame(1.0)
+        self.assertEqual(planificador.reinicios, 1)
+        self.assertEqual(planificador.terminar_frame(1.01), 40)
+        planificador.empezar_frame(1.05)
+        self.assertEqual(planificador.reinicios, 1)
+        # Un retraso de menos de MAX_RETRASO periodos no reinicia
+        planificador.terminar_frame(1.06)
+        planificador.empezar_frame(1.1 + (MAX_RETRASO - 1) * planificador.periodo)
+        self.assertEqual(planificador.reinicios, 1)
+        self.assertEqual(planificador.tardios, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
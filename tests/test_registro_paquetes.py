@@ -0,0 +1,84 @@
+"""
+Pruebas del registro indexado de paquetes
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import random
+import unittest
+
+from registro_paquetes import RegistroPaquetes
+from simulacion import Package, PackageState, Point
+
+ESTADOS = list(PackageState)
+
+
+def paquete(i: int, estado=PackageState.WAREHOUSE, camion=None) -> Package:
+    nuevo = Package(f"PKG{i:03d}", Point(0, 0), Point(10, 10), 50.0)
+    nuevo.state = estado
+    nuevo.assigned_truck = camion
+    return nuevo
+
+
+class TestRegistroPaquetes(unittest.TestCase):
+
+    def test_se_comporta_como_una_lista(self):
+        paquetes = [paquete(i) for i in range(3)]
+        registro = RegistroPaquetes(paquetes[:2])
+        registro.append(paquetes[2])
+        self.assertEqual(list(registro), paquetes)
+        self.assertEqual((len(registro), registro[-1]), (3, paquetes[2]))
+        self.assertIn(paquetes[0], registro)
+        self.assertNotIn(paquete(0), registro)
+        with self.assertRaises(ValueError):
+            registro.agregar(paquete(1))
+
+    def test_grupos_igual_que_filtrar_la_lista(self):
+        azar = random.Random(6)
+        registro = RegistroPaquetes(paquete(i) for i in range(200))
+        camiones = [None, "TRK001", "TRK002", "TRK003"]
+        for _ in range(1000):
+            elegido = registro[azar.randrange(len(registro))]
+            if azar.random() < 0.5:
+                registro.cambiar_estado(elegido, azar.choice(ESTADOS), azar.choice(camiones[1:] + [None]))
+            else:
+                registro.asignar(elegido, azar.choice(camiones))
+        for estado in ESTADOS:
+            esperado = [p for p in registro if p.state == estado]
+            self.assertEqual(sorted(p.id for p in registro.en_estado(estado)), sorted(p.id for p in esperado))
+            self.assertEqual(registro.cuantos(estado), len(esperado))
+            for camion in camiones[1:]:
+                self.assertEqual(sorted(p.id for p in registro.del_camion(camion, estado)),
+                                 sorted(p.id for p in esperado if p.assigned_truck == camion))
+        for camion in camiones[1:]:
+            self.assertEqual(sorted(p.id for p in registro.del_camion(camion)),
+                             sorted(p.id for p in registro if p.assigned_truck == camion))
+
+    def test_en_estado_por_orden_de_llegada(self):
+        a, b, c = paquete(1), paquete(2), paquete(3)
+        registro = RegistroPaquetes([a, b, c])
+        registro.cambiar_estado(b, PackageState.IN_TRANSIT, "TRK001")
+        registro.cambiar_estado(a, PackageState.IN_TRANSIT, "TRK001")
+        self.assertEqual(registro.en_estado(PackageState.IN_TRANSIT), [b, a])
+        self.assertEqual(registro.en_estado(PackageState.WAREHOUSE), [c])
+        self.assertEqual(registro.del_camion("TRK001", PackageState.IN_TRANSIT), [b, a])
+        self.assertEqual(registro.del_camion("TRK002"), [])
+
+    def test_diario_de_cambios(self):
+        a, b, c = paquete(1), paquete(2), paquete(3)
+        registro = RegistroPaquetes([a, b])
+        version, cambiados = registro.cambios_desde(0)
+        self.assertEqual(cambiados, [a, b])
+        self.assertEqual(registro.cambios_desde(version), (version, []))
+        registro.cambiar_estado(a, PackageState.IN_TRANSIT, "TRK001")
+        registro.asignar(a, "TRK002")
+        registro.asignar(a, "TRK002")  # Sin cambio: no se anota
+        registro.agregar(c)
+        nueva, cambiados = registro.cambios_desde(version)
+        self.assertEqual(cambiados, [a, c])
+        self.assertEqual(nueva, registro.version)
+        self.assertEqual(nueva - version, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
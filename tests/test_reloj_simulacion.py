@@ -0,0 +1,61 @@
+"""
+Pruebas del reloj de paso fijo de la simulación
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import random
+import unittest
+
+from simulacion import MAX_PASOS_POR_FRAME, PilotoDirecto, RelojSimulacion, SimulacionNucleo
+
+
+def simulacion_pilotada(semilla: int, hz: float = 20.0) -> SimulacionNucleo:
+    simulacion = SimulacionNucleo(eventos=None, semilla=semilla, hz_fisica=hz)
+    simulacion.create_sample_trucks()
+    for camion in simulacion.camiones:
+        simulacion.pilotos[camion.matricula] = PilotoDirecto()
+    return simulacion
+
+
+class TestRelojSimulacion(unittest.TestCase):
+
+    def test_reparte_el_tiempo_en_pasos_fijos(self):
+        reloj = RelojSimulacion(20)
+        self.assertEqual(reloj.avanzar(0.1), 2)
+        self.assertEqual(reloj.avanzar(0.03), 0)
+        self.assertAlmostEqual(reloj.alfa, 0.6)
+        self.assertEqual(reloj.avanzar(0.03), 1)
+        self.assertAlmostEqual(reloj.acumulado, 0.01)
+        self.assertEqual(reloj.avanzar(-1), 0)
+
+    def test_limita_los_pasos_tras_un_atasco(self):
+        reloj = RelojSimulacion(20)
+        self.assertEqual(reloj.avanzar(5.0), MAX_PASOS_POR_FRAME)
+        self.assertAlmostEqual(reloj.segundos_descartados, 5.0 - MAX_PASOS_POR_FRAME / 20)
+        self.assertLess(reloj.acumulado, reloj.dt)
+        with self.assertRaises(ValueError):
+            RelojSimulacion(0)
+
+    def test_el_ritmo_de_dibujo_no_cambia_el_resultado(self):
+        # 60 fps regulares contra frames irregulares: mismos pasos, mismo estado
+        regular, irregular = simulacion_pilotada(4), simulacion_pilotada(4)
+        for _ in range(600):
+            regular.avanzar_tiempo(1 / 60)
+        azar = random.Random(1)
+        while irregular.ticks < regular.ticks:
+            irregular.avanzar_tiempo(min(azar.uniform(0.001, 0.2), (regular.ticks - irregular.ticks) / 20))
+        self.assertEqual(irregular.ticks, regular.ticks)
+        self.assertEqual(regular.estado(), irregular.estado())
+        self.assertAlmostEqual(regular.tiempo, 10.0, places=6)
+
+    def test_otra_frecuencia_simula_el_mismo_tiempo(self):
+        lenta, rapida = simulacion_pilotada(2, hz=20), simulacion_pilotada(2, hz=120)
+        lenta.ejecutar(400)
+        rapida.ejecutar(2400)
+        self.assertAlmostEqual(lenta.tiempo, rapida.tiempo)
+        self.assertGreater(rapida.recogidas, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Pruebas del grafo de carreteras y del cálculo de rutas
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import math
+import random
+import unittest
+
+from rutas import GrafoCarreteras
+from simulacion import Point, RoadSegment, RoadSystem
+
+
+def tramo(x1, y1, x2, y2, ancho=20) -> RoadSegment:
+    return RoadSegment(Point(x1, y1), Point(x2, y2), ancho)
+
+
+def longitud(puntos) -> float:
+    return sum(math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(puntos, puntos[1:]))
+
+
+class TestGrafoSencillo(unittest.TestCase):
+
+    def setUp(self):
+        # Una "L" con un atajo diagonal y una carretera suelta sin conexión
+        self.carreteras = [tramo(0, 0, 400, 0), tramo(400, 0, 400, 300), tramo(100, 0, 400, 200),
+                           tramo(900, 900, 1000, 900)]
+        self.grafo = GrafoCarreteras(self.carreteras)
+
+    def test_cruces_y_extremos_son_nodos(self):
+        for punto in ((0, 0), (100, 0), (400, 0), (400, 300), (900, 900)):
+            self.assertTrue(any(math.hypot(x - punto[0], y - punto[1]) < 1 for x, y in self.grafo.nodos),
+                            punto)
+
+    def test_ruta_por_el_atajo(self):
+        puntos = self.grafo.ruta((0, 0), (400, 250))
+        self.assertEqual(puntos[-1], (400, 250))
+        self.assertAlmostEqual(longitud([(0, 0)] + puntos), 100 + math.hypot(300, 200) + 50)
+        self.assertAlmostEqual(self.grafo.distancia((0, 0), (400, 250)), longitud([(0, 0)] + puntos))
+
+    def test_mismo_tramo_va_directo(self):
+        self.assertEqual(self.grafo.ruta((10, 0), (90, 0)), [(90, 0)])
+        self.assertAlmostEqual(self.grafo.distancia((10, 0), (90, 0)), 80)
+
+    def test_sin_conexion(self):
+        self.assertIsNone(self.grafo.ruta((0, 0), (950, 900)))
+        self.assertEqual(self.grafo.distancia((0, 0), (950, 900)), math.inf)
+        self.assertIsNone(GrafoCarreteras([]).ruta((0, 0), (1, 1)))
+
+
+class TestGrafoDelSimulador(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.carreteras = RoadSystem(800, 600, random.Random(1))
+        cls.grafo = cls.carreteras.grafo
+
+    def test_a_estrella_coincide_con_dijkstra(self):
+        azar = random.Random(3)
+        nodos = range(len(self.grafo))
+        for _ in range(100):
+            origen, destino = azar.choice(nodos), azar.choice(nodos)
+            distancias, _ = self.grafo.arbol_hacia(destino)
+            encontrado = self.grafo.camino(origen, destino)
+            if origen not in distancias:
+                self.assertIsNone(encontrado)
+                continue
+            coste, camino = encontrado
+            self.assertAlmostEqual(coste, distancias[origen])
+            self.assertEqual((camino[0], camino[-1]), (origen, destino))
+            self.assertAlmostEqual(longitud([self.grafo.nodos[n] for n in camino]), coste)
+
+    def test_la_ruta_va_por_el_asfalto(self):
+        azar = random.Random(4)
+        indice = self.carreteras.indice
+        for _ in range(50):
+            origen = self.carreteras.buildings[azar.randrange(len(self.carreteras.buildings))].position
+            destino = self.carreteras.buildings[azar.randrange(len(self.carreteras.buildings))].position
+            puntos = self.grafo.ruta((origen.x, origen.y), (destino.x, destino.y))
+            self.assertIsNotNone(puntos)
+            recorrido = [(origen.x, origen.y)] + puntos
+            for (xa, ya), (xb, yb) in zip(recorrido, recorrido[1:]):
+                for t in (0.25, 0.5, 0.75):
+                    self.assertIsNotNone(indice.carretera_en(xa + (xb - xa) * t, ya + (yb - ya) * t))
+            self.assertAlmostEqual(self.grafo.distancia((origen.x, origen.y), (destino.x, destino.y)),
+                                   longitud(recorrido))
+
+    def test_cache_de_caminos_en_los_dos_sentidos(self):
+        nombres = list(self.grafo.nodo_lugar)
+        ida = self.grafo.ruta_entre_lugares(nombres[0], nombres[-1])
+        aciertos = self.grafo.aciertos
+        vuelta = self.grafo.ruta_entre_lugares(nombres[-1], nombres[0])
+        self.assertEqual(self.grafo.aciertos, aciertos + 1)
+        self.assertEqual(vuelta, ida[::-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Pruebas de la simulación sin interfaz gráfica
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+from ej6_1 import Camion
+from simulacion import (BODEGA_ESTANDAR, PackageState, PilotoDirecto, PilotoGuion, PilotoRuta,
+                        SimulacionNucleo)
+
+
+def simulacion_con_pilotos(piloto, semilla: int = 3, camiones: int = 2) -> SimulacionNucleo:
+    simulacion = SimulacionNucleo(eventos=None, semilla=semilla)
+    simulacion.create_sample_trucks()
+    for i in range(len(simulacion.camiones), camiones):
+        simulacion.add_truck(Camion(f"SIM{i:05d}", f"Piloto {i}", 8000.0, "Simulación", 90, 0,
+                                    bodega=BODEGA_ESTANDAR))
+    for camion in simulacion.camiones:
+        simulacion.pilotos[camion.matricula] = piloto()
+    return simulacion
+
+
+class TestSimulacionNucleo(unittest.TestCase):
+
+    def test_no_necesita_tkinter(self):
+        codigo = ("import sys; sys.modules['tkinter'] = None\n"
+                  "import simulacion\n"
+                  "s = simulacion.SimulacionNucleo(eventos=None, semilla=1)\n"
+                  "s.create_sample_trucks(); s.ejecutar(50)")
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        proceso = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, cwd=raiz)
+        self.assertEqual(proceso.returncode, 0, proceso.stderr)
+
+    def test_pilotos_recogen_y_entregan_todo(self):
+        for piloto in (PilotoDirecto, PilotoRuta):
+            simulacion = simulacion_con_pilotos(piloto)
+            simulacion.ejecutar(3000)
+            paquetes = simulacion.road_system.packages
+            self.assertEqual(simulacion.entregas, len(paquetes), piloto.__name__)
+            self.assertTrue(all(p.state == PackageState.DELIVERED for p in paquetes))
+            self.assertTrue(all(len(camion.cajas) == 0 for camion in simulacion.camiones))
+
+    def test_misma_semilla_mismo_resultado(self):
+        a, b = simulacion_con_pilotos(PilotoDirecto, 11, 6), simulacion_con_pilotos(PilotoDirecto, 11, 6)
+        for simulacion in (a, b):
+            for _ in range(5):
+                simulacion.crear_mision()
+            simulacion.ejecutar(600)
+        self.assertEqual(a.estado(), b.estado())
+        self.assertEqual((a.recogidas, a.entregas), (b.recogidas, b.entregas))
+
+    def test_cajas_a_bordo_coinciden_con_paquetes_en_transito(self):
+        simulacion = simulacion_con_pilotos(PilotoDirecto, 5, 4)
+        for _ in range(10):
+            simulacion.crear_mision()
+        for _ in range(8):
+            simulacion.ejecutar(100)
+            en_transito = {p.id: p.assigned_truck for p in simulacion.road_system.packages
+                           if p.state == PackageState.IN_TRANSIT}
+            a_bordo = {caja.codigo: camion.matricula for camion in simulacion.camiones for caja in camion.cajas}
+            self.assertEqual(en_transito, a_bordo)
+
+    def test_guion_en_bucle(self):
+        guion = PilotoGuion.desde_texto("forward:2,left+forward:1,none:1")
+        simulacion = simulacion_con_pilotos(PilotoDirecto)
+        camion = simulacion.camiones[0]
+        vistos = [guion(simulacion, camion) for _ in range(8)]
+        self.assertEqual([c["forward"] for c in vistos], [True, True, True, False] * 2)
+        self.assertTrue(vistos[2]["left"])
+        with self.assertRaises(ValueError):
+            PilotoGuion.desde_texto("volar:3")
+
+    def test_camion_activo_sigue_los_controles(self):
+        simulacion = SimulacionNucleo(eventos=None, semilla=1)
+        simulacion.create_sample_trucks()
+        simulacion.controls["forward"] = True
+        simulacion.ejecutar(20)
+        self.assertGreater(simulacion.truck_physics["TRK001"].velocity, 0)
+        self.assertEqual(simulacion.truck_physics["TRK002"].velocity, 0)
+        self.assertGreater(simulacion.camion_activo.velocidad, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Pruebas de la síntesis de sonidos del simulador
+Autor: [Tu nombre]
+Fecha: 17 de Noviembre de 2025
+"""
+
+import math
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+import sintesis_audio
+from sintesis_audio import (NUMPY_AVAILABLE, SONIDOS, CacheSonidos, Pitidos, Tono,
+                            cargar_en_segundo_plano, pcm)
+
+TASA = 22050
+
+
+def muestras_de_referencia(tono: Tono, tasa: int) -> list:
+    """La fórmula directa, muestra a muestra y con la envolvente en todas"""
+    muestras = []
+    for i in range(int(tono.duracion * tasa)):
+        t = i / tasa
+        fase = (tono.frecuencia * t) % 1.0
+        if tono.forma == "seno":
+            onda = math.sin(2 * math.pi * tono.frecuencia * t)
+        elif tono.forma == "cuadrada":
+            onda = 1.0 if fase < 0.5 else -1.0
+        else:
+            onda = 2 * fase - 1
+        envolvente = 1.0
+        if tono.ataque > 0:
+            envolvente = min(envolvente, t / tono.ataque)
+        if tono.relajacion > 0:
+            envolvente = min(envolvente, (tono.duracion - t) / tono.relajacion)
+        muestras.append(round(tono.amplitud * onda * envolvente))
+    return muestras
+
+
+def sin_numpy(funcion, *args):
+    with mock.patch.object(sintesis_audio, "NUMPY_AVAILABLE", False):
+        return funcion(*args)
+
+
+class TestSintesis(unittest.TestCase):
+
+    def test_python_coincide_con_la_referencia(self):
+        for forma in ("seno", "cuadrada", "sierra"):
+            tono = Tono(440, 0.1, 3000, forma=forma)
+            datos = sin_numpy(pcm, tono, TASA, 1)
+            self.assertEqual(list(struct.unpack(f"<{len(datos) // 2}h", datos)),
+                             muestras_de_referencia(tono, TASA), forma)
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "NumPy no está instalado")
+    def test_numpy_y_python_dan_el_mismo_pcm(self):
+        for nombre, sonido in SONIDOS.items():
+            for canales in (1, 2):
+                self.assertEqual(pcm(sonido, TASA, canales), sin_numpy(pcm, sonido, TASA, canales),
+                                 f"{nombre} con {canales} canales")
+
+    def test_canales_intercalados_y_pitidos(self):
+        tono = Tono(1000, 0.05, 2048)
+        mono = sin_numpy(pcm, tono, TASA, 1)
+        estereo = sin_numpy(pcm, tono, TASA, 2)
+        self.assertEqual(len(estereo), 2 * len(mono))
+        self.assertEqual(estereo[:4], mono[:2] * 2)
+        pitidos = sin_numpy(pcm, Pitidos(tono, repeticiones=3, pausa=0.01), TASA, 1)
+        bloque = mono + bytes(2 * int(0.01 * TASA))
+        self.assertEqual(pitidos, bloque * 3)
+
+    def test_tono_invalido(self):
+        with self.assertRaises(ValueError):
+            Tono(440, 0.1, forma="triangular")
+        with self.assertRaises(ValueError):
+            Tono(440, 0.1, amplitud=40000)
+
+
+class TestCacheSonidos(unittest.TestCase):
+
+    def test_segunda_vez_sale_de_la_cache(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            cache = CacheSonidos(directorio)
+            primera = cache.obtener(SONIDOS["claxon"], 8000, 1)
+            segunda = CacheSonidos(directorio)
+            self.assertEqual(segunda.obtener(SONIDOS["claxon"], 8000, 1), primera)
+            self.assertEqual((cache.fallos, segunda.aciertos), (1, 1))
+            self.assertNotEqual(cache.ruta(SONIDOS["claxon"], 8000, 1), cache.ruta(SONIDOS["claxon"], 8000, 2))
+
+    def test_carga_en_segundo_plano(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            cargados = {}
+            hilo = cargar_en_segundo_plano(SONIDOS, 8000, 2, cargados.__setitem__, CacheSonidos(directorio))
+            hilo.join(30)
+            self.assertEqual(set(cargados), set(SONIDOS))
+            self.assertTrue(all(len(datos) % 4 == 0 for datos in cargados.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()